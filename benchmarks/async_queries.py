@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compares running many small lookups on one event loop with AsyncSession
+against running them through a thread pool with Session.
+
+The lookups are the select() counterparts of the example npg_irods and
+genotyping helpers, with the parameters used by the tests. The database is
+given by an ini file laid out like tests/testdb.ini.
+
+Usage: PYTHONPATH=src:tests python benchmarks/async_queries.py \\
+    [--ini tests/testdb.ini] [--lookups N] [--concurrency C]
+"""
+
+import argparse
+import asyncio
+import configparser
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from examples.genotyping import select_flgen_plate
+from examples.npg_irods import select_bmap_flowcell_records, select_stock_records
+from ml_warehouse.engine import dispose_engines, get_engine, make_async_engine
+
+STATEMENTS = [
+    select_flgen_plate(1382108143, "S70"),
+    select_stock_records("stock_barcode_01234"),
+    select_bmap_flowcell_records("KHPZDTGLPQJGPNWU", 2),
+]
+
+
+def run_threads(config, lookups: int, concurrency: int) -> float:
+    engine = get_engine(config=config, pool_size=concurrency, max_overflow=0)
+
+    def lookup(i):
+        with Session(engine) as sess:
+            return sess.execute(STATEMENTS[i % len(STATEMENTS)]).all()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lookup, range(lookups)))
+    elapsed = time.perf_counter() - start
+
+    dispose_engines()
+
+    return elapsed
+
+
+def run_asyncio(config, lookups: int, concurrency: int) -> float:
+    async def lookup(engine, i):
+        async with AsyncSession(engine) as sess:
+            return (await sess.execute(STATEMENTS[i % len(STATEMENTS)])).all()
+
+    async def lookup_all():
+        # The pool bounds the number of lookups in flight.
+        engine = make_async_engine(config=config, pool_size=concurrency, max_overflow=0)
+        start = time.perf_counter()
+        await asyncio.gather(*[lookup(engine, i) for i in range(lookups)])
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+
+        return elapsed
+
+    return asyncio.run(lookup_all())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ini", default="tests/testdb.ini")
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    config = configparser.ConfigParser()
+    config.read(args.ini)
+
+    for name, run in (("thread pool", run_threads), ("asyncio", run_asyncio)):
+        elapsed = run(config, args.lookups, args.concurrency)
+        print(
+            f"{name:12} {args.lookups} lookups in {elapsed:6.2f} s"
+            f"  {args.lookups / elapsed:8.0f} lookups/s"
+        )
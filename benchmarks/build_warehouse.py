@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Builds a synthetic warehouse with ml_warehouse.synthetic, reporting the
+rows loaded per second into each table.
+
+The database given by an ini file laid out like tests/testdb.ini, which should
+be a scratch database, is recreated. Scale 6 builds about 10 million rows;
+LOAD DATA LOCAL INFILE is used when the server allows it.
+
+Usage: PYTHONPATH=src:tests python benchmarks/build_warehouse.py \\
+    [--ini tests/testdb.ini] [--seed N] [--scale F]
+"""
+
+import argparse
+import configparser
+import time
+
+from sqlalchemy.orm import Session
+
+from ml_warehouse.engine import dispose_engines, get_engine
+from ml_warehouse.schema import metadata
+from ml_warehouse.synthetic import SyntheticWarehouse
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ini", default="tests/testdb.ini")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    config = configparser.ConfigParser()
+    config.read(args.ini)
+
+    warehouse = SyntheticWarehouse(seed=args.seed, scale=args.scale)
+
+    engine = get_engine(config=config, connect_args={"local_infile": True})
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    start = time.perf_counter()
+    with Session(engine) as sess:
+        results = warehouse.load(sess)
+    elapsed = time.perf_counter() - start
+
+    for name, loaded in results.items():
+        print(
+            f"{name:36} {loaded.rows:10} rows {loaded.rows_per_second:10.0f} rows/s"
+            f" ({loaded.method})"
+        )
+
+    total = sum(loaded.rows for loaded in results.values())
+    print(f"{total} rows in {elapsed:.0f} s")
+    dispose_engines()
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compares loading the test fixtures through the ORM unit of work with the
+bulk loaders of ml_warehouse.bulk.
+
+Each run recreates the tables of the database given by an ini file laid out
+like tests/testdb.ini, which should be a scratch database, and loads every
+fixture file. LOAD DATA LOCAL INFILE is only measured when the server allows
+it.
+
+Usage: PYTHONPATH=src:tests python benchmarks/bulk_load.py \\
+    [--ini tests/testdb.ini] [--repeat N]
+"""
+
+import argparse
+import configparser
+import time
+
+import yaml
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ml_warehouse import schema
+from ml_warehouse.bulk import INFILE, INSERT, load_yaml, local_infile_enabled
+from ml_warehouse.engine import dispose_engines, get_engine
+
+FIXTURES = [
+    ("IseqRunStatusDict", "tests/fixtures/00-IseqRunStatusDict.yml"),
+    ("IseqRunStatus", "tests/fixtures/100-IseqRunStatus.yml"),
+    ("StudyUsers", "tests/fixtures/100-StudyUser.yml"),
+    ("Sample", "tests/fixtures/200-Sample.yml"),
+    ("Study", "tests/fixtures/200-Study.yml"),
+    ("StockResource", "tests/fixtures/400-StockResource.yml"),
+    ("OseqFlowcell", "tests/fixtures/300-OseqFlowcell.yml"),
+    ("BmapFlowcell", "tests/fixtures/300-BmapFlowcell.yml"),
+    ("IseqFlowcell", "tests/fixtures/300-IseqFlowcell.yml"),
+    ("PacBioRun", "tests/fixtures/300-PacBioRun.yml"),
+    ("IseqRunLaneMetrics", "tests/fixtures/400-IseqRunLaneMetric.yml"),
+    ("IseqProductMetrics", "tests/fixtures/300-IseqProductMetric.yml"),
+]
+
+
+def load_orm(sess: Session, model, path: str) -> int:
+    # The fixture loading of the tests before ml_warehouse.bulk.
+    with open(path, "r") as f:
+        fixtures = yaml.safe_load(f)
+
+    objs = []
+    for row in fixtures:
+        obj = model()
+        for key, value in row.items():
+            setattr(obj, key, value)
+        objs.append(obj)
+
+    sess.add_all(objs)
+    sess.commit()
+
+    return len(objs)
+
+
+def run(engine, method: str, repeat: int) -> tuple:
+    rows = 0
+    elapsed = 0.0
+
+    for _ in range(repeat):
+        schema.metadata.drop_all(engine)
+        schema.metadata.create_all(engine)
+
+        # The session settings must apply to every transaction, so keep to a
+        # single connection.
+        with engine.connect() as conn, Session(conn) as sess:
+            sess.execute(text("SET sql_mode = ''"))
+            sess.execute(text("SET foreign_key_checks = 0"))
+
+            start = time.perf_counter()
+            for name, path in FIXTURES:
+                model = getattr(schema, name)
+                if method == "orm":
+                    rows += load_orm(sess, model, path)
+                else:
+                    rows += load_yaml(sess, model, path, method=method).rows
+            elapsed += time.perf_counter() - start
+
+    return rows, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ini", default="tests/testdb.ini")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    config = configparser.ConfigParser()
+    config.read(args.ini)
+
+    schema.load_all()
+    engine = get_engine(config=config, connect_args={"local_infile": True})
+
+    methods = ["orm", INSERT]
+    with Session(engine) as sess:
+        if local_infile_enabled(sess):
+            methods.append(INFILE)
+
+    for method in methods:
+        rows, elapsed = run(engine, method, args.repeat)
+        print(
+            f"{method:8} {rows} rows in {elapsed:6.2f} s"
+            f"  {rows / elapsed:8.0f} rows/s"
+        )
+
+    schema.metadata.drop_all(engine)
+    dispose_engines()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measures the cost of importing ml_warehouse.schema and configuring mappers.
+
+Each scenario runs in a fresh interpreter, so that nothing is cached between
+runs. SQLAlchemy itself is imported before the clock starts. The "all domains"
+scenario corresponds to the cost of the former single schema module, and the
+"runtime docstrings" scenario adds the add_docstring pass which used to run
+on every class at import time.
+
+Usage: PYTHONPATH=src python benchmarks/import_time.py [--repeat N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = {
+    "import ml_warehouse.schema": "import ml_warehouse.schema",
+    "one domain (CgapHeron)": "from ml_warehouse.schema import CgapHeron",
+    "Sample and its relations": "from ml_warehouse.schema import Sample",
+    "all domains": "import ml_warehouse.schema as s; s.load_all()",
+    "all domains, runtime docstrings": """
+import ml_warehouse.schema as s
+from ml_warehouse._decorators import add_docstring
+s.load_all()
+for mapper in s.Base.registry.mappers:
+    add_docstring(mapper.class_)
+""",
+}
+
+TEMPLATE = """
+import resource
+import time
+import sqlalchemy.orm
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+{statement}
+sqlalchemy.orm.configure_mappers()
+print(time.perf_counter() - start)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss)
+"""
+
+
+def run_scenario(statement: str, repeat: int):
+    """Returns the elapsed times, in seconds, and the growth in peak resident
+    memory, in KiB, of each run of a scenario."""
+    times = []
+    memory = []
+    for _ in range(repeat):
+        out = subprocess.check_output(
+            [sys.executable, "-c", TEMPLATE.format(statement=statement)]
+        ).split()
+        times.append(float(out[0]))
+        memory.append(int(out[1]))
+
+    return times, memory
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    for name, statement in SCENARIOS.items():
+        times, memory = run_scenario(statement, args.repeat)
+        print(
+            f"{name:32} median {statistics.median(times) * 1000:8.1f} ms"
+            f"  min {min(times) * 1000:8.1f} ms"
+            f"  peak RSS +{statistics.median(memory) / 1024:6.1f} MiB"
+        )
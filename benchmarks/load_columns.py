@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compares building NumPy arrays of IseqRunLaneMetrics columns from ORM
+objects with ml_warehouse.columns.load_columns().
+
+The iseq_run_lane_metrics table of the database given by an ini file laid out
+like tests/testdb.ini, which should be a scratch database, is recreated and
+filled with random lanes.
+
+Usage: PYTHONPATH=src:tests python benchmarks/load_columns.py \\
+    [--ini tests/testdb.ini] [--lanes N]
+"""
+
+import argparse
+import configparser
+import time
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ml_warehouse.bulk import load_rows
+from ml_warehouse.columns import load_columns, numpy_dtype
+from ml_warehouse.engine import dispose_engines, get_engine
+from ml_warehouse.schema import IseqRunLaneMetrics
+
+COLUMNS = [
+    IseqRunLaneMetrics.interop_cluster_count_total,
+    IseqRunLaneMetrics.interop_cluster_count_pf_total,
+    IseqRunLaneMetrics.interop_cluster_density_mean,
+    IseqRunLaneMetrics.interop_cluster_pf_mean,
+    IseqRunLaneMetrics.q30_yield_kb_forward_read,
+    IseqRunLaneMetrics.tags_decode_percent,
+]
+
+
+def lanes(n: int):
+    rng = np.random.default_rng(0)
+    for i in range(n):
+        yield {
+            "id_run": i // 8 + 1,
+            "position": i % 8 + 1,
+            "cycles": 318,
+            "interop_cluster_count_total": int(rng.integers(10**8, 10**9)),
+            "interop_cluster_count_pf_total": int(rng.integers(10**8, 10**9)),
+            "interop_cluster_density_mean": float(rng.uniform(100, 3000)),
+            "interop_cluster_pf_mean": float(rng.uniform(50, 100)),
+            "q30_yield_kb_forward_read": int(rng.integers(10**6, 10**8)),
+            # About one lane in ten has no decode percentage.
+            "tags_decode_percent": (
+                None if rng.random() < 0.1 else float(rng.uniform(80, 100))
+            ),
+        }
+
+
+def orm_arrays(sess: Session) -> dict:
+    objs = sess.execute(select(IseqRunLaneMetrics)).scalars().all()
+
+    arrays = {}
+    for col in COLUMNS:
+        values = [getattr(obj, col.key) for obj in objs]
+        mask = np.array([v is None for v in values])
+        data = np.array(
+            [0 if v is None else v for v in values], dtype=numpy_dtype(col.type)
+        )
+        arrays[col.key] = np.ma.MaskedArray(data, mask) if mask.any() else data
+
+    return arrays
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ini", default="tests/testdb.ini")
+    parser.add_argument("--lanes", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    config = configparser.ConfigParser()
+    config.read(args.ini)
+
+    engine = get_engine(config=config)
+    table = IseqRunLaneMetrics.__table__
+    table.drop(engine, checkfirst=True)
+    table.create(engine)
+
+    with Session(engine) as sess:
+        loaded = load_rows(sess, IseqRunLaneMetrics, lanes(args.lanes))
+        print(f"loaded {loaded.rows} lanes at {loaded.rows_per_second:.0f} rows/s")
+
+    for name, load in (
+        ("orm", orm_arrays),
+        ("load_columns", lambda sess: load_columns(sess, *COLUMNS)),
+    ):
+        with Session(engine) as sess:
+            start = time.perf_counter()
+            arrays = load(sess)
+            elapsed = time.perf_counter() - start
+
+        nbytes = sum(a.nbytes for a in arrays.values())
+        print(f"{name:12} {elapsed:6.2f} s  {nbytes / 2**20:6.1f} MiB of arrays")
+
+    table.drop(engine)
+    dispose_engines()
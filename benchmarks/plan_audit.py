@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Audits the query plans of the example query helpers of
+examples/registry.py with EXPLAIN FORMAT=JSON, writing a JSON report of the
+table accesses, findings and suggested indexes of each helper, and printing a
+summary of the findings.
+
+The database given by an ini file laid out like tests/testdb.ini should hold
+representative data, as plans depend on the table statistics.
+
+Usage: PYTHONPATH=src:tests python benchmarks/plan_audit.py \\
+    [--ini tests/testdb.ini] [--output plans.json] [--max-rows N] [helper ...]
+"""
+
+import argparse
+import configparser
+
+from sqlalchemy.orm import Session
+
+from examples.registry import HELPERS
+from ml_warehouse.engine import dispose_engines, get_engine
+from ml_warehouse.explain import DEFAULT_MAX_ROWS, audit_report, write_report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ini", default="tests/testdb.ini")
+    parser.add_argument("--output", default="plans.json")
+    parser.add_argument("--max-rows", type=int, default=DEFAULT_MAX_ROWS)
+    parser.add_argument("helpers", nargs="*", help="Defaults to every helper")
+    args = parser.parse_args()
+
+    unknown = set(args.helpers) - set(HELPERS)
+    if unknown:
+        parser.error(f"unknown helpers {sorted(unknown)}")
+    helpers = {name: HELPERS[name] for name in args.helpers or HELPERS}
+
+    config = configparser.ConfigParser()
+    config.read(args.ini)
+
+    with Session(get_engine(config=config)) as sess:
+        report = audit_report(sess, helpers, args.max_rows)
+    dispose_engines()
+
+    write_report(report, args.output)
+
+    flagged = 0
+    for name, entry in report["helpers"].items():
+        for finding in entry["findings"]:
+            print(
+                f"{name:44} {finding['kind']:16} {finding['table']} {finding['detail']}"
+            )
+            flagged += 1
+        for table, columns in entry["suggested_indexes"].items():
+            print(f"{name:44} {'suggest_index':16} {table} ({', '.join(columns)})")
+
+    print(f"{len(helpers)} helpers audited, {flagged} findings, see {args.output}")
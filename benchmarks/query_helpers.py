@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmarks the example query helpers of examples/registry.py against
+synthetic warehouses of several scale factors, recording latency percentiles,
+rows per second, statements executed and peak RSS in a JSON baseline, and
+compares two baselines, flagging the regressions.
+
+For each scale, the database given by an ini file laid out like
+tests/testdb.ini, which should be a scratch database, is recreated and loaded
+with ml_warehouse.synthetic. The helpers are called with parameters taken from
+the loaded rows, after one untimed call, each in a process of its own so that
+its peak RSS is not that of the helpers run before it.
+
+`compare` exits with status 1 when a metric is worse than its baseline value
+by more than the threshold, a fraction of that value.
+
+Usage: PYTHONPATH=src:tests python benchmarks/query_helpers.py run \\
+    [--ini tests/testdb.ini] [--scales F ...] [--seed N] [--repeats N] \\
+    [--output benchmark.json] [helper ...]
+
+       PYTHONPATH=src:tests python benchmarks/query_helpers.py compare \\
+    [--threshold F] baseline.json current.json
+"""
+
+import argparse
+import configparser
+import json
+import multiprocessing
+import platform
+import resource
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import sqlalchemy
+from sqlalchemy import event, select
+from sqlalchemy.engine import Result
+from sqlalchemy.orm import Query, Session
+
+from examples.genotyping import get_flgen_plate
+from examples.long_illumina import summarize_long_illumina
+from examples.npg_irods import (
+    find_pacbio_runs,
+    get_bmap_flowcell_records,
+    get_stock_records,
+)
+from examples.npg_qc import (
+    get_iseq_product_metrics_by_decode_percent,
+    get_iseq_product_metrics_by_study,
+    get_iseq_product_metrics_run,
+)
+from examples.recently_updated import (
+    get_recent_fluidigm,
+    get_recent_ont,
+    get_recent_pacbio_runs,
+)
+from examples.registry import HELPERS
+from examples.stats import get_sequenced_sum
+from ml_warehouse.engine import dispose_engines, get_engine
+from ml_warehouse.schema import (
+    BmapFlowcell,
+    FlgenPlate,
+    IseqFlowcell,
+    IseqProductMetrics,
+    PacBioRun,
+    StockResource,
+    Study,
+    metadata,
+)
+from ml_warehouse.synthetic import START, SyntheticWarehouse
+
+SCALES = [0.01, 0.1, 1.0]
+RUN_IDS = 5
+
+# Metrics for which a larger value is a regression; for the others, such as
+# rows_per_second, a smaller value is.
+LOWER_IS_BETTER = {"p50_ms", "p90_ms", "p99_ms", "queries", "peak_rss_kib"}
+METRICS = ["p50_ms", "p90_ms", "p99_ms", "rows_per_second", "queries", "peak_rss_kib"]
+
+
+def synthetic_helpers(sess: Session) -> dict:
+    """Returns the helpers of examples/registry.py, with parameters matching
+    rows of the synthetic warehouse in the database of the Session."""
+
+    def first(*columns):
+        row = sess.execute(select(*columns).limit(1)).first()
+        return row if row is not None else (None,) * len(columns)
+
+    run_ids = sess.scalars(
+        select(IseqProductMetrics.id_run)
+        .distinct()
+        .order_by(IseqProductMetrics.id_run)
+        .limit(RUN_IDS)
+    ).all()
+    study_name = sess.scalars(
+        select(Study.name)
+        .join(IseqFlowcell, IseqFlowcell.id_study_tmp == Study.id_study_tmp)
+        .limit(1)
+    ).first()
+    plate_barcode, well_label = first(FlgenPlate.plate_barcode, FlgenPlate.well_label)
+    (stock_id,) = first(StockResource.id_stock_resource_lims)
+    chip_serialnumber, position = first(
+        BmapFlowcell.chip_serialnumber, BmapFlowcell.position
+    )
+    run_name, plate_well = first(PacBioRun.pac_bio_run_name, PacBioRun.well_label)
+
+    # The synthetic dates span 8 years from START.
+    since = START.replace(year=START.year + 6)
+
+    helpers = {
+        "get_flgen_plate": lambda s: get_flgen_plate(s, plate_barcode, well_label),
+        "summarize_long_illumina": lambda s: summarize_long_illumina(
+            s, "%", START, since, 3, run_ids
+        ),
+        "find_pacbio_runs": lambda s: find_pacbio_runs(s, run_name, plate_well),
+        "get_bmap_flowcell_records": lambda s: get_bmap_flowcell_records(
+            s, chip_serialnumber, position
+        ),
+        "get_stock_records": lambda s: get_stock_records(s, stock_id),
+        "get_iseq_product_metrics_by_decode_percent": (
+            lambda s: get_iseq_product_metrics_by_decode_percent(s, 95, run_ids)
+        ),
+        "get_iseq_product_metrics_by_study": (
+            lambda s: get_iseq_product_metrics_by_study(s, study_name, run_ids)
+        ),
+        "get_iseq_product_metrics_run": lambda s: get_iseq_product_metrics_run(
+            s, run_ids, "library_indexed_spike", 1
+        ),
+        "get_recent_fluidigm": lambda s: get_recent_fluidigm(s, since),
+        "get_recent_ont": lambda s: get_recent_ont(s, since),
+        "get_recent_pacbio_runs": lambda s: get_recent_pacbio_runs(s, since),
+        "get_sequenced_sum": lambda s: get_sequenced_sum(s, START),
+    }
+
+    # Fail early rather than silently benchmark a subset of the helpers.
+    missing = set(HELPERS) - set(helpers)
+    if missing:
+        raise ValueError(f"No synthetic parameters for helpers {sorted(missing)}")
+
+    return helpers
+
+
+def fetch(result) -> list:
+    if isinstance(result, Query):
+        return result.all()
+    if isinstance(result, Result):
+        return result.all()
+
+    return list(result)
+
+
+def measure(config: configparser.ConfigParser, name: str, repeats: int) -> dict:
+    """Calls a helper repeatedly, returning its metrics. Meant to be run in a
+    process of its own, whose peak RSS is that of the helper."""
+    engine = get_engine(config=config)
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    with Session(engine) as sess:
+        helper = synthetic_helpers(sess)[name]
+
+        # The first call compiles the statements and fills the caches.
+        rows = len(fetch(helper(sess)))
+        sess.expunge_all()
+
+        event.listen(engine, "before_cursor_execute", count)
+        latencies = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fetch(helper(sess))
+            latencies.append(time.perf_counter() - start)
+            sess.expunge_all()
+        event.remove(engine, "before_cursor_execute", count)
+
+    dispose_engines()
+
+    p = statistics.quantiles(latencies, n=100, method="inclusive")
+    p50 = statistics.median(latencies)
+
+    return {
+        "p50_ms": p50 * 1e3,
+        "p90_ms": p[89] * 1e3,
+        "p99_ms": p[98] * 1e3,
+        "rows": rows,
+        "rows_per_second": rows / p50 if p50 else 0.0,
+        "queries": statements / repeats,
+        # Kilobytes on Linux, bytes on macOS.
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def build(config: configparser.ConfigParser, seed: int, scale: float) -> int:
+    """Recreates the database, loading a synthetic warehouse into it, and
+    returns the number of rows loaded."""
+    warehouse = SyntheticWarehouse(seed=seed, scale=scale)
+
+    engine = get_engine(config=config, connect_args={"local_infile": True})
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    with Session(engine) as sess:
+        results = warehouse.load(sess)
+    dispose_engines()
+
+    return sum(loaded.rows for loaded in results.values())
+
+
+def run(args: argparse.Namespace) -> dict:
+    config = configparser.ConfigParser()
+    config.read(args.ini)
+
+    helpers = args.helpers or list(HELPERS)
+    ctx = multiprocessing.get_context("fork")
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "seed": args.seed,
+        "repeats": args.repeats,
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "results": {},
+    }
+
+    print(f"{'helper':44} {'rows':>8} {'p50 ms':>9} {'p99 ms':>9} {'rows/s':>10}")
+    for scale in args.scales:
+        start = time.perf_counter()
+        loaded = build(config, args.seed, scale)
+        print(f"scale {scale}: {loaded} rows in {time.perf_counter() - start:.0f} s")
+
+        results = report["results"][str(scale)] = {}
+        for name in helpers:
+            with ctx.Pool(1) as pool:
+                metrics = pool.apply(measure, (config, name, args.repeats))
+            results[name] = metrics
+
+            print(
+                f"{name:44} {metrics['rows']:8} {metrics['p50_ms']:9.2f}"
+                f" {metrics['p99_ms']:9.2f} {metrics['rows_per_second']:10.0f}"
+            )
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    return report
+
+
+def regressions(baseline: dict, current: dict, threshold: float) -> list:
+    """Returns (scale, helper, metric, baseline value, current value) tuples
+    for the metrics of current worse than those of baseline by more than
+    threshold, a fraction of the baseline value."""
+    found = []
+
+    for scale, helpers in current["results"].items():
+        for name, metrics in helpers.items():
+            before = baseline["results"].get(scale, {}).get(name)
+            if before is None:
+                continue
+
+            for metric in METRICS:
+                old, new = before.get(metric), metrics.get(metric)
+                if not old or new is None:
+                    continue
+
+                change = (new - old) / old
+                if metric not in LOWER_IS_BETTER:
+                    change = -change
+                if change > threshold:
+                    found.append((scale, name, metric, old, new))
+
+    return found
+
+
+def compare(args: argparse.Namespace) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    found = regressions(baseline, current, args.threshold)
+    for scale, name, metric, old, new in found:
+        print(
+            f"{scale:>6} {name:44} {metric:16} {old:12.2f} -> {new:12.2f}"
+            f" ({(new - old) / old:+.0%})"
+        )
+
+    compared = sum(
+        name in baseline["results"].get(scale, {})
+        for scale, helpers in current["results"].items()
+        for name in helpers
+    )
+    print(
+        f"{compared} helper runs compared, {len(found)} regressions above"
+        f" {args.threshold:.0%}"
+    )
+
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Benchmark the helpers")
+    run_parser.add_argument("--ini", default="tests/testdb.ini")
+    run_parser.add_argument("--scales", type=float, nargs="+", default=SCALES)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--repeats", type=int, default=20)
+    run_parser.add_argument("--output", default="benchmark.json")
+    run_parser.add_argument("helpers", nargs="*", help="Defaults to every helper")
+
+    compare_parser = commands.add_parser("compare", help="Compare two baselines")
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        unknown = set(args.helpers) - set(HELPERS)
+        if unknown:
+            parser.error(f"unknown helpers {sorted(unknown)}")
+        if args.repeats < 2:
+            parser.error("--repeats must be at least 2")
+        run(args)
+    else:
+        sys.exit(compare(args))
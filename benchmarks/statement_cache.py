@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measures the per-call overhead of the example query helpers: building their
+statements, generating the cache keys under which their compiled forms are
+found, and compiling them, which the compiled statement cache saves on every
+call but the first.
+
+With an ini file laid out like tests/testdb.ini, the helpers are also executed
+against that database, reporting the cache hits and misses and the time spent
+preparing statements.
+
+Usage: PYTHONPATH=src:tests python benchmarks/statement_cache.py \\
+    [--calls N] [--ini tests/testdb.ini]
+"""
+
+import argparse
+import configparser
+import time
+from datetime import datetime
+
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Query, Session
+
+from examples.genotyping import get_flgen_plate, select_flgen_plate
+from examples.long_illumina import select_long_illumina, summarize_long_illumina
+from examples.npg_irods import get_stock_records, select_stock_records
+from examples.npg_qc import (
+    get_iseq_product_metrics_run,
+    select_iseq_product_metrics_run,
+)
+from examples.recently_updated import get_recent_ont, select_recent_ont
+from ml_warehouse.engine import dispose_engines, get_engine
+from ml_warehouse.statements import StatementStats
+
+SINCE = datetime(year=2018, month=1, day=1)
+LONG_ILLUMINA = (
+    "%tyler%",
+    datetime(year=2015, month=1, day=14),
+    datetime(year=2021, month=8, day=31),
+    3,
+    [3434, 1239, 1453],
+)
+
+HELPERS = {
+    "get_flgen_plate": lambda s: get_flgen_plate(s, 1382108143, "S70"),
+    "select_flgen_plate": lambda s: select_flgen_plate(1382108143, "S70"),
+    "get_stock_records": lambda s: get_stock_records(s, "stock_barcode_01234"),
+    "select_stock_records": lambda s: select_stock_records("stock_barcode_01234"),
+    "get_recent_ont": lambda s: get_recent_ont(s, SINCE),
+    "select_recent_ont": lambda s: select_recent_ont(SINCE),
+    "get_iseq_product_metrics_run": lambda s: get_iseq_product_metrics_run(
+        s, [7915, 15440, 18980, 17550], "library_indexed_spike", 5
+    ),
+    "select_iseq_product_metrics_run": lambda s: select_iseq_product_metrics_run(
+        [7915, 15440, 18980, 17550], "library_indexed_spike", 5
+    ),
+    "summarize_long_illumina": lambda s: summarize_long_illumina(s, *LONG_ILLUMINA),
+    "select_long_illumina": lambda s: select_long_illumina(*LONG_ILLUMINA),
+}
+
+
+def statement(stmt):
+    # A Query is turned into a statement each time it is executed.
+    return stmt._statement_20() if isinstance(stmt, Query) else stmt
+
+
+def run(sess: Session, stmt) -> list:
+    return stmt.all() if isinstance(stmt, Query) else sess.execute(stmt).all()
+
+
+def per_call(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def overhead(sess: Session, calls: int):
+    dialect = mysql.dialect()
+
+    print(f"{'helper':32} {'build µs':>9} {'key µs':>9} {'compile µs':>11}")
+    for name, helper in HELPERS.items():
+        stmt = helper(sess)
+
+        build = per_call(lambda: helper(sess), calls)
+        key = per_call(lambda: statement(helper(sess))._generate_cache_key(), calls)
+        compile_ = per_call(lambda: statement(stmt).compile(dialect=dialect), calls)
+
+        print(f"{name:32} {build:9.1f} {key - build:9.1f} {compile_:11.1f}")
+
+
+def execute(config: configparser.ConfigParser, calls: int):
+    engine = get_engine(config=config)
+    stats = StatementStats(engine)
+
+    print(f"\n{'helper':32} {'call µs':>9} {'hits':>6} {'misses':>6} {'prep µs':>9}")
+    with Session(engine) as sess:
+        for name, helper in HELPERS.items():
+            stats.reset()
+            elapsed = per_call(
+                lambda: sess.execute(statement(helper(sess))).all(), calls
+            )
+            prep = (
+                (stats.hit_seconds + stats.compile_seconds + stats.uncached_seconds)
+                / calls
+                * 1e6
+            )
+
+            print(
+                f"{name:32} {elapsed:9.1f} {stats.hits:6} {stats.misses:6} {prep:9.1f}"
+            )
+
+    stats.detach()
+    dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--ini")
+    args = parser.parse_args()
+
+    with Session() as sess:
+        overhead(sess, args.calls)
+
+    if args.ini:
+        config = configparser.ConfigParser()
+        config.read(args.ini)
+        execute(config, args.calls)
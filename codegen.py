@@ -17,8 +17,11 @@
 #
 # @author Adam Blanchet <ab59@sanger.ac.uk>
 
+import ast
 import os
+import re
 import subprocess
+from collections import defaultdict
 from datetime import date
 
 
@@ -41,6 +44,27 @@ COPYRIGHT_TEMPLATE = """# -*- coding: utf-8 -*-
 #
 """
 
+SCHEMA_DIR = "src/ml_warehouse/schema"
+
+# Tables are placed in a domain submodule of ml_warehouse.schema according to
+# their name prefix. Tables matching none of the prefixes belong to the core
+# domain, alongside sample and study.
+DOMAIN_PREFIXES = {
+    "cgap": ("cgap_",),
+    "genotyping": ("bmap_", "flgen_"),
+    "iseq": ("iseq_",),
+    "lighthouse": ("lighthouse_",),
+    "ont": ("oseq_",),
+    "pacbio": ("pac_bio_",),
+}
+CORE_DOMAIN = "core"
+
+BLOCK_START = re.compile(r"^(?:class (\w+)\((\w+)\):|(\w+) = Table\()")
+TABLE_NAME = re.compile(r"__tablename__ = '(\w+)'|Table\(\s*'(\w+)'")
+RELATIONSHIP_TARGET = re.compile(r"relationship\('(\w+)'")
+FOREIGN_KEY_TARGET = re.compile(r"'(\w+)\.\w+'")
+COLUMN_ATTRIBUTE = re.compile(r"^    \w+ = Column\(")
+
 
 def gen_copyright():
 
@@ -57,17 +81,196 @@ def gen_copyright():
     return copyright
 
 
-if __name__ == "__main__":
-    PW = os.environ["MYSQL_PW"]
-    USER = os.environ["MYSQL_USER"]
-    HOST = os.environ["MYSQL_HOST"]
-    PORT = os.environ["MYSQL_PORT"]
-    DBNAME = os.environ["MYSQL_DBNAME"]
-
-    url = "mysql+pymysql://{user}:{passw}@{host}:{port}/{db}?charset=utf8mb4".format(
-        user=USER, passw=PW, host=HOST, port=PORT, db=DBNAME
+def table_domain(table_name: str) -> str:
+    for domain, prefixes in DOMAIN_PREFIXES.items():
+        if table_name.startswith(prefixes):
+            return domain
+
+    return CORE_DOMAIN
+
+
+def split_schema(source: str):
+    """Splits the output of sqlacodegen into its import header and one block
+    per mapped class or table.
+
+    Returns the header lines and a list of (name, table name, referenced names,
+    referenced tables, block lines) tuples, in the order they were generated.
+    """
+    header = []
+    blocks = []
+
+    for line in source.splitlines(keepends=True):
+        match = BLOCK_START.match(line)
+
+        if match:
+            name = match.group(1) or match.group(3)
+            parent = match.group(2)
+            blocks.append((name, parent, [line]))
+        elif blocks:
+            blocks[-1][2].append(line)
+        elif line.startswith(("from ", "import ")):
+            header.append(line)
+
+    result = []
+    for name, parent, lines in blocks:
+        while lines[-1].strip() == "":
+            lines.pop()
+
+        text = "".join(lines)
+        table = next(m for m in TABLE_NAME.search(text).groups() if m is not None)
+
+        ref_names = set(RELATIONSHIP_TARGET.findall(text))
+        if parent not in (None, "Base"):
+            ref_names.add(parent)
+
+        ref_tables = {
+            t
+            for line in lines
+            if "ForeignKey" in line
+            for t in FOREIGN_KEY_TARGET.findall(line)
+        }
+
+        result.append((name, table, ref_names, ref_tables, lines))
+
+    return header, result
+
+
+def column_comment(line: str):
+    """Returns the name and comment of a column declared on a single line as
+    `attribute = Column(...)`."""
+    call = ast.parse(line.strip()).body[0].value
+    name = line.split("=")[0].strip()
+    comment = None
+
+    if call.args and isinstance(call.args[0], ast.Constant):
+        name = call.args[0].value
+
+    for keyword in call.keywords:
+        if keyword.arg == "comment":
+            comment = ast.literal_eval(keyword.value)
+
+    return name, comment
+
+
+def document_class(name: str, lines: list) -> list:
+    """Adds the docstrings of a mapped class to its source.
+
+    Each column comment is also passed to the column as its `doc`, which
+    SQLAlchemy uses as the docstring of the mapped attribute. The column names
+    and comments are listed in the docstring of a constructor which defers to
+    the declarative one.
+    """
+    result = []
+    params = []
+
+    for line in lines:
+        if COLUMN_ATTRIBUTE.match(line):
+            col_name, comment = column_comment(line)
+
+            if comment is None:
+                params.append(f"        {col_name}\n")
+            else:
+                line = f"{line.rstrip()[:-1]}, doc={comment!r})\n"
+                doc = comment.replace("\\", "\\\\")
+                params.append(f"        {col_name}: {doc}\n")
+
+        result.append(line)
+
+    result.append("\n")
+    result.append("    def __init__(self, **kwargs):\n")
+    result.append(f'        """Constructs a new {name}.\n\n')
+    result.append("        Parameters\n")
+    result.append("        ----------\n")
+    result.extend(params)
+    result.append('        """\n')
+    result.append("        super().__init__(**kwargs)\n")
+
+    return result
+
+
+def format_item(key: str, values: list) -> str:
+    """Formats a dictionary item with a tuple of strings as its value, the way
+    Black would."""
+    quoted = [f'"{v}"' for v in values]
+    line = f'    "{key}": (' + ", ".join(quoted)
+    line += ",)," if len(values) == 1 else "),"
+
+    if len(line) <= 88:
+        return line + "\n"
+
+    return "".join(
+        [f'    "{key}": (\n', *(f"        {q},\n" for q in quoted), "    ),\n"]
     )
 
+
+def write_schema(source: str, copyright: str):
+    """Writes the sqlacodegen output as one module per domain under SCHEMA_DIR,
+    together with the _index module that ml_warehouse.schema uses to import
+    them on demand.
+    """
+    header, blocks = split_schema(source)
+
+    name_domains = {name: table_domain(table) for name, table, _, _, _ in blocks}
+
+    domain_blocks = defaultdict(list)
+    domain_deps = defaultdict(set)
+
+    for name, table, ref_names, ref_tables, lines in blocks:
+        domain = name_domains[name]
+        domain_blocks[domain].append((name, lines))
+
+        deps = {name_domains[n] for n in ref_names}
+        deps.update(table_domain(t) for t in ref_tables)
+        domain_deps[domain].update(deps - {domain})
+
+    for domain, members in domain_blocks.items():
+        result = [copyright]
+        result.extend(header)
+        result.append("\nfrom ml_warehouse.schema import Base, metadata\n")
+
+        for name, lines in members:
+            result.append("\n\n")
+            if lines[0].startswith("class"):
+                lines = document_class(name, lines)
+            result.extend(lines)
+
+        with open(os.path.join(SCHEMA_DIR, f"{domain}.py"), "w") as write_file:
+            write_file.writelines(result)
+
+    result = [
+        copyright,
+        "# Generated by codegen.py, do not edit.\n\n",
+        "# The mapped classes and tables defined by each domain submodule.\n",
+        "DOMAINS = {\n",
+    ]
+    for domain in sorted(domain_blocks):
+        names = [name for name, _ in domain_blocks[domain]]
+        result.append(format_item(domain, names))
+    result.append("}\n\n")
+
+    result.append("# The domains that must be mapped before each domain can be used.\n")
+    result.append("DEPENDENCIES = {\n")
+    for domain in sorted(domain_blocks):
+        result.append(format_item(domain, sorted(domain_deps[domain])))
+    result.append("}\n")
+
+    with open(os.path.join(SCHEMA_DIR, "_index.py"), "w") as write_file:
+        write_file.writelines(result)
+
+
+def warehouse_url() -> str:
+    """Returns the URL of the warehouse to generate the mappings from, built
+    from the MYSQL_* environment variables."""
+    # Imported here, so that this build-time tool does not install the engine
+    # fork hooks of ml_warehouse.engine when imported.
+    from ml_warehouse.engine import url_from_env
+
+    return url_from_env().render_as_string(hide_password=False)
+
+
+if __name__ == "__main__":
+    url = warehouse_url()
+
     # Generate the declarative mappings.
     # Raise an error in case of non-zero process exit code.
     subprocess.run(
@@ -80,21 +283,10 @@ if __name__ == "__main__":
         ]
     ).check_returncode()
 
-    # Move the generated file.
-    os.rename("generated.py", "src/ml_warehouse/schema.py")
-
-    # Decorate the classes and add copyright statement
-    result = [gen_copyright()]
-    with open("src/ml_warehouse/schema.py", "r") as read_file:
-
-        result.append("from ml_warehouse._decorators import add_docstring\n")
-
-        for line in read_file.readlines():
+    with open("generated.py", "r") as read_file:
+        source = read_file.read()
+    os.remove("generated.py")
 
-            if line.startswith("class"):
-                result.append("@add_docstring\n")
-
-            result.append(line)
-
-    with open("src/ml_warehouse/schema.py", "w") as write_file:
-        write_file.writelines(result)
+    # Split the classes into domain modules, document them and add copyright
+    # statements.
+    write_schema(source, gen_copyright())
@@ -33,10 +33,16 @@ setup(
     package_dir={"": "src"},
     setup_requires=["setuptools_scm"],
     install_requires=[
-        "sqlalchemy >= 1.4",
+        "sqlalchemy >= 1.4.40",
         "sqlalchemy-utils",
         "cryptography",
         "pymysql",
     ],
+    extras_require={
+        "arrow": ["pyarrow"],
+        "async": ["aiomysql"],
+        "numpy": ["numpy"],
+        "yaml": ["pyyaml"],
+    },
     tests_require=["black", "pytest", "pytest-it", "pyyaml"],
 )
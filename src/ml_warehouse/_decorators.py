@@ -21,7 +21,12 @@ from sqlalchemy.orm.attributes import InstrumentedAttribute
 
 
 def add_docstring(decorated_class):
+    """Documents a mapped class from the comments on its table columns.
 
+    The classes in ml_warehouse.schema are generated with these docstrings
+    already in their source, so this is only needed for mapped classes defined
+    elsewhere. It runs once per decorated class, when the class is created.
+    """
     decorated_class.__init__.__doc__ = gather_arguments(decorated_class)
 
     for attr in dir(decorated_class):
@@ -37,7 +42,7 @@ def add_docstring(decorated_class):
 
 
 def gather_arguments(decorated_class):
-
+    """Returns a constructor docstring listing the columns of a mapped class."""
     result = []
     result.append(
         f"""Constructs a new {decorated_class.__name__}.
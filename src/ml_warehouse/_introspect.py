@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, Table, UniqueConstraint, types
+from sqlalchemy.dialects import mysql
+
+# The columns recording when rows change, in order of preference.
+TIMESTAMP_COLUMNS = ("last_updated", "recorded_at", "last_changed")
+
+# The widths of the integer types, in bits.
+_INTEGER_BITS = [
+    (mysql.TINYINT, 8),
+    (mysql.SMALLINT, 16),
+    (mysql.MEDIUMINT, 32),
+    (types.BigInteger, 64),
+    (types.SmallInteger, 16),
+    (types.Integer, 32),
+]
+
+
+def primary_key_column(model) -> Column:
+    """Returns the primary key column of a mapped class, which must have a
+    single-column primary key, such as the *_tmp surrogate keys."""
+    columns = list(model.__table__.primary_key.columns)
+
+    if len(columns) != 1:
+        raise ValueError(
+            f"{model.__name__} does not have a single-column primary key: "
+            f"{[col.name for col in columns]}"
+        )
+
+    return columns[0]
+
+
+def column_keys(model) -> Dict[str, str]:
+    """Returns the keys of the table columns of a mapped class, indexed by both
+    their attribute names and their own keys, e.g. both "yield_" and "yield"
+    map to "yield"."""
+    keys = {}
+    for prop in model.__mapper__.column_attrs:
+        for column in prop.columns:
+            if column.table is model.__table__:
+                keys[prop.key] = column.key
+                keys[column.key] = column.key
+
+    return keys
+
+
+def unique_keys(model) -> List[Tuple[str, ...]]:
+    """Returns the unique keys of the table of a mapped class, as tuples of
+    column keys. The primary key comes first, followed by the unique indexes
+    and then the unique constraints, e.g. those of unique=True columns."""
+    table = model.__table__
+
+    # Indexes and constraints are held in sets, so order them for stability.
+    indexes = sorted(
+        tuple(col.key for col in index.columns)
+        for index in table.indexes
+        if index.unique
+    )
+    constraints = sorted(
+        tuple(col.key for col in constraint.columns)
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    )
+
+    primary_key = tuple(col.key for col in table.primary_key.columns)
+
+    return [primary_key] + indexes + constraints
+
+
+def index_columns(model, name: str) -> Tuple[str, ...]:
+    """Returns the column keys of a named index of the table of a mapped class,
+    e.g. ("pac_bio_run_name", "well_label") for pac_bio_metrics_run_well.
+    "PRIMARY" names the primary key, as in MySQL."""
+    table = model.__table__
+    if name == "PRIMARY":
+        return tuple(col.key for col in table.primary_key.columns)
+
+    for index in table.indexes:
+        if index.name == name:
+            return tuple(col.key for col in index.columns)
+
+    raise ValueError(f"{model.__name__} has no index {name!r}")
+
+
+def timestamp_column(table: Table) -> Optional[Column]:
+    """Returns the column recording when the rows of a table change, the first
+    of TIMESTAMP_COLUMNS which the table has, or None if it has none."""
+    return next((table.c[c] for c in TIMESTAMP_COLUMNS if c in table.c), None)
+
+
+def integer_bits(sql_type: types.Integer) -> int:
+    """Returns the width in bits of the values of an integer SQL type, e.g. 16
+    for a MySQL SMALLINT."""
+    return next(bits for cls, bits in _INTEGER_BITS if isinstance(sql_type, cls))
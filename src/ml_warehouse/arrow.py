@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Streaming export of query results to Apache Arrow and Parquet.
+
+iter_record_batches() reads a statement through a server-side cursor and
+yields Arrow record batches, without building ORM objects. The Arrow types are
+taken from the SQL types of the selected columns, e.g. an unsigned BIGINT is
+read as uint64 and a FLOAT as float32. DOUBLE columns, which SQLAlchemy returns
+as Decimal, are read as float64. write_parquet() writes each batch as a
+compressed Parquet row group, so memory use is bounded by the batch size.
+
+    write_parquet(sess, IseqRunLaneMetrics, "lanes.parquet")
+    table = pyarrow.Table.from_batches(iter_record_batches(sess, stmt))
+
+This module requires pyarrow, which is installed with the "arrow" extra of
+this package.
+"""
+
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select, type_coerce, types
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from ml_warehouse._introspect import integer_bits
+from ml_warehouse.stream import default_batch_size
+
+DEFAULT_COMPRESSION = "zstd"
+
+
+def arrow_type(sql_type: types.TypeEngine) -> pa.DataType:
+    """Returns the Arrow type of values of an SQL type.
+
+    Arguments
+    ---------
+    sql_type: types.TypeEngine
+        The type, e.g. the type of a mapped column.
+
+    Returns
+    -------
+    pa.DataType
+    """
+    if isinstance(sql_type, types.Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, types.Integer):
+        bits = integer_bits(sql_type)
+        if getattr(sql_type, "unsigned", False):
+            return getattr(pa, f"uint{bits}")()
+        return getattr(pa, f"int{bits}")()
+    if isinstance(sql_type, mysql.FLOAT):
+        return pa.float32()
+    if isinstance(sql_type, types.Float):
+        return pa.float64()
+    if isinstance(sql_type, types.Numeric):
+        if sql_type.asdecimal and sql_type.precision is not None:
+            return pa.decimal128(sql_type.precision, sql_type.scale or 0)
+        return pa.float64()
+    if isinstance(sql_type, types.DateTime):
+        return pa.timestamp("us")
+    if isinstance(sql_type, types.Date):
+        return pa.date32()
+    if isinstance(sql_type, types.Time):
+        return pa.time64("us")
+    if isinstance(sql_type, types.LargeBinary):
+        return pa.binary()
+
+    return pa.string()
+
+
+def arrow_schema(stmt: Union[Select, type]) -> pa.Schema:
+    """Returns the Arrow schema of the results of a statement, or of the rows
+    of a mapped class."""
+    if isinstance(stmt, type):
+        stmt = select(stmt)
+
+    return pa.schema(
+        [
+            pa.field(name, arrow_type(col.type), getattr(col, "nullable", True))
+            for name, col in stmt.selected_columns.items()
+        ]
+    )
+
+
+def iter_record_batches(
+    sess: Session, stmt: Union[Select, type], batch_size: Optional[int] = None
+) -> Iterator[pa.RecordBatch]:
+    """Yields the results of a statement as Arrow record batches, reading them
+    through a server-side cursor.
+
+    The statement is executed as Core, so a statement selecting a mapped class
+    yields the columns of its table rather than ORM objects.
+
+    Arguments
+    ---------
+    sess: Session
+        The Session whose connection executes the statement.
+    stmt: Union[Select, type]
+        The statement, or a mapped class to read all the rows of.
+    batch_size: int
+        The number of rows per batch. Defaults to a size based on the width of
+        the selected columns, see ml_warehouse.stream.default_batch_size().
+
+    Returns
+    -------
+    Iterator[pa.RecordBatch]
+    """
+    if isinstance(stmt, type):
+        stmt = select(stmt)
+    if batch_size is None:
+        batch_size = default_batch_size(stmt)
+
+    schema = arrow_schema(stmt)
+    stmt = _floats_as_float(stmt)
+    result = sess.connection().execution_options(stream_results=True).execute(stmt)
+
+    try:
+        for partition in result.partitions(batch_size):
+            columns = zip(*partition)
+            yield pa.record_batch(
+                [pa.array(values, type=f.type) for f, values in zip(schema, columns)],
+                schema=schema,
+            )
+    finally:
+        result.close()
+
+
+def _floats_as_float(stmt: Select) -> Select:
+    # Columns such as DOUBLE are returned as Decimal, which pyarrow will not
+    # convert to a floating point type, unless selected as plain floats.
+    columns = []
+    for name, col in stmt.selected_columns.items():
+        if _decimal_as_float(col.type):
+            col = type_coerce(col, types.Float(asdecimal=False)).label(name)
+        columns.append(col)
+
+    return stmt.with_only_columns(*columns)
+
+
+def _decimal_as_float(sql_type: types.TypeEngine) -> bool:
+    return (
+        isinstance(sql_type, types.Numeric)
+        and sql_type.asdecimal
+        and pa.types.is_floating(arrow_type(sql_type))
+    )
+
+
+def write_parquet(
+    sess: Session,
+    stmt: Union[Select, type],
+    path: Union[str, Path],
+    batch_size: Optional[int] = None,
+    compression: str = DEFAULT_COMPRESSION,
+) -> int:
+    """Writes the results of a statement to a Parquet file, one row group per
+    record batch.
+
+    Arguments
+    ---------
+    sess: Session
+        The Session whose connection executes the statement.
+    stmt: Union[Select, type]
+        The statement, or a mapped class to write all the rows of.
+    path: Union[str, Path]
+        The file to write.
+    batch_size: int
+        The number of rows per batch and row group, see iter_record_batches().
+    compression: str
+        The Parquet compression codec, defaults to zstd.
+
+    Returns
+    -------
+    int
+        The number of rows written.
+    """
+    rows = 0
+    with pq.ParquetWriter(path, arrow_schema(stmt), compression=compression) as writer:
+        for batch in iter_record_batches(sess, stmt, batch_size):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+
+    return rows
@@ -0,0 +1,471 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Bulk loading of rows into warehouse tables.
+
+The loaders bypass the ORM unit of work and insert rows through Core, either
+as batches of INSERT statements, which PyMySQL sends as multi-row INSERTs, or
+with LOAD DATA LOCAL INFILE. The latter is used when both the server and the
+client allow it; the client must be connected with the local_infile option:
+
+    engine = get_engine(config=config, connect_args={"local_infile": True})
+
+Rows are dicts keyed by attribute or column name. A key which is missing from
+a row takes the column's server default, as it would through the ORM.
+
+upsert_rows() inserts rows or updates those whose unique key, such as
+(id_sample_lims, id_lims) for Sample, is already present, with one INSERT ...
+ON DUPLICATE KEY UPDATE statement per batch.
+"""
+
+import csv
+import itertools
+import os
+import re
+import tempfile
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from pymysql.constants import CLIENT
+from sqlalchemy import and_, insert, literal, select, text, types
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session
+
+from ml_warehouse._introspect import column_keys, unique_keys
+
+AUTO = "auto"
+INSERT = "insert"
+INFILE = "infile"
+
+DEFAULT_INSERT_BATCH_SIZE = 1000
+DEFAULT_INFILE_BATCH_SIZE = 50_000
+DEFAULT_COMMIT_SIZE = 50_000
+
+NULL = "\\N"
+
+# The info message of a multi-row INSERT, e.g. "Records: 3  Duplicates: 1".
+_DUPLICATES = re.compile(rb"Duplicates: (\d+)")
+
+# The escapes of MySQL's default LOAD DATA format.
+_INFILE_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"}
+)
+
+
+class LoadResult(NamedTuple):
+    """The outcome of a bulk load."""
+
+    rows: int
+    seconds: float
+    method: str
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else float("inf")
+
+
+def load_rows(
+    sess: Session,
+    model,
+    rows: Iterable[dict],
+    batch_size: Optional[int] = None,
+    commit_size: int = DEFAULT_COMMIT_SIZE,
+    method: str = AUTO,
+) -> LoadResult:
+    """Inserts rows into the table of a mapped class.
+
+    Arguments
+    ---------
+    sess: Session
+        The Session to load the rows with.
+    model:
+        The mapped class.
+    rows: Iterable[dict]
+        The rows, as dicts keyed by attribute or column name.
+    batch_size: Optional[int]
+        The number of rows per INSERT statement, or per LOAD DATA file.
+        Defaults to DEFAULT_INSERT_BATCH_SIZE or DEFAULT_INFILE_BATCH_SIZE.
+    commit_size: int
+        The number of rows after which the transaction is committed. The last
+        rows are always committed.
+    method: str
+        INSERT, INFILE, or AUTO to use INFILE if local_infile_enabled().
+        LOAD DATA LOCAL INFILE skips rows with duplicate keys rather than
+        failing, and only warns about values that cannot be converted. Rows
+        with binary columns or bytes values are always inserted, as the
+        LOAD DATA file is text.
+
+    Returns
+    -------
+    LoadResult
+    """
+    if method == AUTO:
+        method = INFILE if local_infile_enabled(sess) else INSERT
+    if method not in (INSERT, INFILE):
+        raise ValueError(f"Unknown bulk load method {method!r}")
+    if batch_size is None:
+        batch_size = (
+            DEFAULT_INSERT_BATCH_SIZE if method == INSERT else DEFAULT_INFILE_BATCH_SIZE
+        )
+
+    keys = column_keys(model)
+    table = model.__table__
+    rows = (_column_row(model, keys, row) for row in rows)
+
+    start = time.perf_counter()
+    count = 0
+    uncommitted = 0
+    for batch in _batches(rows, batch_size):
+        # Rows can only be sent together if they have the same columns.
+        groups: Dict[tuple, List[dict]] = {}
+        for row in batch:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+
+        for columns, group in groups.items():
+            if method == INSERT or _has_binary(table, columns, group):
+                sess.execute(insert(table), group)
+            else:
+                _load_infile(sess, table, columns, group)
+
+        count += len(batch)
+        uncommitted += len(batch)
+        if uncommitted >= commit_size:
+            sess.commit()
+            uncommitted = 0
+
+    sess.commit()
+
+    return LoadResult(count, time.perf_counter() - start, method)
+
+
+class UpsertResult(NamedTuple):
+    """The outcome of an upsert. Updated rows are those whose key was already
+    present, whether or not their values changed."""
+
+    inserted: int
+    updated: int
+    seconds: float
+
+
+def upsert_rows(
+    sess: Session,
+    model,
+    rows: Iterable[dict],
+    key: Optional[Sequence[str]] = None,
+    update: Optional[Sequence[str]] = None,
+    batch_size: int = DEFAULT_INSERT_BATCH_SIZE,
+    commit_size: int = DEFAULT_COMMIT_SIZE,
+) -> UpsertResult:
+    """Inserts rows into the table of a mapped class, updating the rows whose
+    unique key is already present.
+
+    MySQL updates a row on a conflict with any of the table's unique keys. The
+    key argument only selects the key which every row must provide.
+
+    Arguments
+    ---------
+    sess: Session
+        The Session to write the rows with.
+    model:
+        The mapped class.
+    rows: Iterable[dict]
+        The rows, as dicts keyed by attribute or column name.
+    key: Optional[Sequence[str]]
+        The columns of one of the unique keys of the table, e.g.
+        ("id_sample_lims", "id_lims"). Defaults to the first unique index or
+        unique column whose columns are present in the rows, otherwise to the
+        primary key.
+    update: Optional[Sequence[str]]
+        The columns to update when a row is present. Defaults to all the
+        columns of the row, other than those of the key and the primary key.
+    batch_size: int
+        The number of rows per statement.
+    commit_size: int
+        The number of rows after which the transaction is committed. The last
+        rows are always committed.
+
+    Returns
+    -------
+    UpsertResult
+    """
+    keys = column_keys(model)
+    table = model.__table__
+    primary_key = unique_keys(model)[0]
+
+    if key is not None:
+        columns = set(_column_row(model, keys, dict.fromkeys(key)))
+        matches = [k for k in unique_keys(model) if set(k) == columns]
+        if not matches:
+            raise ValueError(f"{tuple(key)} is not a unique key of {model.__name__}")
+        key = matches[0]
+    if update is not None:
+        update = list(_column_row(model, keys, dict.fromkeys(update)))
+
+    start = time.perf_counter()
+    inserted = 0
+    updated = 0
+    uncommitted = 0
+    for batch in _batches((_column_row(model, keys, r) for r in rows), batch_size):
+        groups: Dict[tuple, List[dict]] = {}
+        for row in batch:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+
+        for columns, group in groups.items():
+            row_key = key or _default_key(model, columns)
+            if not set(row_key) <= set(columns):
+                raise ValueError(f"Rows of {model.__name__} lack the key {row_key}")
+
+            set_columns = update
+            if set_columns is None:
+                excluded = set(row_key) | set(primary_key)
+                set_columns = [c for c in columns if c not in excluded]
+
+            stmt = mysql.insert(table).values(group)
+            if set_columns:
+                stmt = stmt.on_duplicate_key_update(
+                    {c: stmt.inserted[c] for c in set_columns}
+                )
+            else:
+                # Leave present rows as they are.
+                stmt = stmt.on_duplicate_key_update({row_key[0]: table.c[row_key[0]]})
+
+            present = None
+            if len(group) == 1 and _found_rows(sess):
+                present = _present(sess, table, row_key, group[0])
+
+            duplicates = _duplicates(sess.execute(stmt), len(group), present)
+            inserted += len(group) - duplicates
+            updated += duplicates
+
+        uncommitted += len(batch)
+        if uncommitted >= commit_size:
+            sess.commit()
+            uncommitted = 0
+
+    sess.commit()
+
+    return UpsertResult(inserted, updated, time.perf_counter() - start)
+
+
+def load_csv(
+    sess: Session,
+    model,
+    path: Union[str, Path],
+    dialect: str = "excel-tab",
+    null: str = NULL,
+    **kwargs,
+) -> LoadResult:
+    """Inserts the rows of a delimited file with a header line of column names,
+    such as those written by ml_warehouse.export, into the table of a mapped
+    class.
+
+    Arguments
+    ---------
+    sess: Session
+        The Session to load the rows with.
+    model:
+        The mapped class.
+    path: Union[str, Path]
+        The file.
+    dialect: str
+        The csv module dialect of the file, defaults to tab separated.
+    null: str
+        The field value standing for NULL, defaults to \\N.
+    kwargs:
+        Further keyword arguments to load_rows().
+
+    Returns
+    -------
+    LoadResult
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = (
+            {k: None if v == null else v for k, v in row.items()}
+            for row in csv.DictReader(f, dialect=dialect)
+        )
+
+        return load_rows(sess, model, rows, **kwargs)
+
+
+def load_yaml(sess: Session, model, path: Union[str, Path], **kwargs) -> LoadResult:
+    """Inserts the rows of a YAML file holding a list of mappings, such as the
+    test fixtures, into the table of a mapped class.
+
+    Reading YAML requires PyYAML, which is installed with the "yaml" extra of
+    this package.
+
+    Arguments
+    ---------
+    sess: Session
+        The Session to load the rows with.
+    model:
+        The mapped class.
+    path: Union[str, Path]
+        The file.
+    kwargs:
+        Further keyword arguments to load_rows().
+
+    Returns
+    -------
+    LoadResult
+    """
+    import yaml
+
+    with open(path, "r") as f:
+        rows = yaml.safe_load(f) or []
+
+    return load_rows(sess, model, rows, **kwargs)
+
+
+def local_infile_enabled(sess: Session) -> bool:
+    """Returns True if LOAD DATA LOCAL INFILE is allowed on the connection of a
+    Session, by both the client and the server."""
+    conn = sess.connection()
+    if conn.dialect.name != "mysql":
+        return False
+
+    client_flag = getattr(conn.connection.dbapi_connection, "client_flag", 0)
+    if not client_flag & CLIENT.LOCAL_FILES:
+        return False
+
+    return bool(conn.execute(text("SELECT @@GLOBAL.local_infile")).scalar())
+
+
+def _column_row(model, keys: Dict[str, str], row: dict) -> dict:
+    try:
+        return {keys[k]: v for k, v in row.items()}
+    except KeyError as e:
+        raise ValueError(f"{model.__name__} has no column {e.args[0]!r}") from e
+
+
+def _default_key(model, columns: tuple) -> tuple:
+    primary_key, *natural_keys = unique_keys(model)
+    for key in natural_keys:
+        if set(key) <= set(columns):
+            return key
+
+    return primary_key
+
+
+def _found_rows(sess: Session) -> bool:
+    # Set by SQLAlchemy's MySQL dialects unless client_flag_found_rows=False.
+    conn = sess.connection()
+    client_flag = getattr(conn.connection.dbapi_connection, "client_flag", 0)
+
+    return bool(client_flag & CLIENT.FOUND_ROWS)
+
+
+def _present(sess: Session, table, key: tuple, row: dict) -> bool:
+    # A NULL never conflicts with a unique key.
+    if any(row[c] is None for c in key):
+        return False
+
+    condition = and_(*[table.c[c] == row[c] for c in key])
+
+    return sess.execute(select(literal(1)).where(condition)).first() is not None
+
+
+def _duplicates(result, rows: int, present: Optional[bool] = None) -> int:
+    # PyMySQL keeps the server's info message, which counts the rows whose key
+    # was present. The server only sends it for multi-row INSERTs.
+    cursor = result.context.cursor
+    message = getattr(getattr(cursor, "_result", None), "message", None)
+    if isinstance(message, str):
+        message = message.encode()
+    if message:
+        match = _DUPLICATES.search(message)
+        if match:
+            return int(match.group(1))
+
+    if rows == 1:
+        # The affected row count is 1 for an inserted row, 2 for an updated
+        # row and 0 for an unchanged one. With CLIENT_FOUND_ROWS, it is 1 for
+        # an unchanged row too, so present tells whether the key was there.
+        if result.rowcount == 1 and present is not None:
+            return int(present)
+        return int(result.rowcount != 1)
+
+    # Otherwise, the affected row count only tells how many rows were changed,
+    # counting 2 for each.
+    return max(result.rowcount - rows, 0)
+
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    rows = iter(rows)
+    while batch := list(itertools.islice(rows, size)):
+        yield batch
+
+
+def _has_binary(table, columns: tuple, rows: List[dict]) -> bool:
+    # The LOAD DATA file is utf8mb4 text, which cannot hold arbitrary bytes.
+    if any(isinstance(table.c[c].type, types._Binary) for c in columns):
+        return True
+
+    return any(isinstance(v, (bytes, bytearray)) for row in rows for v in row.values())
+
+
+def _load_infile(sess: Session, table, columns: tuple, rows: List[dict]):
+    conn = sess.connection()
+    preparer = conn.dialect.identifier_preparer
+
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", newline="", suffix=".tsv", delete=False
+    ) as f:
+        for row in rows:
+            f.write("\t".join(_infile_value(row[c]) for c in columns))
+            f.write("\n")
+
+    table_name = preparer.format_table(table)
+    column_names = ", ".join(preparer.quote(table.c[c].name) for c in columns)
+
+    try:
+        # The file uses the default FIELDS and LINES options of LOAD DATA.
+        conn.execute(
+            text(
+                f"LOAD DATA LOCAL INFILE :path INTO TABLE {table_name} "
+                f"CHARACTER SET utf8mb4 ({column_names})"
+            ),
+            {"path": f.name},
+        )
+    finally:
+        os.unlink(f.name)
+
+
+def _infile_value(value) -> str:
+    if value is None:
+        return NULL
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        raise TypeError("Bytes cannot be written to a LOAD DATA file")
+
+    return str(value).translate(_INFILE_ESCAPES)
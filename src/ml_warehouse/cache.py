@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Caching of query results.
+
+A QueryCache executes statements and keeps their rows, keyed on the database
+URL, the compiled SQL and its bound parameters, so that dashboards repeating
+the same queries do not run them again:
+
+    cache = QueryCache(ttl=60)
+    rows = cache.execute(sess, get_recent_pacbio_runs(sess, since))
+
+Each result expires after its time to live. Before a cached result is used,
+it is validated with one query reading the latest change to every table of the
+statement: MAX(last_updated), MAX(recorded_at) or MAX(last_changed), whichever
+the table has first, otherwise the MAX of its integer primary key, which
+detects new rows only. A result is stale if any of them moved since it was
+cached. Validation is skipped for tables with neither.
+
+Results are held in memory by an LRUBackend, or on disk, shared between
+processes, by a DiskBackend. Only rows of column values are cached; statements
+selecting mapped classes are refused, as their objects belong to a Session.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+from sqlalchemy import func, select, types
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.util import find_tables
+
+from ml_warehouse._introspect import timestamp_column
+
+DEFAULT_MAXSIZE = 256
+DEFAULT_TTL = 300
+
+
+class CacheEntry(NamedTuple):
+    """A cached result, with the time it expires and the latest changes to
+    its tables when it was cached."""
+
+    rows: List[Row]
+    expires: float
+    stamps: tuple
+
+
+class LRUBackend(object):
+    """An in-process store of cache entries, evicting the least recently used
+    entry beyond a maximum number of entries."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        """Constructs a new LRUBackend.
+
+        Arguments
+        ---------
+        maxsize: int
+            The maximum number of entries.
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+            return entry
+
+    def set(self, key: str, entry: CacheEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskBackend(object):
+    """A store of cache entries as pickle files in a directory, which may be
+    shared by several processes."""
+
+    def __init__(self, directory: Union[str, Path]):
+        """Constructs a new DiskBackend.
+
+        Arguments
+        ---------
+        directory: Union[str, Path]
+            The directory of the entries, which is created if needed.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return CacheEntry(*pickle.load(f))
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def set(self, key: str, entry: CacheEntry):
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+        with open(tmp_path, "wb") as f:
+            pickle.dump(tuple(entry), f)
+        os.replace(tmp_path, path)
+
+    def delete(self, key: str):
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self):
+        for path in self.directory.glob("*.pickle"):
+            path.unlink(missing_ok=True)
+
+    def __len__(self):
+        return len(list(self.directory.glob("*.pickle")))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pickle"
+
+
+class QueryCache(object):
+    """A cache of query results, with hit, miss and staleness counters."""
+
+    def __init__(self, backend=None, ttl: float = DEFAULT_TTL):
+        """Constructs a new QueryCache.
+
+        Arguments
+        ---------
+        backend:
+            The store of cached results, defaults to a new LRUBackend.
+        ttl: float
+            The default time to live of results, in seconds.
+        """
+        self.backend = LRUBackend() if backend is None else backend
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._lock = threading.Lock()
+
+    def execute(
+        self,
+        sess: Session,
+        stmt: Union[Select, Query],
+        ttl: Optional[float] = None,
+        validate: bool = True,
+    ) -> List[Row]:
+        """Returns the rows of a statement, from the cache if possible.
+
+        Arguments
+        ---------
+        sess: Session
+            The Session to execute the statement and its validation with.
+        stmt: Union[Select, Query]
+            The statement, or a Query such as those of the example helpers.
+        ttl: Optional[float]
+            The time to live of the result if it is cached now, in seconds.
+            Defaults to the ttl of the cache.
+        validate: bool
+            Check that the tables of the statement have not changed before
+            using a cached result. Defaults to True.
+
+        Returns
+        -------
+        List[Row]
+        """
+        if isinstance(stmt, Query):
+            stmt = stmt.statement
+        if any(_is_entity(d) for d in stmt.column_descriptions):
+            raise ValueError("Only statements selecting columns can be cached")
+
+        key = cache_key(sess, stmt)
+        stamps_stmt = _stamps_statement(stmt) if validate else None
+
+        entry = self.backend.get(key)
+        if entry is not None:
+            fresh = entry.expires > time.time()
+            if fresh and stamps_stmt is not None:
+                fresh = _stamps(sess, stamps_stmt) == entry.stamps
+            if fresh:
+                self._count("hits")
+                return entry.rows
+
+            self._count("stale")
+            self.backend.delete(key)
+        else:
+            self._count("misses")
+
+        stamps = _stamps(sess, stamps_stmt) if stamps_stmt is not None else ()
+        rows = sess.execute(stmt).all()
+
+        ttl = self.ttl if ttl is None else ttl
+        self.backend.set(key, CacheEntry(rows, time.time() + ttl, stamps))
+
+        return rows
+
+    def clear(self):
+        """Removes every cached result and resets the counters."""
+        self.backend.clear()
+        with self._lock:
+            self.hits = self.misses = self.stale = 0
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+def cache_key(sess: Session, stmt: Select) -> str:
+    """Returns the cache key of a statement: a digest of the URL of the database
+    of the Session, with its password masked, of the SQL of the statement,
+    compiled for that database, and of its bound parameters. The URL keeps the
+    results of processes connected to different databases apart when they
+    share a DiskBackend."""
+    bind = sess.get_bind()
+    url = bind.engine.url.render_as_string(hide_password=True)
+    compiled = stmt.compile(dialect=bind.dialect)
+    params = sorted((k, repr(v)) for k, v in compiled.params.items())
+
+    return hashlib.sha256(repr((url, str(compiled), params)).encode()).hexdigest()
+
+
+def validation_columns(stmt: Select) -> List:
+    """Returns the columns whose maximum values tell whether the tables of a
+    statement have changed, in table name order."""
+    tables = sorted(set(find_tables(stmt, check_columns=True)), key=lambda t: t.name)
+
+    columns = []
+    for table in tables:
+        column = timestamp_column(table)
+        if column is None:
+            pk = list(table.primary_key.columns)
+            if len(pk) == 1 and isinstance(pk[0].type, types.Integer):
+                column = pk[0]
+        if column is not None:
+            columns.append(column)
+
+    return columns
+
+
+def _stamps_statement(stmt: Select) -> Optional[Select]:
+    columns = validation_columns(stmt)
+    if not columns:
+        return None
+
+    return select(*[select(func.max(col)).scalar_subquery() for col in columns])
+
+
+def _stamps(sess: Session, stmt: Select) -> Tuple:
+    return tuple(sess.execute(stmt).one())
+
+
+def _is_entity(description: dict) -> bool:
+    entity = description.get("entity")
+
+    return entity is not None and description.get("expr") is entity
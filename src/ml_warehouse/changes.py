@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Incremental reads of the rows changed since the previous read.
+
+A ChangeFeed reads the rows of one mapped class in the order they changed,
+by their last_updated, recorded_at or last_changed column and then by their
+primary key, which breaks ties between rows changed in the same second. After
+each batch, it records a watermark, the timestamp and key of the last row,
+under the name of its consumer. The next read starts after the watermark, so
+each poll only reads what changed since the previous one:
+
+    feed = ChangeFeed(Sample, "irods-sync", FileWatermarkStore("watermarks"))
+    for samples in feed.poll(sess):
+        ...
+
+The watermark of a batch is committed once the consumer asks for the next
+batch, so a consumer which fails while handling a batch reads it again when
+it restarts. Delivery is at least once: a consumer which breaks out of the
+loop, or closes the generator, after handling a batch has not committed it
+either, and reads it again on its next poll unless it calls commit() itself.
+Watermarks are kept in memory by a MemoryWatermarkStore, or in a JSON file
+per consumer by a FileWatermarkStore.
+
+Rows whose timestamp is NULL are never read. The timestamp columns are not
+indexed in the warehouse schema, so MySQL finds each batch by scanning the
+table; only the rows of the batch are sent and built, however.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from sqlalchemy import and_, func, literal_column, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from ml_warehouse._introspect import TIMESTAMP_COLUMNS, timestamp_column
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Watermark(NamedTuple):
+    """The timestamp and primary key of the last row read by a consumer."""
+
+    timestamp: datetime
+    key: tuple
+
+
+class ChangeBatch(NamedTuple):
+    """A batch of changed rows and the watermark following its last row."""
+
+    rows: List[Any]
+    watermark: Optional[Watermark]
+
+
+class MemoryWatermarkStore(object):
+    """An in-process store of watermarks."""
+
+    def __init__(self):
+        self._watermarks: Dict[tuple, Watermark] = {}
+        self._lock = threading.Lock()
+
+    def get(self, consumer: str, table: str) -> Optional[Watermark]:
+        with self._lock:
+            return self._watermarks.get((consumer, table))
+
+    def set(self, consumer: str, table: str, watermark: Watermark):
+        with self._lock:
+            self._watermarks[(consumer, table)] = watermark
+
+    def delete(self, consumer: str, table: str):
+        with self._lock:
+            self._watermarks.pop((consumer, table), None)
+
+
+class FileWatermarkStore(object):
+    """A store of watermarks as one JSON file per consumer in a directory,
+    holding the watermark of each table read by the consumer."""
+
+    def __init__(self, directory: Union[str, Path]):
+        """Constructs a new FileWatermarkStore.
+
+        Arguments
+        ---------
+        directory: Union[str, Path]
+            The directory of the files, which is created if needed.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def get(self, consumer: str, table: str) -> Optional[Watermark]:
+        entry = self._read(consumer).get(table)
+        if entry is None:
+            return None
+
+        return Watermark(
+            datetime.fromisoformat(entry["timestamp"]), tuple(entry["key"])
+        )
+
+    def set(self, consumer: str, table: str, watermark: Watermark):
+        with self._lock:
+            entries = self._read(consumer)
+            entries[table] = {
+                "timestamp": watermark.timestamp.isoformat(),
+                "key": list(watermark.key),
+            }
+            self._write(consumer, entries)
+
+    def delete(self, consumer: str, table: str):
+        with self._lock:
+            entries = self._read(consumer)
+            if entries.pop(table, None) is not None:
+                self._write(consumer, entries)
+
+    def _path(self, consumer: str) -> Path:
+        return self.directory / f"{consumer}.json"
+
+    def _read(self, consumer: str) -> dict:
+        try:
+            with open(self._path(consumer)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, consumer: str, entries: dict):
+        path = self._path(consumer)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+
+class ChangeFeed(object):
+    """The changes to the rows of a mapped class, read in batches after the
+    watermark of a consumer."""
+
+    def __init__(
+        self,
+        model,
+        consumer: str,
+        store=None,
+        column: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        since: Optional[datetime] = None,
+        settle: int = 0,
+        options: Sequence = (),
+    ):
+        """Constructs a new ChangeFeed.
+
+        Arguments
+        ---------
+        model:
+            The mapped class, e.g. Sample, IseqFlowcell or IseqProductMetrics.
+        consumer: str
+            The name under which the watermark is stored, unique to each reader
+            of the changes.
+        store:
+            The store of watermarks. Defaults to a new MemoryWatermarkStore.
+        column: Optional[str]
+            The timestamp column to read the changes by. Defaults to the first
+            of last_updated, recorded_at and last_changed which the table has.
+        batch_size: int
+            The maximum number of rows per batch.
+        since: Optional[datetime]
+            Where a consumer without a watermark starts, or None to read every
+            row.
+        settle: int
+            The number of seconds for which changes are left unread, for
+            transactions which commit after rows with later timestamps have
+            been read. Defaults to 0.
+        options: Sequence
+            Loader options for the queries, e.g. selectinload(Sample.study).
+        """
+        table = model.__table__
+        if column is None:
+            timestamp = timestamp_column(table)
+            if timestamp is None:
+                raise ValueError(
+                    f"{model.__name__} has none of the columns {TIMESTAMP_COLUMNS}"
+                )
+            column = timestamp.key
+
+        self.model = model
+        self.consumer = consumer
+        self.store = store if store is not None else MemoryWatermarkStore()
+        self.batch_size = batch_size
+        self.since = since
+        self.settle = settle
+        self.options = list(options)
+
+        self.timestamp = getattr(model, column)
+        mapper = model.__mapper__
+        self.key = [
+            getattr(model, mapper.get_property_by_column(col).key)
+            for col in table.primary_key.columns
+        ]
+
+    @property
+    def watermark(self) -> Optional[Watermark]:
+        """The watermark of the consumer, or None if it has not read anything."""
+        return self.store.get(self.consumer, self.model.__tablename__)
+
+    def fetch(self, sess: Session) -> ChangeBatch:
+        """Reads the next batch of changed rows, without committing its
+        watermark.
+
+        Arguments
+        ---------
+        sess: Session
+            The Session to read the rows with.
+
+        Returns
+        -------
+        ChangeBatch
+            The rows, oldest change first, and the watermark of the last row,
+            or the current watermark if there are no rows.
+        """
+        watermark = self.watermark
+
+        stmt = (
+            select(self.model)
+            .where(self.timestamp.is_not(None))
+            .order_by(self.timestamp, *self.key)
+            .limit(self.batch_size)
+            .options(*self.options)
+        )
+        if watermark is not None:
+            stmt = stmt.where(self._after(watermark))
+        elif self.since is not None:
+            stmt = stmt.where(self.timestamp >= self.since)
+        if self.settle:
+            stmt = stmt.where(
+                self.timestamp
+                < func.date_sub(
+                    func.now(), literal_column(f"INTERVAL {int(self.settle)} SECOND")
+                )
+            )
+
+        rows = sess.execute(stmt).scalars().all()
+        if rows:
+            last = rows[-1]
+            watermark = Watermark(
+                getattr(last, self.timestamp.key),
+                tuple(getattr(last, col.key) for col in self.key),
+            )
+
+        return ChangeBatch(rows, watermark)
+
+    def commit(self, batch: ChangeBatch):
+        """Records the watermark of a batch, so that the next batch starts after
+        its rows."""
+        if batch.watermark is not None:
+            self.store.set(self.consumer, self.model.__tablename__, batch.watermark)
+
+    def poll(self, sess: Session, max_batches: Optional[int] = None) -> Iterator[list]:
+        """Yields the batches of rows changed since the watermark, until there
+        are no more changes or max_batches have been read. The watermark of
+        each batch is committed when the consumer asks for the next one, even
+        if there is none and the loop ends, but not if the consumer breaks out
+        of the loop or closes the generator, so that batch is read again on
+        the next poll: delivery is at least once."""
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            batch = self.fetch(sess)
+            if not batch.rows:
+                return
+
+            yield batch.rows
+            self.commit(batch)
+            batches += 1
+
+            if len(batch.rows) < self.batch_size:
+                return
+
+    def reset(self):
+        """Forgets the watermark of the consumer, so that it starts again from
+        since."""
+        self.store.delete(self.consumer, self.model.__tablename__)
+
+    def _after(self, watermark: Watermark):
+        # Written as a range on the timestamp, which an index on the timestamp
+        # and the primary key could serve, followed by the tiebreak.
+        if len(self.key) == 1:
+            later_key = self.key[0] > watermark.key[0]
+        else:
+            later_key = tuple_(*self.key) > tuple_(*watermark.key)
+
+        return and_(
+            self.timestamp >= watermark.timestamp,
+            or_(self.timestamp > watermark.timestamp, later_key),
+        )
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Loading of warehouse columns into NumPy arrays.
+
+load_columns() reads columns through a server-side cursor, in chunks, into
+arrays whose dtypes are taken from the SQL types of the columns, e.g. uint64
+for an unsigned BIGINT and float32 for a FLOAT. No ORM objects are built.
+Columns holding NULLs are returned as masked arrays.
+
+    arrays = load_columns(
+        sess,
+        IseqRunLaneMetrics.interop_cluster_count_pf_total,
+        IseqRunLaneMetrics.tags_decode_percent,
+    )
+    arrays["tags_decode_percent"].mean()
+
+This module requires NumPy, which is installed with the "numpy" extra of this
+package.
+"""
+
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from sqlalchemy import select, types
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session
+
+from ml_warehouse._introspect import integer_bits
+from ml_warehouse.stream import default_batch_size
+
+
+def numpy_dtype(sql_type: types.TypeEngine) -> np.dtype:
+    """Returns the NumPy dtype of values of an SQL type.
+
+    Arguments
+    ---------
+    sql_type: types.TypeEngine
+        The type, e.g. the type of a mapped column.
+
+    Returns
+    -------
+    np.dtype
+        A numeric, bool or datetime64 dtype, or the object dtype for other
+        types such as strings.
+    """
+    if isinstance(sql_type, types.Boolean):
+        return np.dtype(bool)
+    if isinstance(sql_type, types.Integer):
+        sign = "u" if getattr(sql_type, "unsigned", False) else "i"
+        return np.dtype(f"{sign}{integer_bits(sql_type) // 8}")
+    if isinstance(sql_type, mysql.FLOAT):
+        return np.dtype(np.float32)
+    if isinstance(sql_type, (types.Float, types.Numeric)):
+        return np.dtype(np.float64)
+    if isinstance(sql_type, types.DateTime):
+        return np.dtype("datetime64[us]")
+    if isinstance(sql_type, types.Date):
+        return np.dtype("datetime64[D]")
+
+    return np.dtype(object)
+
+
+def load_columns(
+    sess: Session,
+    *columns,
+    filters: Sequence = (),
+    chunk_size: Optional[int] = None,
+) -> Dict[str, Union[np.ndarray, np.ma.MaskedArray]]:
+    """Returns the values of columns as NumPy arrays.
+
+    Arguments
+    ---------
+    sess: Session
+        The Session whose connection executes the query.
+    columns:
+        The columns, e.g. IseqRunLaneMetrics.tags_decode_percent, or other
+        labelled SQL expressions.
+    filters: Sequence
+        SQL expressions that the rows must match.
+    chunk_size: Optional[int]
+        The number of rows converted at a time. Defaults to a size based on
+        the width of the columns, see ml_warehouse.stream.default_batch_size().
+
+    Returns
+    -------
+    Dict[str, Union[np.ndarray, np.ma.MaskedArray]]
+        The arrays, by column name, in the order of the columns. Arrays of
+        columns holding NULLs are masked where the value is NULL.
+    """
+    stmt = select(*columns).where(*filters)
+    if chunk_size is None:
+        chunk_size = default_batch_size(stmt)
+
+    names = list(stmt.selected_columns.keys())
+    dtypes = [numpy_dtype(col.type) for col in stmt.selected_columns]
+    chunks: List[List[np.ndarray]] = [[] for _ in names]
+    masks: List[List[np.ndarray]] = [[] for _ in names]
+
+    result = sess.connection().execution_options(stream_results=True).execute(stmt)
+    try:
+        for partition in result.partitions(chunk_size):
+            for i, values in enumerate(zip(*partition)):
+                data, mask = _to_array(values, dtypes[i])
+                chunks[i].append(data)
+                masks[i].append(mask)
+    finally:
+        result.close()
+
+    arrays = {}
+    for name, dtype, data, mask in zip(names, dtypes, chunks, masks):
+        data = np.concatenate(data) if data else np.empty(0, dtype=dtype)
+        mask = np.concatenate(mask) if mask else np.zeros(0, dtype=bool)
+        arrays[name] = np.ma.MaskedArray(data, mask) if mask.any() else data
+
+    return arrays
+
+
+def _to_array(values: tuple, dtype: np.dtype):
+    mask = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+    if mask.any() and dtype != object:
+        fill = np.datetime64("NaT") if dtype.kind == "M" else 0
+        values = [fill if v is None else v for v in values]
+
+    return np.array(values, dtype=dtype), mask
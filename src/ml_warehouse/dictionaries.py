@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""An in-process cache of small dictionary tables, such as IseqRunStatusDict.
+
+Queries filtering on a description, e.g. run statuses which are "qc complete",
+usually join the dictionary table. Once the cache is enabled, the descriptions
+are translated into ids on the client, so queries can filter with
+`IseqRunStatus.id_run_status_dict IN (...)` instead:
+
+    enable_dictionary_cache(refresh_interval=600)
+    ids = dictionary_ids(IseqRunStatusDict, ["qc complete"], sess)
+
+A table is read when first needed and read again when it is used after its
+refresh interval has passed. Query helpers call dictionary_ids() and
+dictionary_case(), which return None while the cache is disabled, and then
+fall back to the join.
+
+Descriptions are matched as MySQL's default collations compare them in SQL,
+ignoring case and trailing spaces. A table whose descriptions are the same when
+compared that way is rejected rather than translated ambiguously, until its
+refresh interval has passed, and the helpers then fall back to the join.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import Case
+
+from ml_warehouse._introspect import primary_key_column
+
+DEFAULT_REFRESH_INTERVAL = 3600
+DEFAULT_LABEL = "description"
+
+_cache: Optional["DictionaryCache"] = None
+
+
+class DictionaryCache(object):
+    """A cache of the ids and descriptions of dictionary tables."""
+
+    def __init__(self, refresh_interval: Optional[float] = DEFAULT_REFRESH_INTERVAL):
+        """Constructs a new DictionaryCache.
+
+        Arguments
+        ---------
+        refresh_interval: Optional[float]
+            The number of seconds after which a table is read again, or None to
+            read each table only once.
+        """
+        self.refresh_interval = refresh_interval
+
+        self._ids: Dict[type, Dict[str, int]] = {}
+        self._descriptions: Dict[type, Dict[int, str]] = {}
+        self._rejected: Dict[type, ValueError] = {}
+        self._loaded: Dict[type, float] = {}
+        self._lock = threading.Lock()
+
+    def load(self, sess: Session, model, label: str = DEFAULT_LABEL):
+        """Reads the ids and descriptions of a dictionary table.
+
+        Arguments
+        ---------
+        sess: Session
+            The Session to read the table with.
+        model:
+            The mapped class, which must have a single-column primary key.
+        label: str
+            The name of the description column.
+
+        Raises
+        ------
+        ValueError
+            If two descriptions are the same when compared ignoring case and
+            trailing spaces. The table is then rejected until it is due a
+            refresh.
+        """
+        pk = getattr(model, primary_key_column(model).key)
+        rows = sess.execute(select(getattr(model, label), pk)).all()
+
+        ids = {}
+        descriptions = {}
+        error = None
+        for description, id_ in rows:
+            key = _fold(description)
+            if key in ids:
+                error = ValueError(
+                    f"The descriptions {descriptions[ids[key]]!r} and "
+                    f"{description!r} of {model.__tablename__} are not distinct "
+                    "ignoring case and trailing spaces"
+                )
+                break
+            ids[key] = id_
+            descriptions[id_] = description
+
+        with self._lock:
+            if error is None:
+                self._ids[model] = ids
+                self._descriptions[model] = descriptions
+                self._rejected.pop(model, None)
+            else:
+                self._ids.pop(model, None)
+                self._descriptions.pop(model, None)
+                self._rejected[model] = error
+            self._loaded[model] = time.monotonic()
+
+        if error is not None:
+            raise error
+
+    def loaded(self, model) -> bool:
+        """Returns True if a table has been read and is not due a refresh."""
+        with self._lock:
+            loaded = self._loaded.get(model)
+
+        if loaded is None:
+            return False
+        if self.refresh_interval is None:
+            return True
+
+        return time.monotonic() - loaded < self.refresh_interval
+
+    def ids(
+        self, model, descriptions: Sequence[str], sess: Optional[Session] = None
+    ) -> List[int]:
+        """Returns the ids of descriptions of a dictionary table, omitting any
+        unknown descriptions. Descriptions are matched ignoring case and
+        trailing spaces, as in SQL under MySQL's default collations.
+
+        Arguments
+        ---------
+        model:
+            The mapped class.
+        descriptions: Sequence[str]
+            The descriptions.
+        sess: Optional[Session]
+            A Session to read the table with if it is not loaded or is due a
+            refresh. Without one, a table which has not been read raises a
+            LookupError and a table due a refresh is used as it is.
+
+        Returns
+        -------
+        List[int]
+
+        Raises
+        ------
+        ValueError
+            If the table was rejected when it was last read, see load().
+        """
+        ids, _ = self._mappings(model, sess)
+
+        return [ids[k] for k in map(_fold, descriptions) if k in ids]
+
+    def descriptions(self, model, sess: Optional[Session] = None) -> Dict[int, str]:
+        """Returns the descriptions of a dictionary table by id. The Session is
+        used as by ids()."""
+        _, descriptions = self._mappings(model, sess)
+
+        return dict(descriptions)
+
+    def clear(self):
+        """Forgets every table, so that they are read again when next used."""
+        with self._lock:
+            self._ids.clear()
+            self._descriptions.clear()
+            self._rejected.clear()
+            self._loaded.clear()
+
+    def _mappings(
+        self, model, sess: Optional[Session]
+    ) -> Tuple[Dict[str, int], Dict[int, str]]:
+        if sess is not None and not self.loaded(model):
+            self.load(sess, model)
+
+        with self._lock:
+            error = self._rejected.get(model)
+            ids = self._ids.get(model)
+            descriptions = self._descriptions.get(model)
+        if error is not None:
+            raise error
+        if ids is None:
+            raise LookupError(f"The {model.__tablename__} table has not been read")
+
+        return ids, descriptions
+
+
+def enable_dictionary_cache(
+    refresh_interval: Optional[float] = DEFAULT_REFRESH_INTERVAL,
+) -> DictionaryCache:
+    """Enables the dictionary cache of this process, used by the query helpers,
+    and returns it. A cache which is already enabled is kept, with the new
+    refresh interval."""
+    global _cache
+
+    if _cache is None:
+        _cache = DictionaryCache(refresh_interval)
+    else:
+        _cache.refresh_interval = refresh_interval
+
+    return _cache
+
+
+def disable_dictionary_cache():
+    """Disables the dictionary cache of this process."""
+    global _cache
+
+    _cache = None
+
+
+def dictionary_cache() -> Optional[DictionaryCache]:
+    """Returns the dictionary cache of this process, or None if it is disabled."""
+    return _cache
+
+
+def dictionary_ids(
+    model, descriptions: Sequence[str], sess: Optional[Session] = None
+) -> Optional[List[int]]:
+    """Returns the ids of descriptions of a dictionary table from the cache of
+    this process, or None if the cache is disabled or the table cannot be
+    read, or is rejected by DictionaryCache.load(). See DictionaryCache.ids()."""
+    cache = _cache
+    if cache is None:
+        return None
+
+    try:
+        return cache.ids(model, descriptions, sess)
+    except (LookupError, ValueError):
+        return None
+
+
+def dictionary_descriptions(
+    model, sess: Optional[Session] = None
+) -> Optional[Dict[int, str]]:
+    """Returns the descriptions of a dictionary table by id from the cache of
+    this process, or None if the cache is disabled or the table cannot be
+    read, or is rejected by DictionaryCache.load(). See
+    DictionaryCache.descriptions()."""
+    cache = _cache
+    if cache is None:
+        return None
+
+    try:
+        return cache.descriptions(model, sess)
+    except (LookupError, ValueError):
+        return None
+
+
+def dictionary_case(model, column, sess: Optional[Session] = None) -> Optional[Case]:
+    """Returns an SQL CASE expression translating the ids in a column, e.g.
+    IseqRunStatus.id_run_status_dict, into the descriptions of a dictionary
+    table, or None if the cache of this process is disabled or the table cannot
+    be read.
+
+    Arguments
+    ---------
+    model:
+        The mapped class of the dictionary table.
+    column:
+        The column of ids.
+    sess: Optional[Session]
+        A Session to read the table with, see DictionaryCache.ids().
+
+    Returns
+    -------
+    Optional[Case]
+    """
+    descriptions = dictionary_descriptions(model, sess)
+    if descriptions is None:
+        return None
+
+    return case(descriptions, value=column)
+
+
+def _fold(description: str) -> str:
+    # Descriptions as compared by MySQL's default, case-insensitive and PAD
+    # SPACE collations.
+    return description.rstrip(" ").lower()
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Pooled engines for the ML warehouse.
+
+get_engine() returns one engine per process for a given URL and set of pool
+options, creating it on first use. The connection details come from an ini
+file section laid out like tests/testdb.ini, or from the MYSQL_* environment
+variables. Pools are reset in the child after fork(), so that processes never
+share connections.
+"""
+
+import configparser
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+ASYNC_DRIVERNAME = "mysql+aiomysql"
+
+DEFAULT_SECTION = "MySQL"
+DEFAULT_CHARSET = "utf8mb4"
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_RECYCLE = 3600
+DEFAULT_POOL_PRE_PING = True
+
+_engines: Dict[Tuple, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def url_from_config(
+    config: configparser.ConfigParser,
+    section: str = DEFAULT_SECTION,
+    charset: Optional[str] = None,
+) -> URL:
+    """Returns a MySQL URL configured through an ini file.
+
+    The keys and values are:
+
+    [MySQL]
+    user       = <database user, defaults to "mlwh">
+    password   = <database password, defaults to empty i.e. "">
+    ip_address = <database IP address, defaults to "127.0.0.1">
+    port       = <database port, defaults to 3306>
+    schema     = <database schema, defaults to "mlwh">
+    charset    = <connection character set, defaults to "utf8mb4">
+
+    Arguments
+    ---------
+    config: configparser.ConfigParser
+        The parsed ini file.
+    section: str
+        The section holding the connection details.
+    charset: Optional[str]
+        The connection character set, overriding the one in the section.
+
+    Returns
+    -------
+    URL
+        The URL of the database.
+    """
+    if section not in config.sections():
+        raise configparser.Error(
+            "The {} configuration section is missing. "
+            "You need to fill this in before running "
+            "tests on a {} database".format(section, section)
+        )
+    connection_conf = config[section]
+
+    return URL.create(
+        "mysql+pymysql",
+        username=connection_conf.get("user", "mlwh"),
+        password=connection_conf.get("password", ""),
+        host=connection_conf.get("ip_address", "127.0.0.1"),
+        port=connection_conf.getint("port", 3306),
+        database=connection_conf.get("schema", "mlwh"),
+        query={"charset": charset or connection_conf.get("charset", DEFAULT_CHARSET)},
+    )
+
+
+def url_from_env(charset: Optional[str] = None) -> URL:
+    """Returns a MySQL URL configured through the environment variables
+    MYSQL_USER, MYSQL_PW, MYSQL_HOST, MYSQL_PORT and MYSQL_DBNAME.
+
+    Arguments
+    ---------
+    charset: Optional[str]
+        The connection character set, defaults to MYSQL_CHARSET if set,
+        otherwise to "utf8mb4".
+
+    Returns
+    -------
+    URL
+        The URL of the database.
+    """
+    return URL.create(
+        "mysql+pymysql",
+        username=os.environ["MYSQL_USER"],
+        password=os.environ["MYSQL_PW"],
+        host=os.environ["MYSQL_HOST"],
+        port=int(os.environ["MYSQL_PORT"]),
+        database=os.environ["MYSQL_DBNAME"],
+        query={"charset": charset or os.environ.get("MYSQL_CHARSET", DEFAULT_CHARSET)},
+    )
+
+
+def get_engine(
+    url: Optional[URL] = None,
+    config: Optional[configparser.ConfigParser] = None,
+    section: str = DEFAULT_SECTION,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    pool_recycle: Optional[int] = None,
+    pool_pre_ping: Optional[bool] = None,
+    charset: Optional[str] = None,
+    **kwargs,
+) -> Engine:
+    """Returns the engine of this process for a database, creating it if needed.
+
+    The database is given by its URL, otherwise by an ini file section read
+    with url_from_config(), otherwise by the environment as read by
+    url_from_env(). Pool options that are not passed are read from the ini
+    file section, under the same names, if there is one. Calls with the same
+    URL and options return the same engine.
+
+    Arguments
+    ---------
+    url: Optional[URL]
+        The URL of the database.
+    config: Optional[configparser.ConfigParser]
+        The parsed ini file to read the URL and pool options from.
+    section: str
+        The ini file section.
+    pool_size: Optional[int]
+        The number of connections kept open in the pool, defaults to 5.
+    max_overflow: Optional[int]
+        The number of connections allowed beyond pool_size, defaults to 10.
+    pool_recycle: Optional[int]
+        The age in seconds after which connections are replaced, defaults to
+        3600. This should be below the server's wait_timeout.
+    pool_pre_ping: Optional[bool]
+        Test connections for liveness on checkout, defaults to True.
+    charset: Optional[str]
+        The connection character set, defaults to "utf8mb4".
+    kwargs:
+        Further keyword arguments to sqlalchemy.create_engine.
+
+    Returns
+    -------
+    Engine
+    """
+    url, options = _engine_options(
+        url,
+        config,
+        section,
+        pool_size,
+        max_overflow,
+        pool_recycle,
+        pool_pre_ping,
+        charset,
+        kwargs,
+    )
+
+    # Options such as connect_args may not be hashable.
+    key = (
+        url.render_as_string(hide_password=False),
+        tuple(sorted((k, repr(v)) for k, v in options.items())),
+    )
+
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = create_engine(url, future=True, **options)
+            _engines[key] = engine
+
+    return engine
+
+
+def make_async_engine(
+    url: Optional[URL] = None,
+    config: Optional[configparser.ConfigParser] = None,
+    section: str = DEFAULT_SECTION,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    pool_recycle: Optional[int] = None,
+    pool_pre_ping: Optional[bool] = None,
+    charset: Optional[str] = None,
+    **kwargs,
+) -> AsyncEngine:
+    """Returns a new engine for use with SQLAlchemy's asyncio extension.
+
+    The engine connects through the aiomysql driver, which is installed with
+    the "async" extra of this package. The URL and pool options are resolved
+    as for get_engine(). Async connections belong to the event loop which
+    opened them, so these engines are not shared; dispose of them before the
+    loop closes.
+
+    Returns
+    -------
+    AsyncEngine
+    """
+    url, options = _engine_options(
+        url,
+        config,
+        section,
+        pool_size,
+        max_overflow,
+        pool_recycle,
+        pool_pre_ping,
+        charset,
+        kwargs,
+    )
+
+    return create_async_engine(url.set(drivername=ASYNC_DRIVERNAME), **options)
+
+
+def dispose_engines():
+    """Closes the connections of every engine created by get_engine() and
+    forgets them, so that the next call creates a new engine."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+def _engine_options(
+    url,
+    config,
+    section,
+    pool_size,
+    max_overflow,
+    pool_recycle,
+    pool_pre_ping,
+    charset,
+    kwargs,
+):
+    conf = {}
+    if config is not None and section in config.sections():
+        conf = config[section]
+
+    if url is None:
+        if config is not None:
+            url = url_from_config(config, section, charset)
+        else:
+            url = url_from_env(charset)
+    elif charset is not None:
+        url = url.update_query_dict({"charset": charset})
+
+    options = {
+        "pool_size": _option(pool_size, conf, "pool_size", DEFAULT_POOL_SIZE),
+        "max_overflow": _option(
+            max_overflow, conf, "max_overflow", DEFAULT_MAX_OVERFLOW
+        ),
+        "pool_recycle": _option(
+            pool_recycle, conf, "pool_recycle", DEFAULT_POOL_RECYCLE
+        ),
+        "pool_pre_ping": _option(
+            pool_pre_ping, conf, "pool_pre_ping", DEFAULT_POOL_PRE_PING
+        ),
+        **kwargs,
+    }
+
+    return url, options
+
+
+def _option(value, conf, key: str, default):
+    if value is not None:
+        return value
+    if key not in conf:
+        return default
+    if isinstance(default, bool):
+        return conf.getboolean(key)
+
+    return int(conf[key])
+
+
+def _reset_after_fork():
+    global _engines_lock
+
+    # The lock may have been held by another thread of the parent.
+    _engines_lock = threading.Lock()
+
+    # The child inherits the parent's pooled connections. Replace the pools
+    # without closing those connections, which the parent still uses.
+    for engine in _engines.values():
+        engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
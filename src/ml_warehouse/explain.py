@@ -0,0 +1,430 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Auditing of query plans.
+
+audit_report() runs EXPLAIN FORMAT=JSON on the statement of each of a set of
+query helpers and reports, for each helper, the access to every table of the
+plan, what looks expensive in it, and the indexes which might avoid it:
+
+    report = audit_report(sess, {"recent_ont": lambda s: get_recent_ont(s, since)})
+    write_report(report, "plans.json")
+
+The findings are full table scans, full index scans, filesorts, temporary
+tables, estimates of more than max_rows rows examined per scan, and indexes
+used by the server which are not declared in ml_warehouse.schema.
+
+Indexes are suggested for the tables with findings, from the columns the
+statement compares in its WHERE and JOIN ... ON clauses: the columns compared
+for equality with a value, then one compared as a range, or else a column
+joined on, unless an index declared in the schema already starts with them.
+Conditions ORed across tables, such as those of the recently updated examples,
+cannot use an index on any one of them, so their suggestions are only a
+starting point.
+
+The report is plain JSON with sorted keys, to be compared between releases.
+"""
+
+import json
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Union
+
+from sqlalchemy import Table
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import operators, visitors
+from sqlalchemy.sql.elements import BinaryExpression, ColumnClause
+from sqlalchemy.sql.selectable import Join, Select
+
+from ml_warehouse.schema import load_all, metadata
+
+REPORT_VERSION = 1
+DEFAULT_MAX_ROWS = 10_000
+
+FULL_SCAN = "full_scan"
+FULL_INDEX_SCAN = "full_index_scan"
+FILESORT = "filesort"
+TEMPORARY_TABLE = "temporary_table"
+ROWS_EXAMINED = "rows_examined"
+UNDECLARED_INDEX = "undeclared_index"
+
+_EQUALITY = {operators.eq, operators.in_op, operators.is_}
+_RANGE = {
+    operators.gt,
+    operators.ge,
+    operators.lt,
+    operators.le,
+    operators.between_op,
+    operators.like_op,
+}
+
+
+class Finding(NamedTuple):
+    """Something in a plan which may make a query slow."""
+
+    kind: str
+    table: Optional[str]
+    detail: str
+
+
+def explain(sess: Session, stmt) -> dict:
+    """Returns the plan of a statement, as given by EXPLAIN FORMAT=JSON.
+
+    Arguments
+    ---------
+    sess: Session
+        The Session whose connection explains the statement.
+    stmt:
+        A Select, a Query or another executable statement, with its parameters.
+
+    Returns
+    -------
+    dict
+        The plan.
+    """
+    conn = sess.connection()
+    compiled = _statement(stmt).compile(
+        dialect=conn.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    params = compiled.construct_params()
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+
+    result = conn.exec_driver_sql(f"EXPLAIN FORMAT=JSON {compiled}", params)
+
+    return json.loads(result.scalar())
+
+
+def plan_tables(plan: dict) -> List[dict]:
+    """Returns the table accesses of a plan, including those of subqueries,
+    in the order they appear in it."""
+    return [table for table, _ in _walk(plan)]
+
+
+def audit(plan: dict, max_rows: int = DEFAULT_MAX_ROWS) -> List[Finding]:
+    """Returns the findings of a plan.
+
+    Arguments
+    ---------
+    plan: dict
+        The plan, as given by explain().
+    max_rows: int
+        The number of rows examined per scan of a table above which it is
+        reported.
+
+    Returns
+    -------
+    List[Finding]
+    """
+    findings = []
+
+    for node in _nodes(plan):
+        if node.get("using_filesort"):
+            findings.append(Finding(FILESORT, _first_table(node), "Using filesort"))
+        if node.get("using_temporary_table"):
+            findings.append(
+                Finding(TEMPORARY_TABLE, _first_table(node), "Using temporary table")
+            )
+
+    for table, _ in _walk(plan):
+        name = table.get("table_name")
+        access = table.get("access_type")
+        rows = table.get("rows_examined_per_scan")
+
+        if access == "ALL":
+            findings.append(Finding(FULL_SCAN, name, f"{rows} rows examined per scan"))
+        elif access == "index":
+            findings.append(
+                Finding(FULL_INDEX_SCAN, name, f"Full scan of index {table.get('key')}")
+            )
+        if rows is not None and rows > max_rows:
+            findings.append(
+                Finding(ROWS_EXAMINED, name, f"{rows} rows examined per scan")
+            )
+
+        declared = _declared_indexes(name)
+        key = table.get("key")
+        if declared is not None and key is not None and key not in declared:
+            findings.append(
+                Finding(UNDECLARED_INDEX, name, f"Index {key} is not in the schema")
+            )
+
+    return findings
+
+
+def compared_columns(stmt) -> Dict[str, Dict[str, List[str]]]:
+    """Returns the columns compared in the WHERE and JOIN ... ON clauses of a
+    statement and of its subqueries.
+
+    Arguments
+    ---------
+    stmt:
+        A Select, a Query or another statement.
+
+    Returns
+    -------
+    Dict[str, Dict[str, List[str]]]
+        The names of the columns compared for equality with a value
+        ("equality"), as a range ("range") and with another column ("join"),
+        by table name, in the order they are first compared.
+    """
+    columns: Dict[str, Dict[str, List[str]]] = {}
+
+    for clause in _conditions(_statement(stmt)):
+        for binary in visitors.iterate(clause):
+            if not isinstance(binary, BinaryExpression):
+                continue
+
+            sides = (binary.left, binary.right)
+            if all(isinstance(side, ColumnClause) for side in sides):
+                kind = "join"
+            elif binary.operator in _EQUALITY:
+                kind = "equality"
+            elif binary.operator in _RANGE:
+                kind = "range"
+            else:
+                continue
+
+            for side in sides:
+                if isinstance(side, ColumnClause) and isinstance(side.table, Table):
+                    compared = columns.setdefault(
+                        side.table.name, {"equality": [], "range": [], "join": []}
+                    )
+                    if side.name not in compared[kind]:
+                        compared[kind].append(side.name)
+
+    return columns
+
+
+def suggest_indexes(stmt, findings: List[Finding]) -> Dict[str, List[str]]:
+    """Returns the indexes which might avoid the findings of a statement.
+
+    Arguments
+    ---------
+    stmt:
+        A Select, a Query or another statement.
+    findings: List[Finding]
+        The findings of its plan, as given by audit().
+
+    Returns
+    -------
+    Dict[str, List[str]]
+        The columns of a suggested index, by table name.
+    """
+    tables = {f.table for f in findings if f.kind != UNDECLARED_INDEX}
+    suggestions = {}
+
+    for name, compared in compared_columns(stmt).items():
+        table = _table(name)
+        if name not in tables or table is None:
+            continue
+
+        columns = list(compared["equality"])
+        columns.extend(c for c in compared["range"][:1] if c not in columns)
+        if not columns:
+            # A table joined without an index on the join columns.
+            columns = compared["join"][:1]
+        if not columns:
+            continue
+
+        if not any(
+            prefix[: len(columns)] == columns for prefix in _index_columns(table)
+        ):
+            suggestions[name] = columns
+
+    return suggestions
+
+
+def audit_statement(
+    sess: Session, stmt, max_rows: int = DEFAULT_MAX_ROWS
+) -> Dict[str, object]:
+    """Explains a statement and audits its plan.
+
+    Arguments
+    ---------
+    sess: Session
+        The Session whose connection explains the statement.
+    stmt:
+        A Select, a Query or another executable statement, with its parameters.
+    max_rows: int
+        The number of rows examined per scan of a table above which it is
+        reported.
+
+    Returns
+    -------
+    Dict[str, object]
+        The entry of the statement in the report: its SQL, its table accesses,
+        findings and suggested indexes.
+    """
+    plan = explain(sess, stmt)
+    findings = audit(plan, max_rows)
+
+    return {
+        "sql": str(_statement(stmt).compile(dialect=sess.connection().dialect)),
+        "tables": [
+            {field: table.get(field) for field in _TABLE_FIELDS}
+            for table in plan_tables(plan)
+        ],
+        "findings": [f._asdict() for f in findings],
+        "suggested_indexes": suggest_indexes(stmt, findings),
+    }
+
+
+def audit_report(
+    sess: Session,
+    helpers: Dict[str, Callable[[Session], object]],
+    max_rows: int = DEFAULT_MAX_ROWS,
+) -> Dict[str, object]:
+    """Audits the plans of query helpers.
+
+    Arguments
+    ---------
+    sess: Session
+        The Session whose connection explains the statements.
+    helpers: Dict[str, Callable[[Session], object]]
+        Functions building the statement of each helper, with representative
+        parameters, from a Session, by name.
+    max_rows: int
+        The number of rows examined per scan of a table above which it is
+        reported.
+
+    Returns
+    -------
+    Dict[str, object]
+        The report, with the server version and an entry per helper.
+    """
+    version = sess.connection().exec_driver_sql("SELECT VERSION()").scalar()
+
+    return {
+        "version": REPORT_VERSION,
+        "server_version": version,
+        "max_rows": max_rows,
+        "helpers": {
+            name: audit_statement(sess, helper(sess), max_rows)
+            for name, helper in sorted(helpers.items())
+        },
+    }
+
+
+def write_report(report: Dict[str, object], path: Union[str, Path]):
+    """Writes a report as JSON, with sorted keys so that reports can be
+    compared line by line."""
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+_TABLE_FIELDS = (
+    "table_name",
+    "access_type",
+    "possible_keys",
+    "key",
+    "used_key_parts",
+    "rows_examined_per_scan",
+    "rows_produced_per_join",
+    "filtered",
+    "using_index",
+)
+
+
+def _statement(stmt):
+    if isinstance(stmt, Query):
+        return stmt.statement
+
+    # A lambda statement is compiled from the statement it resolves to.
+    return getattr(stmt, "_resolved", stmt)
+
+
+def _nodes(node) -> Iterator[dict]:
+    # Every object of the plan.
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _nodes(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _nodes(value)
+
+
+def _walk(plan: dict) -> Iterator[tuple]:
+    for node in _nodes(plan):
+        table = node.get("table")
+        if isinstance(table, dict) and "table_name" in table:
+            yield table, node
+
+
+def _first_table(node: dict) -> Optional[str]:
+    for table, _ in _walk(node):
+        return table["table_name"]
+
+    return None
+
+
+def _conditions(stmt) -> Iterator:
+    for element in visitors.iterate(stmt):
+        if isinstance(element, Select):
+            if element.whereclause is not None:
+                yield element.whereclause
+            # The joins of a Select are only built from its join() calls here.
+            for from_ in element.get_final_froms():
+                yield from _onclauses(from_)
+
+
+def _onclauses(from_) -> Iterator:
+    if isinstance(from_, Join):
+        yield from _onclauses(from_.left)
+        yield from _onclauses(from_.right)
+        if from_.onclause is not None:
+            yield from_.onclause
+
+
+def _table(name: Optional[str]) -> Optional[Table]:
+    # Plans may name tables of domains which have not been imported yet.
+    if name not in metadata.tables:
+        load_all()
+
+    return metadata.tables.get(name)
+
+
+def _index_columns(table: Table) -> List[List[str]]:
+    indexes = [[c.name for c in table.primary_key.columns]]
+    indexes.extend([c.name for c in index.columns] for index in table.indexes)
+    indexes.extend(
+        [c.name for c in constraint.columns]
+        for constraint in table.constraints
+        if constraint.__visit_name__ == "unique_constraint"
+    )
+
+    return indexes
+
+
+def _declared_indexes(name: Optional[str]) -> Optional[set]:
+    # The names of the indexes of a table, or None if it is not mapped, e.g. a
+    # derived table.
+    table = _table(name)
+    if table is None:
+        return None
+
+    names = {"PRIMARY"}
+    names.update(index.name for index in table.indexes)
+    # MySQL names an unnamed unique key after its first column.
+    names.update(
+        constraint.name or list(constraint.columns)[0].name
+        for constraint in table.constraints
+        if constraint.__visit_name__ == "unique_constraint"
+    )
+
+    return names
@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Parallel export of warehouse tables to sharded files.
+
+export_table() splits a table into ranges of its integer primary key, e.g.
+id_iseq_pr_metrics_tmp, and exports each range to its own file from a pool of
+worker processes. Every worker connects through its own engine.
+
+    results = export_table(IseqProductMetrics, "export/", config=config, workers=8)
+
+The ranges are recorded in a manifest in the output directory, together with
+the row count and timing of each exported partition, or the error of each
+partition which failed. A partition which failed can be exported again with
+retry_partition(), without rerunning the others.
+
+The files are tab separated, with a header line of column names. Values are
+quoted only when needed and NULL is written as \\N.
+"""
+
+import csv
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional, Union
+
+from sqlalchemy import func, select, types
+from sqlalchemy.engine import URL
+from sqlalchemy.orm import Session
+
+from ml_warehouse._introspect import primary_key_column
+from ml_warehouse.engine import get_engine
+from ml_warehouse.stream import iter_rows
+
+MINMAX = "minmax"
+QUANTILES = "quantiles"
+
+DEFAULT_RANGE_SIZE = 1_000_000
+DEFAULT_SAMPLE_SIZE = 10_000
+DEFAULT_WORKERS = 4
+
+NULL = "\\N"
+
+
+class Partition(NamedTuple):
+    """A range of primary key values, including both bounds."""
+
+    index: int
+    lower: int
+    upper: int
+
+
+class PartitionResult(NamedTuple):
+    """The outcome of exporting a partition."""
+
+    partition: Partition
+    path: str
+    rows: int
+    seconds: float
+
+
+def partition_ranges(
+    sess: Session,
+    model,
+    range_size: int = DEFAULT_RANGE_SIZE,
+    method: str = MINMAX,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+) -> List[Partition]:
+    """Returns ranges of the primary key of a mapped class which together
+    cover all its rows.
+
+    Arguments
+    ---------
+    sess: Session
+        The Session to query the keys with.
+    model:
+        The mapped class, which must have a single-column integer primary key.
+    range_size: int
+        For MINMAX, the number of key values in each range. For QUANTILES, the
+        approximate number of rows in each range.
+    method: str
+        MINMAX to split the interval between the smallest and largest keys
+        evenly, or QUANTILES to split at quantiles of a random sample of the
+        keys. QUANTILES gives even partitions when the keys have gaps.
+    sample_size: int
+        The approximate number of keys sampled for QUANTILES.
+
+    Returns
+    -------
+    List[Partition]
+    """
+    column = primary_key_column(model)
+    if not isinstance(column.type, types.Integer):
+        raise ValueError(f"{model.__name__} does not have an integer primary key")
+    if method not in (MINMAX, QUANTILES):
+        raise ValueError(f"Unknown partitioning method {method!r}")
+
+    pk = getattr(model, column.key)
+    lowest, highest, count = sess.execute(
+        select(func.min(pk), func.max(pk), func.count())
+    ).one()
+    if count == 0:
+        return []
+
+    if method == MINMAX:
+        bounds = list(range(lowest, highest + 1, range_size))
+    else:
+        stmt = select(pk).order_by(pk)
+        if count > sample_size:
+            stmt = stmt.where(func.rand() < sample_size / count)
+        sample = sess.execute(stmt).scalars().all()
+
+        n = math.ceil(count / range_size) if sample else 1
+        quantiles = [sample[len(sample) * i // n] for i in range(1, n)]
+        bounds = sorted({lowest, *quantiles})
+
+    uppers = [b - 1 for b in bounds[1:]] + [highest]
+
+    return [Partition(i, lo, up) for i, (lo, up) in enumerate(zip(bounds, uppers))]
+
+
+def export_partition(
+    url: URL, model, partition: Partition, directory: Union[str, Path]
+) -> PartitionResult:
+    """Exports the rows of a mapped class in a partition to a file.
+
+    The file is written under a temporary name and renamed once complete, so
+    an interrupted export never leaves a partial file under the final name.
+
+    Arguments
+    ---------
+    url: URL
+        The URL of the database, connected to through this process's engine.
+    model:
+        The mapped class.
+    partition: Partition
+        The range of primary key values to export.
+    directory: Union[str, Path]
+        The output directory.
+
+    Returns
+    -------
+    PartitionResult
+    """
+    start = time.perf_counter()
+
+    table = model.__table__
+    pk = getattr(model, primary_key_column(model).key)
+    stmt = (
+        select(table).where(pk.between(partition.lower, partition.upper)).order_by(pk)
+    )
+
+    path = Path(directory) / partition_filename(model, partition)
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    rows = 0
+    with Session(get_engine(url=url)) as sess:
+        with open(tmp_path, "w", newline="") as f:
+            writer = csv.writer(f, dialect="excel-tab", lineterminator="\n")
+            writer.writerow([col.name for col in table.columns])
+            for row in iter_rows(sess, stmt):
+                writer.writerow([NULL if v is None else v for v in row])
+                rows += 1
+
+    os.replace(tmp_path, path)
+
+    return PartitionResult(partition, str(path), rows, time.perf_counter() - start)
+
+
+def export_table(
+    model,
+    directory: Union[str, Path],
+    url: Optional[URL] = None,
+    workers: int = DEFAULT_WORKERS,
+    range_size: int = DEFAULT_RANGE_SIZE,
+    method: str = MINMAX,
+    progress: Optional[Callable[[PartitionResult, int, int], None]] = None,
+    **kwargs,
+) -> List[PartitionResult]:
+    """Exports all the rows of a mapped class to one file per partition, using
+    a pool of worker processes.
+
+    Arguments
+    ---------
+    model:
+        The mapped class, which must have a single-column integer primary key.
+    directory: Union[str, Path]
+        The output directory, which is created if needed. The manifest is
+        written to <table>.manifest.json within it.
+    url: Optional[URL]
+        The URL of the database. If None, it is resolved from the keyword
+        arguments as for ml_warehouse.engine.get_engine().
+    workers: int
+        The number of worker processes.
+    range_size: int
+        Passed to partition_ranges().
+    method: str
+        Passed to partition_ranges().
+    progress: Optional[Callable[[PartitionResult, int, int], None]]
+        Called with each partition's result, the number of partitions done and
+        the total number of partitions, as each partition completes.
+    kwargs:
+        config or section, passed to ml_warehouse.engine.get_engine().
+
+    Returns
+    -------
+    List[PartitionResult]
+        The results, in partition order.
+
+    Raises
+    ------
+    RuntimeError
+        If any partition failed, once all the others are done and the manifest
+        records both.
+    """
+    engine = get_engine(url=url, **kwargs)
+    url = engine.url
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    with Session(engine) as sess:
+        partitions = partition_ranges(sess, model, range_size, method)
+    manifest = {
+        "table": model.__tablename__,
+        "partitions": [p._asdict() for p in partitions],
+    }
+    _write_manifest(directory, model, manifest)
+
+    results = []
+    errors = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(export_partition, url, model, p, directory): p
+            for p in partitions
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                partition = futures[future]
+                errors[partition.index] = e
+                _record_error(manifest, partition, e)
+                _write_manifest(directory, model, manifest)
+                continue
+
+            results.append(result)
+            _record_result(manifest, result)
+            _write_manifest(directory, model, manifest)
+
+            if progress is not None:
+                progress(result, len(results), len(partitions))
+
+    if errors:
+        failed = sorted(errors)
+        raise RuntimeError(
+            f"{len(failed)} of {len(partitions)} partitions of "
+            f"{model.__tablename__} failed: {failed}; export them again with "
+            "retry_partition()"
+        ) from errors[failed[0]]
+
+    return sorted(results, key=lambda r: r.partition.index)
+
+
+def retry_partition(
+    model,
+    directory: Union[str, Path],
+    index: int,
+    url: Optional[URL] = None,
+    **kwargs,
+) -> PartitionResult:
+    """Exports one partition of a previous export_table() again, in this
+    process, using the ranges recorded in its manifest.
+
+    Arguments
+    ---------
+    model:
+        The mapped class.
+    directory: Union[str, Path]
+        The output directory of the export.
+    index: int
+        The index of the partition.
+    url: Optional[URL]
+        The URL of the database, resolved as for export_table().
+    kwargs:
+        config or section, passed to ml_warehouse.engine.get_engine().
+
+    Returns
+    -------
+    PartitionResult
+    """
+    directory = Path(directory)
+    manifest = read_manifest(model, directory)
+
+    recorded = [p for p in manifest["partitions"] if p["index"] == index]
+    if not recorded:
+        raise ValueError(f"Partition {index} is missing from the manifest")
+    partition = Partition(*(recorded[0][field] for field in Partition._fields))
+
+    url = get_engine(url=url, **kwargs).url
+    result = export_partition(url, model, partition, directory)
+
+    _record_result(manifest, result)
+    _write_manifest(directory, model, manifest)
+
+    return result
+
+
+def read_manifest(model, directory: Union[str, Path]) -> dict:
+    """Returns the manifest of an export of a mapped class."""
+    with open(Path(directory) / f"{model.__tablename__}.manifest.json") as f:
+        return json.load(f)
+
+
+def partition_filename(model, partition: Partition) -> str:
+    """Returns the name of the file holding a partition of a mapped class."""
+    return f"{model.__tablename__}-{partition.index:05d}.tsv"
+
+
+def _record_result(manifest: dict, result: PartitionResult):
+    entry = manifest["partitions"][result.partition.index]
+    entry.pop("error", None)
+    entry.update(path=result.path, rows=result.rows, seconds=round(result.seconds, 3))
+
+
+def _record_error(manifest: dict, partition: Partition, error: Exception):
+    manifest["partitions"][partition.index]["error"] = repr(error)
+
+
+def _write_manifest(directory: Path, model, manifest: dict):
+    path = directory / f"{model.__tablename__}.manifest.json"
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
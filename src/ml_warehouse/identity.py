@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""A bounded cache of rows shared between sessions, such as Samples and
+Studies looked up repeatedly by ingestion workers.
+
+An IdentityCache holds detached snapshots of the rows of one mapped class,
+found by their natural key, e.g. (id_sample_lims, id_lims) for Sample, or by
+their primary key, e.g. id_sample_tmp:
+
+    samples = IdentityCache(Sample, maxsize=50_000)
+    sample = samples.get(sess, ("5084", "SQSCP"))
+    same = samples.get_by_id(sess, sample.id_sample_tmp)
+
+Snapshots are built from the column values only and never belong to a
+Session, so they must be treated as read-only. Their relationships cannot be
+loaded. Use Session.merge(snapshot, load=False) to obtain a copy attached to a
+Session.
+
+Rows changed in the database are evicted by checking their last_updated
+column, at most once per check interval, against the latest value seen by the
+previous check, or before the first row was loaded.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from ml_warehouse._introspect import primary_key_column, unique_keys
+
+DEFAULT_MAXSIZE = 10_000
+DEFAULT_CHECK_INTERVAL = 60
+
+
+class IdentityCache(object):
+    """A thread-safe, least recently used cache of detached snapshots of the
+    rows of a mapped class."""
+
+    def __init__(
+        self,
+        model,
+        maxsize: int = DEFAULT_MAXSIZE,
+        key: Optional[Sequence[str]] = None,
+        max_age: Optional[float] = None,
+        check_interval: Optional[float] = DEFAULT_CHECK_INTERVAL,
+    ):
+        """Constructs a new IdentityCache.
+
+        Arguments
+        ---------
+        model:
+            The mapped class, which must have a single-column primary key.
+        maxsize: int
+            The maximum number of snapshots. The least recently used snapshots
+            are evicted beyond it.
+        key: Optional[Sequence[str]]
+            The columns of the natural key. Defaults to the first unique index
+            or unique column of the table.
+        max_age: Optional[float]
+            The number of seconds after which a snapshot is read again, or None
+            to keep snapshots until they are evicted or invalidated.
+        check_interval: Optional[float]
+            The minimum number of seconds between checks of last_updated, or
+            None to only check when invalidate_changed() is called. Checks
+            are only made for tables with a last_updated column.
+        """
+        self.model = model
+        self.maxsize = maxsize
+        self.max_age = max_age
+        self.check_interval = check_interval
+
+        self.pk = getattr(model, primary_key_column(model).key)
+        if key is None:
+            key = unique_keys(model)[1]
+        self.key = [getattr(model, k) for k in key]
+        self.last_updated = getattr(model, "last_updated", None)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Snapshots by primary key, in order of use, and the primary keys by
+        # natural key.
+        self._snapshots: OrderedDict = OrderedDict()
+        self._ids = {}
+        self._watermark = None
+        self._checked = time.monotonic()
+        self._lock = threading.RLock()
+
+    def get(self, sess: Session, key: Sequence) -> Optional[Any]:
+        """Returns the snapshot of the row with a natural key, reading it with a
+        Session if it is not cached, or None if there is no such row."""
+        self._check(sess)
+
+        with self._lock:
+            snapshot = self._cached(self._ids.get(tuple(key)))
+
+        if snapshot is None:
+            condition = and_(*[col == value for col, value in zip(self.key, key)])
+            snapshot = self._load(sess, condition)
+
+        return snapshot
+
+    def get_by_id(self, sess: Session, pk) -> Optional[Any]:
+        """Returns the snapshot of the row with a primary key, reading it with
+        a Session if it is not cached, or None if there is no such row."""
+        self._check(sess)
+
+        with self._lock:
+            snapshot = self._cached(pk)
+
+        if snapshot is None:
+            snapshot = self._load(sess, self.pk == pk)
+
+        return snapshot
+
+    def invalidate(self, pk):
+        """Evicts the snapshot of the row with a primary key."""
+        with self._lock:
+            self._evict(pk)
+
+    def invalidate_changed(self, sess: Session) -> int:
+        """Evicts the snapshots of the rows whose last_updated is at or after
+        the latest value seen by the previous check, or before the first row
+        was loaded, and returns their number. A check made before any row was
+        loaded only records the latest value."""
+        if self.last_updated is None:
+            return 0
+
+        with self._lock:
+            watermark = self._watermark
+            self._checked = time.monotonic()
+
+        if watermark is None:
+            latest = sess.execute(select(func.max(self.last_updated))).scalar()
+            with self._lock:
+                self._watermark = latest
+            return 0
+
+        rows = sess.execute(
+            select(self.pk, self.last_updated).where(self.last_updated >= watermark)
+        ).all()
+
+        evicted = 0
+        with self._lock:
+            for pk, last_updated in rows:
+                evicted += self._evict(pk)
+                self._watermark = max(self._watermark, last_updated)
+
+        return evicted
+
+    def clear(self):
+        """Evicts every snapshot."""
+        with self._lock:
+            self._snapshots.clear()
+            self._ids.clear()
+
+    def memory_usage(self) -> int:
+        """Returns an estimate of the memory used by the snapshots, in bytes."""
+        with self._lock:
+            snapshots = [s for s, _ in self._snapshots.values()]
+
+        size = sys.getsizeof(self._snapshots) + sys.getsizeof(self._ids)
+        for snapshot in snapshots:
+            size += sys.getsizeof(snapshot) + sys.getsizeof(snapshot.__dict__)
+            size += sum(sys.getsizeof(v) for v in snapshot.__dict__.values())
+
+        return size
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def _check(self, sess: Session):
+        if self.check_interval is None:
+            return
+        if time.monotonic() - self._checked >= self.check_interval:
+            self.invalidate_changed(sess)
+
+    def _cached(self, pk):
+        # Called with the lock held.
+        entry = self._snapshots.get(pk) if pk is not None else None
+        if entry is not None:
+            snapshot, loaded = entry
+            if self.max_age is None or time.monotonic() - loaded < self.max_age:
+                self._snapshots.move_to_end(pk)
+                self.hits += 1
+                return snapshot
+
+            self._evict(pk)
+
+        self.misses += 1
+
+        return None
+
+    def _load(self, sess: Session, condition) -> Optional[Any]:
+        if self.last_updated is not None and self._watermark is None:
+            # Read before the first row, so that the next check evicts rows
+            # changed since they were loaded.
+            latest = sess.execute(select(func.max(self.last_updated))).scalar()
+            with self._lock:
+                if self._watermark is None:
+                    self._watermark = latest
+                elif latest is not None:
+                    self._watermark = min(self._watermark, latest)
+
+        table = self.model.__table__
+        row = sess.execute(select(table).where(condition)).first()
+        if row is None:
+            return None
+
+        mapper = self.model.__mapper__
+        values = {
+            mapper.get_property_by_column(col).key: row._mapping[col]
+            for col in table.columns
+        }
+        snapshot = self.model(**values)
+        make_transient_to_detached(snapshot)
+
+        pk = values[self.pk.key]
+        key = tuple(values[col.key] for col in self.key)
+        with self._lock:
+            self._remove(pk)
+            self._snapshots[pk] = (snapshot, time.monotonic())
+            self._ids[key] = pk
+            while len(self._snapshots) > self.maxsize:
+                self._evict(next(iter(self._snapshots)))
+
+        return snapshot
+
+    def _evict(self, pk) -> int:
+        # Called with the lock held.
+        if not self._remove(pk):
+            return 0
+        self.evictions += 1
+
+        return 1
+
+    def _remove(self, pk) -> bool:
+        # Called with the lock held.
+        entry = self._snapshots.pop(pk, None)
+        if entry is None:
+            return False
+
+        snapshot = entry[0]
+        self._ids.pop(tuple(getattr(snapshot, col.key) for col in self.key), None)
+
+        return True
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Batched lookups of rows by key.
+
+lookup_many() finds the rows of many keys, such as the (plate_barcode,
+well_label) pairs or the stock ids of a pipeline's input, with one query per
+chunk of keys instead of one per key:
+
+    found = lookup_many(sess, PacBioRunWellMetrics, [("TRACTION-RUN-1", "A1")],
+                        key="pac_bio_metrics_run_well")
+    for run_well in found.missing:
+        ...
+
+The key defaults to the natural key of the table, the first of its unique
+indexes, and may be given as the name of any index of the table or as a list
+of columns. Keys that do not correspond to the leading columns of an index
+are looked up with a table scan per chunk.
+
+Rows are given to the keys which MySQL matched them with: string values are
+compared ignoring case and trailing spaces, as under the case-insensitive,
+PAD SPACE collations of the warehouse, and strings given for integer columns
+are compared as numbers.
+"""
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from sqlalchemy import select, tuple_, types
+from sqlalchemy.orm import Session
+
+from ml_warehouse._introspect import column_keys, index_columns, unique_keys
+
+# MySQL optimises large tuple IN lists well, but the whole list is held in the
+# statement, so keys are sent in chunks of this size.
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class LookupResult(dict):
+    """The rows found by lookup_many(), in a list for each of its keys in the
+    order they were given. Keys without rows map to an empty list."""
+
+    @property
+    def found(self) -> List[Hashable]:
+        """The keys with at least one row."""
+        return [key for key, rows in self.items() if rows]
+
+    @property
+    def missing(self) -> List[Hashable]:
+        """The keys without rows."""
+        return [key for key, rows in self.items() if not rows]
+
+    def one(self, key: Hashable) -> Optional[Any]:
+        """Returns the row of a key, or None if it has no row. Raises
+        ValueError if the key has more than one row."""
+        rows = self[key]
+        if len(rows) > 1:
+            raise ValueError(f"Key {key!r} has {len(rows)} rows")
+
+        return rows[0] if rows else None
+
+
+def lookup_many(
+    sess: Session,
+    model,
+    keys: Iterable[Hashable],
+    key: Optional[Union[str, Sequence[str]]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    options: Sequence = (),
+) -> LookupResult:
+    """Finds the rows of a mapped class with any of a number of keys, using one
+    query per chunk of keys.
+
+    Keys are matched to rows as MySQL compares them, see above, so a row may
+    belong to several keys, e.g. "ABC" and "abc". Keys containing None never
+    match, as NULL is not equal to any value in SQL.
+
+    Arguments
+    ---------
+    sess: Session
+        The Session to execute the queries with.
+    model:
+        The mapped class.
+    keys: Iterable[Hashable]
+        The keys to look up. Keys of several columns are tuples with a value
+        for each column; keys of one column may be plain values. Repeated
+        keys are looked up once.
+    key: Optional[Union[str, Sequence[str]]]
+        The name of the index whose columns make up the keys, "PRIMARY" for
+        the primary key, or the names of the columns. Defaults to the first
+        unique index of the table, or to its primary key if it has none.
+    chunk_size: int
+        The maximum number of keys per query.
+    options: Sequence
+        Loader options for the queries, e.g. selectinload(FlgenPlate.sample).
+
+    Returns
+    -------
+    LookupResult
+        The rows of each key, or an empty list for each missing key.
+
+    Raises
+    ------
+    ValueError
+        If MySQL returns a row which matches none of the keys as compared
+        here, e.g. under an accent-insensitive collation, rather than drop it.
+    """
+    columns = _key_columns(model, key)
+    keys = list(dict.fromkeys(keys))
+
+    result = LookupResult((k, []) for k in keys)
+    if not keys:
+        return result
+
+    composite = len(columns) > 1
+    if composite:
+        for k in keys:
+            if not isinstance(k, tuple) or len(k) != len(columns):
+                raise ValueError(
+                    f"Key {k!r} does not have a value for each of {columns}"
+                )
+        clause = tuple_(*[getattr(model, col) for col in columns])
+    else:
+        clause = getattr(model, columns[0])
+
+    normalisers = [_normaliser(getattr(model, col).type) for col in columns]
+
+    def normalise(values: Sequence) -> tuple:
+        return tuple(f(v) for f, v in zip(normalisers, values))
+
+    # The given keys of each key as MySQL compares them.
+    matching: Dict[tuple, List[Hashable]] = {}
+    for k in keys:
+        matching.setdefault(normalise(k if composite else (k,)), []).append(k)
+
+    for i in range(0, len(keys), chunk_size):
+        chunk = keys[i : i + chunk_size]
+        stmt = select(model).where(clause.in_(chunk)).options(*options)
+
+        for row in sess.execute(stmt).scalars():
+            values = tuple(getattr(row, col) for col in columns)
+            matched = matching.get(normalise(values))
+            if matched is None:
+                raise ValueError(
+                    f"{model.__name__} row with key {values!r} matches none of "
+                    "the keys as compared by lookup_many()"
+                )
+            for k in matched:
+                if row not in result[k]:
+                    result[k].append(row)
+
+    return result
+
+
+def _normaliser(sql_type: types.TypeEngine) -> Callable[[Any], Any]:
+    # Returns a function giving values of a column as MySQL compares them.
+    if isinstance(sql_type, types.Integer):
+        return _as_integer
+    if not isinstance(sql_type, types.String):
+        return _as_is
+
+    collation = sql_type.collation or ""
+    fold = not collation.endswith(("_bin", "_cs"))
+    pad = "_0900_" not in collation
+
+    def normalise(value):
+        if not isinstance(value, str):
+            return value
+        if pad:
+            value = value.rstrip(" ")
+        return value.lower() if fold else value
+
+    return normalise
+
+
+def _as_integer(value):
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return value
+
+    return value
+
+
+def _as_is(value):
+    return value
+
+
+def _key_columns(model, key: Optional[Union[str, Sequence[str]]]) -> List[str]:
+    if key is None:
+        keys = unique_keys(model)
+        key = keys[1] if len(keys) > 1 else keys[0]
+    elif isinstance(key, str):
+        key = index_columns(model, key)
+
+    # Index columns are named by their column keys and may be mapped to
+    # attributes with other names, e.g. "yield" to yield_.
+    attributes = {v: k for k, v in column_keys(model).items() if k != v}
+    names = set(column_keys(model))
+
+    columns = []
+    for col in key:
+        if col not in names:
+            raise ValueError(f"{model.__name__} has no column {col!r}")
+        columns.append(attributes.get(col, col))
+
+    return columns
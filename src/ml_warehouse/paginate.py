@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Keyset pagination over the single-column primary keys of mapped classes.
+
+Each page is selected with `WHERE pk > :last ORDER BY pk LIMIT n`, which reads
+only the rows of the page from the primary key index, however far into the
+table it is. Unlike OFFSET, the cost of a page does not grow with its number.
+
+Every page carries a cursor token that identifies where the next page starts.
+Tokens can be stored, so that an interrupted export resumes where it stopped:
+
+    for page in iter_pages(sess, IseqProductMetrics, cursor=saved_token):
+        write(page.rows)
+        saved_token = page.cursor
+"""
+
+import base64
+import json
+from typing import Iterator, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ml_warehouse._introspect import primary_key_column
+
+DEFAULT_PAGE_SIZE = 1000
+
+
+class Page(NamedTuple):
+    """A page of rows, and the cursor token from which the next page starts.
+
+    The cursor is None if there are no further rows.
+    """
+
+    rows: List
+    cursor: Optional[str]
+
+
+def fetch_page(
+    sess: Session,
+    model,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    filters: Sequence = (),
+    cursor: Optional[str] = None,
+) -> Page:
+    """Returns a page of instances of a mapped class, in primary key order.
+
+    Arguments
+    ---------
+    sess: Session
+        The Session to perform the query against.
+    model:
+        The mapped class, which must have a single-column primary key.
+    page_size: int
+        The maximum number of rows in the page.
+    filters: Sequence
+        Further SQL expressions that the rows must match, e.g.
+        `[IseqFlowcell.id_lims == "SQSCP"]`.
+    cursor: Optional[str]
+        The cursor of the previous page, or None to start at the beginning of
+        the table.
+
+    Returns
+    -------
+    Page
+    """
+    pk = getattr(model, primary_key_column(model).key)
+
+    stmt = select(model).where(*filters).order_by(pk).limit(page_size)
+    if cursor is not None:
+        stmt = stmt.where(pk > decode_cursor(model, cursor))
+
+    rows = sess.execute(stmt).scalars().all()
+
+    next_cursor = None
+    if len(rows) == page_size:
+        next_cursor = encode_cursor(model, getattr(rows[-1], pk.key))
+
+    return Page(rows, next_cursor)
+
+
+def iter_pages(
+    sess: Session,
+    model,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    filters: Sequence = (),
+    cursor: Optional[str] = None,
+) -> Iterator[Page]:
+    """Yields the pages of instances of a mapped class, in primary key order.
+
+    The arguments are those of fetch_page(). Iteration stops after the first
+    page which has no cursor.
+    """
+    while True:
+        page = fetch_page(sess, model, page_size, filters, cursor)
+        if page.rows:
+            yield page
+
+        cursor = page.cursor
+        if cursor is None:
+            return
+
+
+def encode_cursor(model, last_key) -> str:
+    """Returns a cursor token for the page following a primary key value."""
+    data = {"table": model.__tablename__, "after": last_key}
+
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def decode_cursor(model, cursor: str):
+    """Returns the primary key value after which a cursor token's page starts."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError as e:
+        raise ValueError(f"Invalid cursor {cursor!r}") from e
+    if not isinstance(data, dict) or "after" not in data:
+        raise ValueError(f"Invalid cursor {cursor!r}")
+
+    if data.get("table") != model.__tablename__:
+        raise ValueError(
+            f"Cursor {cursor!r} is for table {data.get('table')!r}, "
+            f"not {model.__tablename__!r}"
+        )
+
+    return data["after"]
@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""An incremental rollup of the bases sequenced each month.
+
+Summing IseqRunLaneMetrics.cycles * interop_cluster_count_pf_total by the
+month of each "qc complete" run status reads every lane of the warehouse, yet
+past months rarely change. A YieldRollup keeps those sums by month and by
+instrument model (or another column of IseqRunLaneMetrics), in memory or in a
+JSON file, and refresh() recomputes only the months touched since the previous
+refresh:
+
+    rollup = YieldRollup("yield.json")
+    rollup.refresh(sess)
+    rows = rollup.sequenced_sum(sess, since)
+
+A month is touched by a "qc complete" status added since the previous refresh,
+found by its id_run_status, or by a change to the lane metrics of a run whose
+"qc complete" status falls in that month, found by last_changed. Deleted lanes
+and statuses are only accounted for by rebuild().
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Union
+
+from sqlalchemy import and_, func, literal, or_, select
+from sqlalchemy.orm import Session
+
+from ml_warehouse.dictionaries import dictionary_ids
+from ml_warehouse.schema import (
+    IseqRunLaneMetrics,
+    IseqRunStatus,
+    IseqRunStatusDict,
+)
+
+DEFAULT_GROUP_BY = "instrument_model"
+
+MONTH_FORMAT = "%Y-%m"
+
+
+class YieldRow(NamedTuple):
+    """The bases sequenced in a month, and the number of lanes counted, as in
+    the rows of the get_sequenced_sum() example."""
+
+    bases: Optional[int]
+    month: str
+    count: int
+
+
+class YieldRollup(object):
+    """Sums of the bases sequenced each month, by instrument model, refreshed
+    incrementally from the warehouse."""
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        group_by: Optional[str] = DEFAULT_GROUP_BY,
+    ):
+        """Constructs a new YieldRollup, reading the sums stored in path if it
+        exists.
+
+        Arguments
+        ---------
+        path: Union[str, Path, None]
+            The JSON file to store the sums in, or None to keep them in memory.
+        group_by: Optional[str]
+            The column of IseqRunLaneMetrics to group the sums of each month
+            by, e.g. instrument_model or workflow_type, or None for one sum per
+            month.
+        """
+        if group_by is not None and group_by not in IseqRunLaneMetrics.__table__.c:
+            raise ValueError(f"IseqRunLaneMetrics has no column {group_by!r}")
+
+        self.path = Path(path) if path is not None else None
+        self.group_by = group_by
+
+        # month -> group -> [bases, count], where lanes with a NULL group
+        # have the group None.
+        self._months: Dict[str, Dict[Optional[str], List[int]]] = {}
+        self._last_status: Optional[int] = None
+        self._last_changed: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+        if self.path is not None and self.path.exists():
+            self._read()
+
+    @property
+    def months(self) -> List[str]:
+        """The months with sums, in order."""
+        return sorted(self._months)
+
+    def refresh(self, sess: Session) -> List[str]:
+        """Recomputes the sums of the months touched since the previous refresh,
+        or of every month on the first refresh.
+
+        Arguments
+        ---------
+        sess: Session
+            The Session to read the warehouse with.
+
+        Returns
+        -------
+        List[str]
+            The months recomputed, formatted as YYYY-MM.
+        """
+        with self._lock:
+            last_status, last_changed = sess.execute(
+                select(
+                    select(func.max(IseqRunStatus.id_run_status)).scalar_subquery(),
+                    select(func.max(IseqRunLaneMetrics.last_changed)).scalar_subquery(),
+                )
+            ).one()
+            last_status = last_status or 0
+
+            if self._last_status is None:
+                months = None
+            else:
+                months = self._touched_months(sess, last_status, last_changed)
+                if not months:
+                    return []
+
+            sums = self._sums(sess, months)
+            if months is None:
+                self._months = {}
+                months = set(sums)
+            for month in months:
+                if month in sums:
+                    self._months[month] = sums[month]
+                else:
+                    self._months.pop(month, None)
+
+            self._last_status = last_status
+            self._last_changed = last_changed
+            if self.path is not None:
+                self._write()
+
+            return sorted(months)
+
+    def rebuild(self, sess: Session) -> List[str]:
+        """Recomputes the sums of every month."""
+        with self._lock:
+            self._last_status = None
+
+        return self.refresh(sess)
+
+    def yields(self, since: Optional[str] = None) -> List[tuple]:
+        """Returns the stored sums by month and group.
+
+        Arguments
+        ---------
+        since: Optional[str]
+            The first month to return, formatted as YYYY-MM.
+
+        Returns
+        -------
+        List[tuple]
+            Tuples of month, group, bases and count, ordered by month and group,
+            with the group None for lanes where it is NULL, first.
+        """
+        return [
+            (month, group, bases, count)
+            for month in self.months
+            if since is None or month >= since
+            for group, (bases, count) in sorted(
+                self._months[month].items(), key=_group_order
+            )
+        ]
+
+    def sequenced_sum(self, sess: Session, since: datetime) -> List[YieldRow]:
+        """Returns the bases sequenced each month after a date, as the
+        get_sequenced_sum() example does, from the stored sums.
+
+        Only the month of since is read from the warehouse, as its sum must
+        exclude the statuses up to and including since. The stored sums are
+        used for the months after it.
+
+        Arguments
+        ---------
+        sess: Session
+            The Session to read the month of since with.
+        since: datetime
+            The earliest date from which to count sequencing runs.
+
+        Returns
+        -------
+        List[YieldRow]
+        """
+        first = since.strftime(MONTH_FORMAT)
+
+        rows = []
+        sums = self._sums(sess, {first}, since)
+        if first in sums:
+            rows.append(_total(first, sums[first]))
+
+        for month in self.months:
+            if month > first:
+                rows.append(_total(month, self._months[month]))
+
+        return rows
+
+    def _touched_months(
+        self, sess: Session, last_status: int, last_changed: Optional[datetime]
+    ) -> Set[str]:
+        month = func.date_format(IseqRunStatus.date, MONTH_FORMAT)
+
+        stmt = (
+            select(month)
+            .distinct()
+            .where(
+                _qc_complete(sess),
+                IseqRunStatus.id_run_status > self._last_status,
+                IseqRunStatus.id_run_status <= last_status,
+            )
+        )
+        months = set(sess.execute(stmt).scalars())
+
+        # Rows changed within the second of the previous refresh may not have
+        # been committed then, so that second is read again.
+        if last_changed is not None:
+            changed = select(IseqRunLaneMetrics.id_run).where(
+                IseqRunLaneMetrics.last_changed <= last_changed
+            )
+            if self._last_changed is not None:
+                changed = changed.where(
+                    IseqRunLaneMetrics.last_changed >= self._last_changed
+                )
+
+            stmt = (
+                select(month)
+                .distinct()
+                .where(_qc_complete(sess), IseqRunStatus.id_run.in_(changed))
+            )
+            months.update(sess.execute(stmt).scalars())
+
+        return months
+
+    def _sums(
+        self, sess: Session, months: Optional[Set[str]], after: datetime = None
+    ) -> Dict[str, Dict[Optional[str], List[int]]]:
+        month = func.date_format(IseqRunStatus.date, MONTH_FORMAT).label("month")
+        group = (
+            getattr(IseqRunLaneMetrics, self.group_by).label("group")
+            if self.group_by is not None
+            else literal("").label("group")
+        )
+
+        stmt = (
+            select(
+                month,
+                group,
+                func.sum(
+                    IseqRunLaneMetrics.cycles
+                    * IseqRunLaneMetrics.interop_cluster_count_pf_total
+                ),
+                func.count(),
+            )
+            .where(
+                IseqRunLaneMetrics.id_run == IseqRunStatus.id_run,
+                _qc_complete(sess),
+            )
+            .group_by("month", "group")
+        )
+        if months is not None:
+            # Date ranges, unlike the formatted month, can use an index.
+            stmt = stmt.where(
+                or_(
+                    *[
+                        and_(IseqRunStatus.date >= start, IseqRunStatus.date < end)
+                        for start, end in _month_ranges(months)
+                    ]
+                )
+            )
+        if after is not None:
+            stmt = stmt.where(IseqRunStatus.date > after)
+
+        sums: Dict[str, Dict[Optional[str], List[int]]] = {}
+        for m, g, bases, count in sess.execute(stmt):
+            bases = int(bases) if bases is not None else None
+            sums.setdefault(m, {})[g] = [bases, count]
+
+        return sums
+
+    def _read(self):
+        with open(self.path) as f:
+            state = json.load(f)
+
+        if state["group_by"] != self.group_by:
+            raise ValueError(
+                f"{self.path} holds sums grouped by {state['group_by']!r}, "
+                f"not by {self.group_by!r}"
+            )
+
+        # JSON objects only have string keys, so the groups, which may be
+        # None, are stored as lists of group, bases and count.
+        self._months = {
+            month: {group: [bases, count] for group, bases, count in groups}
+            for month, groups in state["months"].items()
+        }
+        self._last_status = state["last_status"]
+        last_changed = state["last_changed"]
+        self._last_changed = (
+            datetime.fromisoformat(last_changed) if last_changed is not None else None
+        )
+
+    def _write(self):
+        state = {
+            "group_by": self.group_by,
+            "last_status": self._last_status,
+            "last_changed": self._last_changed.isoformat()
+            if self._last_changed is not None
+            else None,
+            "months": {
+                month: [
+                    [group, bases, count]
+                    for group, (bases, count) in sorted(
+                        groups.items(), key=_group_order
+                    )
+                ]
+                for month, groups in self._months.items()
+            },
+        }
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def _total(month: str, groups: Dict[Optional[str], List[int]]) -> YieldRow:
+    # SUM() is NULL when every lane of the month is, like in SQL.
+    bases = [b for b, _ in groups.values() if b is not None]
+
+    return YieldRow(
+        sum(bases) if bases else None, month, sum(c for _, c in groups.values())
+    )
+
+
+def _group_order(item: tuple) -> tuple:
+    # Orders the groups of a month as MySQL does, NULL first.
+    group = item[0]
+
+    return group is not None, group or ""
+
+
+def _month_ranges(months: Set[str]) -> List[tuple]:
+    # Half-open date ranges covering the months, consecutive months merged.
+    ranges = []
+    for month in sorted(months):
+        start = datetime.strptime(month, MONTH_FORMAT)
+        end = datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+        if ranges and ranges[-1][1] == start:
+            ranges[-1][1] = end
+        else:
+            ranges.append([start, end])
+
+    return [tuple(r) for r in ranges]
+
+
+def _qc_complete(sess: Session):
+    ids = dictionary_ids(IseqRunStatusDict, ["qc complete"], sess)
+    if ids is None:
+        return and_(
+            IseqRunStatus.id_run_status_dict == IseqRunStatusDict.id_run_status_dict,
+            IseqRunStatusDict.description == "qc complete",
+        )
+
+    return IseqRunStatus.id_run_status_dict.in_(ids)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Sessions routing reads to warehouse replicas and writes to the primary.
+
+A RoutingSession sends SELECT statements, whether issued through the ORM or
+Core, to one of the engines of a ReplicaSet. The replica is chosen once per
+transaction, so that its reads see the snapshot of a single replica. Flushes,
+DML, SELECT ... FOR UPDATE and textual SQL go to the primary, as does
+Session.connection() when called without a statement. Once a session has written, its reads go to the
+primary until the transaction ends, so that it sees its own uncommitted
+changes.
+
+    replicas = ReplicaSet([get_engine(url=url) for url in replica_urls])
+    primary = get_engine(url=primary_url)
+    Session = sessionmaker(class_=RoutingSession, primary=primary, replicas=replicas)
+"""
+
+import itertools
+import threading
+from contextlib import contextmanager
+from typing import Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+ROUND_ROBIN = "round_robin"
+LEAST_CONNECTIONS = "least_connections"
+
+
+class ReplicaSet(object):
+    """A set of replica engines and the strategy for choosing between them.
+
+    A ReplicaSet is meant to be shared by all the sessions of a process, so
+    that their reads are spread across the replicas.
+    """
+
+    def __init__(self, engines: Sequence[Engine], strategy: str = ROUND_ROBIN):
+        """Constructs a new ReplicaSet.
+
+        Arguments
+        ---------
+        engines: Sequence[Engine]
+            The replica engines.
+        strategy: str
+            ROUND_ROBIN to use each replica in turn, or LEAST_CONNECTIONS to use
+            the replica with the fewest connections checked out of its pool.
+        """
+        if not engines:
+            raise ValueError("A ReplicaSet needs at least one engine")
+        if strategy not in (ROUND_ROBIN, LEAST_CONNECTIONS):
+            raise ValueError(f"Unknown replica selection strategy {strategy!r}")
+
+        self.engines = list(engines)
+        self.strategy = strategy
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def choose(self) -> Engine:
+        """Returns the replica engine to use for the next transaction."""
+        if self.strategy == LEAST_CONNECTIONS:
+            return min(self.engines, key=_checked_out)
+
+        with self._lock:
+            i = next(self._counter)
+
+        return self.engines[i % len(self.engines)]
+
+
+class RoutingSession(Session):
+    """A Session routing reads to replicas and writes to the primary."""
+
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: ReplicaSet,
+        read_your_writes: bool = True,
+        **kwargs,
+    ):
+        """Constructs a new RoutingSession.
+
+        Arguments
+        ---------
+        primary: Engine
+            The engine of the primary database.
+        replicas: ReplicaSet
+            The replicas to send reads to.
+        read_your_writes: bool
+            Send reads to the primary after this session has written, until the
+            end of the transaction. Defaults to True.
+        kwargs:
+            Further keyword arguments to Session.
+        """
+        super().__init__(**kwargs)
+
+        self.primary = primary
+        self.replicas = replicas
+        self.read_your_writes = read_your_writes
+
+        self._wrote = False
+        self._force_primary = 0
+        self._replica = None
+
+        event.listen(self, "after_transaction_end", self._after_transaction_end)
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or (clause is not None and not _is_read(clause)):
+            self._wrote = True
+            return self.primary
+
+        if clause is None or self._force_primary:
+            return self.primary
+        if self.read_your_writes and self._wrote:
+            return self.primary
+
+        if self._replica is None:
+            self._replica = self.replicas.choose()
+
+        return self._replica
+
+    @contextmanager
+    def using_primary(self):
+        """Sends every statement issued within the block to the primary."""
+        self._force_primary += 1
+        try:
+            yield self
+        finally:
+            self._force_primary -= 1
+
+    def _after_transaction_end(self, session, transaction):
+        if transaction.parent is None:
+            self._wrote = False
+            self._replica = None
+
+
+def _is_read(clause) -> bool:
+    # Textual SQL may write, so only SELECT constructs are considered reads.
+    return (
+        getattr(clause, "is_select", False)
+        and getattr(clause, "_for_update_arg", None) is None
+    )
+
+
+def _checked_out(engine: Engine) -> int:
+    checkedout = getattr(engine.pool, "checkedout", None)
+    if checkedout is None:
+        return 0
+
+    return checkedout()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# @author mgcam <mg8@sanger.ac.uk>
+
+"""SQLAlchemy mappings for the ML warehouse.
+
+The mapped classes are generated by codegen.py into one submodule per domain
+(cgap, core, genotyping, iseq, lighthouse, ont and pacbio). A domain submodule
+is only imported when one of its names is first accessed through this module,
+e.g. `from ml_warehouse.schema import CgapHeron` only maps the cgap tables.
+
+Relationships may refer to classes in other domains, e.g. Sample.iseq_flowcell.
+Those domains are imported just before SQLAlchemy configures the mappers, so
+they always resolve. Call load_all() to map every table up front, e.g. before
+using Base.metadata.create_all().
+
+The mappings can also be used through SQLAlchemy's asyncio extension, with an
+engine from ml_warehouse.engine.make_async_engine(). An AsyncSession cannot
+lazy load relationships, so load them eagerly with selectinload() or
+joinedload() options on the statement.
+"""
+
+import sys
+from importlib import import_module
+from types import ModuleType
+
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper, declarative_base
+
+from ml_warehouse.schema._index import DEPENDENCIES, DOMAINS
+
+Base = declarative_base()
+metadata = Base.metadata
+
+_NAME_DOMAINS = {name: domain for domain, names in DOMAINS.items() for name in names}
+
+
+def __getattr__(name: str):
+    domain = _NAME_DOMAINS.get(name)
+    if domain is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(load_domain(domain), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_NAME_DOMAINS))
+
+
+def load_domain(domain: str) -> ModuleType:
+    """Imports the submodule mapping the tables of a domain.
+
+    Arguments
+    ---------
+    domain: str
+        The domain name, one of the keys of DOMAINS.
+
+    Returns
+    -------
+    ModuleType
+        The domain submodule.
+    """
+    if domain not in DOMAINS:
+        raise ValueError(f"Unknown schema domain {domain!r}")
+
+    return import_module(f"{__name__}.{domain}")
+
+
+def load_all():
+    """Imports every domain submodule, mapping all tables of the warehouse."""
+    for domain in DOMAINS:
+        load_domain(domain)
+
+
+def loaded_domains():
+    """Returns the names of the domains whose submodules have been imported."""
+    return [d for d in DOMAINS if f"{__name__}.{d}" in sys.modules]
+
+
+@event.listens_for(Mapper, "before_configured")
+def _load_dependencies():
+    # String references in relationship() are resolved when the mappers are
+    # configured, so every domain they point to must be imported by then.
+    pending = loaded_domains()
+
+    while pending:
+        domain = pending.pop()
+        for dep in DEPENDENCIES[domain]:
+            if f"{__name__}.{dep}" not in sys.modules:
+                load_domain(dep)
+                pending.append(dep)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# @author mgcam <mg8@sanger.ac.uk>
+
+# Generated by codegen.py, do not edit.
+
+# The mapped classes and tables defined by each domain submodule.
+DOMAINS = {
+    "cgap": (
+        "CgapAnalyte",
+        "CgapBiomaterial",
+        "CgapConjuredLabware",
+        "CgapDestruction",
+        "CgapHeron",
+        "CgapLineIdentifier",
+        "CgapOrganoidsConjuredLabware",
+        "CgapRelease",
+        "CgapSupplierBarcode",
+    ),
+    "core": (
+        "ArInternalMetadata",
+        "LongReadQcResult",
+        "PsdSampleCompoundsComponents",
+        "Sample",
+        "t_schema_migrations",
+        "SeqProductIrodsLocations",
+        "Study",
+        "GsuSampleUploads",
+        "QcResult",
+        "SamplesExtractionActivity",
+        "StockResource",
+        "StudyUsers",
+        "TolSampleBioproject",
+    ),
+    "genotyping": ("BmapFlowcell", "FlgenPlate"),
+    "iseq": (
+        "IseqExternalProductMetrics",
+        "IseqHeronClimbStatus",
+        "IseqHeronProductMetrics",
+        "IseqRun",
+        "IseqRunLaneMetrics",
+        "IseqRunStatusDict",
+        "IseqExternalProductComponents",
+        "IseqFlowcell",
+        "IseqRunInfo",
+        "IseqRunStatus",
+        "IseqProductMetrics",
+        "IseqProductAmpliconstats",
+        "IseqProductComponents",
+    ),
+    "lighthouse": ("LighthouseSample",),
+    "ont": ("OseqFlowcell",),
+    "pacbio": ("PacBioRunWellMetrics", "PacBioRun", "PacBioProductMetrics"),
+}
+
+# The domains that must be mapped before each domain can be used.
+DEPENDENCIES = {
+    "cgap": (),
+    "core": ("genotyping", "iseq", "ont", "pacbio"),
+    "genotyping": ("core",),
+    "iseq": ("core",),
+    "lighthouse": (),
+    "ont": ("core",),
+    "pacbio": ("core",),
+}
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# @author mgcam <mg8@sanger.ac.uk>
+
+from sqlalchemy import CHAR, Column, Computed, DECIMAL, Date, DateTime, Enum, Float, ForeignKey, ForeignKeyConstraint, Index, String, TIMESTAMP, Table, Text, text
+from sqlalchemy.dialects.mysql import BIGINT as mysqlBIGINT, CHAR as mysqlCHAR, DATETIME as mysqlDATETIME, DOUBLE as mysqlDOUBLE, ENUM as mysqlENUM, FLOAT as mysqlFLOAT, INTEGER as mysqlINTEGER, SMALLINT as mysqlSMALLINT, TINYINT as mysqlTINYINT, VARCHAR as mysqlVARCHAR
+from sqlalchemy.orm import declarative_base, relationship
+
+from ml_warehouse.schema import Base, metadata
+
+
+class CgapAnalyte(Base):
+    __tablename__ = 'cgap_analyte'
+
+    cgap_analyte_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='Internal to this database id. Value can change.', doc='Internal to this database id. Value can change.')
+    cell_line_uuid = Column(String(36, 'utf8_unicode_ci'), nullable=False, index=True)
+    destination = Column(String(32, 'utf8_unicode_ci'), nullable=False)
+    slot_uuid = Column(String(36, 'utf8_unicode_ci'), nullable=False, unique=True)
+    release_date = Column(TIMESTAMP, nullable=False, server_default=text("'0000-00-00 00:00:00'"))
+    labware_barcode = Column(String(20, 'utf8_unicode_ci'), nullable=False)
+    cell_state = Column(String(40, 'utf8_unicode_ci'), nullable=False)
+    jobs = Column(String(64, 'utf8_unicode_ci'))
+    passage_number = Column(mysqlINTEGER(2))
+    project = Column(String(50, 'utf8_unicode_ci'))
+
+    def __init__(self, **kwargs):
+        """Constructs a new CgapAnalyte.
+
+        Parameters
+        ----------
+        cgap_analyte_tmp: Internal to this database id. Value can change.
+        cell_line_uuid
+        destination
+        slot_uuid
+        release_date
+        labware_barcode
+        cell_state
+        jobs
+        passage_number
+        project
+        """
+        super().__init__(**kwargs)
+
+
+class CgapBiomaterial(Base):
+    __tablename__ = 'cgap_biomaterial'
+
+    cgap_biomaterial_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='Internal to this database id. Value can change.', doc='Internal to this database id. Value can change.')
+    donor_uuid = Column(String(36, 'utf8_unicode_ci'), nullable=False, index=True)
+    biomaterial_uuid = Column(String(36, 'utf8_unicode_ci'), nullable=False, unique=True)
+    donor_accession_number = Column(String(38, 'utf8_unicode_ci'))
+    donor_name = Column(String(64, 'utf8_unicode_ci'))
+
+    def __init__(self, **kwargs):
+        """Constructs a new CgapBiomaterial.
+
+        Parameters
+        ----------
+        cgap_biomaterial_tmp: Internal to this database id. Value can change.
+        donor_uuid
+        biomaterial_uuid
+        donor_accession_number
+        donor_name
+        """
+        super().__init__(**kwargs)
+
+
+class CgapConjuredLabware(Base):
+    __tablename__ = 'cgap_conjured_labware'
+
+    cgap_conjured_labware_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='Internal to this database id. Value can change.', doc='Internal to this database id. Value can change.')
+    barcode = Column(String(32, 'utf8_unicode_ci'), nullable=False, index=True)
+    cell_line_long_name = Column(String(48, 'utf8_unicode_ci'), nullable=False, index=True)
+    cell_line_uuid = Column(String(38, 'utf8_unicode_ci'), nullable=False, index=True)
+    passage_number = Column(mysqlINTEGER(2), nullable=False)
+    conjure_date = Column(TIMESTAMP, nullable=False, index=True, server_default=text("'0000-00-00 00:00:00'"))
+    labware_state = Column(String(20, 'utf8_unicode_ci'), nullable=False, index=True)
+    slot_uuid = Column(String(36, 'utf8_unicode_ci'), nullable=False, unique=True)
+    fate = Column(String(40, 'utf8_unicode_ci'))
+    project = Column(String(50, 'utf8_unicode_ci'), index=True)
+
+    def __init__(self, **kwargs):
+        """Constructs a new CgapConjuredLabware.
+
+        Parameters
+        ----------
+        cgap_conjured_labware_tmp: Internal to this database id. Value can change.
+        barcode
+        cell_line_long_name
+        cell_line_uuid
+        passage_number
+        conjure_date
+        labware_state
+        slot_uuid
+        fate
+        project
+        """
+        super().__init__(**kwargs)
+
+
+class CgapDestruction(Base):
+    __tablename__ = 'cgap_destruction'
+
+    cgap_destruction_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='Internal to this database. Value can change.', doc='Internal to this database. Value can change.')
+    barcode = Column(String(32, 'utf8_unicode_ci'), nullable=False, index=True)
+    cell_line_long_name = Column(String(48, 'utf8_unicode_ci'), nullable=False, index=True)
+    destroyed = Column(TIMESTAMP, nullable=False, index=True, server_default=text("'0000-00-00 00:00:00'"))
+    cell_state = Column(String(40, 'utf8_unicode_ci'), nullable=False)
+    project = Column(String(50, 'utf8_unicode_ci'), index=True)
+
+    def __init__(self, **kwargs):
+        """Constructs a new CgapDestruction.
+
+        Parameters
+        ----------
+        cgap_destruction_tmp: Internal to this database. Value can change.
+        barcode
+        cell_line_long_name
+        destroyed
+        cell_state
+        project
+        """
+        super().__init__(**kwargs)
+
+
+class CgapHeron(Base):
+    __tablename__ = 'cgap_heron'
+    __table_args__ = (
+        Index('cgap_heron_destination_wrangled', 'destination', 'wrangled'),
+        Index('cgap_heron_rack_and_position', 'container_barcode', 'position', unique=True)
+    )
+
+    cgap_heron_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='Internal to this database id. Value can change.', doc='Internal to this database id. Value can change.')
+    container_barcode = Column(String(32, 'utf8_unicode_ci'), nullable=False)
+    supplier_sample_id = Column(String(64, 'utf8_unicode_ci'), nullable=False, index=True)
+    position = Column(String(8, 'utf8_unicode_ci'), nullable=False)
+    sample_type = Column(String(32, 'utf8_unicode_ci'), nullable=False)
+    release_time = Column(TIMESTAMP, nullable=False, index=True, server_default=text("'0000-00-00 00:00:00'"))
+    study = Column(String(32, 'utf8_unicode_ci'), nullable=False, index=True)
+    destination = Column(String(32, 'utf8_unicode_ci'), nullable=False)
+    sample_state = Column(String(32, 'utf8_unicode_ci'), nullable=False)
+    tube_barcode = Column(String(32, 'utf8_unicode_ci'), unique=True)
+    wrangled = Column(TIMESTAMP)
+    lysis_buffer = Column(String(64, 'utf8_unicode_ci'))
+    priority = Column(mysqlTINYINT(4))
+    sample_identifier = Column(String(64, 'utf8_unicode_ci'), index=True, comment='The COG-UK barcode of a sample or the mixtio barcode of a control', doc='The COG-UK barcode of a sample or the mixtio barcode of a control')
+    control_type = Column(mysqlENUM('Positive', 'Negative', collation='utf8_unicode_ci'))
+    control_accession_number = Column(String(32, 'utf8_unicode_ci'))
+
+    def __init__(self, **kwargs):
+        """Constructs a new CgapHeron.
+
+        Parameters
+        ----------
+        cgap_heron_tmp: Internal to this database id. Value can change.
+        container_barcode
+        supplier_sample_id
+        position
+        sample_type
+        release_time
+        study
+        destination
+        sample_state
+        tube_barcode
+        wrangled
+        lysis_buffer
+        priority
+        sample_identifier: The COG-UK barcode of a sample or the mixtio barcode of a control
+        control_type
+        control_accession_number
+        """
+        super().__init__(**kwargs)
+
+
+class CgapLineIdentifier(Base):
+    __tablename__ = 'cgap_line_identifier'
+
+    cgap_line_identifier_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='Internal to this database id. Value can change.', doc='Internal to this database id. Value can change.')
+    line_uuid = Column(String(36, 'utf8_unicode_ci'), nullable=False, unique=True)
+    friendly_name = Column(String(48, 'utf8_unicode_ci'), nullable=False, index=True)
+    biomaterial_uuid = Column(String(36, 'utf8_unicode_ci'), nullable=False, index=True)
+    accession_number = Column(String(38, 'utf8_unicode_ci'))
+    direct_parent_uuid = Column(String(36, 'utf8_unicode_ci'), index=True)
+    project = Column(String(50, 'utf8_unicode_ci'))
+
+    def __init__(self, **kwargs):
+        """Constructs a new CgapLineIdentifier.
+
+        Parameters
+        ----------
+        cgap_line_identifier_tmp: Internal to this database id. Value can change.
+        line_uuid
+        friendly_name
+        biomaterial_uuid
+        accession_number
+        direct_parent_uuid
+        project
+        """
+        super().__init__(**kwargs)
+
+
+class CgapOrganoidsConjuredLabware(Base):
+    __tablename__ = 'cgap_organoids_conjured_labware'
+
+    cgap_organoids_conjured_labware_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='Internal to this database id. Value can change.', doc='Internal to this database id. Value can change.')
+    barcode = Column(String(20, 'utf8_unicode_ci'), nullable=False, index=True)
+    cell_line_long_name = Column(String(48, 'utf8_unicode_ci'), nullable=False, index=True)
+    cell_line_uuid = Column(String(38, 'utf8_unicode_ci'), nullable=False, index=True)
+    passage_number = Column(mysqlINTEGER(2), nullable=False)
+    conjure_date = Column(TIMESTAMP, nullable=False, index=True, server_default=text("'0000-00-00 00:00:00'"))
+    labware_state = Column(String(20, 'utf8_unicode_ci'), nullable=False, index=True)
+    fate = Column(String(40, 'utf8_unicode_ci'))
+
+    def __init__(self, **kwargs):
+        """Constructs a new CgapOrganoidsConjuredLabware.
+
+        Parameters
+        ----------
+        cgap_organoids_conjured_labware_tmp: Internal to this database id. Value can change.
+        barcode
+        cell_line_long_name
+        cell_line_uuid
+        passage_number
+        conjure_date
+        labware_state
+        fate
+        """
+        super().__init__(**kwargs)
+
+
+class CgapRelease(Base):
+    __tablename__ = 'cgap_release'
+
+    cgap_release_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='Internal to this database id. Value can change.', doc='Internal to this database id. Value can change.')
+    barcode = Column(String(20, 'utf8_unicode_ci'), nullable=False, index=True)
+    cell_line_long_name = Column(String(48, 'utf8_unicode_ci'), nullable=False, index=True)
+    cell_line_uuid = Column(String(38, 'utf8_unicode_ci'), nullable=False, index=True)
+    goal = Column(String(64, 'utf8_unicode_ci'), nullable=False)
+    jobs = Column(String(64, 'utf8_unicode_ci'), nullable=False)
+    user = Column(String(6, 'utf8_unicode_ci'), nullable=False)
+    release_date = Column(TIMESTAMP, nullable=False, server_default=text("'0000-00-00 00:00:00'"))
+    cell_state = Column(String(40, 'utf8_unicode_ci'), nullable=False)
+    passage_number = Column(mysqlINTEGER(2), nullable=False)
+    destination = Column(String(64, 'utf8_unicode_ci'))
+    fate = Column(String(40, 'utf8_unicode_ci'))
+    project = Column(String(50, 'utf8_unicode_ci'), index=True)
+
+    def __init__(self, **kwargs):
+        """Constructs a new CgapRelease.
+
+        Parameters
+        ----------
+        cgap_release_tmp: Internal to this database id. Value can change.
+        barcode
+        cell_line_long_name
+        cell_line_uuid
+        goal
+        jobs
+        user
+        release_date
+        cell_state
+        passage_number
+        destination
+        fate
+        project
+        """
+        super().__init__(**kwargs)
+
+
+class CgapSupplierBarcode(Base):
+    __tablename__ = 'cgap_supplier_barcode'
+
+    cgap_supplier_barcode_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='Internal to this database id. Value can change.', doc='Internal to this database id. Value can change.')
+    biomaterial_uuid = Column(String(36, 'utf8_unicode_ci'), nullable=False, index=True)
+    supplier_barcode = Column(String(20, 'utf8_unicode_ci'), nullable=False, unique=True)
+    date = Column(TIMESTAMP, nullable=False, server_default=text("'0000-00-00 00:00:00'"))
+
+    def __init__(self, **kwargs):
+        """Constructs a new CgapSupplierBarcode.
+
+        Parameters
+        ----------
+        cgap_supplier_barcode_tmp: Internal to this database id. Value can change.
+        biomaterial_uuid
+        supplier_barcode
+        date
+        """
+        super().__init__(**kwargs)
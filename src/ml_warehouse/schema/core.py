@@ -0,0 +1,666 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# @author mgcam <mg8@sanger.ac.uk>
+
+from sqlalchemy import CHAR, Column, Computed, DECIMAL, Date, DateTime, Enum, Float, ForeignKey, ForeignKeyConstraint, Index, String, TIMESTAMP, Table, Text, text
+from sqlalchemy.dialects.mysql import BIGINT as mysqlBIGINT, CHAR as mysqlCHAR, DATETIME as mysqlDATETIME, DOUBLE as mysqlDOUBLE, ENUM as mysqlENUM, FLOAT as mysqlFLOAT, INTEGER as mysqlINTEGER, SMALLINT as mysqlSMALLINT, TINYINT as mysqlTINYINT, VARCHAR as mysqlVARCHAR
+from sqlalchemy.orm import declarative_base, relationship
+
+from ml_warehouse.schema import Base, metadata
+
+
+class ArInternalMetadata(Base):
+    __tablename__ = 'ar_internal_metadata'
+
+    key = Column(String(255), primary_key=True)
+    created_at = Column(mysqlDATETIME(fsp=6), nullable=False)
+    updated_at = Column(mysqlDATETIME(fsp=6), nullable=False)
+    value = Column(String(255))
+
+    def __init__(self, **kwargs):
+        """Constructs a new ArInternalMetadata.
+
+        Parameters
+        ----------
+        key
+        created_at
+        updated_at
+        value
+        """
+        super().__init__(**kwargs)
+
+
+class LongReadQcResult(Base):
+    __tablename__ = 'long_read_qc_result'
+
+    id_long_read_qc_result_tmp = Column(mysqlBIGINT(20), primary_key=True)
+    labware_barcode = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='Barcode of the labware that was the source for the QC tests.', doc='Barcode of the labware that was the source for the QC tests.')
+    sample_id = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='External identifier for the sample(s).', doc='External identifier for the sample(s).')
+    assay_type = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='Type of the QC test.', doc='Type of the QC test.')
+    assay_type_key = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='Unique identifier of the QC test.', doc='Unique identifier of the QC test.')
+    value = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='QC result value', doc='QC result value')
+    units = Column(String(255, 'utf8_unicode_ci'), comment='Unit of the value for example mg,ng etc', doc='Unit of the value for example mg,ng etc')
+    id_lims = Column(String(255, 'utf8_unicode_ci'), comment='Identifier of the LIMS where QC was published from', doc='Identifier of the LIMS where QC was published from')
+    id_long_read_qc_result_lims = Column(String(255, 'utf8_unicode_ci'), comment='LIMS specific id for QC result', doc='LIMS specific id for QC result')
+    created = Column(DateTime, comment='The date the qc_result was first created in LIMS', doc='The date the qc_result was first created in LIMS')
+    last_updated = Column(DateTime, comment='The date the qc_result was last updated in LIMS.', doc='The date the qc_result was last updated in LIMS.')
+    recorded_at = Column(DateTime, comment='Timestamp of the latest warehouse update.', doc='Timestamp of the latest warehouse update.')
+    qc_status = Column(String(255, 'utf8_unicode_ci'), comment='Status of the QC decision eg pass, fail etc', doc='Status of the QC decision eg pass, fail etc')
+    qc_status_decision_by = Column(String(255, 'utf8_unicode_ci'), comment='Who made the QC status decision eg ToL, Long Read', doc='Who made the QC status decision eg ToL, Long Read')
+
+    def __init__(self, **kwargs):
+        """Constructs a new LongReadQcResult.
+
+        Parameters
+        ----------
+        id_long_read_qc_result_tmp
+        labware_barcode: Barcode of the labware that was the source for the QC tests.
+        sample_id: External identifier for the sample(s).
+        assay_type: Type of the QC test.
+        assay_type_key: Unique identifier of the QC test.
+        value: QC result value
+        units: Unit of the value for example mg,ng etc
+        id_lims: Identifier of the LIMS where QC was published from
+        id_long_read_qc_result_lims: LIMS specific id for QC result
+        created: The date the qc_result was first created in LIMS
+        last_updated: The date the qc_result was last updated in LIMS.
+        recorded_at: Timestamp of the latest warehouse update.
+        qc_status: Status of the QC decision eg pass, fail etc
+        qc_status_decision_by: Who made the QC status decision eg ToL, Long Read
+        """
+        super().__init__(**kwargs)
+
+
+class PsdSampleCompoundsComponents(Base):
+    __tablename__ = 'psd_sample_compounds_components'
+    __table_args__ = {'comment': 'A join table owned by PSD to associate compound samples with '
+                'their component samples.'}
+
+    id = Column(mysqlBIGINT(20), primary_key=True)
+    compound_id_sample_tmp = Column(mysqlINTEGER(11), nullable=False, comment='The warehouse ID of the compound sample in the association.', doc='The warehouse ID of the compound sample in the association.')
+    component_id_sample_tmp = Column(mysqlINTEGER(11), nullable=False, comment='The warehouse ID of the component sample in the association.', doc='The warehouse ID of the component sample in the association.')
+    last_updated = Column(DateTime, nullable=False, comment='Timestamp of last update.', doc='Timestamp of last update.')
+    recorded_at = Column(DateTime, nullable=False, comment='Timestamp of warehouse update.', doc='Timestamp of warehouse update.')
+
+    def __init__(self, **kwargs):
+        """Constructs a new PsdSampleCompoundsComponents.
+
+        Parameters
+        ----------
+        id
+        compound_id_sample_tmp: The warehouse ID of the compound sample in the association.
+        component_id_sample_tmp: The warehouse ID of the component sample in the association.
+        last_updated: Timestamp of last update.
+        recorded_at: Timestamp of warehouse update.
+        """
+        super().__init__(**kwargs)
+
+
+class Sample(Base):
+    __tablename__ = 'sample'
+    __table_args__ = (
+        Index('index_sample_on_id_sample_lims_and_id_lims', 'id_sample_lims', 'id_lims', unique=True),
+    )
+
+    id_sample_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='Internal to this database id, value can change', doc='Internal to this database id, value can change')
+    id_lims = Column(String(10, 'utf8_unicode_ci'), nullable=False, comment='LIM system identifier, e.g. CLARITY-GCLP, SEQSCAPE', doc='LIM system identifier, e.g. CLARITY-GCLP, SEQSCAPE')
+    id_sample_lims = Column(String(20, 'utf8_unicode_ci'), nullable=False, comment='LIMS-specific sample identifier', doc='LIMS-specific sample identifier')
+    last_updated = Column(DateTime, nullable=False, comment='Timestamp of last update', doc='Timestamp of last update')
+    recorded_at = Column(DateTime, nullable=False, comment='Timestamp of warehouse update', doc='Timestamp of warehouse update')
+    consent_withdrawn = Column(mysqlTINYINT(1), nullable=False, server_default=text("'0'"))
+    uuid_sample_lims = Column(String(36, 'utf8_unicode_ci'), unique=True, comment='LIMS-specific sample uuid', doc='LIMS-specific sample uuid')
+    deleted_at = Column(DateTime, comment='Timestamp of sample deletion', doc='Timestamp of sample deletion')
+    created = Column(DateTime, comment='Timestamp of sample creation', doc='Timestamp of sample creation')
+    name = Column(String(255, 'utf8_unicode_ci'), index=True)
+    reference_genome = Column(String(255, 'utf8_unicode_ci'))
+    organism = Column(String(255, 'utf8_unicode_ci'))
+    accession_number = Column(String(50, 'utf8_unicode_ci'), index=True)
+    common_name = Column(String(255, 'utf8_unicode_ci'))
+    description = Column(Text(collation='utf8_unicode_ci'))
+    taxon_id = Column(mysqlINTEGER(6, unsigned=True))
+    father = Column(String(255, 'utf8_unicode_ci'))
+    mother = Column(String(255, 'utf8_unicode_ci'))
+    replicate = Column(String(255, 'utf8_unicode_ci'))
+    ethnicity = Column(String(255, 'utf8_unicode_ci'))
+    gender = Column(String(20, 'utf8_unicode_ci'))
+    cohort = Column(String(255, 'utf8_unicode_ci'))
+    country_of_origin = Column(String(255, 'utf8_unicode_ci'))
+    geographical_region = Column(String(255, 'utf8_unicode_ci'))
+    sanger_sample_id = Column(String(255, 'utf8_unicode_ci'), index=True)
+    control = Column(mysqlTINYINT(1))
+    supplier_name = Column(String(255, 'utf8_unicode_ci'), index=True)
+    public_name = Column(String(255, 'utf8_unicode_ci'))
+    sample_visibility = Column(String(255, 'utf8_unicode_ci'))
+    strain = Column(String(255, 'utf8_unicode_ci'))
+    donor_id = Column(String(255, 'utf8_unicode_ci'))
+    phenotype = Column(String(255, 'utf8_unicode_ci'), comment='The phenotype of the sample as described in Sequencescape', doc='The phenotype of the sample as described in Sequencescape')
+    developmental_stage = Column(String(255, 'utf8_unicode_ci'), comment='Developmental Stage', doc='Developmental Stage')
+    control_type = Column(String(255, 'utf8_unicode_ci'))
+    sibling = Column(String(255, 'utf8_unicode_ci'))
+    is_resubmitted = Column(mysqlTINYINT(1))
+    date_of_sample_collection = Column(String(255, 'utf8_unicode_ci'))
+    date_of_sample_extraction = Column(String(255, 'utf8_unicode_ci'))
+    extraction_method = Column(String(255, 'utf8_unicode_ci'))
+    purified = Column(String(255, 'utf8_unicode_ci'))
+    purification_method = Column(String(255, 'utf8_unicode_ci'))
+    customer_measured_concentration = Column(String(255, 'utf8_unicode_ci'))
+    concentration_determined_by = Column(String(255, 'utf8_unicode_ci'))
+    sample_type = Column(String(255, 'utf8_unicode_ci'))
+    storage_conditions = Column(String(255, 'utf8_unicode_ci'))
+    genotype = Column(String(255, 'utf8_unicode_ci'))
+    age = Column(String(255, 'utf8_unicode_ci'))
+    cell_type = Column(String(255, 'utf8_unicode_ci'))
+    disease_state = Column(String(255, 'utf8_unicode_ci'))
+    compound = Column(String(255, 'utf8_unicode_ci'))
+    dose = Column(String(255, 'utf8_unicode_ci'))
+    immunoprecipitate = Column(String(255, 'utf8_unicode_ci'))
+    growth_condition = Column(String(255, 'utf8_unicode_ci'))
+    organism_part = Column(String(255, 'utf8_unicode_ci'))
+    time_point = Column(String(255, 'utf8_unicode_ci'))
+    disease = Column(String(255, 'utf8_unicode_ci'))
+    subject = Column(String(255, 'utf8_unicode_ci'))
+    treatment = Column(String(255, 'utf8_unicode_ci'))
+    date_of_consent_withdrawn = Column(DateTime)
+    marked_as_consent_withdrawn_by = Column(String(255, 'utf8_unicode_ci'))
+    customer_measured_volume = Column(String(255, 'utf8_unicode_ci'))
+    gc_content = Column(String(255, 'utf8_unicode_ci'))
+    dna_source = Column(String(255, 'utf8_unicode_ci'))
+
+    bmap_flowcell = relationship('BmapFlowcell', back_populates='sample')
+    flgen_plate = relationship('FlgenPlate', back_populates='sample')
+    gsu_sample_uploads = relationship('GsuSampleUploads', back_populates='sample')
+    iseq_flowcell = relationship('IseqFlowcell', back_populates='sample')
+    oseq_flowcell = relationship('OseqFlowcell', back_populates='sample')
+    pac_bio_run = relationship('PacBioRun', back_populates='sample')
+    qc_result = relationship('QcResult', back_populates='sample')
+    samples_extraction_activity = relationship('SamplesExtractionActivity', back_populates='sample')
+    stock_resource = relationship('StockResource', back_populates='sample')
+    tol_sample_bioproject = relationship('TolSampleBioproject', back_populates='sample')
+
+    def __init__(self, **kwargs):
+        """Constructs a new Sample.
+
+        Parameters
+        ----------
+        id_sample_tmp: Internal to this database id, value can change
+        id_lims: LIM system identifier, e.g. CLARITY-GCLP, SEQSCAPE
+        id_sample_lims: LIMS-specific sample identifier
+        last_updated: Timestamp of last update
+        recorded_at: Timestamp of warehouse update
+        consent_withdrawn
+        uuid_sample_lims: LIMS-specific sample uuid
+        deleted_at: Timestamp of sample deletion
+        created: Timestamp of sample creation
+        name
+        reference_genome
+        organism
+        accession_number
+        common_name
+        description
+        taxon_id
+        father
+        mother
+        replicate
+        ethnicity
+        gender
+        cohort
+        country_of_origin
+        geographical_region
+        sanger_sample_id
+        control
+        supplier_name
+        public_name
+        sample_visibility
+        strain
+        donor_id
+        phenotype: The phenotype of the sample as described in Sequencescape
+        developmental_stage: Developmental Stage
+        control_type
+        sibling
+        is_resubmitted
+        date_of_sample_collection
+        date_of_sample_extraction
+        extraction_method
+        purified
+        purification_method
+        customer_measured_concentration
+        concentration_determined_by
+        sample_type
+        storage_conditions
+        genotype
+        age
+        cell_type
+        disease_state
+        compound
+        dose
+        immunoprecipitate
+        growth_condition
+        organism_part
+        time_point
+        disease
+        subject
+        treatment
+        date_of_consent_withdrawn
+        marked_as_consent_withdrawn_by
+        customer_measured_volume
+        gc_content
+        dna_source
+        """
+        super().__init__(**kwargs)
+
+
+t_schema_migrations = Table(
+    'schema_migrations', metadata,
+    Column('version', String(255, 'utf8_unicode_ci'), nullable=False, unique=True)
+)
+
+
+class SeqProductIrodsLocations(Base):
+    __tablename__ = 'seq_product_irods_locations'
+    __table_args__ = (
+        Index('pi_root_product', 'irods_root_collection', 'id_product', unique=True),
+        {'comment': 'Table relating products to their irods locations'}
+    )
+
+    id_seq_product_irods_locations_tmp = Column(mysqlBIGINT(20, unsigned=True), primary_key=True, comment='Internal to this database id, value can change', doc='Internal to this database id, value can change')
+    id_product = Column(mysqlVARCHAR(64, charset='utf8', collation='utf8_unicode_ci'), nullable=False, index=True, comment='A sequencing platform specific product id. For Illumina, data corresponds to the id_iseq_product column in the iseq_product_metrics table', doc='A sequencing platform specific product id. For Illumina, data corresponds to the id_iseq_product column in the iseq_product_metrics table')
+    seq_platform_name = Column(Enum('Illumina', 'PacBio', 'ONT'), nullable=False, index=True, comment='Name of the sequencing platform used to produce raw data', doc='Name of the sequencing platform used to produce raw data')
+    pipeline_name = Column(String(32), nullable=False, index=True, comment='The name of the pipeline used to produce the data, values are: npg-prod, npg-prod-alt-process, cellranger, spaceranger, ncov2019-artic-nf', doc='The name of the pipeline used to produce the data, values are: npg-prod, npg-prod-alt-process, cellranger, spaceranger, ncov2019-artic-nf')
+    irods_root_collection = Column(String(255), nullable=False, comment='Path to the product root collection in iRODS', doc='Path to the product root collection in iRODS')
+    created = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'), comment='Datetime this record was created', doc='Datetime this record was created')
+    last_changed = Column(DateTime, server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'), comment='Datetime this record was created or changed', doc='Datetime this record was created or changed')
+    irods_data_relative_path = Column(String(255), comment='The path, relative to the root collection, to the most used data location', doc='The path, relative to the root collection, to the most used data location')
+    irods_secondary_data_relative_path = Column(String(255), comment='The path, relative to the root collection, to a useful data location', doc='The path, relative to the root collection, to a useful data location')
+
+    def __init__(self, **kwargs):
+        """Constructs a new SeqProductIrodsLocations.
+
+        Parameters
+        ----------
+        id_seq_product_irods_locations_tmp: Internal to this database id, value can change
+        id_product: A sequencing platform specific product id. For Illumina, data corresponds to the id_iseq_product column in the iseq_product_metrics table
+        seq_platform_name: Name of the sequencing platform used to produce raw data
+        pipeline_name: The name of the pipeline used to produce the data, values are: npg-prod, npg-prod-alt-process, cellranger, spaceranger, ncov2019-artic-nf
+        irods_root_collection: Path to the product root collection in iRODS
+        created: Datetime this record was created
+        last_changed: Datetime this record was created or changed
+        irods_data_relative_path: The path, relative to the root collection, to the most used data location
+        irods_secondary_data_relative_path: The path, relative to the root collection, to a useful data location
+        """
+        super().__init__(**kwargs)
+
+
+class Study(Base):
+    __tablename__ = 'study'
+    __table_args__ = (
+        Index('study_id_lims_id_study_lims_index', 'id_lims', 'id_study_lims', unique=True),
+    )
+
+    id_study_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='Internal to this database id, value can change', doc='Internal to this database id, value can change')
+    id_lims = Column(String(10, 'utf8_unicode_ci'), nullable=False, comment='LIM system identifier, e.g. GCLP-CLARITY, SEQSCAPE', doc='LIM system identifier, e.g. GCLP-CLARITY, SEQSCAPE')
+    id_study_lims = Column(String(20, 'utf8_unicode_ci'), nullable=False, comment='LIMS-specific study identifier', doc='LIMS-specific study identifier')
+    last_updated = Column(DateTime, nullable=False, comment='Timestamp of last update', doc='Timestamp of last update')
+    recorded_at = Column(DateTime, nullable=False, comment='Timestamp of warehouse update', doc='Timestamp of warehouse update')
+    remove_x_and_autosomes = Column(mysqlTINYINT(1), nullable=False, server_default=text("'0'"))
+    aligned = Column(mysqlTINYINT(1), nullable=False, server_default=text("'1'"))
+    separate_y_chromosome_data = Column(mysqlTINYINT(1), nullable=False, server_default=text("'0'"))
+    uuid_study_lims = Column(String(36, 'utf8_unicode_ci'), unique=True, comment='LIMS-specific study uuid', doc='LIMS-specific study uuid')
+    deleted_at = Column(DateTime, comment='Timestamp of study deletion', doc='Timestamp of study deletion')
+    created = Column(DateTime, comment='Timestamp of study creation', doc='Timestamp of study creation')
+    name = Column(String(255, 'utf8_unicode_ci'), index=True)
+    reference_genome = Column(String(255, 'utf8_unicode_ci'))
+    ethically_approved = Column(mysqlTINYINT(1))
+    faculty_sponsor = Column(String(255, 'utf8_unicode_ci'))
+    state = Column(String(50, 'utf8_unicode_ci'))
+    study_type = Column(String(50, 'utf8_unicode_ci'))
+    abstract = Column(Text(collation='utf8_unicode_ci'))
+    abbreviation = Column(String(255, 'utf8_unicode_ci'))
+    accession_number = Column(String(50, 'utf8_unicode_ci'), index=True)
+    description = Column(Text(collation='utf8_unicode_ci'))
+    contains_human_dna = Column(mysqlTINYINT(1), comment='Lane may contain human DNA', doc='Lane may contain human DNA')
+    contaminated_human_dna = Column(mysqlTINYINT(1), comment='Human DNA in the lane is a contaminant and should be removed', doc='Human DNA in the lane is a contaminant and should be removed')
+    data_release_strategy = Column(String(255, 'utf8_unicode_ci'))
+    data_release_sort_of_study = Column(String(255, 'utf8_unicode_ci'))
+    ena_project_id = Column(String(255, 'utf8_unicode_ci'))
+    study_title = Column(String(255, 'utf8_unicode_ci'))
+    study_visibility = Column(String(255, 'utf8_unicode_ci'))
+    ega_dac_accession_number = Column(String(255, 'utf8_unicode_ci'))
+    array_express_accession_number = Column(String(255, 'utf8_unicode_ci'))
+    ega_policy_accession_number = Column(String(255, 'utf8_unicode_ci'))
+    data_release_timing = Column(String(255, 'utf8_unicode_ci'))
+    data_release_delay_period = Column(String(255, 'utf8_unicode_ci'))
+    data_release_delay_reason = Column(String(255, 'utf8_unicode_ci'))
+    data_access_group = Column(String(255, 'utf8_unicode_ci'))
+    prelim_id = Column(String(20, 'utf8_unicode_ci'), comment='The preliminary study id prior to entry into the LIMS', doc='The preliminary study id prior to entry into the LIMS')
+    hmdmc_number = Column(String(255, 'utf8_unicode_ci'), comment='The Human Materials and Data Management Committee approval number(s) for the study.', doc='The Human Materials and Data Management Committee approval number(s) for the study.')
+    data_destination = Column(String(255, 'utf8_unicode_ci'), comment="The data destination type(s) for the study. It could be 'standard', '14mg' or 'gseq'. This may be extended, if Sanger gains more external customers. It can contain multiply destinations separated by a space.", doc="The data destination type(s) for the study. It could be 'standard', '14mg' or 'gseq'. This may be extended, if Sanger gains more external customers. It can contain multiply destinations separated by a space.")
+    s3_email_list = Column(String(255, 'utf8_unicode_ci'))
+    data_deletion_period = Column(String(255, 'utf8_unicode_ci'))
+
+    bmap_flowcell = relationship('BmapFlowcell', back_populates='study')
+    flgen_plate = relationship('FlgenPlate', back_populates='study')
+    gsu_sample_uploads = relationship('GsuSampleUploads', back_populates='study')
+    iseq_flowcell = relationship('IseqFlowcell', back_populates='study')
+    oseq_flowcell = relationship('OseqFlowcell', back_populates='study')
+    pac_bio_run = relationship('PacBioRun', back_populates='study')
+    stock_resource = relationship('StockResource', back_populates='study')
+    study_users = relationship('StudyUsers', back_populates='study')
+
+    def __init__(self, **kwargs):
+        """Constructs a new Study.
+
+        Parameters
+        ----------
+        id_study_tmp: Internal to this database id, value can change
+        id_lims: LIM system identifier, e.g. GCLP-CLARITY, SEQSCAPE
+        id_study_lims: LIMS-specific study identifier
+        last_updated: Timestamp of last update
+        recorded_at: Timestamp of warehouse update
+        remove_x_and_autosomes
+        aligned
+        separate_y_chromosome_data
+        uuid_study_lims: LIMS-specific study uuid
+        deleted_at: Timestamp of study deletion
+        created: Timestamp of study creation
+        name
+        reference_genome
+        ethically_approved
+        faculty_sponsor
+        state
+        study_type
+        abstract
+        abbreviation
+        accession_number
+        description
+        contains_human_dna: Lane may contain human DNA
+        contaminated_human_dna: Human DNA in the lane is a contaminant and should be removed
+        data_release_strategy
+        data_release_sort_of_study
+        ena_project_id
+        study_title
+        study_visibility
+        ega_dac_accession_number
+        array_express_accession_number
+        ega_policy_accession_number
+        data_release_timing
+        data_release_delay_period
+        data_release_delay_reason
+        data_access_group
+        prelim_id: The preliminary study id prior to entry into the LIMS
+        hmdmc_number: The Human Materials and Data Management Committee approval number(s) for the study.
+        data_destination: The data destination type(s) for the study. It could be 'standard', '14mg' or 'gseq'. This may be extended, if Sanger gains more external customers. It can contain multiply destinations separated by a space.
+        s3_email_list
+        data_deletion_period
+        """
+        super().__init__(**kwargs)
+
+
+class GsuSampleUploads(Base):
+    __tablename__ = 'gsu_sample_uploads'
+
+    id_gsu_sample_upload_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='Row ID', doc='Row ID')
+    file_path = Column(String(255, 'utf8_unicode_ci'), nullable=False, unique=True, comment='Location of data file', doc='Location of data file')
+    id_study_tmp = Column(ForeignKey('study.id_study_tmp'), nullable=False, index=True, comment='Study for this item', doc='Study for this item')
+    id_sample_tmp = Column(ForeignKey('sample.id_sample_tmp'), nullable=False, index=True, comment='Sample info for this item', doc='Sample info for this item')
+    library_name = Column(String(40, 'utf8_unicode_ci'), nullable=False, comment='Supplier library name', doc='Supplier library name')
+    library_type = Column(String(40, 'utf8_unicode_ci'), nullable=False, comment='Library type', doc='Library type')
+    instrument_model = Column(String(40, 'utf8_unicode_ci'), nullable=False, comment='Sequencing machine used', doc='Sequencing machine used')
+    lab_name = Column(String(100, 'utf8_unicode_ci'), nullable=False, comment='Lab supplying the data', doc='Lab supplying the data')
+    created = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'), comment='Datetime this record was created', doc='Datetime this record was created')
+    last_changed = Column(DateTime, server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'), comment='Datetime this record was last updated', doc='Datetime this record was last updated')
+    run_accession = Column(String(40, 'utf8_unicode_ci'), unique=True, comment='ENA run accession, populated on ENA submission', doc='ENA run accession, populated on ENA submission')
+
+    sample = relationship('Sample', back_populates='gsu_sample_uploads')
+    study = relationship('Study', back_populates='gsu_sample_uploads')
+
+    def __init__(self, **kwargs):
+        """Constructs a new GsuSampleUploads.
+
+        Parameters
+        ----------
+        id_gsu_sample_upload_tmp: Row ID
+        file_path: Location of data file
+        id_study_tmp: Study for this item
+        id_sample_tmp: Sample info for this item
+        library_name: Supplier library name
+        library_type: Library type
+        instrument_model: Sequencing machine used
+        lab_name: Lab supplying the data
+        created: Datetime this record was created
+        last_changed: Datetime this record was last updated
+        run_accession: ENA run accession, populated on ENA submission
+        """
+        super().__init__(**kwargs)
+
+
+class QcResult(Base):
+    __tablename__ = 'qc_result'
+    __table_args__ = (
+        Index('lookup_index', 'id_qc_result_lims', 'id_lims'),
+    )
+
+    id_qc_result_tmp = Column(mysqlINTEGER(11), primary_key=True)
+    id_sample_tmp = Column(ForeignKey('sample.id_sample_tmp'), nullable=False, index=True)
+    id_qc_result_lims = Column(String(20), nullable=False, comment='LIMS-specific qc_result identifier', doc='LIMS-specific qc_result identifier')
+    id_lims = Column(String(10), nullable=False, comment='LIMS system identifier (e.g. SEQUENCESCAPE)', doc='LIMS system identifier (e.g. SEQUENCESCAPE)')
+    value = Column(String(255), nullable=False, comment='Value of the mesurement', doc='Value of the mesurement')
+    units = Column(String(255), nullable=False, comment='Mesurement unit', doc='Mesurement unit')
+    qc_type = Column(String(255), nullable=False, comment='Type of mesurement', doc='Type of mesurement')
+    date_created = Column(DateTime, nullable=False, comment='The date the qc_result was first created in SS', doc='The date the qc_result was first created in SS')
+    last_updated = Column(DateTime, nullable=False, comment='The date the qc_result was last updated in SS', doc='The date the qc_result was last updated in SS')
+    recorded_at = Column(DateTime, nullable=False, comment='Timestamp of warehouse update', doc='Timestamp of warehouse update')
+    id_pool_lims = Column(String(255), comment='Most specific LIMs identifier associated with the pool. (Asset external_identifier in SS)', doc='Most specific LIMs identifier associated with the pool. (Asset external_identifier in SS)')
+    id_library_lims = Column(String(255), index=True, comment='Earliest LIMs identifier associated with library creation. (Aliquot external_identifier in SS)', doc='Earliest LIMs identifier associated with library creation. (Aliquot external_identifier in SS)')
+    labware_purpose = Column(String(255), comment='Labware Purpose name. (e.g. Plate Purpose for a Well)', doc='Labware Purpose name. (e.g. Plate Purpose for a Well)')
+    assay = Column(String(255), comment='assay type and version', doc='assay type and version')
+    cv = Column(Float, comment='Coefficient of variance', doc='Coefficient of variance')
+
+    sample = relationship('Sample', back_populates='qc_result')
+
+    def __init__(self, **kwargs):
+        """Constructs a new QcResult.
+
+        Parameters
+        ----------
+        id_qc_result_tmp
+        id_sample_tmp
+        id_qc_result_lims: LIMS-specific qc_result identifier
+        id_lims: LIMS system identifier (e.g. SEQUENCESCAPE)
+        value: Value of the mesurement
+        units: Mesurement unit
+        qc_type: Type of mesurement
+        date_created: The date the qc_result was first created in SS
+        last_updated: The date the qc_result was last updated in SS
+        recorded_at: Timestamp of warehouse update
+        id_pool_lims: Most specific LIMs identifier associated with the pool. (Asset external_identifier in SS)
+        id_library_lims: Earliest LIMs identifier associated with library creation. (Aliquot external_identifier in SS)
+        labware_purpose: Labware Purpose name. (e.g. Plate Purpose for a Well)
+        assay: assay type and version
+        cv: Coefficient of variance
+        """
+        super().__init__(**kwargs)
+
+
+class SamplesExtractionActivity(Base):
+    __tablename__ = 'samples_extraction_activity'
+
+    id_activity_tmp = Column(mysqlINTEGER(11), primary_key=True)
+    id_activity_lims = Column(String(255, 'utf8_unicode_ci'), nullable=False, index=True, comment='LIMs-specific activity id', doc='LIMs-specific activity id')
+    id_sample_tmp = Column(ForeignKey('sample.id_sample_tmp'), nullable=False, index=True, comment='Sample id, see "sample.id_sample_tmp"', doc='Sample id, see "sample.id_sample_tmp"')
+    activity_type = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='The type of the activity performed', doc='The type of the activity performed')
+    instrument = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='The name of the instrument used to perform the activity', doc='The name of the instrument used to perform the activity')
+    kit_barcode = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='The barcode of the kit used to perform the activity', doc='The barcode of the kit used to perform the activity')
+    kit_type = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='The type of kit used to perform the activity', doc='The type of kit used to perform the activity')
+    input_barcode = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='The barcode of the labware (eg. plate or tube) at the begining of the activity', doc='The barcode of the labware (eg. plate or tube) at the begining of the activity')
+    output_barcode = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='The barcode of the labware (eg. plate or tube)  at the end of the activity', doc='The barcode of the labware (eg. plate or tube)  at the end of the activity')
+    user = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='The name of the user who was most recently associated with the activity', doc='The name of the user who was most recently associated with the activity')
+    last_updated = Column(DateTime, nullable=False, comment='Timestamp of last change to activity', doc='Timestamp of last change to activity')
+    recorded_at = Column(DateTime, nullable=False, comment='Timestamp of warehouse update', doc='Timestamp of warehouse update')
+    completed_at = Column(DateTime, nullable=False, comment='Timestamp of activity completion', doc='Timestamp of activity completion')
+    id_lims = Column(String(10, 'utf8_unicode_ci'), nullable=False, comment='LIM system identifier', doc='LIM system identifier')
+    deleted_at = Column(DateTime, comment='Timestamp of any activity removal', doc='Timestamp of any activity removal')
+
+    sample = relationship('Sample', back_populates='samples_extraction_activity')
+
+    def __init__(self, **kwargs):
+        """Constructs a new SamplesExtractionActivity.
+
+        Parameters
+        ----------
+        id_activity_tmp
+        id_activity_lims: LIMs-specific activity id
+        id_sample_tmp: Sample id, see "sample.id_sample_tmp"
+        activity_type: The type of the activity performed
+        instrument: The name of the instrument used to perform the activity
+        kit_barcode: The barcode of the kit used to perform the activity
+        kit_type: The type of kit used to perform the activity
+        input_barcode: The barcode of the labware (eg. plate or tube) at the begining of the activity
+        output_barcode: The barcode of the labware (eg. plate or tube)  at the end of the activity
+        user: The name of the user who was most recently associated with the activity
+        last_updated: Timestamp of last change to activity
+        recorded_at: Timestamp of warehouse update
+        completed_at: Timestamp of activity completion
+        id_lims: LIM system identifier
+        deleted_at: Timestamp of any activity removal
+        """
+        super().__init__(**kwargs)
+
+
+class StockResource(Base):
+    __tablename__ = 'stock_resource'
+    __table_args__ = (
+        Index('composition_lookup_index', 'id_stock_resource_lims', 'id_sample_tmp', 'id_lims'),
+    )
+
+    id_stock_resource_tmp = Column(mysqlINTEGER(11), primary_key=True)
+    last_updated = Column(DateTime, nullable=False, comment='Timestamp of last update', doc='Timestamp of last update')
+    recorded_at = Column(DateTime, nullable=False, comment='Timestamp of warehouse update', doc='Timestamp of warehouse update')
+    created = Column(DateTime, nullable=False, comment='Timestamp of initial registration of stock in LIMS', doc='Timestamp of initial registration of stock in LIMS')
+    id_sample_tmp = Column(ForeignKey('sample.id_sample_tmp'), nullable=False, index=True, comment='Sample id, see "sample.id_sample_tmp"', doc='Sample id, see "sample.id_sample_tmp"')
+    id_study_tmp = Column(ForeignKey('study.id_study_tmp'), nullable=False, index=True, comment='Sample id, see "study.id_study_tmp"', doc='Sample id, see "study.id_study_tmp"')
+    id_lims = Column(String(10, 'utf8_unicode_ci'), nullable=False, comment='LIM system identifier', doc='LIM system identifier')
+    id_stock_resource_lims = Column(String(20, 'utf8_unicode_ci'), nullable=False, comment='Lims specific identifier for the stock', doc='Lims specific identifier for the stock')
+    labware_type = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='The type of labware containing the stock. eg. Well, Tube', doc='The type of labware containing the stock. eg. Well, Tube')
+    labware_machine_barcode = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='The barcode of the containing labware as read by a barcode scanner', doc='The barcode of the containing labware as read by a barcode scanner')
+    labware_human_barcode = Column(String(255, 'utf8_unicode_ci'), nullable=False, index=True, comment='The barcode of the containing labware in human readable format', doc='The barcode of the containing labware in human readable format')
+    deleted_at = Column(DateTime, comment='Timestamp of initial registration of deletion in parent LIMS. NULL if not deleted.', doc='Timestamp of initial registration of deletion in parent LIMS. NULL if not deleted.')
+    stock_resource_uuid = Column(String(36, 'utf8_unicode_ci'), comment='Uuid identifier for the stock', doc='Uuid identifier for the stock')
+    labware_coordinate = Column(String(255, 'utf8_unicode_ci'), comment='For wells, the coordinate on the containing plate. Null for tubes.', doc='For wells, the coordinate on the containing plate. Null for tubes.')
+    current_volume = Column(Float, comment='The current volume of material in microlitres based on measurements and know usage', doc='The current volume of material in microlitres based on measurements and know usage')
+    initial_volume = Column(Float, comment='The result of the initial volume measurement in microlitres conducted on the material', doc='The result of the initial volume measurement in microlitres conducted on the material')
+    concentration = Column(Float, comment='The concentration of material recorded in the lab in nanograms per microlitre', doc='The concentration of material recorded in the lab in nanograms per microlitre')
+    gel_pass = Column(String(255, 'utf8_unicode_ci'), comment='The recorded result for the qel QC assay.', doc='The recorded result for the qel QC assay.')
+    pico_pass = Column(String(255, 'utf8_unicode_ci'), comment='The recorded result for the pico green assay. A pass indicates a successful assay, not sufficient material.', doc='The recorded result for the pico green assay. A pass indicates a successful assay, not sufficient material.')
+    snp_count = Column(mysqlINTEGER(11), comment='The number of markers detected in genotyping assays', doc='The number of markers detected in genotyping assays')
+    measured_gender = Column(String(255, 'utf8_unicode_ci'), comment='The gender call base on the genotyping assay', doc='The gender call base on the genotyping assay')
+
+    sample = relationship('Sample', back_populates='stock_resource')
+    study = relationship('Study', back_populates='stock_resource')
+
+    def __init__(self, **kwargs):
+        """Constructs a new StockResource.
+
+        Parameters
+        ----------
+        id_stock_resource_tmp
+        last_updated: Timestamp of last update
+        recorded_at: Timestamp of warehouse update
+        created: Timestamp of initial registration of stock in LIMS
+        id_sample_tmp: Sample id, see "sample.id_sample_tmp"
+        id_study_tmp: Sample id, see "study.id_study_tmp"
+        id_lims: LIM system identifier
+        id_stock_resource_lims: Lims specific identifier for the stock
+        labware_type: The type of labware containing the stock. eg. Well, Tube
+        labware_machine_barcode: The barcode of the containing labware as read by a barcode scanner
+        labware_human_barcode: The barcode of the containing labware in human readable format
+        deleted_at: Timestamp of initial registration of deletion in parent LIMS. NULL if not deleted.
+        stock_resource_uuid: Uuid identifier for the stock
+        labware_coordinate: For wells, the coordinate on the containing plate. Null for tubes.
+        current_volume: The current volume of material in microlitres based on measurements and know usage
+        initial_volume: The result of the initial volume measurement in microlitres conducted on the material
+        concentration: The concentration of material recorded in the lab in nanograms per microlitre
+        gel_pass: The recorded result for the qel QC assay.
+        pico_pass: The recorded result for the pico green assay. A pass indicates a successful assay, not sufficient material.
+        snp_count: The number of markers detected in genotyping assays
+        measured_gender: The gender call base on the genotyping assay
+        """
+        super().__init__(**kwargs)
+
+
+class StudyUsers(Base):
+    __tablename__ = 'study_users'
+
+    id_study_users_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='Internal to this database id, value can change', doc='Internal to this database id, value can change')
+    id_study_tmp = Column(ForeignKey('study.id_study_tmp'), nullable=False, index=True, comment='Study id, see "study.id_study_tmp"', doc='Study id, see "study.id_study_tmp"')
+    last_updated = Column(DateTime, nullable=False, comment='Timestamp of last update', doc='Timestamp of last update')
+    role = Column(String(255, 'utf8_unicode_ci'))
+    login = Column(String(255, 'utf8_unicode_ci'))
+    email = Column(String(255, 'utf8_unicode_ci'))
+    name = Column(String(255, 'utf8_unicode_ci'))
+
+    study = relationship('Study', back_populates='study_users')
+
+    def __init__(self, **kwargs):
+        """Constructs a new StudyUsers.
+
+        Parameters
+        ----------
+        id_study_users_tmp: Internal to this database id, value can change
+        id_study_tmp: Study id, see "study.id_study_tmp"
+        last_updated: Timestamp of last update
+        role
+        login
+        email
+        name
+        """
+        super().__init__(**kwargs)
+
+
+class TolSampleBioproject(Base):
+    __tablename__ = 'tol_sample_bioproject'
+
+    id_tsb_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True)
+    date_added = Column(TIMESTAMP, nullable=False, server_default=text('CURRENT_TIMESTAMP'))
+    date_updated = Column(TIMESTAMP, nullable=False, server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'))
+    id_sample_tmp = Column(ForeignKey('sample.id_sample_tmp', ondelete='SET NULL'), index=True)
+    file = Column(String(255), unique=True)
+    library_type = Column(Enum('Chromium genome', 'Haplotagging', 'Hi-C', 'Hi-C - Arima v1', 'Hi-C - Arima v2', 'Hi-C - Dovetail', 'Hi-C - Omni-C', 'Hi-C - Qiagen', 'PacBio - CLR', 'PacBio - HiFi', 'ONT', 'RNA PolyA', 'RNA-seq dUTP eukaryotic', 'Standard', 'unknown', 'HiSeqX PCR free', 'PacBio - HiFi (ULI)'))
+    tolid = Column(String(40))
+    biosample_accession = Column(String(255))
+    bioproject_accession = Column(String(255))
+    filename = Column(String(255))
+
+    sample = relationship('Sample', back_populates='tol_sample_bioproject')
+
+    def __init__(self, **kwargs):
+        """Constructs a new TolSampleBioproject.
+
+        Parameters
+        ----------
+        id_tsb_tmp
+        date_added
+        date_updated
+        id_sample_tmp
+        file
+        library_type
+        tolid
+        biosample_accession
+        bioproject_accession
+        filename
+        """
+        super().__init__(**kwargs)
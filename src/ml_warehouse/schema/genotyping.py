@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# @author mgcam <mg8@sanger.ac.uk>
+
+from sqlalchemy import CHAR, Column, Computed, DECIMAL, Date, DateTime, Enum, Float, ForeignKey, ForeignKeyConstraint, Index, String, TIMESTAMP, Table, Text, text
+from sqlalchemy.dialects.mysql import BIGINT as mysqlBIGINT, CHAR as mysqlCHAR, DATETIME as mysqlDATETIME, DOUBLE as mysqlDOUBLE, ENUM as mysqlENUM, FLOAT as mysqlFLOAT, INTEGER as mysqlINTEGER, SMALLINT as mysqlSMALLINT, TINYINT as mysqlTINYINT, VARCHAR as mysqlVARCHAR
+from sqlalchemy.orm import declarative_base, relationship
+
+from ml_warehouse.schema import Base, metadata
+
+
+class BmapFlowcell(Base):
+    __tablename__ = 'bmap_flowcell'
+
+    id_bmap_flowcell_tmp = Column(mysqlINTEGER(11), primary_key=True)
+    last_updated = Column(DateTime, nullable=False, comment='Timestamp of last update', doc='Timestamp of last update')
+    recorded_at = Column(DateTime, nullable=False, comment='Timestamp of warehouse update', doc='Timestamp of warehouse update')
+    id_sample_tmp = Column(ForeignKey('sample.id_sample_tmp'), nullable=False, index=True, comment='Sample id, see "sample.id_sample_tmp"', doc='Sample id, see "sample.id_sample_tmp"')
+    id_study_tmp = Column(ForeignKey('study.id_study_tmp'), nullable=False, index=True, comment='Study id, see "study.id_study_tmp"', doc='Study id, see "study.id_study_tmp"')
+    experiment_name = Column(String(255), nullable=False, comment='The name of the experiment, eg. The lims generated run id', doc='The name of the experiment, eg. The lims generated run id')
+    instrument_name = Column(String(255), nullable=False, comment='The name of the instrument on which the sample was run', doc='The name of the instrument on which the sample was run')
+    enzyme_name = Column(String(255), nullable=False, comment='The name of the recognition enzyme used', doc='The name of the recognition enzyme used')
+    chip_barcode = Column(String(255), nullable=False, comment='Manufacturer chip identifier', doc='Manufacturer chip identifier')
+    id_flowcell_lims = Column(String(255), nullable=False, index=True, comment='LIMs-specific flowcell id', doc='LIMs-specific flowcell id')
+    id_lims = Column(String(10), nullable=False, comment='LIM system identifier', doc='LIM system identifier')
+    chip_serialnumber = Column(String(16), comment='Manufacturer chip identifier', doc='Manufacturer chip identifier')
+    position = Column(mysqlINTEGER(10, unsigned=True), comment='Flowcell position', doc='Flowcell position')
+    id_library_lims = Column(String(255), index=True, comment='Earliest LIMs identifier associated with library creation', doc='Earliest LIMs identifier associated with library creation')
+
+    sample = relationship('Sample', back_populates='bmap_flowcell')
+    study = relationship('Study', back_populates='bmap_flowcell')
+
+    def __init__(self, **kwargs):
+        """Constructs a new BmapFlowcell.
+
+        Parameters
+        ----------
+        id_bmap_flowcell_tmp
+        last_updated: Timestamp of last update
+        recorded_at: Timestamp of warehouse update
+        id_sample_tmp: Sample id, see "sample.id_sample_tmp"
+        id_study_tmp: Study id, see "study.id_study_tmp"
+        experiment_name: The name of the experiment, eg. The lims generated run id
+        instrument_name: The name of the instrument on which the sample was run
+        enzyme_name: The name of the recognition enzyme used
+        chip_barcode: Manufacturer chip identifier
+        id_flowcell_lims: LIMs-specific flowcell id
+        id_lims: LIM system identifier
+        chip_serialnumber: Manufacturer chip identifier
+        position: Flowcell position
+        id_library_lims: Earliest LIMs identifier associated with library creation
+        """
+        super().__init__(**kwargs)
+
+
+class FlgenPlate(Base):
+    __tablename__ = 'flgen_plate'
+    __table_args__ = (
+        Index('flgen_plate_id_lims_id_flgen_plate_lims_index', 'id_lims', 'id_flgen_plate_lims'),
+    )
+
+    id_flgen_plate_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='Internal to this database id, value can change', doc='Internal to this database id, value can change')
+    id_sample_tmp = Column(ForeignKey('sample.id_sample_tmp'), nullable=False, index=True, comment='Sample id, see "sample.id_sample_tmp"', doc='Sample id, see "sample.id_sample_tmp"')
+    id_study_tmp = Column(ForeignKey('study.id_study_tmp'), nullable=False, index=True, comment='Study id, see "study.id_study_tmp"', doc='Study id, see "study.id_study_tmp"')
+    cost_code = Column(String(20, 'utf8_unicode_ci'), nullable=False, comment='Valid WTSI cost code', doc='Valid WTSI cost code')
+    id_lims = Column(String(10, 'utf8_unicode_ci'), nullable=False, comment='LIM system identifier, e.g. CLARITY-GCLP, SEQSCAPE', doc='LIM system identifier, e.g. CLARITY-GCLP, SEQSCAPE')
+    last_updated = Column(DateTime, nullable=False, comment='Timestamp of last update', doc='Timestamp of last update')
+    recorded_at = Column(DateTime, nullable=False, comment='Timestamp of warehouse update', doc='Timestamp of warehouse update')
+    plate_barcode = Column(mysqlINTEGER(10, unsigned=True), nullable=False, comment='Manufacturer (Fluidigm) chip barcode', doc='Manufacturer (Fluidigm) chip barcode')
+    id_flgen_plate_lims = Column(String(20, 'utf8_unicode_ci'), nullable=False, comment='LIMs-specific plate id', doc='LIMs-specific plate id')
+    well_label = Column(String(10, 'utf8_unicode_ci'), nullable=False, comment='Manufactuer well identifier within a plate, S001-S192', doc='Manufactuer well identifier within a plate, S001-S192')
+    plate_barcode_lims = Column(String(128, 'utf8_unicode_ci'), comment='LIMs-specific plate barcode', doc='LIMs-specific plate barcode')
+    plate_uuid_lims = Column(String(36, 'utf8_unicode_ci'), comment='LIMs-specific plate uuid', doc='LIMs-specific plate uuid')
+    plate_size = Column(mysqlSMALLINT(6), comment='Total number of wells on a plate', doc='Total number of wells on a plate')
+    plate_size_occupied = Column(mysqlSMALLINT(6), comment='Number of occupied wells on a plate', doc='Number of occupied wells on a plate')
+    well_uuid_lims = Column(String(36, 'utf8_unicode_ci'), comment='LIMs-specific well uuid', doc='LIMs-specific well uuid')
+    qc_state = Column(mysqlTINYINT(1), comment='QC state; 1 (pass), 0 (fail), NULL (not known)', doc='QC state; 1 (pass), 0 (fail), NULL (not known)')
+
+    sample = relationship('Sample', back_populates='flgen_plate')
+    study = relationship('Study', back_populates='flgen_plate')
+
+    def __init__(self, **kwargs):
+        """Constructs a new FlgenPlate.
+
+        Parameters
+        ----------
+        id_flgen_plate_tmp: Internal to this database id, value can change
+        id_sample_tmp: Sample id, see "sample.id_sample_tmp"
+        id_study_tmp: Study id, see "study.id_study_tmp"
+        cost_code: Valid WTSI cost code
+        id_lims: LIM system identifier, e.g. CLARITY-GCLP, SEQSCAPE
+        last_updated: Timestamp of last update
+        recorded_at: Timestamp of warehouse update
+        plate_barcode: Manufacturer (Fluidigm) chip barcode
+        id_flgen_plate_lims: LIMs-specific plate id
+        well_label: Manufactuer well identifier within a plate, S001-S192
+        plate_barcode_lims: LIMs-specific plate barcode
+        plate_uuid_lims: LIMs-specific plate uuid
+        plate_size: Total number of wells on a plate
+        plate_size_occupied: Number of occupied wells on a plate
+        well_uuid_lims: LIMs-specific well uuid
+        qc_state: QC state; 1 (pass), 0 (fail), NULL (not known)
+        """
+        super().__init__(**kwargs)
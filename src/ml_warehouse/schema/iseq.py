@@ -0,0 +1,915 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# @author mgcam <mg8@sanger.ac.uk>
+
+from sqlalchemy import CHAR, Column, Computed, DECIMAL, Date, DateTime, Enum, Float, ForeignKey, ForeignKeyConstraint, Index, String, TIMESTAMP, Table, Text, text
+from sqlalchemy.dialects.mysql import BIGINT as mysqlBIGINT, CHAR as mysqlCHAR, DATETIME as mysqlDATETIME, DOUBLE as mysqlDOUBLE, ENUM as mysqlENUM, FLOAT as mysqlFLOAT, INTEGER as mysqlINTEGER, SMALLINT as mysqlSMALLINT, TINYINT as mysqlTINYINT, VARCHAR as mysqlVARCHAR
+from sqlalchemy.orm import declarative_base, relationship
+
+from ml_warehouse.schema import Base, metadata
+
+
+class IseqExternalProductMetrics(Base):
+    __tablename__ = 'iseq_external_product_metrics'
+    __table_args__ = {'comment': 'Externally computed metrics for data sequenced at WSI'}
+
+    id_iseq_ext_pr_metrics_tmp = Column(mysqlBIGINT(20, unsigned=True), primary_key=True, comment='Internal to this database id, value can change', doc='Internal to this database id, value can change')
+    file_name = Column(String(300), nullable=False, index=True, comment='Comma-delimitered alphabetically sorted list of file names, which unambigiously define WSI sources of data', doc='Comma-delimitered alphabetically sorted list of file names, which unambigiously define WSI sources of data')
+    file_path = Column(String(760), nullable=False, unique=True, comment='Comma-delimitered alphabetically sorted list of full external file paths for the files in file_names column as uploaded by WSI', doc='Comma-delimitered alphabetically sorted list of full external file paths for the files in file_names column as uploaded by WSI')
+    created = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'), comment='Datetime this record was created', doc='Datetime this record was created')
+    last_changed = Column(DateTime, server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'), comment='Datetime this record was created or changed', doc='Datetime this record was created or changed')
+    supplier_sample_name = Column(mysqlVARCHAR(255, charset='utf8', collation='utf8_unicode_ci'), index=True, comment='Sample name given by the supplier, as recorded by WSI', doc='Sample name given by the supplier, as recorded by WSI')
+    plate_barcode = Column(mysqlVARCHAR(255, charset='utf8', collation='utf8_unicode_ci'), index=True, comment='Stock plate barcode, as recorded by WSI', doc='Stock plate barcode, as recorded by WSI')
+    library_id = Column(mysqlINTEGER(11), index=True, comment='WSI library identifier', doc='WSI library identifier')
+    md5_staging = Column(CHAR(32), comment='WSI validation hex MD5, not set for multiple source files', doc='WSI validation hex MD5, not set for multiple source files')
+    manifest_upload_status = Column(CHAR(15), index=True, comment='WSI manifest upload status, one of "IN PROGRESS", "DONE", "FAIL", not set for multiple source files', doc='WSI manifest upload status, one of "IN PROGRESS", "DONE", "FAIL", not set for multiple source files')
+    manifest_upload_status_change_date = Column(DateTime, comment='Date the status of manifest upload is changed by WSI', doc='Date the status of manifest upload is changed by WSI')
+    id_run = Column(mysqlINTEGER(10, unsigned=True), index=True, comment='NPG run identifier, defined where the product corresponds to a single line', doc='NPG run identifier, defined where the product corresponds to a single line')
+    id_iseq_product = Column(mysqlCHAR(64, charset='utf8', collation='utf8_unicode_ci'), index=True, comment='product id', doc='product id')
+    iseq_composition_tmp = Column(String(600), comment='JSON representation of the composition object, the column might be deleted in future', doc='JSON representation of the composition object, the column might be deleted in future')
+    id_archive_product = Column(CHAR(64), comment='Archive ID for data product', doc='Archive ID for data product')
+    destination = Column(String(15), server_default=text("'UKBMP'"), comment='Data destination, from 20200323 defaults to "UKBMP"', doc='Data destination, from 20200323 defaults to "UKBMP"')
+    processing_status = Column(CHAR(15), index=True, comment='Overall status of the product, one of "PASS", "HOLD", "INSUFFICIENT", "FAIL"', doc='Overall status of the product, one of "PASS", "HOLD", "INSUFFICIENT", "FAIL"')
+    qc_overall_assessment = Column(CHAR(4), index=True, comment='State of the product after phase 3 of processing, one of "PASS" or "FAIL"', doc='State of the product after phase 3 of processing, one of "PASS" or "FAIL"')
+    qc_status = Column(CHAR(15), comment='State of the product after phase 2 of processing, one of "PASS", "HOLD", "INSUFFICIENT", "FAIL"', doc='State of the product after phase 2 of processing, one of "PASS", "HOLD", "INSUFFICIENT", "FAIL"')
+    sequencing_start_date = Column(Date, comment='Sequencing start date obtained from the CRAM file header, not set for multiple source files', doc='Sequencing start date obtained from the CRAM file header, not set for multiple source files')
+    upload_date = Column(Date, comment='Upload date, not set for multiple source files', doc='Upload date, not set for multiple source files')
+    md5_validation_date = Column(Date, comment='Date of MD5 validation, not set for multiple source files', doc='Date of MD5 validation, not set for multiple source files')
+    processing_start_date = Column(Date, comment='Processing start date', doc='Processing start date')
+    analysis_start_date = Column(Date)
+    phase2_end_date = Column(DateTime, comment='Date the phase 2 analysis finished for this product', doc='Date the phase 2 analysis finished for this product')
+    analysis_end_date = Column(Date)
+    archival_date = Column(Date, comment='Date made available or pushed to archive service', doc='Date made available or pushed to archive service')
+    archive_confirmation_date = Column(Date, comment='Date of confirmation of integrity of data product by archive service', doc='Date of confirmation of integrity of data product by archive service')
+    md5 = Column(CHAR(32), comment='External validation hex MD5, not set for multiple source files', doc='External validation hex MD5, not set for multiple source files')
+    md5_validation = Column(CHAR(4), comment='Outcome of MD5 validation as "PASS" or "FAIL", not set for multiple source files', doc='Outcome of MD5 validation as "PASS" or "FAIL", not set for multiple source files')
+    format_validation = Column(CHAR(4), comment='Outcome of format validation as "PASS" or "FAIL", not set for multiple source files', doc='Outcome of format validation as "PASS" or "FAIL", not set for multiple source files')
+    upload_status = Column(CHAR(4), comment='Upload status as "PASS" or "FAIL", "PASS" if both MD5 and format validation are "PASS", not set for multiple source files', doc='Upload status as "PASS" or "FAIL", "PASS" if both MD5 and format validation are "PASS", not set for multiple source files')
+    instrument_id = Column(String(256), index=True, comment='Comma separated sorted list of instrument IDs obtained from the CRAM file header(s)', doc='Comma separated sorted list of instrument IDs obtained from the CRAM file header(s)')
+    flowcell_id = Column(String(256), index=True, comment='Comma separated sorted list of flowcell IDs obtained from the CRAM file header(s)', doc='Comma separated sorted list of flowcell IDs obtained from the CRAM file header(s)')
+    annotation = Column(String(15), comment='Annotation regarding data provenance, i.e. is sequence data from first pass, re-run, top-up, etc.', doc='Annotation regarding data provenance, i.e. is sequence data from first pass, re-run, top-up, etc.')
+    min_read_length = Column(mysqlTINYINT(3, unsigned=True), comment='Minimum read length observed in the data file', doc='Minimum read length observed in the data file')
+    target_autosome_coverage_threshold = Column(mysqlINTEGER(3, unsigned=True), server_default=text("'15'"), comment='Target autosome coverage threshold, defaults to 15', doc='Target autosome coverage threshold, defaults to 15')
+    target_autosome_gt_coverage_threshold = Column(Float, comment='Coverage percent at >= target_autosome_coverage_threshold X as a fraction', doc='Coverage percent at >= target_autosome_coverage_threshold X as a fraction')
+    target_autosome_gt_coverage_threshold_assessment = Column(CHAR(4), comment='"PASS" if target_autosome_percent_gt_coverage_threshold > 95%, "FAIL" otherwise', doc='"PASS" if target_autosome_percent_gt_coverage_threshold > 95%, "FAIL" otherwise')
+    verify_bam_id_score = Column(mysqlFLOAT(unsigned=True), comment='FREEMIX value of sample contamination levels as a fraction', doc='FREEMIX value of sample contamination levels as a fraction')
+    verify_bam_id_score_assessment = Column(CHAR(4), comment='"PASS" if verify_bam_id_score > 0.01, "FAIL" otherwise', doc='"PASS" if verify_bam_id_score > 0.01, "FAIL" otherwise')
+    double_error_fraction = Column(mysqlFLOAT(unsigned=True), comment='Fraction of marker pairs with two read pairs evidencing parity and non-parity, may only be calculated if 1% <= verify_bam_id_score < 5%', doc='Fraction of marker pairs with two read pairs evidencing parity and non-parity, may only be calculated if 1% <= verify_bam_id_score < 5%')
+    contamination_assessment = Column(CHAR(4), comment='"PASS" or "FAIL" based on verify_bam_id_score_assessment and double_error_fraction < 0.2%', doc='"PASS" or "FAIL" based on verify_bam_id_score_assessment and double_error_fraction < 0.2%')
+    yield_whole_genome = Column(mysqlFLOAT(unsigned=True), comment='Sequence data quantity (Gb) excluding duplicate reads, adaptors, overlapping bases from reads on the same fragment, soft-clipped bases', doc='Sequence data quantity (Gb) excluding duplicate reads, adaptors, overlapping bases from reads on the same fragment, soft-clipped bases')
+    yield_ = Column('yield', mysqlFLOAT(unsigned=True), comment='Sequence data quantity (Gb) excluding duplicate reads, adaptors, overlapping bases from reads on the same fragment, soft-clipped bases, non-N autosome only', doc='Sequence data quantity (Gb) excluding duplicate reads, adaptors, overlapping bases from reads on the same fragment, soft-clipped bases, non-N autosome only')
+    yield_q20 = Column(mysqlBIGINT(20, unsigned=True), comment='Yield in bases at or above Q20 filtered in the same way as the yield column values', doc='Yield in bases at or above Q20 filtered in the same way as the yield column values')
+    yield_q30 = Column(mysqlBIGINT(20, unsigned=True), comment='Yield in bases at or above Q30 filtered in the same way as the yield column values', doc='Yield in bases at or above Q30 filtered in the same way as the yield column values')
+    num_reads = Column(mysqlBIGINT(20, unsigned=True), comment='Number of reads filtered in the same way as the yield column values', doc='Number of reads filtered in the same way as the yield column values')
+    gc_fraction_forward_read = Column(mysqlFLOAT(unsigned=True))
+    gc_fraction_reverse_read = Column(mysqlFLOAT(unsigned=True))
+    adapter_contamination = Column(String(255), comment='The maximum over adapters and cycles in reads/fragments as a fraction per file and RG. Values for first and second reads separated with ",", and values for individual files separated with "/". e.g. "0.1/0.1/0.1/0.1,0.1/0.1/0.1/0.1"', doc='The maximum over adapters and cycles in reads/fragments as a fraction per file and RG. Values for first and second reads separated with ",", and values for individual files separated with "/". e.g. "0.1/0.1/0.1/0.1,0.1/0.1/0.1/0.1"')
+    adapter_contamination_assessment = Column(String(255), comment='"PASS", "WARN", "FAIL" per read and file. Multiple values are represented as forward slash-separated array of strings with a comma separating entries for paired-end 1 and 2 reads e.g. "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"', doc='"PASS", "WARN", "FAIL" per read and file. Multiple values are represented as forward slash-separated array of strings with a comma separating entries for paired-end 1 and 2 reads e.g. "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"')
+    pre_adapter_min_total_qscore = Column(mysqlTINYINT(3, unsigned=True), comment='Minimum of TOTAL_QSCORE values in PreAdapter report from CollectSequencingArtifactMetrics', doc='Minimum of TOTAL_QSCORE values in PreAdapter report from CollectSequencingArtifactMetrics')
+    ref_bias_min_total_qscore = Column(mysqlTINYINT(3, unsigned=True), comment='Minimum of TOTAL_QSCORE values in BaitBias report from CollectSequencingArtifactMetrics', doc='Minimum of TOTAL_QSCORE values in BaitBias report from CollectSequencingArtifactMetrics')
+    target_proper_pair_mapped_reads_fraction = Column(mysqlFLOAT(unsigned=True), comment='Fraction of properly paired mapped reads filtered in the same way as the yield column values', doc='Fraction of properly paired mapped reads filtered in the same way as the yield column values')
+    target_proper_pair_mapped_reads_assessment = Column(CHAR(4), comment='"PASS" if target_proper_pair_mapped_reads_fraction > 0.95, "FAIL" otherwise', doc='"PASS" if target_proper_pair_mapped_reads_fraction > 0.95, "FAIL" otherwise')
+    insert_size_mean = Column(mysqlFLOAT(unsigned=True))
+    insert_size_std = Column(mysqlFLOAT(unsigned=True))
+    sequence_error_rate = Column(mysqlFLOAT(unsigned=True), comment='Reported by samtools, as a fraction', doc='Reported by samtools, as a fraction')
+    basic_statistics_assessement = Column(String(255), comment='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"', doc='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"')
+    overrepresented_sequences_assessement = Column(String(255), comment='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"', doc='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"')
+    n_content_per_base_assessement = Column(String(255), comment='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"', doc='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"')
+    sequence_content_per_base_assessement = Column(String(255), comment='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"', doc='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"')
+    sequence_quality_per_base_assessement = Column(String(255), comment='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"', doc='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"')
+    gc_content_per_sequence_assessement = Column(String(255), comment='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"', doc='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"')
+    quality_scores_per_sequence_assessement = Column(String(255), comment='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"', doc='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"')
+    sequence_duplication_levels_assessement = Column(String(255), comment='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"', doc='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"')
+    sequence_length_distribution_assessement = Column(String(255), comment='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"', doc='FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"')
+    FastQC_overall_assessment = Column(CHAR(4), comment='FastQC "PASS" or "FAIL"', doc='FastQC "PASS" or "FAIL"')
+    nrd = Column(mysqlFLOAT(unsigned=True), comment='Sample discordance levels at non-reference genotypes as a fraction', doc='Sample discordance levels at non-reference genotypes as a fraction')
+    nrd_assessment = Column(CHAR(4), comment='"PASS" based on nrd_persent < 2% or "FAIL" or "NA" if genotyping data not available for this sample', doc='"PASS" based on nrd_persent < 2% or "FAIL" or "NA" if genotyping data not available for this sample')
+    sex_reported = Column(CHAR(6), comment='Sex as reported by sample supplier', doc='Sex as reported by sample supplier')
+    sex_computed = Column(CHAR(6), comment='Genetic sex as identified by sequence data', doc='Genetic sex as identified by sequence data')
+    input_files_status = Column(CHAR(10), comment="Status of the input files, either 'USEABLE' or 'DELETED'", doc="Status of the input files, either 'USEABLE' or 'DELETED'")
+    intermediate_files_status = Column(CHAR(10), comment="Status of the intermediate files, either 'USEABLE' or 'DELETED'", doc="Status of the intermediate files, either 'USEABLE' or 'DELETED'")
+    output_files_status = Column(CHAR(10), comment="Status of the output files, either 'ARCHIVED', 'USEABLE' or 'DELETED'", doc="Status of the output files, either 'ARCHIVED', 'USEABLE' or 'DELETED'")
+    input_status_override_ref = Column(String(255), comment='Status override reference for the input files', doc='Status override reference for the input files')
+    intermediate_status_override_ref = Column(String(255), comment='Status override reference for the intermediate files', doc='Status override reference for the intermediate files')
+    output_status_override_ref = Column(String(255), comment='Status override reference for the output files', doc='Status override reference for the output files')
+
+    iseq_external_product_components = relationship('IseqExternalProductComponents', back_populates='iseq_external_product_metrics')
+
+    def __init__(self, **kwargs):
+        """Constructs a new IseqExternalProductMetrics.
+
+        Parameters
+        ----------
+        id_iseq_ext_pr_metrics_tmp: Internal to this database id, value can change
+        file_name: Comma-delimitered alphabetically sorted list of file names, which unambigiously define WSI sources of data
+        file_path: Comma-delimitered alphabetically sorted list of full external file paths for the files in file_names column as uploaded by WSI
+        created: Datetime this record was created
+        last_changed: Datetime this record was created or changed
+        supplier_sample_name: Sample name given by the supplier, as recorded by WSI
+        plate_barcode: Stock plate barcode, as recorded by WSI
+        library_id: WSI library identifier
+        md5_staging: WSI validation hex MD5, not set for multiple source files
+        manifest_upload_status: WSI manifest upload status, one of "IN PROGRESS", "DONE", "FAIL", not set for multiple source files
+        manifest_upload_status_change_date: Date the status of manifest upload is changed by WSI
+        id_run: NPG run identifier, defined where the product corresponds to a single line
+        id_iseq_product: product id
+        iseq_composition_tmp: JSON representation of the composition object, the column might be deleted in future
+        id_archive_product: Archive ID for data product
+        destination: Data destination, from 20200323 defaults to "UKBMP"
+        processing_status: Overall status of the product, one of "PASS", "HOLD", "INSUFFICIENT", "FAIL"
+        qc_overall_assessment: State of the product after phase 3 of processing, one of "PASS" or "FAIL"
+        qc_status: State of the product after phase 2 of processing, one of "PASS", "HOLD", "INSUFFICIENT", "FAIL"
+        sequencing_start_date: Sequencing start date obtained from the CRAM file header, not set for multiple source files
+        upload_date: Upload date, not set for multiple source files
+        md5_validation_date: Date of MD5 validation, not set for multiple source files
+        processing_start_date: Processing start date
+        analysis_start_date
+        phase2_end_date: Date the phase 2 analysis finished for this product
+        analysis_end_date
+        archival_date: Date made available or pushed to archive service
+        archive_confirmation_date: Date of confirmation of integrity of data product by archive service
+        md5: External validation hex MD5, not set for multiple source files
+        md5_validation: Outcome of MD5 validation as "PASS" or "FAIL", not set for multiple source files
+        format_validation: Outcome of format validation as "PASS" or "FAIL", not set for multiple source files
+        upload_status: Upload status as "PASS" or "FAIL", "PASS" if both MD5 and format validation are "PASS", not set for multiple source files
+        instrument_id: Comma separated sorted list of instrument IDs obtained from the CRAM file header(s)
+        flowcell_id: Comma separated sorted list of flowcell IDs obtained from the CRAM file header(s)
+        annotation: Annotation regarding data provenance, i.e. is sequence data from first pass, re-run, top-up, etc.
+        min_read_length: Minimum read length observed in the data file
+        target_autosome_coverage_threshold: Target autosome coverage threshold, defaults to 15
+        target_autosome_gt_coverage_threshold: Coverage percent at >= target_autosome_coverage_threshold X as a fraction
+        target_autosome_gt_coverage_threshold_assessment: "PASS" if target_autosome_percent_gt_coverage_threshold > 95%, "FAIL" otherwise
+        verify_bam_id_score: FREEMIX value of sample contamination levels as a fraction
+        verify_bam_id_score_assessment: "PASS" if verify_bam_id_score > 0.01, "FAIL" otherwise
+        double_error_fraction: Fraction of marker pairs with two read pairs evidencing parity and non-parity, may only be calculated if 1% <= verify_bam_id_score < 5%
+        contamination_assessment: "PASS" or "FAIL" based on verify_bam_id_score_assessment and double_error_fraction < 0.2%
+        yield_whole_genome: Sequence data quantity (Gb) excluding duplicate reads, adaptors, overlapping bases from reads on the same fragment, soft-clipped bases
+        yield: Sequence data quantity (Gb) excluding duplicate reads, adaptors, overlapping bases from reads on the same fragment, soft-clipped bases, non-N autosome only
+        yield_q20: Yield in bases at or above Q20 filtered in the same way as the yield column values
+        yield_q30: Yield in bases at or above Q30 filtered in the same way as the yield column values
+        num_reads: Number of reads filtered in the same way as the yield column values
+        gc_fraction_forward_read
+        gc_fraction_reverse_read
+        adapter_contamination: The maximum over adapters and cycles in reads/fragments as a fraction per file and RG. Values for first and second reads separated with ",", and values for individual files separated with "/". e.g. "0.1/0.1/0.1/0.1,0.1/0.1/0.1/0.1"
+        adapter_contamination_assessment: "PASS", "WARN", "FAIL" per read and file. Multiple values are represented as forward slash-separated array of strings with a comma separating entries for paired-end 1 and 2 reads e.g. "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"
+        pre_adapter_min_total_qscore: Minimum of TOTAL_QSCORE values in PreAdapter report from CollectSequencingArtifactMetrics
+        ref_bias_min_total_qscore: Minimum of TOTAL_QSCORE values in BaitBias report from CollectSequencingArtifactMetrics
+        target_proper_pair_mapped_reads_fraction: Fraction of properly paired mapped reads filtered in the same way as the yield column values
+        target_proper_pair_mapped_reads_assessment: "PASS" if target_proper_pair_mapped_reads_fraction > 0.95, "FAIL" otherwise
+        insert_size_mean
+        insert_size_std
+        sequence_error_rate: Reported by samtools, as a fraction
+        basic_statistics_assessement: FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"
+        overrepresented_sequences_assessement: FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"
+        n_content_per_base_assessement: FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"
+        sequence_content_per_base_assessement: FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"
+        sequence_quality_per_base_assessement: FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"
+        gc_content_per_sequence_assessement: FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"
+        quality_scores_per_sequence_assessement: FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"
+        sequence_duplication_levels_assessement: FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"
+        sequence_length_distribution_assessement: FastQC "PASS", "WARN", "FAIL" per input file. Array of strings separated by "/", with a "," separating entries for paired-end 1 and 2 reads. e.g. Four RG "PASS/PASS/WARN/PASS,PASS/PASS/WARN/PASS"
+        FastQC_overall_assessment: FastQC "PASS" or "FAIL"
+        nrd: Sample discordance levels at non-reference genotypes as a fraction
+        nrd_assessment: "PASS" based on nrd_persent < 2% or "FAIL" or "NA" if genotyping data not available for this sample
+        sex_reported: Sex as reported by sample supplier
+        sex_computed: Genetic sex as identified by sequence data
+        input_files_status: Status of the input files, either 'USEABLE' or 'DELETED'
+        intermediate_files_status: Status of the intermediate files, either 'USEABLE' or 'DELETED'
+        output_files_status: Status of the output files, either 'ARCHIVED', 'USEABLE' or 'DELETED'
+        input_status_override_ref: Status override reference for the input files
+        intermediate_status_override_ref: Status override reference for the intermediate files
+        output_status_override_ref: Status override reference for the output files
+        """
+        super().__init__(**kwargs)
+
+
+class IseqHeronClimbStatus(Base):
+    __tablename__ = 'iseq_heron_climb_status'
+
+    id = Column(mysqlINTEGER(10, unsigned=True), primary_key=True)
+    id_iseq_product = Column(CHAR(64, 'utf8_unicode_ci'), index=True)
+    supplier_sample_name = Column(String(255, 'utf8_unicode_ci'), index=True)
+    climb_upload = Column(DateTime, index=True)
+    folder_name = Column(String(64, 'utf8_unicode_ci'), index=True)
+    climb_biosample_metadata_upload = Column(DateTime)
+    cog_sample_meta = Column(mysqlTINYINT(1))
+    climb_sequence_metadata_upload = Column(DateTime)
+
+    def __init__(self, **kwargs):
+        """Constructs a new IseqHeronClimbStatus.
+
+        Parameters
+        ----------
+        id
+        id_iseq_product
+        supplier_sample_name
+        climb_upload
+        folder_name
+        climb_biosample_metadata_upload
+        cog_sample_meta
+        climb_sequence_metadata_upload
+        """
+        super().__init__(**kwargs)
+
+
+class IseqHeronProductMetrics(Base):
+    __tablename__ = 'iseq_heron_product_metrics'
+    __table_args__ = {'comment': 'Heron project additional metrics'}
+
+    id_iseq_hrpr_metrics_tmp = Column(mysqlBIGINT(20, unsigned=True), primary_key=True, comment='Internal to this database id, value can change', doc='Internal to this database id, value can change')
+    id_iseq_product = Column(CHAR(64, 'utf8_unicode_ci'), nullable=False, unique=True, comment='Product id, a foreign key into iseq_product_metrics table', doc='Product id, a foreign key into iseq_product_metrics table')
+    created = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'), comment='Datetime this record was created', doc='Datetime this record was created')
+    last_changed = Column(DateTime, server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'), comment='Datetime this record was created or changed', doc='Datetime this record was created or changed')
+    id_run = Column(mysqlINTEGER(10, unsigned=True), index=True, comment='Run id', doc='Run id')
+    supplier_sample_name = Column(String(255, 'utf8_unicode_ci'), index=True, comment='Sample name given by the supplier, as recorded by WSI', doc='Sample name given by the supplier, as recorded by WSI')
+    pp_name = Column(String(40, 'utf8_unicode_ci'), server_default=text("'ncov2019-artic-nf'"), comment='The name of the pipeline that produced the QC metric', doc='The name of the pipeline that produced the QC metric')
+    pp_version = Column(String(40, 'utf8_unicode_ci'), index=True, comment='The version of the pipeline specified in the pp_name column', doc='The version of the pipeline specified in the pp_name column')
+    pp_repo_url = Column(String(255, 'utf8_unicode_ci'), comment='URL of the VCS repository for this pipeline', doc='URL of the VCS repository for this pipeline')
+    artic_qc_outcome = Column(CHAR(15, 'utf8_unicode_ci'), comment='Artic pipeline QC outcome, "TRUE", "FALSE" or a NULL value', doc='Artic pipeline QC outcome, "TRUE", "FALSE" or a NULL value')
+    climb_upload = Column(DateTime, comment='Datetime files for this sample were uploaded to CLIMB', doc='Datetime files for this sample were uploaded to CLIMB')
+    cog_sample_meta = Column(mysqlTINYINT(1, unsigned=True), comment='A Boolean flag to mark sample metadata upload to COG', doc='A Boolean flag to mark sample metadata upload to COG')
+    path_root = Column(String(255, 'utf8_unicode_ci'), comment='The uploaded files path root for the entity', doc='The uploaded files path root for the entity')
+    ivar_md = Column(mysqlSMALLINT(5, unsigned=True), comment='ivar minimum depth used in generating the default consensus', doc='ivar minimum depth used in generating the default consensus')
+    pct_N_bases = Column(Float, comment='Percent of N bases', doc='Percent of N bases')
+    pct_covered_bases = Column(Float, comment='Percent of covered bases', doc='Percent of covered bases')
+    longest_no_N_run = Column(mysqlSMALLINT(5, unsigned=True), comment='Longest consensus data stretch without N', doc='Longest consensus data stretch without N')
+    ivar_amd = Column(mysqlSMALLINT(5, unsigned=True), comment='ivar minimum depth used in generating the additional consensus', doc='ivar minimum depth used in generating the additional consensus')
+    pct_N_bases_amd = Column(Float, comment='Percent of N bases in the additional consensus', doc='Percent of N bases in the additional consensus')
+    longest_no_N_run_amd = Column(mysqlSMALLINT(5, unsigned=True), comment='Longest data stretch without N in the additional consensus', doc='Longest data stretch without N in the additional consensus')
+    num_aligned_reads = Column(mysqlBIGINT(20, unsigned=True), comment='Number of aligned filtered reads', doc='Number of aligned filtered reads')
+
+    def __init__(self, **kwargs):
+        """Constructs a new IseqHeronProductMetrics.
+
+        Parameters
+        ----------
+        id_iseq_hrpr_metrics_tmp: Internal to this database id, value can change
+        id_iseq_product: Product id, a foreign key into iseq_product_metrics table
+        created: Datetime this record was created
+        last_changed: Datetime this record was created or changed
+        id_run: Run id
+        supplier_sample_name: Sample name given by the supplier, as recorded by WSI
+        pp_name: The name of the pipeline that produced the QC metric
+        pp_version: The version of the pipeline specified in the pp_name column
+        pp_repo_url: URL of the VCS repository for this pipeline
+        artic_qc_outcome: Artic pipeline QC outcome, "TRUE", "FALSE" or a NULL value
+        climb_upload: Datetime files for this sample were uploaded to CLIMB
+        cog_sample_meta: A Boolean flag to mark sample metadata upload to COG
+        path_root: The uploaded files path root for the entity
+        ivar_md: ivar minimum depth used in generating the default consensus
+        pct_N_bases: Percent of N bases
+        pct_covered_bases: Percent of covered bases
+        longest_no_N_run: Longest consensus data stretch without N
+        ivar_amd: ivar minimum depth used in generating the additional consensus
+        pct_N_bases_amd: Percent of N bases in the additional consensus
+        longest_no_N_run_amd: Longest data stretch without N in the additional consensus
+        num_aligned_reads: Number of aligned filtered reads
+        """
+        super().__init__(**kwargs)
+
+
+class IseqRun(Base):
+    __tablename__ = 'iseq_run'
+    __table_args__ = {'comment': 'Table linking run and flowcell identities with the run folder '
+                'name'}
+
+    id_run = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='NPG run identifier', doc='NPG run identifier')
+    id_flowcell_lims = Column(String(20, 'utf8_unicode_ci'), index=True, comment='LIMS specific flowcell id', doc='LIMS specific flowcell id')
+    folder_name = Column(String(64, 'utf8_unicode_ci'), comment='Runfolder name', doc='Runfolder name')
+    rp__read1_number_of_cycles = Column(mysqlSMALLINT(5, unsigned=True), comment='Read 1 number of cycles', doc='Read 1 number of cycles')
+    rp__read2_number_of_cycles = Column(mysqlSMALLINT(5, unsigned=True), comment='Read 2 number of cycles', doc='Read 2 number of cycles')
+    rp__flow_cell_mode = Column(String(4, 'utf8_unicode_ci'), comment='Flowcell mode', doc='Flowcell mode')
+    rp__workflow_type = Column(String(16, 'utf8_unicode_ci'), comment='Workflow type', doc='Workflow type')
+    rp__flow_cell_consumable_version = Column(String(4, 'utf8_unicode_ci'), comment='Flowcell consumable version', doc='Flowcell consumable version')
+    rp__sbs_consumable_version = Column(String(4, 'utf8_unicode_ci'), comment='Sbs consumable version', doc='Sbs consumable version')
+
+    def __init__(self, **kwargs):
+        """Constructs a new IseqRun.
+
+        Parameters
+        ----------
+        id_run: NPG run identifier
+        id_flowcell_lims: LIMS specific flowcell id
+        folder_name: Runfolder name
+        rp__read1_number_of_cycles: Read 1 number of cycles
+        rp__read2_number_of_cycles: Read 2 number of cycles
+        rp__flow_cell_mode: Flowcell mode
+        rp__workflow_type: Workflow type
+        rp__flow_cell_consumable_version: Flowcell consumable version
+        rp__sbs_consumable_version: Sbs consumable version
+        """
+        super().__init__(**kwargs)
+
+
+class IseqRunLaneMetrics(Base):
+    __tablename__ = 'iseq_run_lane_metrics'
+    __table_args__ = (
+        Index('iseq_rlm_cancelled_and_run_complete_index', 'cancelled', 'run_complete'),
+        Index('iseq_rlm_cancelled_and_run_pending_index', 'cancelled', 'run_pending')
+    )
+
+    id_run = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, nullable=False, index=True, comment='NPG run identifier', doc='NPG run identifier')
+    position = Column(mysqlSMALLINT(2, unsigned=True), primary_key=True, nullable=False, comment='Flowcell lane number', doc='Flowcell lane number')
+    paired_read = Column(mysqlTINYINT(1, unsigned=True), nullable=False, server_default=text("'0'"))
+    cycles = Column(mysqlINTEGER(4, unsigned=True), nullable=False)
+    cancelled = Column(mysqlTINYINT(1, unsigned=True), nullable=False, server_default=text("'0'"), comment='Boolen flag to indicate whether the run was cancelled', doc='Boolen flag to indicate whether the run was cancelled')
+    flowcell_barcode = Column(String(15, 'utf8_unicode_ci'), comment='Manufacturer flowcell barcode or other identifier as recorded by NPG', doc='Manufacturer flowcell barcode or other identifier as recorded by NPG')
+    last_changed = Column(DateTime, server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'), comment='Date this record was created or changed', doc='Date this record was created or changed')
+    qc_seq = Column(mysqlTINYINT(1), comment='Sequencing lane level QC outcome, a result of either manual or automatic assessment by core', doc='Sequencing lane level QC outcome, a result of either manual or automatic assessment by core')
+    instrument_name = Column(CHAR(32, 'utf8_unicode_ci'))
+    instrument_external_name = Column(CHAR(10, 'utf8_unicode_ci'), comment='Name assigned to the instrument by the manufacturer', doc='Name assigned to the instrument by the manufacturer')
+    instrument_model = Column(CHAR(64, 'utf8_unicode_ci'))
+    instrument_side = Column(CHAR(1, 'utf8_unicode_ci'), comment='Illumina instrument side (A or B), if appropriate', doc='Illumina instrument side (A or B), if appropriate')
+    workflow_type = Column(String(20, 'utf8_unicode_ci'), comment='Illumina instrument workflow type', doc='Illumina instrument workflow type')
+    run_pending = Column(DateTime, comment='Timestamp of run pending status', doc='Timestamp of run pending status')
+    run_complete = Column(DateTime, comment='Timestamp of run complete status', doc='Timestamp of run complete status')
+    qc_complete = Column(DateTime, comment='Timestamp of qc complete status', doc='Timestamp of qc complete status')
+    pf_cluster_count = Column(mysqlBIGINT(20, unsigned=True))
+    raw_cluster_count = Column(mysqlBIGINT(20, unsigned=True))
+    raw_cluster_density = Column(mysqlDOUBLE(12, 3, unsigned=True))
+    pf_cluster_density = Column(mysqlDOUBLE(12, 3, unsigned=True))
+    pf_bases = Column(mysqlBIGINT(20, unsigned=True))
+    q20_yield_kb_forward_read = Column(mysqlINTEGER(10, unsigned=True))
+    q20_yield_kb_reverse_read = Column(mysqlINTEGER(10, unsigned=True))
+    q30_yield_kb_forward_read = Column(mysqlINTEGER(10, unsigned=True))
+    q30_yield_kb_reverse_read = Column(mysqlINTEGER(10, unsigned=True))
+    q40_yield_kb_forward_read = Column(mysqlINTEGER(10, unsigned=True))
+    q40_yield_kb_reverse_read = Column(mysqlINTEGER(10, unsigned=True))
+    tags_decode_percent = Column(mysqlFLOAT(5, 2, unsigned=True))
+    tags_decode_cv = Column(mysqlFLOAT(6, 2, unsigned=True))
+    unexpected_tags_percent = Column(mysqlFLOAT(5, 2, unsigned=True), comment='tag0_perfect_match_reads as a percentage of total_lane_reads', doc='tag0_perfect_match_reads as a percentage of total_lane_reads')
+    tag_hops_percent = Column(mysqlFLOAT(unsigned=True), comment='Percentage tag hops for dual index runs', doc='Percentage tag hops for dual index runs')
+    tag_hops_power = Column(mysqlFLOAT(unsigned=True), comment='Power to detect tag hops for dual index runs', doc='Power to detect tag hops for dual index runs')
+    run_priority = Column(mysqlTINYINT(3), comment='Sequencing lane level run priority, a result of either manual or default value set by core', doc='Sequencing lane level run priority, a result of either manual or default value set by core')
+    interop_cluster_count_total = Column(mysqlBIGINT(20, unsigned=True), comment='Total cluster count for this lane (derived from Illumina InterOp files)', doc='Total cluster count for this lane (derived from Illumina InterOp files)')
+    interop_cluster_count_mean = Column(mysqlDOUBLE(unsigned=True), comment='Total cluster count, mean value over tiles of this lane (derived from Illumina InterOp files)', doc='Total cluster count, mean value over tiles of this lane (derived from Illumina InterOp files)')
+    interop_cluster_count_stdev = Column(mysqlDOUBLE(unsigned=True), comment='Standard deviation value for interop_cluster_count_mean', doc='Standard deviation value for interop_cluster_count_mean')
+    interop_cluster_count_pf_total = Column(mysqlBIGINT(20, unsigned=True), comment='Purity-filtered cluster count for this lane (derived from Illumina InterOp files)', doc='Purity-filtered cluster count for this lane (derived from Illumina InterOp files)')
+    interop_cluster_count_pf_mean = Column(mysqlDOUBLE(unsigned=True), comment='Purity-filtered cluster count, mean value over tiles of this lane (derived from Illumina InterOp files)', doc='Purity-filtered cluster count, mean value over tiles of this lane (derived from Illumina InterOp files)')
+    interop_cluster_count_pf_stdev = Column(mysqlDOUBLE(unsigned=True), comment='Standard deviation value for interop_cluster_count_pf_mean', doc='Standard deviation value for interop_cluster_count_pf_mean')
+    interop_cluster_density_mean = Column(mysqlDOUBLE(unsigned=True), comment='Cluster density, mean value over tiles of this lane (derived from Illumina InterOp files)', doc='Cluster density, mean value over tiles of this lane (derived from Illumina InterOp files)')
+    interop_cluster_density_stdev = Column(mysqlDOUBLE(unsigned=True), comment='Standard deviation value for interop_cluster_density_mean', doc='Standard deviation value for interop_cluster_density_mean')
+    interop_cluster_density_pf_mean = Column(mysqlDOUBLE(unsigned=True), comment='Purity-filtered cluster density, mean value over tiles of this lane (derived from Illumina InterOp files)', doc='Purity-filtered cluster density, mean value over tiles of this lane (derived from Illumina InterOp files)')
+    interop_cluster_density_pf_stdev = Column(mysqlDOUBLE(unsigned=True), comment='Standard deviation value for interop_cluster_density_pf_mean', doc='Standard deviation value for interop_cluster_density_pf_mean')
+    interop_cluster_pf_mean = Column(mysqlFLOAT(5, 2, unsigned=True), comment=' Percent of purity-filtered clusters, mean value over tiles of this lane (derived from Illumina InterOp files)', doc=' Percent of purity-filtered clusters, mean value over tiles of this lane (derived from Illumina InterOp files)')
+    interop_cluster_pf_stdev = Column(mysqlFLOAT(5, 2, unsigned=True), comment='Standard deviation value for interop_cluster_pf_mean', doc='Standard deviation value for interop_cluster_pf_mean')
+    interop_occupied_mean = Column(mysqlFLOAT(5, 2, unsigned=True), comment='Percent of occupied flowcell wells, a mean value over tiles of this lane (derived from Illumina InterOp files)', doc='Percent of occupied flowcell wells, a mean value over tiles of this lane (derived from Illumina InterOp files)')
+    interop_occupied_stdev = Column(mysqlFLOAT(5, 2, unsigned=True), comment='Standard deviation value for interop_occupied_mean', doc='Standard deviation value for interop_occupied_mean')
+
+    iseq_product_metrics = relationship('IseqProductMetrics', back_populates='iseq_run_lane_metrics')
+
+    def __init__(self, **kwargs):
+        """Constructs a new IseqRunLaneMetrics.
+
+        Parameters
+        ----------
+        id_run: NPG run identifier
+        position: Flowcell lane number
+        paired_read
+        cycles
+        cancelled: Boolen flag to indicate whether the run was cancelled
+        flowcell_barcode: Manufacturer flowcell barcode or other identifier as recorded by NPG
+        last_changed: Date this record was created or changed
+        qc_seq: Sequencing lane level QC outcome, a result of either manual or automatic assessment by core
+        instrument_name
+        instrument_external_name: Name assigned to the instrument by the manufacturer
+        instrument_model
+        instrument_side: Illumina instrument side (A or B), if appropriate
+        workflow_type: Illumina instrument workflow type
+        run_pending: Timestamp of run pending status
+        run_complete: Timestamp of run complete status
+        qc_complete: Timestamp of qc complete status
+        pf_cluster_count
+        raw_cluster_count
+        raw_cluster_density
+        pf_cluster_density
+        pf_bases
+        q20_yield_kb_forward_read
+        q20_yield_kb_reverse_read
+        q30_yield_kb_forward_read
+        q30_yield_kb_reverse_read
+        q40_yield_kb_forward_read
+        q40_yield_kb_reverse_read
+        tags_decode_percent
+        tags_decode_cv
+        unexpected_tags_percent: tag0_perfect_match_reads as a percentage of total_lane_reads
+        tag_hops_percent: Percentage tag hops for dual index runs
+        tag_hops_power: Power to detect tag hops for dual index runs
+        run_priority: Sequencing lane level run priority, a result of either manual or default value set by core
+        interop_cluster_count_total: Total cluster count for this lane (derived from Illumina InterOp files)
+        interop_cluster_count_mean: Total cluster count, mean value over tiles of this lane (derived from Illumina InterOp files)
+        interop_cluster_count_stdev: Standard deviation value for interop_cluster_count_mean
+        interop_cluster_count_pf_total: Purity-filtered cluster count for this lane (derived from Illumina InterOp files)
+        interop_cluster_count_pf_mean: Purity-filtered cluster count, mean value over tiles of this lane (derived from Illumina InterOp files)
+        interop_cluster_count_pf_stdev: Standard deviation value for interop_cluster_count_pf_mean
+        interop_cluster_density_mean: Cluster density, mean value over tiles of this lane (derived from Illumina InterOp files)
+        interop_cluster_density_stdev: Standard deviation value for interop_cluster_density_mean
+        interop_cluster_density_pf_mean: Purity-filtered cluster density, mean value over tiles of this lane (derived from Illumina InterOp files)
+        interop_cluster_density_pf_stdev: Standard deviation value for interop_cluster_density_pf_mean
+        interop_cluster_pf_mean:  Percent of purity-filtered clusters, mean value over tiles of this lane (derived from Illumina InterOp files)
+        interop_cluster_pf_stdev: Standard deviation value for interop_cluster_pf_mean
+        interop_occupied_mean: Percent of occupied flowcell wells, a mean value over tiles of this lane (derived from Illumina InterOp files)
+        interop_occupied_stdev: Standard deviation value for interop_occupied_mean
+        """
+        super().__init__(**kwargs)
+
+
+class IseqRunStatusDict(Base):
+    __tablename__ = 'iseq_run_status_dict'
+
+    id_run_status_dict = Column(mysqlINTEGER(10, unsigned=True), primary_key=True)
+    description = Column(String(64, 'utf8_unicode_ci'), nullable=False, index=True)
+    iscurrent = Column(mysqlTINYINT(3, unsigned=True), nullable=False)
+    temporal_index = Column(mysqlSMALLINT(5, unsigned=True))
+
+    iseq_run_status = relationship('IseqRunStatus', back_populates='iseq_run_status_dict')
+
+    def __init__(self, **kwargs):
+        """Constructs a new IseqRunStatusDict.
+
+        Parameters
+        ----------
+        id_run_status_dict
+        description
+        iscurrent
+        temporal_index
+        """
+        super().__init__(**kwargs)
+
+
+class IseqExternalProductComponents(Base):
+    __tablename__ = 'iseq_external_product_components'
+    __table_args__ = (
+        Index('iseq_ext_pr_comp_compi', 'component_index', 'num_components'),
+        Index('iseq_ext_pr_comp_ncomp', 'num_components', 'id_iseq_product'),
+        Index('iseq_ext_pr_comp_unique', 'id_iseq_product', 'id_iseq_product_ext', unique=True),
+        {'comment': 'Table linking iseq_external_product_metrics table products to '
+                'components in the iseq_product_metrics table'}
+    )
+
+    id_iseq_ext_pr_components_tmp = Column(mysqlBIGINT(20, unsigned=True), primary_key=True, comment='Internal to this database id, value can change', doc='Internal to this database id, value can change')
+    id_iseq_product_ext = Column(ForeignKey('iseq_external_product_metrics.id_iseq_product'), nullable=False, index=True, comment='id (digest) for the external product composition', doc='id (digest) for the external product composition')
+    id_iseq_product = Column(CHAR(64, 'utf8_unicode_ci'), nullable=False, comment='id (digest) for one of the products components', doc='id (digest) for one of the products components')
+    num_components = Column(mysqlTINYINT(3, unsigned=True), nullable=False, comment='Number of component products for this product', doc='Number of component products for this product')
+    component_index = Column(mysqlTINYINT(3, unsigned=True), nullable=False, comment='Unique component index within all components of this product, a value from 1 to the value of num_components column for this product', doc='Unique component index within all components of this product, a value from 1 to the value of num_components column for this product')
+
+    iseq_external_product_metrics = relationship('IseqExternalProductMetrics', back_populates='iseq_external_product_components')
+
+    def __init__(self, **kwargs):
+        """Constructs a new IseqExternalProductComponents.
+
+        Parameters
+        ----------
+        id_iseq_ext_pr_components_tmp: Internal to this database id, value can change
+        id_iseq_product_ext: id (digest) for the external product composition
+        id_iseq_product: id (digest) for one of the products components
+        num_components: Number of component products for this product
+        component_index: Unique component index within all components of this product, a value from 1 to the value of num_components column for this product
+        """
+        super().__init__(**kwargs)
+
+
+class IseqFlowcell(Base):
+    __tablename__ = 'iseq_flowcell'
+    __table_args__ = (
+        Index('index_iseq_flowcell_id_flowcell_lims_position_tag_index_id_lims', 'id_flowcell_lims', 'position', 'tag_index', 'id_lims', unique=True),
+        Index('index_iseqflowcell__flowcell_barcode__position__tag_index', 'flowcell_barcode', 'position', 'tag_index'),
+        Index('index_iseqflowcell__id_flowcell_lims__position__tag_index', 'id_flowcell_lims', 'position', 'tag_index'),
+        Index('iseq_flowcell_id_lims_id_flowcell_lims_index', 'id_lims', 'id_flowcell_lims')
+    )
+
+    id_iseq_flowcell_tmp = Column(mysqlINTEGER(10, unsigned=True), primary_key=True, comment='Internal to this database id, value can change', doc='Internal to this database id, value can change')
+    last_updated = Column(DateTime, nullable=False, comment='Timestamp of last update', doc='Timestamp of last update')
+    recorded_at = Column(DateTime, nullable=False, comment='Timestamp of warehouse update', doc='Timestamp of warehouse update')
+    id_sample_tmp = Column(ForeignKey('sample.id_sample_tmp'), nullable=False, index=True, comment='Sample id, see "sample.id_sample_tmp"', doc='Sample id, see "sample.id_sample_tmp"')
+    id_lims = Column(String(10, 'utf8_unicode_ci'), nullable=False, comment='LIM system identifier, e.g. CLARITY-GCLP, SEQSCAPE', doc='LIM system identifier, e.g. CLARITY-GCLP, SEQSCAPE')
+    id_flowcell_lims = Column(String(20, 'utf8_unicode_ci'), nullable=False, comment='LIMs-specific flowcell id, batch_id for Sequencescape', doc='LIMs-specific flowcell id, batch_id for Sequencescape')
+    position = Column(mysqlSMALLINT(2, unsigned=True), nullable=False, comment='Flowcell lane number', doc='Flowcell lane number')
+    entity_type = Column(String(30, 'utf8_unicode_ci'), nullable=False, comment='Lane type: library, pool, library_control, library_indexed, library_indexed_spike', doc='Lane type: library, pool, library_control, library_indexed, library_indexed_spike')
+    entity_id_lims = Column(String(20, 'utf8_unicode_ci'), nullable=False, comment='Most specific LIMs identifier associated with this lane or plex or spike', doc='Most specific LIMs identifier associated with this lane or plex or spike')
+    is_spiked = Column(mysqlTINYINT(1), nullable=False, server_default=text("'0'"), comment='Boolean flag indicating presence of a spike', doc='Boolean flag indicating presence of a spike')
+    id_pool_lims = Column(String(20, 'utf8_unicode_ci'), nullable=False, index=True, comment='Most specific LIMs identifier associated with the pool', doc='Most specific LIMs identifier associated with the pool')
+    id_study_tmp = Column(ForeignKey('study.id_study_tmp'), index=True, comment='Study id, see "study.id_study_tmp"', doc='Study id, see "study.id_study_tmp"')
+    cost_code = Column(String(20, 'utf8_unicode_ci'), comment='Valid WTSI cost code', doc='Valid WTSI cost code')
+    is_r_and_d = Column(mysqlTINYINT(1), server_default=text("'0'"), comment='A boolean flag derived from cost code, flags RandD', doc='A boolean flag derived from cost code, flags RandD')
+    priority = Column(mysqlSMALLINT(2, unsigned=True), server_default=text("'1'"), comment='Priority', doc='Priority')
+    manual_qc = Column(mysqlTINYINT(1), comment='Legacy QC decision value set per lane which may be used for per-lane billing: iseq_product_metrics.qc is likely to contain the per product QC summary of use to most downstream users', doc='Legacy QC decision value set per lane which may be used for per-lane billing: iseq_product_metrics.qc is likely to contain the per product QC summary of use to most downstream users')
+    external_release = Column(mysqlTINYINT(1), comment='Defaults to manual qc value; can be changed by the user later', doc='Defaults to manual qc value; can be changed by the user later')
+    flowcell_barcode = Column(String(15, 'utf8_unicode_ci'), comment='Manufacturer flowcell barcode or other identifier', doc='Manufacturer flowcell barcode or other identifier')
+    tag_index = Column(mysqlSMALLINT(5, unsigned=True), comment='Tag index, NULL if lane is not a pool', doc='Tag index, NULL if lane is not a pool')
+    tag_sequence = Column(String(30, 'utf8_unicode_ci'), comment='Tag sequence', doc='Tag sequence')
+    tag_set_id_lims = Column(String(20, 'utf8_unicode_ci'), comment='LIMs-specific identifier of the tag set', doc='LIMs-specific identifier of the tag set')
+    tag_set_name = Column(String(100, 'utf8_unicode_ci'), comment='WTSI-wide tag set name', doc='WTSI-wide tag set name')
+    tag_identifier = Column(String(30, 'utf8_unicode_ci'), comment='The position of tag within the tag group', doc='The position of tag within the tag group')
+    tag2_sequence = Column(String(30, 'utf8_unicode_ci'), comment='Tag sequence for tag 2', doc='Tag sequence for tag 2')
+    tag2_set_id_lims = Column(String(20, 'utf8_unicode_ci'), comment='LIMs-specific identifier of the tag set for tag 2', doc='LIMs-specific identifier of the tag set for tag 2')
+    tag2_set_name = Column(String(100, 'utf8_unicode_ci'), comment='WTSI-wide tag set name for tag 2', doc='WTSI-wide tag set name for tag 2')
+    tag2_identifier = Column(String(30, 'utf8_unicode_ci'), comment='The position of tag2 within the tag group', doc='The position of tag2 within the tag group')
+    pipeline_id_lims = Column(String(60, 'utf8_unicode_ci'), comment='LIMs-specific pipeline identifier that unambiguously defines library type', doc='LIMs-specific pipeline identifier that unambiguously defines library type')
+    bait_name = Column(String(50, 'utf8_unicode_ci'), comment='WTSI-wide name that uniquely identifies a bait set', doc='WTSI-wide name that uniquely identifies a bait set')
+    requested_insert_size_from = Column(mysqlINTEGER(5, unsigned=True), comment='Requested insert size min value', doc='Requested insert size min value')
+    requested_insert_size_to = Column(mysqlINTEGER(5, unsigned=True), comment='Requested insert size max value', doc='Requested insert size max value')
+    forward_read_length = Column(mysqlSMALLINT(4, unsigned=True), comment='Requested forward read length, bp', doc='Requested forward read length, bp')
+    reverse_read_length = Column(mysqlSMALLINT(4, unsigned=True), comment='Requested reverse read length, bp', doc='Requested reverse read length, bp')
+    legacy_library_id = Column(mysqlINTEGER(11), index=True, comment='Legacy library_id for backwards compatibility.', doc='Legacy library_id for backwards compatibility.')
+    id_library_lims = Column(String(255, 'utf8_unicode_ci'), index=True, comment='Earliest LIMs identifier associated with library creation', doc='Earliest LIMs identifier associated with library creation')
+    team = Column(String(255, 'utf8_unicode_ci'), comment='The team responsible for creating the flowcell', doc='The team responsible for creating the flowcell')
+    purpose = Column(String(30, 'utf8_unicode_ci'), comment='Describes the reason the sequencing was conducted. Eg. Standard, QC, Control', doc='Describes the reason the sequencing was conducted. Eg. Standard, QC, Control')
+    suboptimal = Column(mysqlTINYINT(1), comment='Indicates that a sample has failed a QC step during processing', doc='Indicates that a sample has failed a QC step during processing')
+    primer_panel = Column(String(255, 'utf8_unicode_ci'), comment='Primer Panel name', doc='Primer Panel name')
+    spiked_phix_barcode = Column(String(20, 'utf8_unicode_ci'), comment='Barcode of the PhiX tube added to the lane', doc='Barcode of the PhiX tube added to the lane')
+    spiked_phix_percentage = Column(Float, comment='Percentage PhiX tube spiked in the pool in terms of molar concentration', doc='Percentage PhiX tube spiked in the pool in terms of molar concentration')
+    loading_concentration = Column(Float, comment='Final instrument loading concentration (pM)', doc='Final instrument loading concentration (pM)')
+    workflow = Column(String(20, 'utf8_unicode_ci'), comment='Workflow used when processing the flowcell', doc='Workflow used when processing the flowcell')
+
+    sample = relationship('Sample', back_populates='iseq_flowcell')
+    study = relationship('Study', back_populates='iseq_flowcell')
+    iseq_product_metrics = relationship('IseqProductMetrics', back_populates='iseq_flowcell')
+
+    def __init__(self, **kwargs):
+        """Constructs a new IseqFlowcell.
+
+        Parameters
+        ----------
+        id_iseq_flowcell_tmp: Internal to this database id, value can change
+        last_updated: Timestamp of last update
+        recorded_at: Timestamp of warehouse update
+        id_sample_tmp: Sample id, see "sample.id_sample_tmp"
+        id_lims: LIM system identifier, e.g. CLARITY-GCLP, SEQSCAPE
+        id_flowcell_lims: LIMs-specific flowcell id, batch_id for Sequencescape
+        position: Flowcell lane number
+        entity_type: Lane type: library, pool, library_control, library_indexed, library_indexed_spike
+        entity_id_lims: Most specific LIMs identifier associated with this lane or plex or spike
+        is_spiked: Boolean flag indicating presence of a spike
+        id_pool_lims: Most specific LIMs identifier associated with the pool
+        id_study_tmp: Study id, see "study.id_study_tmp"
+        cost_code: Valid WTSI cost code
+        is_r_and_d: A boolean flag derived from cost code, flags RandD
+        priority: Priority
+        manual_qc: Legacy QC decision value set per lane which may be used for per-lane billing: iseq_product_metrics.qc is likely to contain the per product QC summary of use to most downstream users
+        external_release: Defaults to manual qc value; can be changed by the user later
+        flowcell_barcode: Manufacturer flowcell barcode or other identifier
+        tag_index: Tag index, NULL if lane is not a pool
+        tag_sequence: Tag sequence
+        tag_set_id_lims: LIMs-specific identifier of the tag set
+        tag_set_name: WTSI-wide tag set name
+        tag_identifier: The position of tag within the tag group
+        tag2_sequence: Tag sequence for tag 2
+        tag2_set_id_lims: LIMs-specific identifier of the tag set for tag 2
+        tag2_set_name: WTSI-wide tag set name for tag 2
+        tag2_identifier: The position of tag2 within the tag group
+        pipeline_id_lims: LIMs-specific pipeline identifier that unambiguously defines library type
+        bait_name: WTSI-wide name that uniquely identifies a bait set
+        requested_insert_size_from: Requested insert size min value
+        requested_insert_size_to: Requested insert size max value
+        forward_read_length: Requested forward read length, bp
+        reverse_read_length: Requested reverse read length, bp
+        legacy_library_id: Legacy library_id for backwards compatibility.
+        id_library_lims: Earliest LIMs identifier associated with library creation
+        team: The team responsible for creating the flowcell
+        purpose: Describes the reason the sequencing was conducted. Eg. Standard, QC, Control
+        suboptimal: Indicates that a sample has failed a QC step during processing
+        primer_panel: Primer Panel name
+        spiked_phix_barcode: Barcode of the PhiX tube added to the lane
+        spiked_phix_percentage: Percentage PhiX tube spiked in the pool in terms of molar concentration
+        loading_concentration: Final instrument loading concentration (pM)
+        workflow: Workflow used when processing the flowcell
+        """
+        super().__init__(**kwargs)
+
+
+class IseqRunInfo(IseqRun):
+    __tablename__ = 'iseq_run_info'
+    __table_args__ = {'comment': 'Table storing selected text files from the run folder'}
+
+    id_run = Column(ForeignKey('iseq_run.id_run'), primary_key=True, comment='NPG run identifier', doc='NPG run identifier')
+    run_parameters_xml = Column(Text(collation='utf8_unicode_ci'), comment="The contents of Illumina's {R,r}unParameters.xml file", doc="The contents of Illumina's {R,r}unParameters.xml file")
+
+    def __init__(self, **kwargs):
+        """Constructs a new IseqRunInfo.
+
+        Parameters
+        ----------
+        id_run: NPG run identifier
+        run_parameters_xml: The contents of Illumina's {R,r}unParameters.xml file
+        """
+        super().__init__(**kwargs)
+
+
+class IseqRunStatus(Base):
+    __tablename__ = 'iseq_run_status'
+
+    id_run_status = Column(mysqlINTEGER(11, unsigned=True), primary_key=True)
+    id_run = Column(mysqlINTEGER(10, unsigned=True), nullable=False, index=True, comment='NPG run identifier', doc='NPG run identifier')
+    date = Column(DateTime, nullable=False, comment='Status timestamp', doc='Status timestamp')
+    id_run_status_dict = Column(ForeignKey('iseq_run_status_dict.id_run_status_dict'), nullable=False, index=True, comment='Status identifier, see iseq_run_status_dict.id_run_status_dict', doc='Status identifier, see iseq_run_status_dict.id_run_status_dict')
+    iscurrent = Column(mysqlTINYINT(1), nullable=False, comment='Boolean flag, 1 is the status is current, 0 otherwise', doc='Boolean flag, 1 is the status is current, 0 otherwise')
+
+    iseq_run_status_dict = relationship('IseqRunStatusDict', back_populates='iseq_run_status')
+
+    def __init__(self, **kwargs):
+        """Constructs a new IseqRunStatus.
+
+        Parameters
+        ----------
+        id_run_status
+        id_run: NPG run identifier
+        date: Status timestamp
+        id_run_status_dict: Status identifier, see iseq_run_status_dict.id_run_status_dict
+        iscurrent: Boolean flag, 1 is the status is current, 0 otherwise
+        """
+        super().__init__(**kwargs)
+
+
+class IseqProductMetrics(Base):
+    __tablename__ = 'iseq_product_metrics'
+    __table_args__ = (
+        ForeignKeyConstraint(['id_run', 'position'], ['iseq_run_lane_metrics.id_run', 'iseq_run_lane_metrics.position'], ondelete='CASCADE'),
+        Index('iseq_pm_fcid_run_pos_tag_index', 'id_run', 'position', 'tag_index')
+    )
+
+    id_iseq_pr_metrics_tmp = Column(mysqlBIGINT(20, unsigned=True), primary_key=True, comment='Internal to this database id, value can change', doc='Internal to this database id, value can change')
+    id_iseq_product = Column(CHAR(64, 'utf8_unicode_ci'), nullable=False, unique=True, comment='Product id', doc='Product id')
+    last_changed = Column(DateTime, server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'), comment='Date this record was created or changed', doc='Date this record was created or changed')
+    id_iseq_flowcell_tmp = Column(ForeignKey('iseq_flowcell.id_iseq_flowcell_tmp', ondelete='SET NULL'), index=True, comment='Flowcell id, see "iseq_flowcell.id_iseq_flowcell_tmp"', doc='Flowcell id, see "iseq_flowcell.id_iseq_flowcell_tmp"')
+    id_run = Column(mysqlINTEGER(10, unsigned=True), comment='NPG run identifier', doc='NPG run identifier')
+    position = Column(mysqlSMALLINT(2, unsigned=True), comment='Flowcell lane number', doc='Flowcell lane number')
+    tag_index = Column(mysqlSMALLINT(5, unsigned=True), comment='Tag index, NULL if lane is not a pool', doc='Tag index, NULL if lane is not a pool')
+    iseq_composition_tmp = Column(String(600, 'utf8_unicode_ci'), comment='JSON representation of the composition object, the column might be deleted in future', doc='JSON representation of the composition object, the column might be deleted in future')
+    qc_seq = Column(mysqlTINYINT(1), comment='Sequencing lane level QC outcome, a result of either manual or automatic assessment by core', doc='Sequencing lane level QC outcome, a result of either manual or automatic assessment by core')
+    qc_lib = Column(mysqlTINYINT(1), comment='Library QC outcome, a result of either manual or automatic assessment by core', doc='Library QC outcome, a result of either manual or automatic assessment by core')
+    qc_user = Column(mysqlTINYINT(1), comment='Library QC outcome according to the data user criteria, a result of either manual or automatic assessment', doc='Library QC outcome according to the data user criteria, a result of either manual or automatic assessment')
+    qc = Column(mysqlTINYINT(1), comment='Overall QC assessment outcome, a logical product (conjunction) of qc_seq and qc_lib values, defaults to the qc_seq value when qc_lib is not defined', doc='Overall QC assessment outcome, a logical product (conjunction) of qc_seq and qc_lib values, defaults to the qc_seq value when qc_lib is not defined')
+    tag_sequence4deplexing = Column(String(30, 'utf8_unicode_ci'), comment='Tag sequence used for deplexing the lane, common suffix might have been truncated', doc='Tag sequence used for deplexing the lane, common suffix might have been truncated')
+    actual_forward_read_length = Column(mysqlSMALLINT(4, unsigned=True), comment='Actual forward read length, bp', doc='Actual forward read length, bp')
+    actual_reverse_read_length = Column(mysqlSMALLINT(4, unsigned=True), comment='Actual reverse read length, bp', doc='Actual reverse read length, bp')
+    indexing_read_length = Column(mysqlSMALLINT(2, unsigned=True), comment='Indexing read length, bp', doc='Indexing read length, bp')
+    tag_decode_percent = Column(mysqlFLOAT(5, 2, unsigned=True))
+    tag_decode_count = Column(mysqlINTEGER(10, unsigned=True))
+    insert_size_quartile1 = Column(mysqlSMALLINT(5, unsigned=True))
+    insert_size_quartile3 = Column(mysqlSMALLINT(5, unsigned=True))
+    insert_size_median = Column(mysqlSMALLINT(5, unsigned=True))
+    insert_size_num_modes = Column(mysqlSMALLINT(4, unsigned=True))
+    insert_size_normal_fit_confidence = Column(mysqlFLOAT(3, 2, unsigned=True))
+    gc_percent_forward_read = Column(mysqlFLOAT(5, 2, unsigned=True))
+    gc_percent_reverse_read = Column(mysqlFLOAT(5, 2, unsigned=True))
+    sequence_mismatch_percent_forward_read = Column(mysqlFLOAT(4, 2, unsigned=True))
+    sequence_mismatch_percent_reverse_read = Column(mysqlFLOAT(4, 2, unsigned=True))
+    adapters_percent_forward_read = Column(mysqlFLOAT(5, 2, unsigned=True))
+    adapters_percent_reverse_read = Column(mysqlFLOAT(5, 2, unsigned=True))
+    ref_match1_name = Column(String(100, 'utf8_unicode_ci'))
+    ref_match1_percent = Column(mysqlFLOAT(5, 2))
+    ref_match2_name = Column(String(100, 'utf8_unicode_ci'))
+    ref_match2_percent = Column(mysqlFLOAT(5, 2))
+    q20_yield_kb_forward_read = Column(mysqlINTEGER(10, unsigned=True))
+    q20_yield_kb_reverse_read = Column(mysqlINTEGER(10, unsigned=True))
+    q30_yield_kb_forward_read = Column(mysqlINTEGER(10, unsigned=True))
+    q30_yield_kb_reverse_read = Column(mysqlINTEGER(10, unsigned=True))
+    q40_yield_kb_forward_read = Column(mysqlINTEGER(10, unsigned=True))
+    q40_yield_kb_reverse_read = Column(mysqlINTEGER(10, unsigned=True))
+    num_reads = Column(mysqlBIGINT(20, unsigned=True))
+    percent_mapped = Column(mysqlFLOAT(5, 2))
+    percent_duplicate = Column(mysqlFLOAT(5, 2))
+    chimeric_reads_percent = Column(mysqlFLOAT(5, 2, unsigned=True), comment='mate_mapped_defferent_chr_5 as percentage of all', doc='mate_mapped_defferent_chr_5 as percentage of all')
+    human_percent_mapped = Column(mysqlFLOAT(5, 2))
+    human_percent_duplicate = Column(mysqlFLOAT(5, 2))
+    genotype_sample_name_match = Column(String(8, 'utf8_unicode_ci'))
+    genotype_sample_name_relaxed_match = Column(String(8, 'utf8_unicode_ci'))
+    genotype_mean_depth = Column(mysqlFLOAT(7, 2))
+    mean_bait_coverage = Column(mysqlFLOAT(8, 2, unsigned=True))
+    on_bait_percent = Column(mysqlFLOAT(5, 2, unsigned=True))
+    on_or_near_bait_percent = Column(mysqlFLOAT(5, 2, unsigned=True))
+    verify_bam_id_average_depth = Column(mysqlFLOAT(11, 2, unsigned=True))
+    verify_bam_id_score = Column(mysqlFLOAT(6, 5, unsigned=True))
+    verify_bam_id_snp_count = Column(mysqlINTEGER(10, unsigned=True))
+    rna_exonic_rate = Column(mysqlFLOAT(unsigned=True), comment='Exonic Rate is the fraction mapping within exons', doc='Exonic Rate is the fraction mapping within exons')
+    rna_percent_end_2_reads_sense = Column(mysqlFLOAT(unsigned=True), comment='Percentage of intragenic End 2 reads that were sequenced in the sense direction.', doc='Percentage of intragenic End 2 reads that were sequenced in the sense direction.')
+    rna_rrna_rate = Column(mysqlFLOAT(unsigned=True), comment='rRNA Rate is per total reads', doc='rRNA Rate is per total reads')
+    rna_genes_detected = Column(mysqlINTEGER(10, unsigned=True), comment='Number of genes detected with at least 5 reads.', doc='Number of genes detected with at least 5 reads.')
+    rna_norm_3_prime_coverage = Column(mysqlFLOAT(unsigned=True), comment='3 prime n-based normalization: n is the transcript length at that end; norm is the ratio between the coverage at the 3 prime end and the average coverage of the full transcript, averaged over all transcripts', doc='3 prime n-based normalization: n is the transcript length at that end; norm is the ratio between the coverage at the 3 prime end and the average coverage of the full transcript, averaged over all transcripts')
+    rna_norm_5_prime_coverage = Column(mysqlFLOAT(unsigned=True), comment='5 prime n-based normalization: n is the transcript length at that end; norm is the ratio between the coverage at the 5 prime end and the average coverage of the full transcript, averaged over all transcripts', doc='5 prime n-based normalization: n is the transcript length at that end; norm is the ratio between the coverage at the 5 prime end and the average coverage of the full transcript, averaged over all transcripts')
+    rna_intronic_rate = Column(mysqlFLOAT(unsigned=True), comment='Intronic rate is the fraction mapping within introns', doc='Intronic rate is the fraction mapping within introns')
+    rna_transcripts_detected = Column(mysqlINTEGER(10, unsigned=True), comment='Number of transcripts detected with at least 5 reads', doc='Number of transcripts detected with at least 5 reads')
+    rna_globin_percent_tpm = Column(mysqlFLOAT(unsigned=True), comment='Percentage of globin genes TPM (transcripts per million) detected', doc='Percentage of globin genes TPM (transcripts per million) detected')
+    rna_mitochondrial_percent_tpm = Column(mysqlFLOAT(unsigned=True), comment='Percentage of mitochondrial genes TPM (transcripts per million) detected', doc='Percentage of mitochondrial genes TPM (transcripts per million) detected')
+    gbs_call_rate = Column(mysqlFLOAT(unsigned=True), comment='The GbS call rate is the fraction of loci called on the relevant primer panel', doc='The GbS call rate is the fraction of loci called on the relevant primer panel')
+    gbs_pass_rate = Column(mysqlFLOAT(unsigned=True), comment='The GbS pass rate is the fraction of loci called and passing filters on the relevant primer panel', doc='The GbS pass rate is the fraction of loci called and passing filters on the relevant primer panel')
+    nrd_percent = Column(mysqlFLOAT(5, 2), comment='Percent of non-reference discordance', doc='Percent of non-reference discordance')
+    target_filter = Column(String(30, 'utf8_unicode_ci'), comment='Filter used to produce the target stats file', doc='Filter used to produce the target stats file')
+    target_length = Column(mysqlBIGINT(12, unsigned=True), comment='The total length of the target regions', doc='The total length of the target regions')
+    target_mapped_reads = Column(mysqlBIGINT(20, unsigned=True), comment='The number of mapped reads passing the target filter', doc='The number of mapped reads passing the target filter')
+    target_proper_pair_mapped_reads = Column(mysqlBIGINT(20, unsigned=True), comment='The number of proper pair mapped reads passing the target filter', doc='The number of proper pair mapped reads passing the target filter')
+    target_mapped_bases = Column(mysqlBIGINT(20, unsigned=True), comment='The number of mapped bases passing the target filter', doc='The number of mapped bases passing the target filter')
+    target_coverage_threshold = Column(mysqlINTEGER(4), comment='The coverage threshold used in the target perc target greater than depth calculation', doc='The coverage threshold used in the target perc target greater than depth calculation')
+    target_percent_gt_coverage_threshold = Column(mysqlFLOAT(5, 2), comment='The percentage of the target covered at greater than the depth specified', doc='The percentage of the target covered at greater than the depth specified')
+    target_autosome_coverage_threshold = Column(mysqlINTEGER(4), comment='The coverage threshold used in the perc target autosome greater than depth calculation', doc='The coverage threshold used in the perc target autosome greater than depth calculation')
+    target_autosome_percent_gt_coverage_threshold = Column(mysqlFLOAT(5, 2), comment='The percentage of the target autosome covered at greater than the depth specified', doc='The percentage of the target autosome covered at greater than the depth specified')
+    sub_titv_class = Column(mysqlFLOAT(unsigned=True), comment='The ratio of transition substitution counts to transvertion', doc='The ratio of transition substitution counts to transvertion')
+    sub_titv_mean_ca = Column(mysqlFLOAT(unsigned=True), comment='TiTv where count of CA+GT is taken as if it were mean across other transversions', doc='TiTv where count of CA+GT is taken as if it were mean across other transversions')
+    sub_frac_sub_hq = Column(mysqlFLOAT(unsigned=True), comment='Fraction of substitutions which are high quality (>=Q30)', doc='Fraction of substitutions which are high quality (>=Q30)')
+    sub_oxog_bias = Column(mysqlFLOAT(unsigned=True), comment='How similar CA to GT counts are within each read (high quality >=Q30 substitutions only) in order to detect OxoG oxidative artifacts', doc='How similar CA to GT counts are within each read (high quality >=Q30 substitutions only) in order to detect OxoG oxidative artifacts')
+    sub_sym_gt_ca = Column(mysqlFLOAT(unsigned=True), comment='How symmetrical CA and GT counts are within each read', doc='How symmetrical CA and GT counts are within each read')
+    sub_sym_ct_ga = Column(mysqlFLOAT(unsigned=True), comment='How symmetrical CT and GA counts are within each read', doc='How symmetrical CT and GA counts are within each read')
+    sub_sym_ag_tc = Column(mysqlFLOAT(unsigned=True), comment='How symmetrical AG and TC counts are within each read', doc='How symmetrical AG and TC counts are within each read')
+    sub_cv_ti = Column(mysqlFLOAT(unsigned=True), comment='Coefficient of variation across all Ti substitutions = std(Ti)/mean(Ti)', doc='Coefficient of variation across all Ti substitutions = std(Ti)/mean(Ti)')
+    sub_gt_ti = Column(mysqlFLOAT(unsigned=True), comment='Computed as a maximum between (i) ratio of GT counts to TC and (ii) ratio CA to GA', doc='Computed as a maximum between (i) ratio of GT counts to TC and (ii) ratio CA to GA')
+    sub_gt_mean_ti = Column(mysqlFLOAT(unsigned=True), comment='Computed as a maximum between (i) ratio of GT counts to mean(Ti) and (ii) ratio CA to mean(Ti)', doc='Computed as a maximum between (i) ratio of GT counts to mean(Ti) and (ii) ratio CA to mean(Ti)')
+    sub_ctoa_oxh = Column(mysqlFLOAT(unsigned=True), comment='This metric is used to compute the likelihood of C2A and its predicted level', doc='This metric is used to compute the likelihood of C2A and its predicted level')
+    sub_ctoa_art_predicted_level = Column(mysqlTINYINT(1, unsigned=True), comment='C2A predicted level - 0 = not present, 1 = low, 2 = medium and 3 = high', doc='C2A predicted level - 0 = not present, 1 = low, 2 = medium and 3 = high')
+
+    iseq_flowcell = relationship('IseqFlowcell', back_populates='iseq_product_metrics')
+    iseq_run_lane_metrics = relationship('IseqRunLaneMetrics', back_populates='iseq_product_metrics')
+    iseq_product_ampliconstats = relationship('IseqProductAmpliconstats', back_populates='iseq_product_metrics')
+    iseq_product_components = relationship('IseqProductComponents', foreign_keys='[IseqProductComponents.id_iseq_pr_component_tmp]', back_populates='iseq_product_metrics')
+    iseq_product_components_ = relationship('IseqProductComponents', foreign_keys='[IseqProductComponents.id_iseq_pr_tmp]', back_populates='iseq_product_metrics_')
+
+    def __init__(self, **kwargs):
+        """Constructs a new IseqProductMetrics.
+
+        Parameters
+        ----------
+        id_iseq_pr_metrics_tmp: Internal to this database id, value can change
+        id_iseq_product: Product id
+        last_changed: Date this record was created or changed
+        id_iseq_flowcell_tmp: Flowcell id, see "iseq_flowcell.id_iseq_flowcell_tmp"
+        id_run: NPG run identifier
+        position: Flowcell lane number
+        tag_index: Tag index, NULL if lane is not a pool
+        iseq_composition_tmp: JSON representation of the composition object, the column might be deleted in future
+        qc_seq: Sequencing lane level QC outcome, a result of either manual or automatic assessment by core
+        qc_lib: Library QC outcome, a result of either manual or automatic assessment by core
+        qc_user: Library QC outcome according to the data user criteria, a result of either manual or automatic assessment
+        qc: Overall QC assessment outcome, a logical product (conjunction) of qc_seq and qc_lib values, defaults to the qc_seq value when qc_lib is not defined
+        tag_sequence4deplexing: Tag sequence used for deplexing the lane, common suffix might have been truncated
+        actual_forward_read_length: Actual forward read length, bp
+        actual_reverse_read_length: Actual reverse read length, bp
+        indexing_read_length: Indexing read length, bp
+        tag_decode_percent
+        tag_decode_count
+        insert_size_quartile1
+        insert_size_quartile3
+        insert_size_median
+        insert_size_num_modes
+        insert_size_normal_fit_confidence
+        gc_percent_forward_read
+        gc_percent_reverse_read
+        sequence_mismatch_percent_forward_read
+        sequence_mismatch_percent_reverse_read
+        adapters_percent_forward_read
+        adapters_percent_reverse_read
+        ref_match1_name
+        ref_match1_percent
+        ref_match2_name
+        ref_match2_percent
+        q20_yield_kb_forward_read
+        q20_yield_kb_reverse_read
+        q30_yield_kb_forward_read
+        q30_yield_kb_reverse_read
+        q40_yield_kb_forward_read
+        q40_yield_kb_reverse_read
+        num_reads
+        percent_mapped
+        percent_duplicate
+        chimeric_reads_percent: mate_mapped_defferent_chr_5 as percentage of all
+        human_percent_mapped
+        human_percent_duplicate
+        genotype_sample_name_match
+        genotype_sample_name_relaxed_match
+        genotype_mean_depth
+        mean_bait_coverage
+        on_bait_percent
+        on_or_near_bait_percent
+        verify_bam_id_average_depth
+        verify_bam_id_score
+        verify_bam_id_snp_count
+        rna_exonic_rate: Exonic Rate is the fraction mapping within exons
+        rna_percent_end_2_reads_sense: Percentage of intragenic End 2 reads that were sequenced in the sense direction.
+        rna_rrna_rate: rRNA Rate is per total reads
+        rna_genes_detected: Number of genes detected with at least 5 reads.
+        rna_norm_3_prime_coverage: 3 prime n-based normalization: n is the transcript length at that end; norm is the ratio between the coverage at the 3 prime end and the average coverage of the full transcript, averaged over all transcripts
+        rna_norm_5_prime_coverage: 5 prime n-based normalization: n is the transcript length at that end; norm is the ratio between the coverage at the 5 prime end and the average coverage of the full transcript, averaged over all transcripts
+        rna_intronic_rate: Intronic rate is the fraction mapping within introns
+        rna_transcripts_detected: Number of transcripts detected with at least 5 reads
+        rna_globin_percent_tpm: Percentage of globin genes TPM (transcripts per million) detected
+        rna_mitochondrial_percent_tpm: Percentage of mitochondrial genes TPM (transcripts per million) detected
+        gbs_call_rate: The GbS call rate is the fraction of loci called on the relevant primer panel
+        gbs_pass_rate: The GbS pass rate is the fraction of loci called and passing filters on the relevant primer panel
+        nrd_percent: Percent of non-reference discordance
+        target_filter: Filter used to produce the target stats file
+        target_length: The total length of the target regions
+        target_mapped_reads: The number of mapped reads passing the target filter
+        target_proper_pair_mapped_reads: The number of proper pair mapped reads passing the target filter
+        target_mapped_bases: The number of mapped bases passing the target filter
+        target_coverage_threshold: The coverage threshold used in the target perc target greater than depth calculation
+        target_percent_gt_coverage_threshold: The percentage of the target covered at greater than the depth specified
+        target_autosome_coverage_threshold: The coverage threshold used in the perc target autosome greater than depth calculation
+        target_autosome_percent_gt_coverage_threshold: The percentage of the target autosome covered at greater than the depth specified
+        sub_titv_class: The ratio of transition substitution counts to transvertion
+        sub_titv_mean_ca: TiTv where count of CA+GT is taken as if it were mean across other transversions
+        sub_frac_sub_hq: Fraction of substitutions which are high quality (>=Q30)
+        sub_oxog_bias: How similar CA to GT counts are within each read (high quality >=Q30 substitutions only) in order to detect OxoG oxidative artifacts
+        sub_sym_gt_ca: How symmetrical CA and GT counts are within each read
+        sub_sym_ct_ga: How symmetrical CT and GA counts are within each read
+        sub_sym_ag_tc: How symmetrical AG and TC counts are within each read
+        sub_cv_ti: Coefficient of variation across all Ti substitutions = std(Ti)/mean(Ti)
+        sub_gt_ti: Computed as a maximum between (i) ratio of GT counts to TC and (ii) ratio CA to GA
+        sub_gt_mean_ti: Computed as a maximum between (i) ratio of GT counts to mean(Ti) and (ii) ratio CA to mean(Ti)
+        sub_ctoa_oxh: This metric is used to compute the likelihood of C2A and its predicted level
+        sub_ctoa_art_predicted_level: C2A predicted level - 0 = not present, 1 = low, 2 = medium and 3 = high
+        """
+        super().__init__(**kwargs)
+
+
+class IseqProductAmpliconstats(Base):
+    __tablename__ = 'iseq_product_ampliconstats'
+    __table_args__ = (
+        Index('iseq_hrm_digest_unq', 'id_iseq_product', 'primer_panel', 'amplicon_index', unique=True),
+        Index('iseq_pastats_amplicon', 'primer_panel_num_amplicons', 'amplicon_index'),
+        {'comment': 'Some of per sample per amplicon metrics generated by samtools '
+                'ampliconstats'}
+    )
+
+    id_iseq_pr_astats_tmp = Column(mysqlBIGINT(20, unsigned=True), primary_key=True, comment='Internal to this database id, value can change', doc='Internal to this database id, value can change')
+    id_iseq_product = Column(ForeignKey('iseq_product_metrics.id_iseq_product'), nullable=False, comment='Product id, a foreign key into iseq_product_metrics table', doc='Product id, a foreign key into iseq_product_metrics table')
+    primer_panel = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='A string uniquely identifying the primer panel', doc='A string uniquely identifying the primer panel')
+    primer_panel_num_amplicons = Column(mysqlSMALLINT(5, unsigned=True), nullable=False, comment='Total number of amplicons in the primer panel', doc='Total number of amplicons in the primer panel')
+    amplicon_index = Column(mysqlSMALLINT(5, unsigned=True), nullable=False, comment='Amplicon index (position) in the primer panel, from 1 to the value of primer_panel_num_amplicons', doc='Amplicon index (position) in the primer panel, from 1 to the value of primer_panel_num_amplicons')
+    pp_name = Column(String(40, 'utf8_unicode_ci'), nullable=False, comment='Name of the portable pipeline that generated the data', doc='Name of the portable pipeline that generated the data')
+    created = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'), comment='Datetime this record was created', doc='Datetime this record was created')
+    last_changed = Column(DateTime, server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'), comment='Datetime this record was created or changed', doc='Datetime this record was created or changed')
+    pp_version = Column(String(40, 'utf8_unicode_ci'), comment='Version of the portable pipeline and/or samtools that generated the data', doc='Version of the portable pipeline and/or samtools that generated the data')
+    metric_FPCOV_1 = Column(DECIMAL(5, 2), comment='Coverage percent at depth 1', doc='Coverage percent at depth 1')
+    metric_FPCOV_10 = Column(DECIMAL(5, 2), comment='Coverage percent at depth 10', doc='Coverage percent at depth 10')
+    metric_FPCOV_20 = Column(DECIMAL(5, 2), comment='Coverage percent at depth 20', doc='Coverage percent at depth 20')
+    metric_FPCOV_100 = Column(DECIMAL(5, 2), comment='Coverage percent at depth 100', doc='Coverage percent at depth 100')
+    metric_FREADS = Column(mysqlINTEGER(10, unsigned=True), comment='Number of aligned filtered reads', doc='Number of aligned filtered reads')
+
+    iseq_product_metrics = relationship('IseqProductMetrics', back_populates='iseq_product_ampliconstats')
+
+    def __init__(self, **kwargs):
+        """Constructs a new IseqProductAmpliconstats.
+
+        Parameters
+        ----------
+        id_iseq_pr_astats_tmp: Internal to this database id, value can change
+        id_iseq_product: Product id, a foreign key into iseq_product_metrics table
+        primer_panel: A string uniquely identifying the primer panel
+        primer_panel_num_amplicons: Total number of amplicons in the primer panel
+        amplicon_index: Amplicon index (position) in the primer panel, from 1 to the value of primer_panel_num_amplicons
+        pp_name: Name of the portable pipeline that generated the data
+        created: Datetime this record was created
+        last_changed: Datetime this record was created or changed
+        pp_version: Version of the portable pipeline and/or samtools that generated the data
+        metric_FPCOV_1: Coverage percent at depth 1
+        metric_FPCOV_10: Coverage percent at depth 10
+        metric_FPCOV_20: Coverage percent at depth 20
+        metric_FPCOV_100: Coverage percent at depth 100
+        metric_FREADS: Number of aligned filtered reads
+        """
+        super().__init__(**kwargs)
+
+
+class IseqProductComponents(Base):
+    __tablename__ = 'iseq_product_components'
+    __table_args__ = (
+        Index('iseq_pr_comp_compi', 'component_index', 'num_components'),
+        Index('iseq_pr_comp_ncomp', 'num_components', 'id_iseq_pr_tmp'),
+        Index('iseq_pr_comp_unique', 'id_iseq_pr_tmp', 'id_iseq_pr_component_tmp', unique=True)
+    )
+
+    id_iseq_pr_components_tmp = Column(mysqlBIGINT(20, unsigned=True), primary_key=True, comment='Internal to this database id, value can change', doc='Internal to this database id, value can change')
+    id_iseq_pr_tmp = Column(ForeignKey('iseq_product_metrics.id_iseq_pr_metrics_tmp', ondelete='CASCADE'), nullable=False, comment='iseq_product_metrics table row id for the product', doc='iseq_product_metrics table row id for the product')
+    id_iseq_pr_component_tmp = Column(ForeignKey('iseq_product_metrics.id_iseq_pr_metrics_tmp'), nullable=False, index=True, comment="iseq_product_metrics table row id for one of this product's components", doc="iseq_product_metrics table row id for one of this product's components")
+    num_components = Column(mysqlTINYINT(3, unsigned=True), nullable=False, comment='Number of component products for this product', doc='Number of component products for this product')
+    component_index = Column(mysqlTINYINT(3, unsigned=True), nullable=False, comment='Unique component index within all components of this product, \\na value from 1 to the value of num_components column for this product', doc='Unique component index within all components of this product, \\na value from 1 to the value of num_components column for this product')
+
+    iseq_product_metrics = relationship('IseqProductMetrics', foreign_keys=[id_iseq_pr_component_tmp], back_populates='iseq_product_components')
+    iseq_product_metrics_ = relationship('IseqProductMetrics', foreign_keys=[id_iseq_pr_tmp], back_populates='iseq_product_components_')
+
+    def __init__(self, **kwargs):
+        """Constructs a new IseqProductComponents.
+
+        Parameters
+        ----------
+        id_iseq_pr_components_tmp: Internal to this database id, value can change
+        id_iseq_pr_tmp: iseq_product_metrics table row id for the product
+        id_iseq_pr_component_tmp: iseq_product_metrics table row id for one of this product's components
+        num_components: Number of component products for this product
+        component_index: Unique component index within all components of this product, \\na value from 1 to the value of num_components column for this product
+        """
+        super().__init__(**kwargs)
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# @author mgcam <mg8@sanger.ac.uk>
+
+from sqlalchemy import CHAR, Column, Computed, DECIMAL, Date, DateTime, Enum, Float, ForeignKey, ForeignKeyConstraint, Index, String, TIMESTAMP, Table, Text, text
+from sqlalchemy.dialects.mysql import BIGINT as mysqlBIGINT, CHAR as mysqlCHAR, DATETIME as mysqlDATETIME, DOUBLE as mysqlDOUBLE, ENUM as mysqlENUM, FLOAT as mysqlFLOAT, INTEGER as mysqlINTEGER, SMALLINT as mysqlSMALLINT, TINYINT as mysqlTINYINT, VARCHAR as mysqlVARCHAR
+from sqlalchemy.orm import declarative_base, relationship
+
+from ml_warehouse.schema import Base, metadata
+
+
+class PacBioRunWellMetrics(Base):
+    __tablename__ = 'pac_bio_run_well_metrics'
+    __table_args__ = (
+        Index('pac_bio_metrics_run_well', 'pac_bio_run_name', 'well_label', unique=True),
+        Index('pb_rw_qc_state_index', 'qc_seq_state', 'qc_seq_state_is_final'),
+        {'comment': 'Status and run information by well and some basic QC data from '
+                'SMRT Link'}
+    )
+
+    id_pac_bio_rw_metrics_tmp = Column(mysqlINTEGER(11), primary_key=True)
+    pac_bio_run_name = Column(mysqlVARCHAR(255, charset='utf8', collation='utf8_unicode_ci'), nullable=False, comment='Lims specific identifier for the pacbio run', doc='Lims specific identifier for the pacbio run')
+    well_label = Column(mysqlVARCHAR(255, charset='utf8', collation='utf8_unicode_ci'), nullable=False, comment='The well identifier for the plate, A1-H12', doc='The well identifier for the plate, A1-H12')
+    instrument_type = Column(mysqlVARCHAR(32, charset='utf8', collation='utf8_unicode_ci'), nullable=False, comment='The instrument type e.g. Sequel', doc='The instrument type e.g. Sequel')
+    id_pac_bio_product = Column(mysqlCHAR(64, charset='utf8', collation='utf8_unicode_ci'), nullable=False, unique=True, comment='Product id', doc='Product id')
+    qc_seq_state = Column(String(255), comment='Current sequencing QC state', doc='Current sequencing QC state')
+    qc_seq_state_is_final = Column(mysqlTINYINT(1), comment='A flag marking the sequencing QC state as final (1) or not final (0)', doc='A flag marking the sequencing QC state as final (1) or not final (0)')
+    qc_seq_date = Column(DateTime, index=True, comment='The date the current sequencing QC state was assigned', doc='The date the current sequencing QC state was assigned')
+    qc_seq = Column(mysqlTINYINT(1), comment='The final sequencing QC outcome as 0(failed), 1(passed) or NULL', doc='The final sequencing QC outcome as 0(failed), 1(passed) or NULL')
+    instrument_name = Column(mysqlVARCHAR(32, charset='utf8', collation='utf8_unicode_ci'), comment='The instrument name e.g. SQ54097', doc='The instrument name e.g. SQ54097')
+    chip_type = Column(mysqlVARCHAR(32, charset='utf8', collation='utf8_unicode_ci'), comment='The chip type e.g. 8mChip', doc='The chip type e.g. 8mChip')
+    sl_hostname = Column(mysqlVARCHAR(255, charset='utf8', collation='utf8_unicode_ci'), comment='SMRT Link server hostname', doc='SMRT Link server hostname')
+    sl_run_uuid = Column(mysqlVARCHAR(36, charset='utf8', collation='utf8_unicode_ci'), comment='SMRT Link specific run uuid', doc='SMRT Link specific run uuid')
+    ts_run_name = Column(mysqlVARCHAR(32, charset='utf8', collation='utf8_unicode_ci'), comment='The PacBio run name', doc='The PacBio run name')
+    movie_name = Column(mysqlVARCHAR(32, charset='utf8', collation='utf8_unicode_ci'), index=True, comment='The PacBio movie name', doc='The PacBio movie name')
+    movie_minutes = Column(mysqlSMALLINT(5, unsigned=True), comment='Movie time (collection time) in minutes', doc='Movie time (collection time) in minutes')
+    created_by = Column(mysqlVARCHAR(32, charset='utf8', collation='utf8_unicode_ci'), comment='Created by user name recorded in SMRT Link', doc='Created by user name recorded in SMRT Link')
+    binding_kit = Column(mysqlVARCHAR(255, charset='utf8', collation='utf8_unicode_ci'), comment='Binding kit version', doc='Binding kit version')
+    sequencing_kit = Column(mysqlVARCHAR(255, charset='utf8', collation='utf8_unicode_ci'), comment='Sequencing kit version', doc='Sequencing kit version')
+    sequencing_kit_lot_number = Column(mysqlVARCHAR(255, charset='utf8', collation='utf8_unicode_ci'), comment='Sequencing Kit lot number', doc='Sequencing Kit lot number')
+    cell_lot_number = Column(String(32), comment='SMRT Cell Lot Number', doc='SMRT Cell Lot Number')
+    ccs_execution_mode = Column(mysqlVARCHAR(32, charset='utf8', collation='utf8_unicode_ci'), index=True, comment='The PacBio ccs exection mode e.g. OnInstument, OffInstument or None', doc='The PacBio ccs exection mode e.g. OnInstument, OffInstument or None')
+    include_kinetics = Column(mysqlTINYINT(1, unsigned=True), comment='Include kinetics information where ccs is run', doc='Include kinetics information where ccs is run')
+    hifi_only_reads = Column(mysqlTINYINT(1, unsigned=True), comment='CCS was run on the instrument and only HiFi reads were included in the export from the instrument', doc='CCS was run on the instrument and only HiFi reads were included in the export from the instrument')
+    heteroduplex_analysis = Column(mysqlTINYINT(1, unsigned=True), comment='Analysis has been run on the instrument to detect and resolve heteroduplex reads', doc='Analysis has been run on the instrument to detect and resolve heteroduplex reads')
+    loading_conc = Column(mysqlFLOAT(unsigned=True), comment='SMRT Cell loading concentration (pM)', doc='SMRT Cell loading concentration (pM)')
+    run_start = Column(DateTime, comment='Timestamp of run started', doc='Timestamp of run started')
+    run_complete = Column(DateTime, index=True, comment='Timestamp of run complete', doc='Timestamp of run complete')
+    run_transfer_complete = Column(DateTime, comment='Timestamp of run transfer complete', doc='Timestamp of run transfer complete')
+    run_status = Column(String(32), comment='Last recorded status, primarily to explain runs not completed.', doc='Last recorded status, primarily to explain runs not completed.')
+    well_start = Column(DateTime, comment='Timestamp of well started', doc='Timestamp of well started')
+    well_complete = Column(DateTime, index=True, comment='Timestamp of well complete', doc='Timestamp of well complete')
+    well_status = Column(String(32), comment='Last recorded status, primarily to explain wells not completed.', doc='Last recorded status, primarily to explain wells not completed.')
+    chemistry_sw_version = Column(mysqlVARCHAR(32, charset='utf8', collation='utf8_unicode_ci'), comment='The PacBio chemistry software version', doc='The PacBio chemistry software version')
+    instrument_sw_version = Column(mysqlVARCHAR(32, charset='utf8', collation='utf8_unicode_ci'), comment='The PacBio instrument software version', doc='The PacBio instrument software version')
+    primary_analysis_sw_version = Column(mysqlVARCHAR(32, charset='utf8', collation='utf8_unicode_ci'), comment='The PacBio primary analysis software version', doc='The PacBio primary analysis software version')
+    control_num_reads = Column(mysqlINTEGER(10, unsigned=True), comment='The number of control reads', doc='The number of control reads')
+    control_concordance_mean = Column(mysqlFLOAT(8, 6, unsigned=True), comment='The average concordance between the control raw reads and the control reference sequence', doc='The average concordance between the control raw reads and the control reference sequence')
+    control_concordance_mode = Column(mysqlFLOAT(unsigned=True), comment='The modal value from the concordance between the control raw reads and the control reference sequence', doc='The modal value from the concordance between the control raw reads and the control reference sequence')
+    control_read_length_mean = Column(mysqlINTEGER(10, unsigned=True), comment='The mean polymerase read length of the control reads', doc='The mean polymerase read length of the control reads')
+    local_base_rate = Column(mysqlFLOAT(8, 6, unsigned=True), comment='The average base incorporation rate, excluding polymerase pausing events', doc='The average base incorporation rate, excluding polymerase pausing events')
+    polymerase_read_bases = Column(mysqlBIGINT(20, unsigned=True), comment='Calculated by multiplying the number of productive (P1) ZMWs by the mean polymerase read length', doc='Calculated by multiplying the number of productive (P1) ZMWs by the mean polymerase read length')
+    polymerase_num_reads = Column(mysqlINTEGER(10, unsigned=True), comment='The number of polymerase reads', doc='The number of polymerase reads')
+    polymerase_read_length_mean = Column(mysqlINTEGER(10, unsigned=True), comment='The mean high-quality read length of all polymerase reads', doc='The mean high-quality read length of all polymerase reads')
+    polymerase_read_length_n50 = Column(mysqlINTEGER(10, unsigned=True), comment='Fifty percent of the trimmed read length of all polymerase reads are longer than this value', doc='Fifty percent of the trimmed read length of all polymerase reads are longer than this value')
+    insert_length_mean = Column(mysqlINTEGER(10, unsigned=True), comment='The average subread length, considering only the longest subread from each ZMW', doc='The average subread length, considering only the longest subread from each ZMW')
+    insert_length_n50 = Column(mysqlINTEGER(10, unsigned=True), comment='Fifty percent of the subreads are longer than this value when considering only the longest subread from each ZMW', doc='Fifty percent of the subreads are longer than this value when considering only the longest subread from each ZMW')
+    unique_molecular_bases = Column(mysqlBIGINT(20, unsigned=True), comment='The unique molecular yield in bp', doc='The unique molecular yield in bp')
+    productive_zmws_num = Column(mysqlINTEGER(10, unsigned=True), comment='Number of productive ZMWs', doc='Number of productive ZMWs')
+    p0_num = Column(mysqlINTEGER(10, unsigned=True), comment='Number of empty ZMWs with no high quality read detected', doc='Number of empty ZMWs with no high quality read detected')
+    p1_num = Column(mysqlINTEGER(10, unsigned=True), comment='Number of ZMWs with a high quality read detected', doc='Number of ZMWs with a high quality read detected')
+    p2_num = Column(mysqlINTEGER(10, unsigned=True), comment='Number of other ZMWs, signal detected but no high quality read', doc='Number of other ZMWs, signal detected but no high quality read')
+    adapter_dimer_percent = Column(mysqlFLOAT(5, 2, unsigned=True), comment='The percentage of pre-filter ZMWs which have observed inserts of 0-10 bp', doc='The percentage of pre-filter ZMWs which have observed inserts of 0-10 bp')
+    short_insert_percent = Column(mysqlFLOAT(5, 2, unsigned=True), comment='The percentage of pre-filter ZMWs which have observed inserts of 11-100 bp', doc='The percentage of pre-filter ZMWs which have observed inserts of 11-100 bp')
+    hifi_read_bases = Column(mysqlBIGINT(20, unsigned=True), comment='The number of HiFi bases', doc='The number of HiFi bases')
+    hifi_num_reads = Column(mysqlINTEGER(10, unsigned=True), comment='The number of HiFi reads', doc='The number of HiFi reads')
+    hifi_read_length_mean = Column(mysqlINTEGER(10, unsigned=True), comment='The mean HiFi read length', doc='The mean HiFi read length')
+    hifi_read_quality_median = Column(mysqlSMALLINT(5, unsigned=True), comment='The median HiFi base quality', doc='The median HiFi base quality')
+    hifi_number_passes_mean = Column(mysqlINTEGER(10, unsigned=True), comment='The mean number of passes per HiFi read', doc='The mean number of passes per HiFi read')
+    hifi_low_quality_read_bases = Column(mysqlBIGINT(20, unsigned=True), comment='The number of HiFi bases filtered due to low quality (<Q20)', doc='The number of HiFi bases filtered due to low quality (<Q20)')
+    hifi_low_quality_num_reads = Column(mysqlINTEGER(10, unsigned=True), comment='The number of HiFi reads filtered due to low quality (<Q20)', doc='The number of HiFi reads filtered due to low quality (<Q20)')
+    hifi_low_quality_read_length_mean = Column(mysqlINTEGER(10, unsigned=True), comment='The mean length of HiFi reads filtered due to low quality (<Q20)', doc='The mean length of HiFi reads filtered due to low quality (<Q20)')
+    hifi_low_quality_read_quality_median = Column(mysqlSMALLINT(5, unsigned=True), comment='The median base quality of HiFi bases filtered due to low quality (<Q20)', doc='The median base quality of HiFi bases filtered due to low quality (<Q20)')
+
+    pac_bio_product_metrics = relationship('PacBioProductMetrics', back_populates='pac_bio_run_well_metrics')
+
+    def __init__(self, **kwargs):
+        """Constructs a new PacBioRunWellMetrics.
+
+        Parameters
+        ----------
+        id_pac_bio_rw_metrics_tmp
+        pac_bio_run_name: Lims specific identifier for the pacbio run
+        well_label: The well identifier for the plate, A1-H12
+        instrument_type: The instrument type e.g. Sequel
+        id_pac_bio_product: Product id
+        qc_seq_state: Current sequencing QC state
+        qc_seq_state_is_final: A flag marking the sequencing QC state as final (1) or not final (0)
+        qc_seq_date: The date the current sequencing QC state was assigned
+        qc_seq: The final sequencing QC outcome as 0(failed), 1(passed) or NULL
+        instrument_name: The instrument name e.g. SQ54097
+        chip_type: The chip type e.g. 8mChip
+        sl_hostname: SMRT Link server hostname
+        sl_run_uuid: SMRT Link specific run uuid
+        ts_run_name: The PacBio run name
+        movie_name: The PacBio movie name
+        movie_minutes: Movie time (collection time) in minutes
+        created_by: Created by user name recorded in SMRT Link
+        binding_kit: Binding kit version
+        sequencing_kit: Sequencing kit version
+        sequencing_kit_lot_number: Sequencing Kit lot number
+        cell_lot_number: SMRT Cell Lot Number
+        ccs_execution_mode: The PacBio ccs exection mode e.g. OnInstument, OffInstument or None
+        include_kinetics: Include kinetics information where ccs is run
+        hifi_only_reads: CCS was run on the instrument and only HiFi reads were included in the export from the instrument
+        heteroduplex_analysis: Analysis has been run on the instrument to detect and resolve heteroduplex reads
+        loading_conc: SMRT Cell loading concentration (pM)
+        run_start: Timestamp of run started
+        run_complete: Timestamp of run complete
+        run_transfer_complete: Timestamp of run transfer complete
+        run_status: Last recorded status, primarily to explain runs not completed.
+        well_start: Timestamp of well started
+        well_complete: Timestamp of well complete
+        well_status: Last recorded status, primarily to explain wells not completed.
+        chemistry_sw_version: The PacBio chemistry software version
+        instrument_sw_version: The PacBio instrument software version
+        primary_analysis_sw_version: The PacBio primary analysis software version
+        control_num_reads: The number of control reads
+        control_concordance_mean: The average concordance between the control raw reads and the control reference sequence
+        control_concordance_mode: The modal value from the concordance between the control raw reads and the control reference sequence
+        control_read_length_mean: The mean polymerase read length of the control reads
+        local_base_rate: The average base incorporation rate, excluding polymerase pausing events
+        polymerase_read_bases: Calculated by multiplying the number of productive (P1) ZMWs by the mean polymerase read length
+        polymerase_num_reads: The number of polymerase reads
+        polymerase_read_length_mean: The mean high-quality read length of all polymerase reads
+        polymerase_read_length_n50: Fifty percent of the trimmed read length of all polymerase reads are longer than this value
+        insert_length_mean: The average subread length, considering only the longest subread from each ZMW
+        insert_length_n50: Fifty percent of the subreads are longer than this value when considering only the longest subread from each ZMW
+        unique_molecular_bases: The unique molecular yield in bp
+        productive_zmws_num: Number of productive ZMWs
+        p0_num: Number of empty ZMWs with no high quality read detected
+        p1_num: Number of ZMWs with a high quality read detected
+        p2_num: Number of other ZMWs, signal detected but no high quality read
+        adapter_dimer_percent: The percentage of pre-filter ZMWs which have observed inserts of 0-10 bp
+        short_insert_percent: The percentage of pre-filter ZMWs which have observed inserts of 11-100 bp
+        hifi_read_bases: The number of HiFi bases
+        hifi_num_reads: The number of HiFi reads
+        hifi_read_length_mean: The mean HiFi read length
+        hifi_read_quality_median: The median HiFi base quality
+        hifi_number_passes_mean: The mean number of passes per HiFi read
+        hifi_low_quality_read_bases: The number of HiFi bases filtered due to low quality (<Q20)
+        hifi_low_quality_num_reads: The number of HiFi reads filtered due to low quality (<Q20)
+        hifi_low_quality_read_length_mean: The mean length of HiFi reads filtered due to low quality (<Q20)
+        hifi_low_quality_read_quality_median: The median base quality of HiFi bases filtered due to low quality (<Q20)
+        """
+        super().__init__(**kwargs)
+
+
+class PacBioRun(Base):
+    __tablename__ = 'pac_bio_run'
+    __table_args__ = (
+        Index('unique_pac_bio_entry', 'id_lims', 'id_pac_bio_run_lims', 'well_label', 'comparable_tag_identifier', 'comparable_tag2_identifier', unique=True),
+    )
+
+    id_pac_bio_tmp = Column(mysqlINTEGER(11), primary_key=True)
+    last_updated = Column(DateTime, nullable=False, comment='Timestamp of last update', doc='Timestamp of last update')
+    recorded_at = Column(DateTime, nullable=False, comment='Timestamp of warehouse update', doc='Timestamp of warehouse update')
+    id_sample_tmp = Column(ForeignKey('sample.id_sample_tmp'), nullable=False, index=True, comment='Sample id, see "sample.id_sample_tmp"', doc='Sample id, see "sample.id_sample_tmp"')
+    id_study_tmp = Column(ForeignKey('study.id_study_tmp'), nullable=False, index=True, comment='Sample id, see "study.id_study_tmp"', doc='Sample id, see "study.id_study_tmp"')
+    id_pac_bio_run_lims = Column(String(20, 'utf8_unicode_ci'), nullable=False, comment='Lims specific identifier for the pacbio run', doc='Lims specific identifier for the pacbio run')
+    cost_code = Column(String(20, 'utf8_unicode_ci'), nullable=False, comment='Valid WTSI cost-code', doc='Valid WTSI cost-code')
+    id_lims = Column(String(10, 'utf8_unicode_ci'), nullable=False, comment='LIM system identifier', doc='LIM system identifier')
+    plate_barcode = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='The human readable barcode for the plate loaded onto the machine', doc='The human readable barcode for the plate loaded onto the machine')
+    plate_uuid_lims = Column(String(36, 'utf8_unicode_ci'), nullable=False, comment='The plate uuid', doc='The plate uuid')
+    well_label = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='The well identifier for the plate, A1-H12', doc='The well identifier for the plate, A1-H12')
+    well_uuid_lims = Column(String(36, 'utf8_unicode_ci'), nullable=False, comment='The well uuid', doc='The well uuid')
+    pac_bio_library_tube_id_lims = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='LIMS specific identifier for originating library tube', doc='LIMS specific identifier for originating library tube')
+    pac_bio_library_tube_uuid = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='The uuid for the originating library tube', doc='The uuid for the originating library tube')
+    pac_bio_library_tube_name = Column(String(255, 'utf8_unicode_ci'), nullable=False, comment='The name of the originating library tube', doc='The name of the originating library tube')
+    pac_bio_run_uuid = Column(String(36, 'utf8_unicode_ci'), comment='Uuid identifier for the pacbio run', doc='Uuid identifier for the pacbio run')
+    tag_identifier = Column(String(30, 'utf8_unicode_ci'), comment='Tag index within tag set, NULL if untagged', doc='Tag index within tag set, NULL if untagged')
+    tag_sequence = Column(String(30, 'utf8_unicode_ci'), comment='Tag sequence for tag', doc='Tag sequence for tag')
+    tag_set_id_lims = Column(String(20, 'utf8_unicode_ci'), comment='LIMs-specific identifier of the tag set for tag', doc='LIMs-specific identifier of the tag set for tag')
+    tag_set_name = Column(String(100, 'utf8_unicode_ci'), comment='WTSI-wide tag set name for tag', doc='WTSI-wide tag set name for tag')
+    tag2_sequence = Column(String(30, 'utf8_unicode_ci'))
+    tag2_set_id_lims = Column(String(20, 'utf8_unicode_ci'))
+    tag2_set_name = Column(String(100, 'utf8_unicode_ci'))
+    tag2_identifier = Column(String(30, 'utf8_unicode_ci'))
+    pac_bio_library_tube_legacy_id = Column(mysqlINTEGER(11), comment='Legacy library_id for backwards compatibility.', doc='Legacy library_id for backwards compatibility.')
+    library_created_at = Column(DateTime, comment='Timestamp of library creation', doc='Timestamp of library creation')
+    pac_bio_run_name = Column(String(255, 'utf8_unicode_ci'), comment='Name of the run', doc='Name of the run')
+    pipeline_id_lims = Column(String(60, 'utf8_unicode_ci'), comment='LIMS-specific pipeline identifier that unambiguously defines library type (eg. Sequel-v1, IsoSeq-v1)', doc='LIMS-specific pipeline identifier that unambiguously defines library type (eg. Sequel-v1, IsoSeq-v1)')
+    comparable_tag_identifier = Column(String(255, 'utf8_unicode_ci'), Computed('(ifnull(`tag_identifier`,-(1)))', persisted=False))
+    comparable_tag2_identifier = Column(String(255, 'utf8_unicode_ci'), Computed('(ifnull(`tag2_identifier`,-(1)))', persisted=False))
+
+    sample = relationship('Sample', back_populates='pac_bio_run')
+    study = relationship('Study', back_populates='pac_bio_run')
+    pac_bio_product_metrics = relationship('PacBioProductMetrics', back_populates='pac_bio_run')
+
+    def __init__(self, **kwargs):
+        """Constructs a new PacBioRun.
+
+        Parameters
+        ----------
+        id_pac_bio_tmp
+        last_updated: Timestamp of last update
+        recorded_at: Timestamp of warehouse update
+        id_sample_tmp: Sample id, see "sample.id_sample_tmp"
+        id_study_tmp: Sample id, see "study.id_study_tmp"
+        id_pac_bio_run_lims: Lims specific identifier for the pacbio run
+        cost_code: Valid WTSI cost-code
+        id_lims: LIM system identifier
+        plate_barcode: The human readable barcode for the plate loaded onto the machine
+        plate_uuid_lims: The plate uuid
+        well_label: The well identifier for the plate, A1-H12
+        well_uuid_lims: The well uuid
+        pac_bio_library_tube_id_lims: LIMS specific identifier for originating library tube
+        pac_bio_library_tube_uuid: The uuid for the originating library tube
+        pac_bio_library_tube_name: The name of the originating library tube
+        pac_bio_run_uuid: Uuid identifier for the pacbio run
+        tag_identifier: Tag index within tag set, NULL if untagged
+        tag_sequence: Tag sequence for tag
+        tag_set_id_lims: LIMs-specific identifier of the tag set for tag
+        tag_set_name: WTSI-wide tag set name for tag
+        tag2_sequence
+        tag2_set_id_lims
+        tag2_set_name
+        tag2_identifier
+        pac_bio_library_tube_legacy_id: Legacy library_id for backwards compatibility.
+        library_created_at: Timestamp of library creation
+        pac_bio_run_name: Name of the run
+        pipeline_id_lims: LIMS-specific pipeline identifier that unambiguously defines library type (eg. Sequel-v1, IsoSeq-v1)
+        comparable_tag_identifier
+        comparable_tag2_identifier
+        """
+        super().__init__(**kwargs)
+
+
+class PacBioProductMetrics(Base):
+    __tablename__ = 'pac_bio_product_metrics'
+    __table_args__ = (
+        Index('pac_bio_metrics_product', 'id_pac_bio_tmp', 'id_pac_bio_rw_metrics_tmp', unique=True),
+        {'comment': 'A linking table for the pac_bio_run and pac_bio_run_well_metrics '
+                'tables with a potential for adding per-product QC data'}
+    )
+
+    id_pac_bio_pr_metrics_tmp = Column(mysqlINTEGER(11), primary_key=True)
+    id_pac_bio_rw_metrics_tmp = Column(ForeignKey('pac_bio_run_well_metrics.id_pac_bio_rw_metrics_tmp', ondelete='CASCADE'), nullable=False, index=True, comment='PacBio run well metrics id, see "pac_bio_run_well_metrics.id_pac_bio_rw_metrics_tmp"', doc='PacBio run well metrics id, see "pac_bio_run_well_metrics.id_pac_bio_rw_metrics_tmp"')
+    id_pac_bio_tmp = Column(ForeignKey('pac_bio_run.id_pac_bio_tmp', ondelete='SET NULL'), comment='PacBio run id, see "pac_bio_run.id_pac_bio_tmp"', doc='PacBio run id, see "pac_bio_run.id_pac_bio_tmp"')
+    id_pac_bio_product = Column(mysqlCHAR(64, charset='utf8', collation='utf8_unicode_ci'), nullable=False, unique=True, comment='Product id', doc='Product id')
+    qc = Column(mysqlTINYINT(1), index=True, comment='The final QC outcome of the product as 0(failed), 1(passed) or NULL', doc='The final QC outcome of the product as 0(failed), 1(passed) or NULL')
+
+    pac_bio_run_well_metrics = relationship('PacBioRunWellMetrics', back_populates='pac_bio_product_metrics')
+    pac_bio_run = relationship('PacBioRun', back_populates='pac_bio_product_metrics')
+
+    def __init__(self, **kwargs):
+        """Constructs a new PacBioProductMetrics.
+
+        Parameters
+        ----------
+        id_pac_bio_pr_metrics_tmp
+        id_pac_bio_rw_metrics_tmp: PacBio run well metrics id, see "pac_bio_run_well_metrics.id_pac_bio_rw_metrics_tmp"
+        id_pac_bio_tmp: PacBio run id, see "pac_bio_run.id_pac_bio_tmp"
+        id_pac_bio_product: Product id
+        qc: The final QC outcome of the product as 0(failed), 1(passed) or NULL
+        """
+        super().__init__(**kwargs)
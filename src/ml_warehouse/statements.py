@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Statistics of the compiled statement cache of an engine.
+
+SQLAlchemy compiles a statement to SQL once per engine and structure, caching
+the result under a key generated from the statement each time it is executed.
+A StatementStats counts, for the statements executed by an engine, the hits
+and misses of that cache and the time spent preparing them. For a hit, that
+is the time from execute() to the cursor; for a miss, the time from execute()
+until the statement has been compiled, excluding the processing of its
+parameters. Statements which cannot be cached, or executed with caching
+disabled, are counted apart, with their time from execute() to the cursor:
+
+    stats = StatementStats(engine)
+    ...
+    print(stats.hits, stats.misses, stats.compile_seconds)
+
+The query helpers keep this preparation short by building their statements
+with lambda_stmt(), whose cache keys are generated from the code location of
+the lambdas rather than from the statement structure, or from templates built
+once with bind parameters.
+"""
+
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+_START = "ml_warehouse.statements.start"
+
+
+class StatementStats(object):
+    """Counts the compiled statement cache hits and misses of an engine."""
+
+    def __init__(self, engine: Optional[Engine] = None):
+        """Constructs a new StatementStats.
+
+        Arguments
+        ---------
+        engine: Optional[Engine]
+            An engine to attach to, see attach().
+        """
+        self.engine = None
+
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        self.hit_seconds = 0.0
+        self.compile_seconds = 0.0
+        self.uncached_seconds = 0.0
+        self._lock = threading.Lock()
+
+        if engine is not None:
+            self.attach(engine)
+
+    def attach(self, engine: Engine):
+        """Starts counting the statements executed by an engine."""
+        if self.engine is not None:
+            raise ValueError("This StatementStats is already attached to an engine")
+
+        event.listen(engine, "before_execute", self._before_execute)
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        self.engine = engine
+
+    def detach(self):
+        """Stops counting the statements of the engine."""
+        if self.engine is None:
+            return
+
+        event.remove(self.engine, "before_execute", self._before_execute)
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        self.engine = None
+
+    def reset(self):
+        """Sets the counters to zero."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.uncached = 0
+            self.hit_seconds = 0.0
+            self.compile_seconds = 0.0
+            self.uncached_seconds = 0.0
+
+    @property
+    def executions(self) -> int:
+        """The number of statements counted."""
+        return self.hits + self.misses + self.uncached
+
+    @property
+    def hit_ratio(self) -> float:
+        """The fraction of cacheable statements found in the cache."""
+        cacheable = self.hits + self.misses
+
+        return self.hits / cacheable if cacheable else 0.0
+
+    @property
+    def cache_size(self) -> int:
+        """The number of compiled statements cached by the engine."""
+        cache = getattr(self.engine, "_compiled_cache", None)
+
+        return len(cache) if cache is not None else 0
+
+    def _before_execute(
+        self, conn, clauseelement, multiparams, params, execution_options
+    ):
+        conn.info[_START] = time.perf_counter()
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        # Statements executed as plain strings are neither compiled nor cached.
+        if context is None or context.compiled is None:
+            return
+
+        now = time.perf_counter()
+        start = conn.info.get(_START)
+        seconds = now - start if start is not None else 0.0
+
+        with self._lock:
+            if context.cache_hit is CACHE_HIT:
+                self.hits += 1
+                self.hit_seconds += seconds
+            elif context.cache_hit is CACHE_MISS:
+                self.misses += 1
+                self.compile_seconds += _compile_seconds(context, start, now)
+            else:
+                self.uncached += 1
+                self.uncached_seconds += seconds
+
+
+def _compile_seconds(context, start: Optional[float], now: float) -> float:
+    # The time from execute() until the statement was compiled, as recorded by
+    # SQLAlchemy when it generates the compiled form.
+    generated = getattr(context.compiled, "_gen_time", None)
+    if start is None or generated is None or not start <= generated <= now:
+        return 0.0
+
+    return generated - start
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Streaming reads of large warehouse tables.
+
+iter_rows() reads a statement through an unbuffered server-side cursor (an
+SSCursor for PyMySQL), building ORM objects one batch at a time and removing
+each batch from the Session once it has been consumed. Memory use depends on
+the batch size rather than on the number of rows.
+"""
+
+from typing import Iterator, Union
+
+from sqlalchemy import select, types
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+# The default batch size targets this many bytes of column data per batch.
+DEFAULT_BATCH_BYTES = 4 * 1024 * 1024
+MIN_BATCH_SIZE = 100
+MAX_BATCH_SIZE = 20_000
+
+# Estimated widths, in bytes, of columns whose type has no length.
+NUMERIC_WIDTH = 8
+DATETIME_WIDTH = 8
+TEXT_WIDTH = 1024
+OTHER_WIDTH = 32
+
+
+def iter_rows(
+    sess: Session, stmt: Union[Select, type], batch_size: int = None
+) -> Iterator[Row]:
+    """Yields the rows of a statement, reading them in batches through a
+    server-side cursor.
+
+    The ORM objects of each batch are expunged from the Session once all the
+    rows of the batch have been consumed, so they are neither refreshed nor
+    flushed afterwards. The Session's connection is busy until the iteration
+    is finished or the iterator is closed.
+
+    Arguments
+    ---------
+    sess: Session
+        The Session to execute the statement with.
+    stmt: Union[Select, type]
+        The statement, or a mapped class to read all the rows of.
+    batch_size: int
+        The number of rows to fetch and build at a time. Defaults to a size
+        based on the width of the selected columns, see default_batch_size().
+
+    Returns
+    -------
+    Iterator[Row]
+        The rows of the result.
+    """
+    if isinstance(stmt, type):
+        stmt = select(stmt)
+    if batch_size is None:
+        batch_size = default_batch_size(stmt)
+
+    result = sess.execute(
+        stmt, execution_options={"stream_results": True, "yield_per": batch_size}
+    )
+
+    try:
+        for partition in result.partitions(batch_size):
+            yield from partition
+
+            for row in partition:
+                for value in row:
+                    if hasattr(value, "_sa_instance_state") and value in sess:
+                        sess.expunge(value)
+    finally:
+        result.close()
+
+
+def default_batch_size(stmt: Select, batch_bytes: int = DEFAULT_BATCH_BYTES) -> int:
+    """Returns a batch size for reading a statement, so that a batch holds about
+    batch_bytes of column data.
+
+    Narrow rows such as those of IseqRunStatus are read in larger batches than
+    wide rows such as those of PacBioRunWellMetrics. The size is bounded by
+    MIN_BATCH_SIZE and MAX_BATCH_SIZE.
+
+    Arguments
+    ---------
+    stmt: Select
+        The statement.
+    batch_bytes: int
+        The target amount of column data per batch.
+
+    Returns
+    -------
+    int
+    """
+    width = sum(column_width(col) for col in stmt.selected_columns)
+
+    return max(MIN_BATCH_SIZE, min(MAX_BATCH_SIZE, batch_bytes // max(width, 1)))
+
+
+def column_width(column) -> int:
+    """Returns the estimated width, in bytes, of a value of a column."""
+    column_type = column.type
+
+    if isinstance(column_type, types.Text):
+        return TEXT_WIDTH
+    if isinstance(column_type, (types.String, types.LargeBinary)):
+        return getattr(column_type, "length", None) or TEXT_WIDTH
+    if isinstance(column_type, (types.Integer, types.Numeric, types.Boolean)):
+        return NUMERIC_WIDTH
+    if isinstance(column_type, (types.DateTime, types.Date, types.Time)):
+        return DATETIME_WIDTH
+
+    return OTHER_WIDTH
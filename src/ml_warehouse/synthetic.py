@@ -0,0 +1,684 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Deterministic synthetic warehouses of any size.
+
+A SyntheticWarehouse generates rows for every table of the schema from a seed
+and a scale factor, the same rows for the same seed and scale, and loads them
+with the bulk loaders of ml_warehouse.bulk:
+
+    warehouse = SyntheticWarehouse(seed=1, scale=6)
+    results = warehouse.load(sess)
+
+At scale 1, the warehouse has about 1.6 million rows; the table sizes are
+given by ROWS, multiplied by the scale. Foreign keys always point to generated
+rows, and the rows follow the shape of the warehouse where it matters to query
+plans:
+
+ - iseq_flowcell holds pools of 1 to 384 tagged libraries per lane, and
+   iseq_product_metrics one product per library, on the lanes of
+   iseq_run_lane_metrics, 8 per run;
+ - iseq_run_status holds a run's statuses in workflow order, some repeated
+   many times, with runs still in progress stopping part of the way;
+ - pac_bio_run holds pools of libraries per well of pac_bio_run_well_metrics,
+   and pac_bio_product_metrics one product per library;
+ - the other foreign keys are skewed, a tenth of the samples and studies
+   having about half of the rows referring to them.
+
+Other columns take random values of their type, NULL in a tenth of the rows
+when they are nullable, and distinct values when they are part of a unique
+key. This module requires NumPy, which is installed with the "numpy" extra of
+this package.
+"""
+
+import zlib
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Column, Table, UniqueConstraint, types
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session
+
+from ml_warehouse._introspect import integer_bits
+from ml_warehouse.bulk import AUTO, LoadResult, load_rows
+from ml_warehouse.schema import Base, load_all, metadata
+
+# The number of rows of each table at scale 1. Tables which are not listed
+# have DEFAULT_ROWS rows. iseq_run_status, iseq_product_metrics and
+# pac_bio_product_metrics follow from their parent tables.
+ROWS = {
+    "sample": 200_000,
+    "study": 2_000,
+    "iseq_run_lane_metrics": 16_000,
+    "iseq_flowcell": 400_000,
+    "iseq_product_components": 100_000,
+    "iseq_product_ampliconstats": 100_000,
+    "pac_bio_run_well_metrics": 8_000,
+    "pac_bio_run": 60_000,
+    "oseq_flowcell": 20_000,
+    "flgen_plate": 50_000,
+    "stock_resource": 50_000,
+    "bmap_flowcell": 10_000,
+    "qc_result": 100_000,
+}
+DEFAULT_ROWS = 1_000
+
+DEFAULT_SEED = 0
+DEFAULT_NULL_FRACTION = 0.1
+
+# The exponent skewing the choice of parent rows, see _skewed().
+DEFAULT_SKEW = 3.0
+
+# The rows of iseq_run_status_dict, which are the same at every scale.
+RUN_STATUSES = [
+    (1, "run pending", 1, 100),
+    (2, "run in progress", 1, 120),
+    (3, "run on hold", 1, 110),
+    (4, "run complete", 1, 160),
+    (5, "run cancelled", 1, 140),
+    (6, "analysis pending", 1, 200),
+    (7, "analysis in progress", 1, 240),
+    (8, "analysis on hold", 1, 260),
+    (9, "analysis complete", 1, 280),
+    (10, "analysis cancelled", 1, 270),
+    (11, "run mirrored", 1, 170),
+    (12, "run archived", 1, 420),
+    (14, "analysis prelim", 0, None),
+    (15, "analysis prelim complete", 0, None),
+    (16, "run quarantined", 0, None),
+    (17, "archival pending", 1, 400),
+    (18, "archival in progress", 1, 410),
+    (19, "qc review pending", 1, 300),
+    (20, "qc complete", 1, 500),
+    (21, "data discarded", 1, 220),
+    (22, "run stopped early", 1, 130),
+    (24, "secondary analysis in progress", 1, 250),
+    (25, "qc on hold", 1, 320),
+    (26, "qc in progress", 1, 310),
+]
+
+# The statuses of a run which goes through the whole workflow, in order.
+RUN_WORKFLOW = [1, 2, 4, 11, 6, 7, 24, 9, 19, 26, 17, 18, 12, 20]
+
+LANES_PER_RUN = 8
+INSTRUMENT_MODELS = ["HiSeqX", "HiSeq", "NovaSeq", "MiSeq"]
+CYCLES = [151, 302, 318, 518]
+POOL_SIZES = [1, 2, 8, 24, 96, 384]
+POOL_WEIGHTS = [0.25, 0.1, 0.25, 0.2, 0.15, 0.05]
+PACBIO_WELLS = ["A1", "B1", "C1", "D1"]
+PACBIO_POOL_SIZES = [1, 2, 4, 8, 16, 48]
+AMPLICONS_PER_PRODUCT = 98
+
+# Dates are spread over the 8 years from START.
+START = datetime(year=2015, month=1, day=1)
+SPAN_SECONDS = 8 * 365 * 24 * 3600
+
+CHUNK_SIZE = 50_000
+
+# The largest integer generated for a column, whatever its type allows.
+_MAX_INTEGER = 1_000_000
+
+
+class SyntheticWarehouse(object):
+    """The rows of a synthetic warehouse of a given seed and scale."""
+
+    def __init__(
+        self,
+        seed: int = DEFAULT_SEED,
+        scale: float = 1.0,
+        rows: Optional[Dict[str, int]] = None,
+        null_fraction: float = DEFAULT_NULL_FRACTION,
+        skew: float = DEFAULT_SKEW,
+    ):
+        """Constructs a new SyntheticWarehouse.
+
+        Arguments
+        ---------
+        seed: int
+            The seed of the random values.
+        scale: float
+            The factor applied to the number of rows of every table.
+        rows: Optional[Dict[str, int]]
+            Numbers of rows at scale 1 replacing those of ROWS, by table name.
+        null_fraction: float
+            The fraction of NULL values of nullable columns.
+        skew: float
+            How unevenly rows are spread over their parent rows, 1 for evenly.
+        """
+        load_all()
+
+        self.seed = seed
+        self.scale = scale
+        self.rows = {**ROWS, **(rows or {})}
+        self.null_fraction = null_fraction
+        self.skew = skew
+
+        self._plans: Dict[str, Dict[str, np.ndarray]] = {}
+        self._profiled: Dict[str, set] = {}
+
+    @property
+    def tables(self) -> List[Table]:
+        """The tables of the warehouse, parents before children."""
+        return metadata.sorted_tables
+
+    def count(self, table_name: str) -> int:
+        """Returns the number of rows of a table."""
+        return len(self._plan(table_name)["_index"])
+
+    def iter_rows(self, table_name: str) -> Iterator[dict]:
+        """Yields the rows of a table, as dicts keyed by column key.
+
+        Arguments
+        ---------
+        table_name: str
+            The name of the table.
+
+        Returns
+        -------
+        Iterator[dict]
+        """
+        table = metadata.tables[table_name]
+        plan = self._plan(table_name)
+        index = plan["_index"]
+        unique = _unique_columns(table, self._profiled[table_name])
+
+        for chunk, start in enumerate(range(0, len(index), CHUNK_SIZE)):
+            rng = self._rng(table_name, "rows", chunk)
+            stop = min(start + CHUNK_SIZE, len(index))
+
+            values = {}
+            for col in table.columns:
+                if col.key in plan:
+                    values[col.key] = plan[col.key][start:stop].tolist()
+                else:
+                    values[col.key] = self._values(
+                        rng, col, index[start:stop], col.key in unique
+                    )
+
+            keys = list(values)
+            for row in zip(*values.values()):
+                yield dict(zip(keys, row))
+
+    def load(
+        self,
+        sess: Session,
+        tables: Optional[Sequence[str]] = None,
+        method: str = AUTO,
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, LoadResult]:
+        """Loads the rows of the warehouse with ml_warehouse.bulk.load_rows(),
+        into tables which must exist and should be empty.
+
+        Arguments
+        ---------
+        sess: Session
+            The Session to load the rows with.
+        tables: Optional[Sequence[str]]
+            The names of the tables to load, defaults to all of them.
+        method: str
+            The bulk load method, see ml_warehouse.bulk.load_rows().
+        batch_size: Optional[int]
+            The number of rows per batch, see ml_warehouse.bulk.load_rows().
+
+        Returns
+        -------
+        Dict[str, LoadResult]
+            The outcome of loading each table, by name, in the order loaded.
+        """
+        models = {m.local_table.name: m.class_ for m in Base.registry.mappers}
+
+        results = {}
+        for table in self.tables:
+            if tables is not None and table.name not in tables:
+                continue
+
+            results[table.name] = load_rows(
+                sess,
+                models[table.name],
+                self.iter_rows(table.name),
+                batch_size=batch_size,
+                method=method,
+            )
+
+        return results
+
+    def _rng(self, table_name: str, *stream) -> np.random.Generator:
+        # One stream per table, so that the rows of a table do not depend on
+        # which other tables have been generated.
+        return np.random.default_rng(
+            [self.seed, zlib.crc32(table_name.encode()), *map(_stream_id, stream)]
+        )
+
+    def _scaled(self, table_name: str) -> int:
+        return int(round(self.rows.get(table_name, DEFAULT_ROWS) * self.scale))
+
+    def _plan(self, table_name: str) -> Dict[str, np.ndarray]:
+        # The columns generated up front: those set by a profile, the foreign
+        # keys and the columns other tables refer to.
+        plan = self._plans.get(table_name)
+        if plan is not None:
+            return plan
+
+        table = metadata.tables[table_name]
+        rng = self._rng(table_name, "plan")
+
+        profile = _PROFILES.get(table_name)
+        if profile is not None:
+            plan = profile(self, rng, self._scaled(table_name))
+        else:
+            plan = {"_index": np.arange(self._scaled(table_name))}
+        profiled = {name for name in plan if name in table.c}
+        n = len(plan["_index"])
+
+        for constraint in table.foreign_key_constraints:
+            local = [col.key for col in constraint.columns]
+            if all(key in plan for key in local):
+                continue
+
+            parent = self._plan(constraint.referred_table.name)
+            remote = [element.column.key for element in constraint.elements]
+            picks = self._parents(rng, table, local, len(parent["_index"]), n)
+            for key, remote_key in zip(local, remote):
+                plan[key] = _take(parent[remote_key], picks)
+
+        plan = _deduplicate(table, plan, profiled)
+
+        unique = _unique_columns(table, profiled)
+        referenced = _referenced_columns(table)
+        for col in table.columns:
+            if col.key not in plan and (
+                col.key in referenced
+                or (col.primary_key and isinstance(col.type, types.Integer))
+            ):
+                # Columns referred to are keys of their table, even where the
+                # schema does not declare them unique.
+                plan[col.key] = np.array(
+                    self._values(
+                        rng, col, plan["_index"], col.key in unique | referenced
+                    ),
+                    dtype=object,
+                )
+
+        self._plans[table_name] = plan
+        self._profiled[table_name] = profiled
+
+        return plan
+
+    def _parents(
+        self, rng: np.random.Generator, table: Table, local: list, m: int, n: int
+    ) -> np.ndarray:
+        # The rows of the parent table that n rows refer to, or -1 for NULL.
+        if m == 0:
+            return np.full(n, -1)
+
+        primary_key = [col.key for col in table.primary_key.columns]
+        if local == primary_key:
+            # One row per parent row at most, such as iseq_run_info.
+            return rng.permutation(m)[: min(n, m)]
+
+        return _skewed(rng, n, m, self.skew)
+
+    def _values(
+        self, rng: np.random.Generator, col: Column, index: np.ndarray, unique: bool
+    ) -> list:
+        n = len(index)
+        sql_type = col.type
+
+        if unique:
+            values = _unique_values(col, index)
+        elif isinstance(sql_type, types.Enum):
+            values = rng.choice(sql_type.enums, n).tolist()
+        elif _is_flag(sql_type):
+            values = rng.integers(0, 2, n).tolist()
+        elif isinstance(sql_type, types.Integer):
+            values = rng.integers(0, _max_integer(sql_type) + 1, n).tolist()
+        elif isinstance(sql_type, types.Numeric) and not isinstance(
+            sql_type, types.Float
+        ):
+            digits = (sql_type.precision or 10) - (sql_type.scale or 0)
+            high = min(10 ** min(digits, 6) - 1, _MAX_INTEGER)
+            values = np.round(rng.uniform(0, high, n), sql_type.scale or 0).tolist()
+        elif isinstance(sql_type, types.Float):
+            values = np.round(rng.uniform(0, 100, n), 3).tolist()
+        elif isinstance(sql_type, types.DateTime):
+            values = _dates(rng, n).tolist()
+        elif isinstance(sql_type, types.Date):
+            values = _dates(rng, n).astype("datetime64[D]").tolist()
+        elif isinstance(sql_type, types.String):
+            # About ten rows per distinct value.
+            values = _strings(col, rng.integers(0, max(n // 10, 1), n).tolist())
+        else:
+            values = [None] * n
+
+        if col.nullable and not unique:
+            for i in np.flatnonzero(rng.random(n) < self.null_fraction).tolist():
+                values[i] = None
+
+        return values
+
+
+def _profile_sample(ws: SyntheticWarehouse, rng, n: int) -> dict:
+    return {"_index": np.arange(n), "id_lims": np.full(n, "SQSCP", dtype=object)}
+
+
+def _profile_run_status_dict(ws: SyntheticWarehouse, rng, n: int) -> dict:
+    ids, descriptions, iscurrent, temporal_index = zip(*RUN_STATUSES)
+
+    return {
+        "_index": np.arange(len(RUN_STATUSES)),
+        "id_run_status_dict": np.array(ids, dtype=object),
+        "description": np.array(descriptions, dtype=object),
+        "iscurrent": np.array(iscurrent, dtype=object),
+        "temporal_index": np.array(temporal_index, dtype=object),
+    }
+
+
+def _profile_lanes(ws: SyntheticWarehouse, rng, n: int) -> dict:
+    index = np.arange(n)
+
+    run = index // LANES_PER_RUN
+    models = rng.choice(INSTRUMENT_MODELS, run[-1] + 1 if n else 0)
+
+    return {
+        "_index": index,
+        "id_run": (run + 1).astype(object),
+        "position": (index % LANES_PER_RUN + 1).astype(object),
+        "cycles": rng.choice(CYCLES, n).astype(object),
+        "instrument_model": models[run].astype(object),
+    }
+
+
+def _profile_run_status(ws: SyntheticWarehouse, rng, n: int) -> dict:
+    runs = np.unique(ws._plan("iseq_run_lane_metrics")["id_run"].astype(np.int64))
+    steps = len(RUN_WORKFLOW)
+
+    # Most statuses are set once, some many times over, and one run in ten is
+    # part of the way through the workflow.
+    counts = np.minimum(rng.zipf(3.0, (len(runs), steps)), 20)
+    ends = np.where(
+        rng.random(len(runs)) < 0.1, rng.integers(1, steps, len(runs)), steps
+    )
+    counts[np.arange(steps) >= ends[:, None]] = 0
+
+    per_run = counts.sum(axis=1)
+    n = int(per_run.sum())
+    run = np.repeat(np.arange(len(runs)), per_run)
+    status = np.repeat(np.tile(RUN_WORKFLOW, len(runs)), counts.ravel())
+
+    # Each status follows the previous one of its run by about 3 hours.
+    gaps = rng.exponential(3 * 3600, n).astype(np.int64)
+    elapsed = np.cumsum(gaps)
+    first = np.cumsum(per_run) - per_run
+    elapsed -= np.repeat(elapsed[first] - gaps[first], per_run)
+    dates = _dates(rng, len(runs))[run] + elapsed.astype("timedelta64[s]")
+
+    last = np.zeros(n, dtype=int)
+    last[np.cumsum(per_run) - 1] = 1
+
+    return {
+        "_index": np.arange(n),
+        "id_run_status": np.arange(1, n + 1).astype(object),
+        "id_run": runs[run].astype(object),
+        "date": dates.astype(object),
+        "id_run_status_dict": status.astype(object),
+        "iscurrent": last.astype(object),
+    }
+
+
+def _profile_flowcell(ws: SyntheticWarehouse, rng, n: int) -> dict:
+    sizes = _pools(rng, n, POOL_SIZES, POOL_WEIGHTS)
+    lane = np.repeat(np.arange(len(sizes)), sizes)
+    tag = np.arange(n) - np.repeat(np.cumsum(sizes) - sizes, sizes) + 1
+    pooled = sizes[lane] > 1
+
+    return {
+        "_index": np.arange(n),
+        "_lane": lane,
+        "id_lims": np.full(n, "SQSCP", dtype=object),
+        "id_flowcell_lims": np.array(
+            [str(100_000 + lane // LANES_PER_RUN) for lane in lane.tolist()],
+            dtype=object,
+        ),
+        "position": (lane % LANES_PER_RUN + 1).astype(object),
+        "tag_index": np.where(pooled, tag, None).astype(object),
+        "id_pool_lims": np.array([f"NT{lane}" for lane in lane.tolist()], dtype=object),
+        "entity_type": np.where(pooled, "library_indexed", "library").astype(object),
+    }
+
+
+def _profile_product_metrics(ws: SyntheticWarehouse, rng, n: int) -> dict:
+    flowcell = ws._plan("iseq_flowcell")
+    lanes = ws._plan("iseq_run_lane_metrics")
+    n = len(flowcell["_index"])
+
+    # The lanes of iseq_flowcell are laid out on those of iseq_run_lane_metrics
+    # in turn, so that positions agree.
+    lane = flowcell["_lane"] % max(len(lanes["_index"]), 1)
+
+    return {
+        "_index": np.arange(n),
+        "id_iseq_flowcell_tmp": flowcell["id_iseq_flowcell_tmp"],
+        "id_run": lanes["id_run"][lane],
+        "position": lanes["position"][lane],
+        "tag_index": flowcell["tag_index"],
+    }
+
+
+def _profile_ampliconstats(ws: SyntheticWarehouse, rng, n: int) -> dict:
+    products = ws._plan("iseq_product_metrics")["id_iseq_product"]
+    index = np.arange(min(n, len(products) * AMPLICONS_PER_PRODUCT))
+    chosen = rng.permutation(len(products))[index // AMPLICONS_PER_PRODUCT]
+
+    return {
+        "_index": index,
+        "id_iseq_product": products[chosen],
+        "primer_panel": np.full(len(index), "nCoV-2019/V4.1", dtype=object),
+        "amplicon_index": (index % AMPLICONS_PER_PRODUCT + 1).astype(object),
+    }
+
+
+def _profile_wells(ws: SyntheticWarehouse, rng, n: int) -> dict:
+    index = np.arange(n)
+    wells = len(PACBIO_WELLS)
+
+    return {
+        "_index": index,
+        "pac_bio_run_name": np.array(
+            [f"TRACTION-RUN-{i // wells + 1}" for i in index.tolist()], dtype=object
+        ),
+        "well_label": np.array(PACBIO_WELLS, dtype=object)[index % wells],
+    }
+
+
+def _profile_pacbio_run(ws: SyntheticWarehouse, rng, n: int) -> dict:
+    wells = ws._plan("pac_bio_run_well_metrics")
+    sizes = _pools(rng, n, PACBIO_POOL_SIZES)
+    well = np.repeat(np.arange(len(sizes)), sizes) % max(len(wells["_index"]), 1)
+
+    return {
+        "_index": np.arange(n),
+        "_well": well,
+        "id_lims": np.full(n, "SQSCP", dtype=object),
+        "id_pac_bio_run_lims": np.array(
+            [f"{w // len(PACBIO_WELLS) + 1}" for w in well.tolist()], dtype=object
+        ),
+        "pac_bio_run_name": wells["pac_bio_run_name"][well],
+        "well_label": wells["well_label"][well],
+    }
+
+
+def _profile_pacbio_product(ws: SyntheticWarehouse, rng, n: int) -> dict:
+    runs = ws._plan("pac_bio_run")
+    wells = ws._plan("pac_bio_run_well_metrics")
+
+    return {
+        "_index": np.arange(len(runs["_index"])),
+        "id_pac_bio_tmp": runs["id_pac_bio_tmp"],
+        "id_pac_bio_rw_metrics_tmp": wells["id_pac_bio_rw_metrics_tmp"][runs["_well"]],
+    }
+
+
+_PROFILES: Dict[str, Callable[[SyntheticWarehouse, np.random.Generator, int], dict]] = {
+    "sample": _profile_sample,
+    "study": _profile_sample,
+    "iseq_run_status_dict": _profile_run_status_dict,
+    "iseq_run_lane_metrics": _profile_lanes,
+    "iseq_run_status": _profile_run_status,
+    "iseq_flowcell": _profile_flowcell,
+    "iseq_product_metrics": _profile_product_metrics,
+    "iseq_product_ampliconstats": _profile_ampliconstats,
+    "pac_bio_run_well_metrics": _profile_wells,
+    "pac_bio_run": _profile_pacbio_run,
+    "pac_bio_product_metrics": _profile_pacbio_product,
+}
+
+
+def _skewed(rng: np.random.Generator, n: int, m: int, skew: float) -> np.ndarray:
+    # Indices into m parent rows, where u ** skew of a uniform u crowds the
+    # picks towards the first rows. The parents are shuffled by a permutation
+    # seeded from m, so that the popular ones are spread over the table.
+    picks = np.floor(m * rng.random(n) ** skew).astype(np.int64)
+
+    return np.random.default_rng(m).permutation(m)[picks]
+
+
+def _pools(rng: np.random.Generator, n: int, sizes: list, weights=None) -> np.ndarray:
+    # Pool sizes adding up to n, the last pool being cut short.
+    mean = np.average(sizes, weights=weights)
+    pools = rng.choice(sizes, int(n / mean * 1.2) + 1, p=weights)
+    while pools.sum() < n:
+        pools = np.append(pools, rng.choice(sizes, len(pools), p=weights))
+
+    cut = int(np.searchsorted(np.cumsum(pools), n))
+    pools = pools[: cut + 1]
+    pools[-1] -= pools.sum() - n
+
+    return pools[pools > 0]
+
+
+def _take(values: np.ndarray, picks: np.ndarray) -> np.ndarray:
+    taken = values[np.maximum(picks, 0)].astype(object)
+    taken[picks < 0] = None
+
+    return taken
+
+
+def _deduplicate(table: Table, plan: dict, profiled: set) -> dict:
+    # Drops the rows repeating a unique key made of foreign keys only, such as
+    # those of iseq_product_components.
+    for key in _unique_keys(table):
+        if not all(col in plan for col in key) or profiled.intersection(key):
+            continue
+
+        seen = set()
+        first = []
+        for i, row in enumerate(zip(*(plan[col].tolist() for col in key))):
+            if row not in seen:
+                seen.add(row)
+                first.append(i)
+
+        plan = {name: values[first] for name, values in plan.items()}
+        plan["_index"] = np.arange(len(first))
+
+    return plan
+
+
+def _unique_keys(table: Table) -> List[Tuple[str, ...]]:
+    keys = [tuple(col.key for col in table.primary_key.columns)]
+    keys.extend(
+        tuple(col.key for col in index.columns)
+        for index in table.indexes
+        if index.unique
+    )
+    keys.extend(
+        tuple(col.key for col in constraint.columns)
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    )
+
+    return [key for key in keys if key]
+
+
+def _unique_columns(table: Table, profiled: set) -> set:
+    # A column of each unique key takes distinct values: the first which is
+    # neither a foreign key nor set by a profile. Keys without one are
+    # unique by construction or deduplicated.
+    foreign = {fk.parent.key for fk in table.foreign_keys}
+
+    unique = set()
+    for key in _unique_keys(table):
+        free = [col for col in key if col not in foreign and col not in profiled]
+        if free:
+            unique.add(free[0])
+
+    return unique
+
+
+def _referenced_columns(table: Table) -> set:
+    return {
+        fk.column.key
+        for other in metadata.tables.values()
+        for fk in other.foreign_keys
+        if fk.column.table is table
+    }
+
+
+def _is_flag(sql_type) -> bool:
+    return isinstance(sql_type, types.Boolean) or (
+        isinstance(sql_type, mysql.TINYINT) and sql_type.display_width == 1
+    )
+
+
+def _max_integer(sql_type) -> int:
+    bits = integer_bits(sql_type)
+    if not getattr(sql_type, "unsigned", False):
+        bits -= 1
+
+    return min(2**bits - 1, _MAX_INTEGER)
+
+
+def _unique_values(col: Column, index: np.ndarray) -> list:
+    if isinstance(col.type, types.Integer):
+        return (index + 1).tolist()
+    if isinstance(col.type, types.DateTime):
+        return (np.datetime64(START, "s") + index.astype("timedelta64[s]")).tolist()
+
+    return _strings(col, index.tolist())
+
+
+def _strings(col: Column, codes: list) -> list:
+    # The column name followed by a hexadecimal code, shortened to fit the
+    # column.
+    length = getattr(col.type, "length", None) or 255
+    prefix = col.name[: max(length - 9, 0)]
+    values = [f"{prefix}_{code:x}" for code in codes]
+
+    if len(prefix) + 9 > length:
+        values = [value[-length:] for value in values]
+
+    return values
+
+
+def _dates(rng: np.random.Generator, n: int) -> np.ndarray:
+    seconds = rng.integers(0, SPAN_SECONDS, n)
+
+    return np.datetime64(START, "s") + seconds.astype("timedelta64[s]")
+
+
+def _stream_id(stream) -> int:
+    return zlib.crc32(stream.encode()) if isinstance(stream, str) else int(stream)
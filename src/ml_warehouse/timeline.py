@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Run status histories as NumPy arrays.
+
+A RunTimeline loads the IseqRunStatus history into arrays sorted by run and
+date, so that the state of many runs, now or at any time, and the time spent
+in each state can be computed without querying the warehouse again:
+
+    timeline = RunTimeline()
+    timeline.refresh(sess)
+
+    states, since = timeline.current_state([15440, 15454])
+    timeline.describe(states)
+    timeline.state_at(datetime(2015, 2, 6), [15440, 15454])
+    timeline.durations("run pending", "qc complete")
+
+refresh() reads only the statuses added since it was last called, by their
+id_run_status, and merges them into the arrays; statuses are not expected to
+be updated or deleted. A run's state at a time is that of its latest status
+dated at or before that time, ties being broken by id_run_status; the
+iscurrent flag is not read.
+
+Dates are held to the second, like MySQL DATETIME columns. This module
+requires NumPy, which is installed with the "numpy" extra of this package.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ml_warehouse.columns import load_columns
+from ml_warehouse.dictionaries import dictionary_descriptions
+from ml_warehouse.schema import IseqRunStatus, IseqRunStatusDict
+
+# The state of runs without a status at the time asked for.
+NO_STATE = -1
+
+# Statuses are looked up by a key packing the position of their run above the
+# seconds of their date since _EPOCH, the earliest MySQL DATETIME, which fit in
+# 36 bits until 3177. Dates outside that range are clamped to it.
+_EPOCH = np.datetime64("1000-01-01T00:00:00", "s")
+_SECONDS_BITS = 36
+
+
+class RunTimeline(object):
+    """The status histories of Illumina runs, as arrays of the start of each
+    status, sorted by run and date."""
+
+    def __init__(self):
+        self.runs = np.empty(0, dtype=np.uint32)
+        self.descriptions: Dict[int, str] = {}
+
+        self._id = np.empty(0, dtype=np.int64)
+        self._run = np.empty(0, dtype=np.uint32)
+        self._date = np.empty(0, dtype="datetime64[s]")
+        self._state = np.empty(0, dtype=np.int32)
+        self._index()
+
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """The number of statuses loaded."""
+        return len(self._id)
+
+    def refresh(self, sess: Session) -> int:
+        """Reads the statuses added since the previous refresh and merges them
+        into the timeline.
+
+        Arguments
+        ---------
+        sess: Session
+            The Session to read the warehouse with.
+
+        Returns
+        -------
+        int
+            The number of statuses read.
+        """
+        with self._lock:
+            last_id = int(self._id.max()) if len(self._id) else 0
+            arrays = load_columns(
+                sess,
+                IseqRunStatus.id_run_status,
+                IseqRunStatus.id_run,
+                IseqRunStatus.date,
+                IseqRunStatus.id_run_status_dict,
+                filters=[IseqRunStatus.id_run_status > last_id],
+            )
+
+            self.descriptions = _run_status_descriptions(sess)
+
+            added = len(arrays["id_run_status"])
+            if added:
+                self._id = np.concatenate([self._id, arrays["id_run_status"]])
+                self._run = np.concatenate([self._run, arrays["id_run"]])
+                self._date = np.concatenate(
+                    [self._date, arrays["date"].astype("datetime64[s]")]
+                )
+                self._state = np.concatenate(
+                    [self._state, arrays["id_run_status_dict"].astype(np.int32)]
+                )
+
+                order = np.lexsort((self._id, self._date, self._run))
+                self._id = self._id[order]
+                self._run = self._run[order]
+                self._date = self._date[order]
+                self._state = self._state[order]
+                self._index()
+
+            return added
+
+    def current_state(
+        self, id_runs: Optional[Sequence[int]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the latest state of runs.
+
+        Arguments
+        ---------
+        id_runs: Optional[Sequence[int]]
+            The runs, or None for every run in the order of the runs attribute.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            The id_run_status_dict of the latest status of each run, and the
+            date of that status. Unknown runs have the state NO_STATE and the
+            date NaT.
+        """
+        pos, found = self._positions(id_runs)
+        last = self._offsets[pos + 1] - 1 if len(self.runs) else pos
+
+        return self._pick(last, found)
+
+    def state_at(
+        self,
+        when: Union[datetime, np.datetime64, Sequence],
+        id_runs: Optional[Sequence[int]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the state of runs at a time.
+
+        Arguments
+        ---------
+        when: Union[datetime, np.datetime64, Sequence]
+            The time, or one time per run.
+        id_runs: Optional[Sequence[int]]
+            The runs, or None for every run in the order of the runs attribute.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            The id_run_status_dict of the status of each run at that time, and
+            the date of that status. Runs without a status by then, or asked
+            for at the time NaT, have the state NO_STATE and the date NaT.
+        """
+        pos, found = self._positions(id_runs)
+        when = np.broadcast_to(np.asarray(when, dtype="datetime64[s]"), pos.shape)
+
+        i = np.searchsorted(self._keys, _keys(pos, when), side="right") - 1
+        found = found & (i >= self._offsets[pos]) & ~np.isnat(when)
+
+        return self._pick(i, found)
+
+    def first_dates(
+        self, state: Union[int, str], id_runs: Optional[Sequence[int]] = None
+    ) -> np.ndarray:
+        """Returns the date each run first entered a state, e.g. the pending
+        date of the summarize_long_illumina() example.
+
+        Arguments
+        ---------
+        state: Union[int, str]
+            The id_run_status_dict or the description of the state.
+        id_runs: Optional[Sequence[int]]
+            The runs, or None for every run in the order of the runs attribute.
+
+        Returns
+        -------
+        np.ndarray
+            The dates, NaT for runs which never entered the state.
+        """
+        pos, found = self._positions(id_runs)
+
+        mask = self._state == self._state_id(state)
+        # The statuses are sorted by date within each run, so the first of each
+        # run is the earliest.
+        runs, first = np.unique(self._pos[mask], return_index=True)
+        dates = np.full(len(self.runs), np.datetime64("NaT"), dtype="datetime64[s]")
+        dates[runs] = self._date[mask][first]
+
+        return np.where(found, dates[pos], np.datetime64("NaT"))
+
+    def durations(
+        self,
+        start: Union[int, str],
+        end: Union[int, str],
+        id_runs: Optional[Sequence[int]] = None,
+    ) -> np.ndarray:
+        """Returns the time between runs first entering one state and first
+        entering another.
+
+        Arguments
+        ---------
+        start: Union[int, str]
+            The id_run_status_dict or the description of the first state.
+        end: Union[int, str]
+            The id_run_status_dict or the description of the second state.
+        id_runs: Optional[Sequence[int]]
+            The runs, or None for every run in the order of the runs attribute.
+
+        Returns
+        -------
+        np.ndarray
+            timedelta64 durations, NaT for runs which did not enter both states.
+        """
+        return self.first_dates(end, id_runs) - self.first_dates(start, id_runs)
+
+    def time_in_state(
+        self,
+        state: Union[int, str],
+        id_runs: Optional[Sequence[int]] = None,
+        until: Union[datetime, np.datetime64, None] = None,
+    ) -> np.ndarray:
+        """Returns the total time runs spent in a state, over all the times they
+        entered it. A status lasts until the next status of its run.
+
+        Arguments
+        ---------
+        state: Union[int, str]
+            The id_run_status_dict or the description of the state.
+        id_runs: Optional[Sequence[int]]
+            The runs, or None for every run in the order of the runs attribute.
+        until: Union[datetime, np.datetime64, None]
+            The end of the period considered, which also ends the latest status
+            of each run. Defaults to now.
+
+        Returns
+        -------
+        np.ndarray
+            timedelta64 durations, zero for runs which never entered the state.
+        """
+        pos, found = self._positions(id_runs)
+        if until is None:
+            until = datetime.now()
+        until = np.datetime64(until, "s")
+
+        ends = np.empty_like(self._date)
+        ends[:-1] = self._date[1:]
+        ends[self._offsets[1:] - 1] = until
+        ends = np.minimum(ends, until)
+
+        mask = (self._state == self._state_id(state)) & (self._date < until)
+        seconds = (ends[mask] - self._date[mask]).astype(np.int64)
+        totals = np.bincount(
+            self._pos[mask], weights=seconds, minlength=len(self.runs)
+        ).astype(np.int64)
+
+        return np.where(found, totals[pos], 0).astype("timedelta64[s]")
+
+    def describe(self, states: np.ndarray) -> np.ndarray:
+        """Returns the descriptions of states, None for NO_STATE."""
+        return np.array(
+            [self.descriptions.get(int(s)) for s in np.asarray(states).ravel()],
+            dtype=object,
+        ).reshape(np.shape(states))
+
+    def _index(self):
+        self.runs, starts = np.unique(self._run, return_index=True)
+        self._offsets = np.append(starts, len(self._run)).astype(np.int64)
+        self._pos = np.repeat(np.arange(len(self.runs)), np.diff(self._offsets))
+        self._keys = _keys(self._pos, self._date)
+
+    def _positions(self, id_runs) -> Tuple[np.ndarray, np.ndarray]:
+        # The position of each run in the runs attribute, and whether it is there.
+        if id_runs is None:
+            pos = np.arange(len(self.runs))
+            return pos, np.ones(len(pos), dtype=bool)
+
+        id_runs = np.asarray(id_runs)
+        pos = np.searchsorted(self.runs, id_runs)
+        pos = np.minimum(pos, max(len(self.runs) - 1, 0))
+        found = (
+            self.runs[pos] == id_runs if len(self.runs) else np.zeros(pos.shape, bool)
+        )
+
+        return np.where(found, pos, 0), found
+
+    def _pick(self, i: np.ndarray, found: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if not len(self._state):
+            return (
+                np.full(found.shape, NO_STATE, dtype=np.int32),
+                np.full(found.shape, np.datetime64("NaT"), dtype="datetime64[s]"),
+            )
+
+        i = np.where(found, i, 0)
+        states = np.where(found, self._state[i], NO_STATE)
+        dates = np.where(found, self._date[i], np.datetime64("NaT"))
+
+        return states, dates
+
+    def _state_id(self, state: Union[int, str]) -> int:
+        if not isinstance(state, str):
+            return int(state)
+
+        for id_state, description in self.descriptions.items():
+            if description == state:
+                return id_state
+
+        raise ValueError(f"Unknown run status {state!r}")
+
+
+def _keys(pos: np.ndarray, dates: np.ndarray) -> np.ndarray:
+    seconds = (dates.astype("datetime64[s]") - _EPOCH).astype(np.int64)
+    seconds = np.clip(seconds, 0, (1 << _SECONDS_BITS) - 1)
+
+    return (pos.astype(np.int64) << _SECONDS_BITS) + seconds
+
+
+def _run_status_descriptions(sess: Session) -> Dict[int, str]:
+    descriptions = dictionary_descriptions(IseqRunStatusDict, sess)
+    if descriptions is None:
+        descriptions = dict(
+            sess.execute(
+                select(
+                    IseqRunStatusDict.id_run_status_dict,
+                    IseqRunStatusDict.description,
+                )
+            ).all()
+        )
+
+    return descriptions
@@ -3,11 +3,13 @@ import os
 from typing import Optional
 
 import pytest
-import yaml
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.orm import Session
 from sqlalchemy_utils import create_database, database_exists, drop_database
 
+from ml_warehouse.bulk import load_yaml
+from ml_warehouse.engine import url_from_config, url_from_env
 from ml_warehouse.schema import (
     Base,
     BmapFlowcell,
@@ -23,6 +25,8 @@ from ml_warehouse.schema import (
     StockResource,
     Study,
     StudyUsers,
+    load_all,
+    metadata,
 )
 
 # From the pytest docs:
@@ -34,6 +38,41 @@ from ml_warehouse.schema import (
 
 test_ini = os.path.join(os.path.dirname(__file__), "testdb.ini")
 
+SAVEPOINT = "savepoint"
+CLONE = "clone"
+
+# The named variants of the template and the fixtures they load on top of
+# those of initialize_mlwh(), into their own tables only.
+VARIANTS = {
+    "flgen": [
+        (Study, "tests/fixtures/400-Study.yml"),
+        (Sample, "tests/fixtures/400-Sample.yml"),
+        (FlgenPlate, "tests/fixtures/400-FlgenPlate.yml"),
+    ],
+    "ipm": [(IseqProductMetrics, "tests/fixtures/300-IseqProductMetric.yml")],
+}
+
+# The fixtures which give mlwh_session a variant of the template.
+VARIANT_FIXTURES = {"mlwh_session_flgen": "flgen", "mlwh_session_ipm": "ipm"}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--mlwh-isolation",
+        choices=[SAVEPOINT, CLONE],
+        default=SAVEPOINT,
+        help="How mlwh_session isolates tests: by rolling back a transaction "
+        "(the default) or by giving every test a fresh clone of the template",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "mlwh_clone: give mlwh_session a fresh clone of the template database, "
+        "for tests issuing DDL or reading their changes through other connections",
+    )
+
 
 @pytest.fixture(scope="session")
 def config() -> configparser.ConfigParser:
@@ -41,24 +80,19 @@ def config() -> configparser.ConfigParser:
     # should be an instance in a container, discarded after each test run.
     test_config = configparser.ConfigParser()
     test_config.read(test_ini)
-    yield test_config
-
-
-def insert_from_yaml(sess: Session, table_type, fixtures_fname: str):
 
-    with open(fixtures_fname, "r") as f:
-        fixtures = yaml.safe_load(f)
-        objs = []
+    # Each pytest-xdist worker has a schema of its own, e.g. mlwarehouse_gw0,
+    # created and seeded once per worker.
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker is not None:
+        schema = test_config["MySQL"]["schema"]
+        test_config["MySQL"]["schema"] = f"{schema}_{worker}"
 
-        for row in fixtures:
-            table = table_type()
-            for key, value in row.items():
-                setattr(table, key, value)
+    yield test_config
 
-            objs.append(table)
 
-        sess.add_all(objs)
-        sess.commit()
+def insert_from_yaml(sess: Session, table_type, fixtures_fname: str):
+    load_yaml(sess, table_type, fixtures_fname)
 
 
 def initialize_mlwh(session: Session):
@@ -86,109 +120,229 @@ def initialize_mlwh(session: Session):
 
 @pytest.fixture(scope="function")
 def mlwh_session_flgen(mlwh_session: Session) -> Session:
-    mlwh_session.execute(text("SET foreign_key_checks=0;"))
-    insert_from_yaml(mlwh_session, Study, "tests/fixtures/400-Study.yml")
-    insert_from_yaml(mlwh_session, Sample, "tests/fixtures/400-Sample.yml")
-    insert_from_yaml(mlwh_session, FlgenPlate, "tests/fixtures/400-FlgenPlate.yml")
-    mlwh_session.execute(text("SET foreign_key_checks=1;"))
-
+    # mlwh_session gives tests using this fixture the flgen variant.
     yield mlwh_session
 
 
 @pytest.fixture(scope="function")
-def mlwh_session_ipm(mlwh_session) -> Session:
-    mlwh_session.execute(text("SET foreign_key_checks=0;"))
-    insert_from_yaml(
-        mlwh_session, IseqProductMetrics, "tests/fixtures/300-IseqProductMetric.yml"
-    )
-    mlwh_session.execute(text("SET foreign_key_checks=1;"))
-
+def mlwh_session_ipm(mlwh_session: Session) -> Session:
+    # mlwh_session gives tests using this fixture the ipm variant.
     yield mlwh_session
 
 
 @pytest.fixture(scope="function")
 def prod_session() -> Optional[Session]:
 
-    user = os.environ.get("MYSQL_USER")
-    db = os.environ.get("MYSQL_DBNAME")
-    password = os.environ.get("MYSQL_PW")
-    host = os.environ.get("MYSQL_HOST")
-    port = os.environ.get("MYSQL_PORT")
-
-    if None in (user, db, password, host, port):
+    try:
+        url = url_from_env()
+    except KeyError:
         yield None
         return
 
-    url = f"mysql+pymysql://{user}:{password}@{host}:{port}/{db}?charset=utf8mb4"
     engine = create_engine(url, future=True)
     session = Session(engine)
 
     yield session
 
     session.close()
+    engine.dispose()
 
 
-@pytest.fixture(scope="function")
-def mlwh_session(config: configparser.ConfigParser) -> Session:
+class TemplateDatabase(object):
+    """A template warehouse database, built and seeded once per test session,
+    and the test database, named in testdb.ini, cloned from it.
 
-    uri = mysql_url(config)
-    engine = create_engine(uri, echo=False, future=True)
+    A test run within a transaction that is rolled back leaves the test
+    database as cloned. Any other test makes it dirty, so that it is cloned
+    again before the next test.
 
-    if not database_exists(engine.url):
-        create_database(engine.url)
+    Each of the VARIANTS has a template database of its own, holding only its
+    tables, with the rows of the template and its fixtures. use() copies these
+    tables into the test database, or back those of the template.
 
-    with engine.connect() as conn:
-        # Workaround for invalid default values for dates.
-        conn.execute(text("SET sql_mode = '';"))
-        conn.commit()
-        # Make it easier to populate the tables
-        conn.execute(text("SET foreign_key_checks=0;"))
-        conn.commit()
+    The fixtures are loaded and copied with foreign key checks off, so unlike
+    when initialize_mlwh() loaded them into the test database directly, their
+    rows are never checked against the foreign keys.
+    """
 
-    Base.metadata.create_all(engine)
+    def __init__(self, url: URL):
+        self.url = url
+        self.template_url = url.set(database=f"{url.database}_template")
+        self.variant_urls = {
+            name: url.set(database=f"{self.template_url.database}_{name}")
+            for name in VARIANTS
+        }
+        self.dirty = True
+        self.variant: Optional[str] = None
+
+        # Only used to build and copy tables, with foreign key checks off.
+        self._engine = make_engine(self.template_url, foreign_key_checks=False)
+
+    def build(self):
+        """Creates the template database and loads the fixtures into it."""
+        if database_exists(self.template_url):
+            drop_database(self.template_url)
+        create_database(self.template_url)
+
+        # Map the tables of every schema domain, not only those imported above.
+        load_all()
+        metadata.create_all(self._engine)
+
+        with Session(self._engine) as sess:
+            initialize_mlwh(sess)
+            sess.commit()
+
+        for name, fixtures in VARIANTS.items():
+            self._build_variant(name, fixtures)
+
+    def clone(self, empty: bool = False):
+        """Recreates the test database with the tables of the template and,
+        unless empty, their rows. Rows are copied with foreign key checks off,
+        see above."""
+        if database_exists(self.url):
+            drop_database(self.url)
+        create_database(self.url)
+
+        engine = make_engine(self.url)
+        metadata.create_all(engine)
+        engine.dispose()
+
+        if not empty:
+            with self._engine.begin() as conn:
+                for table in metadata.sorted_tables:
+                    conn.exec_driver_sql(
+                        f"INSERT INTO `{self.url.database}`.`{table.name}` "
+                        f"SELECT * FROM `{self.template_url.database}`.`{table.name}`"
+                    )
+
+        self.dirty = empty
+        self.variant = None
+
+    def use(self, variant: Optional[str]):
+        """Gives the clean test database the rows of a variant of the template,
+        or those of the template if the variant is None."""
+        if variant == self.variant:
+            return
+
+        tables = {
+            model.__table__
+            for name in (self.variant, variant)
+            if name is not None
+            for model, _ in VARIANTS[name]
+        }
+        source = self.template_url if variant is None else self.variant_urls[variant]
+
+        with self._engine.begin() as conn:
+            for table in tables:
+                conn.exec_driver_sql(
+                    f"DELETE FROM `{self.url.database}`.`{table.name}`"
+                )
+                conn.exec_driver_sql(
+                    f"INSERT INTO `{self.url.database}`.`{table.name}` "
+                    f"SELECT * FROM `{source.database}`.`{table.name}`"
+                )
+
+        self.variant = variant
+
+    def drop(self):
+        """Drops the test and template databases."""
+        self._engine.dispose()
+
+        for url in (self.url, self.template_url, *self.variant_urls.values()):
+            if database_exists(url):
+                drop_database(url)
+
+    def _build_variant(self, name: str, fixtures):
+        url = self.variant_urls[name]
+        if database_exists(url):
+            drop_database(url)
+        create_database(url)
+
+        tables = [model.__table__ for model, _ in fixtures]
+        with self._engine.begin() as conn:
+            for table in tables:
+                conn.exec_driver_sql(
+                    f"CREATE TABLE `{url.database}`.`{table.name}` "
+                    f"LIKE `{self.template_url.database}`.`{table.name}`"
+                )
+                conn.exec_driver_sql(
+                    f"INSERT INTO `{url.database}`.`{table.name}` "
+                    f"SELECT * FROM `{self.template_url.database}`.`{table.name}`"
+                )
+
+        engine = make_engine(url, foreign_key_checks=False)
+        with Session(engine) as sess:
+            for model, fixtures_fname in fixtures:
+                insert_from_yaml(sess, model, fixtures_fname)
+            sess.commit()
+        engine.dispose()
+
+
+def make_engine(url: URL, foreign_key_checks: bool = True) -> Engine:
+    engine = create_engine(url, echo=False, future=True)
+
+    @event.listens_for(engine, "connect")
+    def set_session_variables(dbapi_connection, connection_record):
+        with dbapi_connection.cursor() as cursor:
+            # Workaround for invalid default values for dates.
+            cursor.execute("SET sql_mode = ''")
+            if not foreign_key_checks:
+                # Make it easier to populate the tables
+                cursor.execute("SET foreign_key_checks=0")
+
+    return engine
 
-    session_maker = sessionmaker(bind=engine)
-    sess: Session() = session_maker()
 
-    initialize_mlwh(sess)
-    with engine.connect() as conn:
-        conn.execute(text("SET foreign_key_checks=1;"))
-        conn.commit()
+@pytest.fixture(scope="session")
+def mlwh_template(config: configparser.ConfigParser) -> TemplateDatabase:
+    template = TemplateDatabase(url_from_config(config))
+    template.build()
 
-    yield sess
-    sess.close()
+    yield template
 
-    drop_database(engine.url)
+    template.drop()
 
 
-def mysql_url(config: configparser.ConfigParser):
-    """Returns a MySQL URL configured through an ini file.
+@pytest.fixture(scope="function")
+def mlwh_session(request, mlwh_template: TemplateDatabase) -> Session:
+    # Each test has an engine of its own, so that statements compiled by other
+    # tests are not in its cache.
+    if mlwh_template.dirty:
+        mlwh_template.clone()
+    variant = next(
+        (v for f, v in VARIANT_FIXTURES.items() if f in request.fixturenames), None
+    )
+    mlwh_template.use(variant)
+    engine = make_engine(mlwh_template.url)
 
-    The keys and values are:
+    clone = request.config.getoption("mlwh_isolation") == CLONE
+    if clone or request.node.get_closest_marker("mlwh_clone"):
+        mlwh_template.dirty = True
+        sess = Session(engine)
 
-    [MySQL]
-    user       = <database user, defaults to "mlwh">
-    password   = <database password, defaults to empty i.e. "">
-    ip_address = <database IP address, defaults to "127.0.0.1">
-    port       = <database port, defaults to 3306>
-    schema     = <database schema, defaults to "mlwh">
-    """
-    section = "MySQL"
-
-    if section not in config.sections():
-        raise configparser.Error(
-            "The {} configuration section is missing. "
-            "You need to fill this in before running "
-            "tests on a {} database".format(section, section)
-        )
-    connection_conf = config[section]
-    user = connection_conf.get("user", "mlwh")
-    password = connection_conf.get("password", "")
-    ip_address = connection_conf.get("ip_address", "127.0.0.1")
-    port = connection_conf.get("port", "3306")
-    schema = connection_conf.get("schema", "mlwh")
-
-    return (
-        f"mysql+pymysql://{user}:{password}@"
-        f"{ip_address}:{port}/{schema}?charset=utf8mb4"
-    )
+        yield sess
+
+        sess.close()
+        engine.dispose()
+        return
+
+    # The session joins a transaction that is rolled back after the test.
+    # Session.commit() and rollback() end a SAVEPOINT, which is started again.
+    conn = engine.connect()
+    trans = conn.begin()
+    sess = Session(bind=conn)
+    nested = conn.begin_nested()
+
+    @event.listens_for(sess, "after_transaction_end")
+    def restart_savepoint(session, transaction):
+        nonlocal nested
+        if not nested.is_active:
+            nested = conn.begin_nested()
+
+    yield sess
+
+    sess.close()
+    if trans.is_active:
+        trans.rollback()
+    conn.close()
+    engine.dispose()
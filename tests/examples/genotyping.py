@@ -17,7 +17,11 @@
 #
 # @author Adam Blanchet <ab59@sanger.ac.uk>
 
-from sqlalchemy.orm import Session
+from functools import lru_cache
+
+from sqlalchemy import bindparam, lambda_stmt, select
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import StatementLambdaElement
 
 from ml_warehouse.schema import FlgenPlate
 
@@ -49,9 +53,41 @@ def get_flgen_plate(sess: Session, plate_barcode: int, well_label: str):
         ```
     """
 
-    result = sess.query(FlgenPlate).filter(
-        (FlgenPlate.plate_barcode == plate_barcode)
-        & (FlgenPlate.well_label == well_label)
+    return (
+        _flgen_plate_query()
+        .with_session(sess)
+        .params(plate_barcode=plate_barcode, well_label=well_label)
+    )
+
+
+def select_flgen_plate(plate_barcode: int, well_label: str) -> StatementLambdaElement:
+    """The select() counterpart of get_flgen_plate, which can be executed by a
+    Session or an AsyncSession.
+
+    Arguments
+    ---------
+    plate_barcode: int
+        The manufacturer (Fluidigm) barcode.
+    well_label: str
+        The manufacturer well identifier.
+
+    Returns
+    -------
+    StatementLambdaElement
+        The statement corresponding to the search, selecting FlgenPlate.
+    """
+
+    return lambda_stmt(
+        lambda: select(FlgenPlate).where(
+            (FlgenPlate.plate_barcode == plate_barcode)
+            & (FlgenPlate.well_label == well_label)
+        )
     )
 
-    return result
+
+@lru_cache(maxsize=None)
+def _flgen_plate_query() -> Query:
+    return Query(FlgenPlate).filter(
+        (FlgenPlate.plate_barcode == bindparam("plate_barcode"))
+        & (FlgenPlate.well_label == bindparam("well_label"))
+    )
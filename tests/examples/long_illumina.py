@@ -18,13 +18,17 @@
 # @author Adam Blanchet <ab59@sanger.ac.uk>
 
 from datetime import datetime, timedelta
-from typing import Sequence
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
 
+from sqlalchemy import bindparam, case, lambda_stmt, select
 from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import StatementLambdaElement
 from sqlalchemy.sql.functions import func
 from sqlalchemy.sql.schema import Column
 from sqlalchemy.types import INTEGER
 
+from ml_warehouse.dictionaries import dictionary_descriptions
 from ml_warehouse.schema import (
     IseqFlowcell,
     IseqProductMetrics,
@@ -33,6 +37,8 @@ from ml_warehouse.schema import (
     Study,
 )
 
+FINISHED_STATES = ("qc complete", "archival complete", "analysis cancelled")
+
 
 def summarize_long_illumina(
     sess: Session,
@@ -116,58 +122,192 @@ def summarize_long_illumina(
     ```
     """
 
-    irps = (
-        sess.query(
-            func.min(IseqRunStatus.date).label("pending_date"), IseqRunStatus.id_run
+    return (
+        _long_illumina_query(_run_states(sess))
+        .with_session(sess)
+        .params(
+            faculty_sponsor_pattern=faculty_sponsor_pattern,
+            max_age=max_age,
+            active_run_min_age=active_run_min_age,
+            min_tot_days=min_tot_days,
+            ids_also_included=list(ids_also_included),
         )
-        .filter(IseqRunStatus.id_run_status_dict == 1)
-        .group_by(IseqRunStatus.id_run)
-        .subquery("irps")
     )
 
-    tot_days = func.datediff(IseqRunStatus.date, irps.c.pending_date).label("tot_days")
 
-    return (
-        sess.query(
+def select_long_illumina(
+    faculty_sponsor_pattern: str,
+    max_age: datetime,
+    active_run_min_age: timedelta,
+    min_tot_days: int,
+    ids_also_included: Sequence[int],
+) -> StatementLambdaElement:
+    """
+    The select() counterpart of summarize_long_illumina, which can be executed by
+    a Session or an AsyncSession.
+
+    Arguments
+    ---------
+    faculty_sponsor_pattern: str
+        A SQL pattern string, to select the faculty_sponsor (e.g. "%bob%")
+    max_age: datetime
+        The age of the oldest run to consider.
+    active_run_min_age: datetime
+        The minimum age to consider still active runs.
+    ids_also_included:
+        Run IDs to include in the results regardless.
+
+    Returns
+    -------
+    StatementLambdaElement
+        The statement corresponding to the search, with fields `id_run`,
+        `current_state`, `date`, `tot_days` and `studies`.
+    """
+
+    states = _run_states()
+    current_state, finished, join_dict = _run_state(states)
+    ids_also_included = list(ids_also_included)
+
+    # The run state expressions depend on the dictionary cache, so the cached
+    # statements are keyed on the run states rather than on the expressions.
+    stmt = lambda_stmt(
+        lambda: select(
             IseqRunStatus.id_run,
-            IseqRunStatusDict.description.label("current_state"),
+            current_state.label("current_state"),
             IseqRunStatus.date,
-            tot_days.label("tot_days"),
+            _tot_days(_pending_runs()),
             func.group_concat(func.distinct(Study.name)).label("studies"),
         )
+        .select_from(Study)
         .join(IseqFlowcell, IseqFlowcell.id_study_tmp == Study.id_study_tmp)
         .join(
             IseqProductMetrics,
             IseqProductMetrics.id_iseq_flowcell_tmp
             == IseqFlowcell.id_iseq_flowcell_tmp,
         )
-        .join(irps, irps.c.id_run == IseqProductMetrics.id_run)
+        .join(_pending_runs(), _pending_runs().c.id_run == IseqProductMetrics.id_run)
         .join(
             IseqRunStatus,
             (IseqRunStatus.id_run == IseqProductMetrics.id_run)
             & (IseqRunStatus.iscurrent == 1),
-        )
-        .join(
+        ),
+        track_on=[repr(states)],
+    )
+    if join_dict:
+        stmt += lambda s: s.join(
             IseqRunStatusDict,
             IseqRunStatusDict.id_run_status_dict == IseqRunStatus.id_run_status_dict,
         )
-        .filter(Study.faculty_sponsor.like(faculty_sponsor_pattern))
+
+    return stmt.add_criteria(
+        lambda s: s.where(Study.faculty_sponsor.like(faculty_sponsor_pattern))
         .group_by(IseqRunStatus.id_run)
         .having(
-            (
-                (
-                    ~(
-                        IseqRunStatusDict.description.in_(
-                            ("qc complete", "archival complete", "analysis cancelled")
-                        )
-                    )
-                )
-                & (IseqRunStatus.date < (active_run_min_age))
-            )
+            ((~finished) & (IseqRunStatus.date < (active_run_min_age)))
             | (
                 (Column(INTEGER, name="tot_days") > min_tot_days)
                 & (IseqRunStatus.date > (max_age))
             )
             | (IseqRunStatus.id_run.in_(ids_also_included))
+        ),
+        track_on=[repr(states)],
+    )
+
+
+@lru_cache(maxsize=16)
+def _long_illumina_query(states: Optional[Tuple[Tuple[int, str], ...]]) -> Query:
+    irps = _pending_runs()
+    current_state, finished, join_dict = _run_state(states)
+
+    query = (
+        Query(
+            [
+                IseqRunStatus.id_run,
+                current_state.label("current_state"),
+                IseqRunStatus.date,
+                _tot_days(irps),
+                func.group_concat(func.distinct(Study.name)).label("studies"),
+            ]
         )
+        .join(IseqFlowcell, IseqFlowcell.id_study_tmp == Study.id_study_tmp)
+        .join(
+            IseqProductMetrics,
+            IseqProductMetrics.id_iseq_flowcell_tmp
+            == IseqFlowcell.id_iseq_flowcell_tmp,
+        )
+        .join(irps, irps.c.id_run == IseqProductMetrics.id_run)
+        .join(
+            IseqRunStatus,
+            (IseqRunStatus.id_run == IseqProductMetrics.id_run)
+            & (IseqRunStatus.iscurrent == 1),
+        )
+    )
+    if join_dict:
+        query = query.join(
+            IseqRunStatusDict,
+            IseqRunStatusDict.id_run_status_dict == IseqRunStatus.id_run_status_dict,
+        )
+
+    return (
+        query.filter(Study.faculty_sponsor.like(bindparam("faculty_sponsor_pattern")))
+        .group_by(IseqRunStatus.id_run)
+        .having(
+            ((~finished) & (IseqRunStatus.date < bindparam("active_run_min_age")))
+            | (
+                (Column(INTEGER, name="tot_days") > bindparam("min_tot_days"))
+                & (IseqRunStatus.date > bindparam("max_age"))
+            )
+            | (IseqRunStatus.id_run.in_(bindparam("ids_also_included", expanding=True)))
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def _pending_runs():
+    # The date each run was first pending.
+    return (
+        select(func.min(IseqRunStatus.date).label("pending_date"), IseqRunStatus.id_run)
+        .where(IseqRunStatus.id_run_status_dict == 1)
+        .group_by(IseqRunStatus.id_run)
+        .subquery("irps")
     )
+
+
+def _tot_days(irps):
+    return func.datediff(IseqRunStatus.date, irps.c.pending_date).label("tot_days")
+
+
+def _run_states(
+    sess: Optional[Session] = None,
+) -> Optional[Tuple[Tuple[int, str], ...]]:
+    # The run states by id from the dictionary cache, or None without the
+    # cache, or before it has read the table when there is no Session to read
+    # it with.
+    descriptions = dictionary_descriptions(IseqRunStatusDict, sess)
+    if descriptions is None:
+        return None
+
+    return tuple(sorted(descriptions.items()))
+
+
+@lru_cache(maxsize=16)
+def _run_state(states: Optional[Tuple[Tuple[int, str], ...]]):
+    # Returns the current state of runs, the condition that they are finished
+    # and whether IseqRunStatusDict must be joined. With the run states, both
+    # are computed from the ids of the statuses, without the join.
+    if states is None:
+        return (
+            IseqRunStatusDict.description,
+            IseqRunStatusDict.description.in_(FINISHED_STATES),
+            True,
+        )
+
+    current_state = case(dict(states), value=IseqRunStatus.id_run_status_dict)
+    # Match the descriptions as the collation of the joined column would.
+    ids = [
+        i
+        for i, description in states
+        if description.rstrip(" ").lower() in FINISHED_STATES
+    ]
+
+    return current_state, IseqRunStatus.id_run_status_dict.in_(ids), False
@@ -17,9 +17,12 @@
 #
 # @author Adam Blanchet <ab59@sanger.ac.uk>
 
+from functools import lru_cache
 from typing import Optional
 
+from sqlalchemy import bindparam, lambda_stmt, select
 from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import Select, StatementLambdaElement
 
 from ml_warehouse.schema import BmapFlowcell, PacBioRun, StockResource
 
@@ -48,11 +51,7 @@ def get_stock_records(sess: Session, stock_id: str):
 
     """
 
-    result = sess.query(StockResource).filter(
-        StockResource.id_stock_resource_lims == stock_id
-    )
-
-    return result
+    return _stock_records_query().with_session(sess).params(stock_id=stock_id)
 
 
 def get_bmap_flowcell_records(sess: Session, chip_serialnumber: str, position: int):
@@ -81,13 +80,12 @@ def get_bmap_flowcell_records(sess: Session, chip_serialnumber: str, position: i
         ```
     """
 
-    result = sess.query(BmapFlowcell).filter(
-        (BmapFlowcell.chip_serialnumber == chip_serialnumber)
-        & (BmapFlowcell.position == position)
+    return (
+        _bmap_flowcell_records_query()
+        .with_session(sess)
+        .params(chip_serialnumber=chip_serialnumber, position=position)
     )
 
-    return result
-
 
 def find_pacbio_runs(
     sess: Session, run_id: str, plate_well: str, tag_identifier: Optional[str] = None
@@ -111,13 +109,121 @@ def find_pacbio_runs(
         The Query object corresponding to the search.
     """
 
-    result = sess.query(PacBioRun).filter(
+    return (
+        _pacbio_runs_query(tag_identifier is not None)
+        .with_session(sess)
+        .params(run_id=run_id, plate_well=plate_well, tag_identifier=tag_identifier)
+    )
+
+
+def select_stock_records(stock_id: str) -> StatementLambdaElement:
+    """The select() counterpart of get_stock_records, which can be executed by a
+    Session or an AsyncSession.
+
+    Arguments
+    ---------
+    stock_id: str
+        The stock ID for the StockResource.
+
+    Returns
+    -------
+    StatementLambdaElement
+        The statement corresponding to the search, selecting StockResource.
+    """
+
+    return lambda_stmt(
+        lambda: select(StockResource).where(
+            StockResource.id_stock_resource_lims == stock_id
+        )
+    )
+
+
+def select_bmap_flowcell_records(
+    chip_serialnumber: str, position: int
+) -> StatementLambdaElement:
+    """The select() counterpart of get_bmap_flowcell_records, which can be
+    executed by a Session or an AsyncSession.
+
+    Arguments
+    ---------
+    chip_serialnumber: str
+        The chip serialnumber.
+    position: int
+        The BmapFlowcell position.
+
+    Returns
+    -------
+    StatementLambdaElement
+        The statement corresponding to the search, selecting BmapFlowcell.
+    """
+
+    return lambda_stmt(
+        lambda: select(BmapFlowcell).where(
+            (BmapFlowcell.chip_serialnumber == chip_serialnumber)
+            & (BmapFlowcell.position == position)
+        )
+    )
+
+
+def select_pacbio_runs(
+    run_id: str, plate_well: str, tag_identifier: Optional[str] = None
+) -> Select:
+    """The select() counterpart of find_pacbio_runs, which can be executed by a
+    Session or an AsyncSession. Unlike the other select() counterparts, it
+    returns a Select so that loader options can be added to it.
+
+    Arguments
+    ---------
+    run_id: str
+        PacBio run ID.
+    plate_well: str
+        PacBio plate well, zero-padded form.
+    tag_identifier: Optional[str]
+        Tag identifier.
+
+    Returns
+    -------
+    Select
+        The statement corresponding to the search, selecting PacBioRun.
+    """
+
+    stmt = select(PacBioRun).where(
         (PacBioRun.pac_bio_run_name == run_id) | (PacBioRun.well_label == plate_well)
     )
 
     if tag_identifier is not None:
-        result = result.filter(PacBioRun.tag_identifier == tag_identifier)
+        stmt = stmt.where(PacBioRun.tag_identifier == tag_identifier)
+
+    return stmt.group_by(
+        PacBioRun.pac_bio_run_name, PacBioRun.well_label, PacBioRun.tag_identifier
+    )
+
+
+@lru_cache(maxsize=None)
+def _stock_records_query() -> Query:
+    return Query(StockResource).filter(
+        StockResource.id_stock_resource_lims == bindparam("stock_id")
+    )
+
+
+@lru_cache(maxsize=None)
+def _bmap_flowcell_records_query() -> Query:
+    return Query(BmapFlowcell).filter(
+        (BmapFlowcell.chip_serialnumber == bindparam("chip_serialnumber"))
+        & (BmapFlowcell.position == bindparam("position"))
+    )
+
+
+@lru_cache(maxsize=None)
+def _pacbio_runs_query(with_tag: bool) -> Query:
+    query = Query(PacBioRun).filter(
+        (PacBioRun.pac_bio_run_name == bindparam("run_id"))
+        | (PacBioRun.well_label == bindparam("plate_well"))
+    )
+
+    if with_tag:
+        query = query.filter(PacBioRun.tag_identifier == bindparam("tag_identifier"))
 
-    return result.group_by(
+    return query.group_by(
         PacBioRun.pac_bio_run_name, PacBioRun.well_label, PacBioRun.tag_identifier
     )
@@ -17,9 +17,12 @@
 #
 # @author Adam Blanchet <ab59@sanger.ac.uk>
 
+from functools import lru_cache
 from typing import Sequence
 
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, lambda_stmt, select
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import StatementLambdaElement
 from sqlalchemy.sql.expression import distinct
 from sqlalchemy.sql.functions import func
 from sqlalchemy.sql.schema import Column
@@ -66,18 +69,12 @@ def get_iseq_product_metrics_run(
             q[group by p.id_run having study_count = ?];
     """
 
-    study_count_f = func.count(distinct(Study.id_study_lims))
-
     return (
-        sess.query(IseqProductMetrics.id_run, study_count_f.label("study_count"))
-        .join(IseqProductMetrics.iseq_flowcell)
-        .join(IseqFlowcell.study)
-        .filter(
-            ~(IseqFlowcell.entity_type == excluded_type)
-            & (IseqProductMetrics.id_run.in_(run_ids))
+        _iseq_product_metrics_run_query()
+        .with_session(sess)
+        .params(
+            run_ids=list(run_ids), excluded_type=excluded_type, study_count=study_count
         )
-        .group_by(IseqProductMetrics.id_run)
-        .having(Column(Integer, name="study_count") == study_count)
     )
 
 
@@ -111,16 +108,12 @@ def get_iseq_product_metrics_by_study(
         ```
     """
 
-    result = (
-        sess.query(IseqProductMetrics.id_run)
-        .distinct()
-        .join(IseqProductMetrics.iseq_flowcell)
-        .join(IseqFlowcell.study)
-        .filter((Study.name == study_name) & (IseqProductMetrics.id_run.in_(run_ids)))
+    return (
+        _iseq_product_metrics_by_study_query()
+        .with_session(sess)
+        .params(study_name=study_name, run_ids=list(run_ids))
     )
 
-    return result
-
 
 def get_iseq_product_metrics_by_decode_percent(
     sess: Session, max_decode_percent: int, run_ids: Sequence[int]
@@ -151,10 +144,108 @@ def get_iseq_product_metrics_by_decode_percent(
         ```
     """
 
-    result = (
-        sess.query(IseqRunLaneMetrics.id_run)
+    return (
+        _iseq_product_metrics_by_decode_percent_query()
+        .with_session(sess)
+        .params(max_decode_percent=max_decode_percent, run_ids=list(run_ids))
+    )
+
+
+def select_iseq_product_metrics_run(
+    run_ids: Sequence[int], excluded_type: str, study_count: int
+) -> StatementLambdaElement:
+    """The select() counterpart of get_iseq_product_metrics_run, which can be
+    executed by a Session or an AsyncSession.
+
+    Arguments
+    ---------
+    run_ids: Sequence[int]
+        The run IDs to check.
+    excluded_type: str
+        The Flowcell type to exclude from the search.
+    study_count: int
+        The study count that IseqProductMetrics should match.
+
+    Returns
+    -------
+    StatementLambdaElement
+        The statement corresponding to the search, with fields `id_run` and
+        `study_count`.
+    """
+
+    run_ids = list(run_ids)
+
+    return lambda_stmt(
+        lambda: select(
+            IseqProductMetrics.id_run,
+            func.count(distinct(Study.id_study_lims)).label("study_count"),
+        )
+        .join(IseqProductMetrics.iseq_flowcell)
+        .join(IseqFlowcell.study)
+        .where(
+            ~(IseqFlowcell.entity_type == excluded_type)
+            & (IseqProductMetrics.id_run.in_(run_ids))
+        )
+        .group_by(IseqProductMetrics.id_run)
+        .having(Column(Integer, name="study_count") == study_count)
+    )
+
+
+def select_iseq_product_metrics_by_study(
+    study_name: str, run_ids: Sequence[int]
+) -> StatementLambdaElement:
+    """The select() counterpart of get_iseq_product_metrics_by_study, which can
+    be executed by a Session or an AsyncSession.
+
+    Arguments
+    ---------
+    study_name: str
+        The Study name to match against.
+    run_ids: Sequence[int]
+        The set of run IDs to search within.
+
+    Returns
+    -------
+    StatementLambdaElement
+        The statement corresponding to the search, with the field `id_run`.
+    """
+
+    run_ids = list(run_ids)
+
+    return lambda_stmt(
+        lambda: select(IseqProductMetrics.id_run)
         .distinct()
-        .filter(
+        .join(IseqProductMetrics.iseq_flowcell)
+        .join(IseqFlowcell.study)
+        .where((Study.name == study_name) & (IseqProductMetrics.id_run.in_(run_ids)))
+    )
+
+
+def select_iseq_product_metrics_by_decode_percent(
+    max_decode_percent: int, run_ids: Sequence[int]
+) -> StatementLambdaElement:
+    """The select() counterpart of get_iseq_product_metrics_by_decode_percent,
+    which can be executed by a Session or an AsyncSession.
+
+    Arguments
+    ---------
+    max_decode_percent: int
+        The maximum desired tags_decode_percent.
+    run_ids: Sequence[int]
+        The set of run IDs against which to perform the search.
+
+    Returns
+    -------
+    StatementLambdaElement
+        The statement corresponding to the search, with the field `id_run`.
+    """
+
+    run_ids = list(run_ids)
+
+    return lambda_stmt(
+        lambda: select(IseqRunLaneMetrics.id_run)
+        .distinct()
+        .where(
             (
                 (IseqRunLaneMetrics.tags_decode_percent == None)
                 | (IseqRunLaneMetrics.tags_decode_percent < max_decode_percent)
@@ -163,4 +254,51 @@ def get_iseq_product_metrics_by_decode_percent(
         )
     )
 
-    return result
+
+@lru_cache(maxsize=None)
+def _iseq_product_metrics_run_query() -> Query:
+    study_count_f = func.count(distinct(Study.id_study_lims))
+
+    return (
+        Query([IseqProductMetrics.id_run, study_count_f.label("study_count")])
+        .join(IseqProductMetrics.iseq_flowcell)
+        .join(IseqFlowcell.study)
+        .filter(
+            ~(IseqFlowcell.entity_type == bindparam("excluded_type"))
+            & (IseqProductMetrics.id_run.in_(bindparam("run_ids", expanding=True)))
+        )
+        .group_by(IseqProductMetrics.id_run)
+        .having(Column(Integer, name="study_count") == bindparam("study_count"))
+    )
+
+
+@lru_cache(maxsize=None)
+def _iseq_product_metrics_by_study_query() -> Query:
+    return (
+        Query(IseqProductMetrics.id_run)
+        .distinct()
+        .join(IseqProductMetrics.iseq_flowcell)
+        .join(IseqFlowcell.study)
+        .filter(
+            (Study.name == bindparam("study_name"))
+            & (IseqProductMetrics.id_run.in_(bindparam("run_ids", expanding=True)))
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def _iseq_product_metrics_by_decode_percent_query() -> Query:
+    return (
+        Query(IseqRunLaneMetrics.id_run)
+        .distinct()
+        .filter(
+            (
+                (IseqRunLaneMetrics.tags_decode_percent == None)
+                | (
+                    IseqRunLaneMetrics.tags_decode_percent
+                    < bindparam("max_decode_percent")
+                )
+            )
+            & (IseqRunLaneMetrics.id_run.in_(bindparam("run_ids", expanding=True)))
+        )
+    )
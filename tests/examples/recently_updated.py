@@ -18,8 +18,11 @@
 # @author Adam Blanchet <ab59@sanger.ac.uk>
 
 from datetime import datetime, timedelta
+from functools import lru_cache
 
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, lambda_stmt, select
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import StatementLambdaElement
 
 from ml_warehouse.schema import FlgenPlate, OseqFlowcell, PacBioRun, Sample, Study
 
@@ -40,27 +43,7 @@ def get_recent_pacbio_runs(sess: Session, max_age: datetime):
         The Query corresponding to the search.
     """
 
-    return (
-        sess.query(
-            Sample.last_updated.label("sample_last_updated"),
-            Study.last_updated.label("study_last_updated"),
-            PacBioRun.last_updated.label("pacbiorun_last_updated"),
-            PacBioRun.id_pac_bio_run_lims,
-            PacBioRun.plate_barcode,
-            PacBioRun.well_label,
-            PacBioRun.pac_bio_library_tube_name,
-            PacBioRun.tag_set_name,
-            PacBioRun.tag_set_id_lims,
-            PacBioRun.tag_sequence,
-            PacBioRun.tag_identifier,
-            PacBioRun.tag2_set_name,
-            PacBioRun.tag2_sequence,
-            PacBioRun.tag2_identifier,
-        )
-        .distinct()
-        .join(PacBioRun.sample, PacBioRun.study)
-        .filter((Sample.last_updated > max_age) | (Study.last_updated > max_age))
-    )
+    return _recent_pacbio_runs_query().with_session(sess).params(max_age=max_age)
 
 
 def get_recent_ont(sess: Session, max_age: datetime):
@@ -79,30 +62,7 @@ def get_recent_ont(sess: Session, max_age: datetime):
         The Query corresponding to the search.
     """
 
-    return (
-        sess.query(
-            Sample.name,
-            Sample.supplier_name,
-            Study.id_study_lims,
-            OseqFlowcell.experiment_name,
-            OseqFlowcell.instrument_slot,
-            OseqFlowcell.tag_set_name,
-            OseqFlowcell.tag_set_id_lims,
-            OseqFlowcell.tag_sequence,
-            OseqFlowcell.tag_identifier,
-            OseqFlowcell.tag2_set_name,
-            OseqFlowcell.tag2_sequence,
-            OseqFlowcell.tag2_identifier,
-        )
-        .distinct()
-        .join(OseqFlowcell.sample)
-        .join(OseqFlowcell.study)
-        .filter(
-            (OseqFlowcell.last_updated > max_age)
-            | (Sample.last_updated > max_age)
-            | (Study.last_updated > max_age)
-        )
-    )
+    return _recent_ont_query().with_session(sess).params(max_age=max_age)
 
 
 def get_recent_fluidigm(sess: Session, max_age: datetime):
@@ -123,15 +83,212 @@ def get_recent_fluidigm(sess: Session, max_age: datetime):
         `last_updated`, `id_study_lims`, `plate_barcode`, `well_label` and `recorded_at`.
     """
 
+    return _recent_fluidigm_query().with_session(sess).params(max_age=max_age)
+
+
+def select_recent_pacbio_runs(max_age: datetime) -> StatementLambdaElement:
+    """The select() counterpart of get_recent_pacbio_runs, which can be executed
+    by a Session or an AsyncSession.
+
+    Arguments
+    ---------
+    max_age: datetime
+        The maximum age of the PacBio runs.
+
+    Returns
+    -------
+    StatementLambdaElement
+        The statement corresponding to the search.
+    """
+
+    return lambda_stmt(
+        lambda: (
+            select(
+                Sample.last_updated.label("sample_last_updated"),
+                Study.last_updated.label("study_last_updated"),
+                PacBioRun.last_updated.label("pacbiorun_last_updated"),
+                PacBioRun.id_pac_bio_run_lims,
+                PacBioRun.plate_barcode,
+                PacBioRun.well_label,
+                PacBioRun.pac_bio_library_tube_name,
+                PacBioRun.tag_set_name,
+                PacBioRun.tag_set_id_lims,
+                PacBioRun.tag_sequence,
+                PacBioRun.tag_identifier,
+                PacBioRun.tag2_set_name,
+                PacBioRun.tag2_sequence,
+                PacBioRun.tag2_identifier,
+            )
+            .distinct()
+            .select_from(PacBioRun)
+            .join(PacBioRun.sample)
+            .join(PacBioRun.study)
+            .where((Sample.last_updated > max_age) | (Study.last_updated > max_age))
+        )
+    )
+
+
+def select_recent_ont(max_age: datetime) -> StatementLambdaElement:
+    """The select() counterpart of get_recent_ont, which can be executed by a
+    Session or an AsyncSession.
+
+    Arguments
+    ---------
+    max_age: datetime
+        The maximum age of the last update to the OseqFlowcell entry.
+
+    Returns
+    -------
+    StatementLambdaElement
+        The statement corresponding to the search.
+    """
+
+    return lambda_stmt(
+        lambda: (
+            select(
+                Sample.name,
+                Sample.supplier_name,
+                Study.id_study_lims,
+                OseqFlowcell.experiment_name,
+                OseqFlowcell.instrument_slot,
+                OseqFlowcell.tag_set_name,
+                OseqFlowcell.tag_set_id_lims,
+                OseqFlowcell.tag_sequence,
+                OseqFlowcell.tag_identifier,
+                OseqFlowcell.tag2_set_name,
+                OseqFlowcell.tag2_sequence,
+                OseqFlowcell.tag2_identifier,
+            )
+            .distinct()
+            .select_from(OseqFlowcell)
+            .join(OseqFlowcell.sample)
+            .join(OseqFlowcell.study)
+            .where(
+                (OseqFlowcell.last_updated > max_age)
+                | (Sample.last_updated > max_age)
+                | (Study.last_updated > max_age)
+            )
+        )
+    )
+
+
+def select_recent_fluidigm(max_age: datetime) -> StatementLambdaElement:
+    """The select() counterpart of get_recent_fluidigm, which can be executed by
+    a Session or an AsyncSession.
+
+    Arguments
+    ---------
+    max_age: datetime
+        The maximum age of the last update to the FlgenPlate's corresponding Sample.
+
+    Returns
+    -------
+    StatementLambdaElement
+        The statement corresponding to the search, with fields `name`,
+        `consent_withdrawn`, `last_updated`, `id_study_lims`, `plate_barcode`,
+        `well_label` and `recorded_at`.
+    """
+
+    return lambda_stmt(
+        lambda: (
+            select(
+                Sample.name,
+                Sample.consent_withdrawn,
+                Sample.last_updated,
+                Study.id_study_lims,
+                FlgenPlate.plate_barcode,
+                FlgenPlate.well_label,
+                FlgenPlate.recorded_at,
+            )
+            .distinct()
+            .select_from(FlgenPlate)
+            .join(FlgenPlate.sample)
+            .join(FlgenPlate.study)
+            .where(
+                (FlgenPlate.last_updated > max_age)
+                | (Study.last_updated > max_age)
+                | (Sample.last_updated > max_age)
+            )
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def _recent_pacbio_runs_query() -> Query:
+    max_age = bindparam("max_age")
+
+    return (
+        Query(
+            [
+                Sample.last_updated.label("sample_last_updated"),
+                Study.last_updated.label("study_last_updated"),
+                PacBioRun.last_updated.label("pacbiorun_last_updated"),
+                PacBioRun.id_pac_bio_run_lims,
+                PacBioRun.plate_barcode,
+                PacBioRun.well_label,
+                PacBioRun.pac_bio_library_tube_name,
+                PacBioRun.tag_set_name,
+                PacBioRun.tag_set_id_lims,
+                PacBioRun.tag_sequence,
+                PacBioRun.tag_identifier,
+                PacBioRun.tag2_set_name,
+                PacBioRun.tag2_sequence,
+                PacBioRun.tag2_identifier,
+            ]
+        )
+        .distinct()
+        .join(PacBioRun.sample, PacBioRun.study)
+        .filter((Sample.last_updated > max_age) | (Study.last_updated > max_age))
+    )
+
+
+@lru_cache(maxsize=None)
+def _recent_ont_query() -> Query:
+    max_age = bindparam("max_age")
+
+    return (
+        Query(
+            [
+                Sample.name,
+                Sample.supplier_name,
+                Study.id_study_lims,
+                OseqFlowcell.experiment_name,
+                OseqFlowcell.instrument_slot,
+                OseqFlowcell.tag_set_name,
+                OseqFlowcell.tag_set_id_lims,
+                OseqFlowcell.tag_sequence,
+                OseqFlowcell.tag_identifier,
+                OseqFlowcell.tag2_set_name,
+                OseqFlowcell.tag2_sequence,
+                OseqFlowcell.tag2_identifier,
+            ]
+        )
+        .distinct()
+        .join(OseqFlowcell.sample)
+        .join(OseqFlowcell.study)
+        .filter(
+            (OseqFlowcell.last_updated > max_age)
+            | (Sample.last_updated > max_age)
+            | (Study.last_updated > max_age)
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def _recent_fluidigm_query() -> Query:
+    max_age = bindparam("max_age")
+
     return (
-        sess.query(
-            Sample.name,
-            Sample.consent_withdrawn,
-            Sample.last_updated,
-            Study.id_study_lims,
-            FlgenPlate.plate_barcode,
-            FlgenPlate.well_label,
-            FlgenPlate.recorded_at,
+        Query(
+            [
+                Sample.name,
+                Sample.consent_withdrawn,
+                Sample.last_updated,
+                Study.id_study_lims,
+                FlgenPlate.plate_barcode,
+                FlgenPlate.well_label,
+                FlgenPlate.recorded_at,
+            ]
         )
         .distinct()
         .join(FlgenPlate.sample)
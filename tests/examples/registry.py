@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""The example query helpers, with representative parameters taken from the
+tests, for tools which run all of them, such as benchmarks/plan_audit.py."""
+
+from datetime import datetime
+from typing import Callable, Dict
+
+from sqlalchemy.orm import Session
+
+from examples.genotyping import get_flgen_plate
+from examples.long_illumina import summarize_long_illumina
+from examples.npg_irods import (
+    find_pacbio_runs,
+    get_bmap_flowcell_records,
+    get_stock_records,
+)
+from examples.npg_qc import (
+    get_iseq_product_metrics_by_decode_percent,
+    get_iseq_product_metrics_by_study,
+    get_iseq_product_metrics_run,
+)
+from examples.recently_updated import (
+    get_recent_fluidigm,
+    get_recent_ont,
+    get_recent_pacbio_runs,
+)
+from examples.stats import get_sequenced_sum
+
+HELPERS: Dict[str, Callable[[Session], object]] = {
+    "get_flgen_plate": lambda s: get_flgen_plate(s, 1382108143, "S70"),
+    "summarize_long_illumina": lambda s: summarize_long_illumina(
+        s,
+        "%tyler%",
+        datetime(year=2015, month=1, day=14),
+        datetime(year=2021, month=8, day=31),
+        3,
+        [3434, 1239, 1453],
+    ),
+    "find_pacbio_runs": lambda s: find_pacbio_runs(s, 32669, "B1"),
+    "get_bmap_flowcell_records": lambda s: get_bmap_flowcell_records(
+        s, "KHPZDTGLPQJGPNWU", 2
+    ),
+    "get_stock_records": lambda s: get_stock_records(s, "stock_barcode_01234"),
+    "get_iseq_product_metrics_by_decode_percent": (
+        lambda s: get_iseq_product_metrics_by_decode_percent(
+            s, 95, [7915, 15440, 18448, 18980, 26291]
+        )
+    ),
+    "get_iseq_product_metrics_by_study": lambda s: get_iseq_product_metrics_by_study(
+        s, "Illumina Controls", (7915, 17550, 18980, 7915, 18448, 1337)
+    ),
+    "get_iseq_product_metrics_run": lambda s: get_iseq_product_metrics_run(
+        s, [7915, 15440, 18980, 17550], "library_indexed_spike", 5
+    ),
+    "get_recent_fluidigm": lambda s: get_recent_fluidigm(
+        s, datetime(year=2021, month=8, day=19)
+    ),
+    "get_recent_ont": lambda s: get_recent_ont(s, datetime(year=2018, month=1, day=1)),
+    "get_recent_pacbio_runs": lambda s: get_recent_pacbio_runs(
+        s, datetime(year=2021, month=1, day=31)
+    ),
+    "get_sequenced_sum": lambda s: get_sequenced_sum(
+        s, datetime(year=2010, month=1, day=1)
+    ),
+}
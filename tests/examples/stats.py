@@ -18,14 +18,19 @@
 # @author Adam Blanchet <ab59@sanger.ac.uk>
 
 from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Tuple
 
+from ml_warehouse.dictionaries import dictionary_ids
 from ml_warehouse.schema import (
     IseqRunLaneMetrics,
     IseqRunStatus,
     IseqRunStatusDict,
 )
 
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, lambda_stmt, select
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import StatementLambdaElement
 from sqlalchemy.sql.functions import func
 
 
@@ -47,7 +52,35 @@ def get_sequenced_sum(sess: Session, since: datetime):
     """
 
     return (
-        sess.query(
+        _sequenced_sum_query(_qc_complete_ids(sess))
+        .with_session(sess)
+        .params(since=since)
+    )
+
+
+def select_sequenced_sum(since: datetime) -> StatementLambdaElement:
+    """The select() counterpart of get_sequenced_sum, which can be executed by a
+    Session or an AsyncSession.
+
+    Arguments
+    ---------
+    since: datetime
+        The earliest date from which to count sequencing runs.
+
+    Returns
+    -------
+    StatementLambdaElement
+        The statement corresponding to the search, with fields `bases`, `month`,
+        `count`.
+    """
+
+    ids = _qc_complete_ids()
+    qc_complete = _qc_complete(ids)
+
+    # The condition depends on the dictionary cache, so the cached statements
+    # are keyed on the ids rather than on the condition.
+    return lambda_stmt(
+        lambda: select(
             func.sum(
                 IseqRunLaneMetrics.cycles
                 * IseqRunLaneMetrics.interop_cluster_count_pf_total
@@ -55,12 +88,55 @@ def get_sequenced_sum(sess: Session, since: datetime):
             func.date_format(IseqRunStatus.date, "%Y-%m").label("month"),
             func.count("*").label("count"),
         )
-        .filter(
+        .where(
             (IseqRunLaneMetrics.id_run == IseqRunStatus.id_run)
-            & (IseqRunStatus.id_run_status_dict == IseqRunStatusDict.id_run_status_dict)
-            & (IseqRunStatusDict.description == "qc complete")
+            & qc_complete
             & (IseqRunStatus.date > since)
         )
         .group_by("month")
+        .order_by("month"),
+        track_on=[repr(ids)],
+    )
+
+
+@lru_cache(maxsize=16)
+def _sequenced_sum_query(qc_complete_ids: Optional[Tuple[int, ...]]) -> Query:
+    return (
+        Query(
+            [
+                func.sum(
+                    IseqRunLaneMetrics.cycles
+                    * IseqRunLaneMetrics.interop_cluster_count_pf_total
+                ).label("bases"),
+                func.date_format(IseqRunStatus.date, "%Y-%m").label("month"),
+                func.count("*").label("count"),
+            ]
+        )
+        .filter(
+            (IseqRunLaneMetrics.id_run == IseqRunStatus.id_run)
+            & _qc_complete(qc_complete_ids)
+            & (IseqRunStatus.date > bindparam("since"))
+        )
+        .group_by("month")
         .order_by("month")
     )
+
+
+def _qc_complete_ids(sess: Optional[Session] = None) -> Optional[Tuple[int, ...]]:
+    # The ids of "qc complete" from the dictionary cache, or None without the
+    # cache, or before it has read the table when there is no Session to read
+    # it with.
+    ids = dictionary_ids(IseqRunStatusDict, ["qc complete"], sess)
+
+    return tuple(ids) if ids is not None else None
+
+
+@lru_cache(maxsize=16)
+def _qc_complete(ids: Optional[Tuple[int, ...]]):
+    # Without the ids, filter through a join.
+    if ids is None:
+        return (
+            IseqRunStatus.id_run_status_dict == IseqRunStatusDict.id_run_status_dict
+        ) & (IseqRunStatusDict.description == "qc complete")
+
+    return IseqRunStatus.id_run_status_dict.in_(ids)
@@ -0,0 +1,4 @@
+-- Lets the test user create the schemas of the tests: the template schema,
+-- mlwarehouse_template, and those of pytest-xdist workers, e.g.
+-- mlwarehouse_gw0 and mlwarehouse_gw0_template.
+GRANT ALL PRIVILEGES ON `mlwarehouse%`.* TO 'test'@'%';
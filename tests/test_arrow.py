@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from pathlib import Path
+
+import pytest
+from pytest import mark as m
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session
+
+from ml_warehouse.schema import (
+    IseqExternalProductMetrics,
+    IseqRunLaneMetrics,
+    PacBioRunWellMetrics,
+)
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from ml_warehouse.arrow import (  # noqa: E402
+    arrow_schema,
+    iter_record_batches,
+    write_parquet,
+)
+
+
+@m.describe("Mapping SQL types to Arrow")
+class TestMLWarehouseArrowTypes(object):
+    @m.it("Maps MySQL numeric types by width and sign")
+    def test_numeric_types(self):
+        schema = arrow_schema(IseqRunLaneMetrics)
+
+        assert schema.field("interop_cluster_count_pf_total").type == pa.uint64()
+        assert schema.field("cycles").type == pa.uint32()
+        assert schema.field("position").type == pa.uint16()
+        assert schema.field("tags_decode_percent").type == pa.float32()
+        assert schema.field("raw_cluster_density").type == pa.float64()
+
+    @m.it("Maps dates, strings and nullability")
+    def test_other_types(self):
+        schema = arrow_schema(PacBioRunWellMetrics)
+
+        assert schema.field("run_start").type == pa.timestamp("us")
+        assert schema.field("pac_bio_run_name").type == pa.string()
+        assert not schema.field("id_pac_bio_rw_metrics_tmp").nullable
+        assert schema.field("run_start").nullable
+
+    @m.it("Names columns as in the table")
+    def test_column_names(self):
+        schema = arrow_schema(IseqExternalProductMetrics)
+
+        assert "yield" in schema.names
+        assert "yield_" not in schema.names
+
+
+@m.describe("Exporting query results to Arrow and Parquet")
+class TestMLWarehouseArrowExport(object):
+    @m.it("Reads DOUBLE columns, returned as Decimal, as float64")
+    def test_double_columns(self):
+        lanes = Table(
+            "lanes",
+            MetaData(),
+            Column("id_run", Integer, primary_key=True),
+            Column("raw_cluster_density", mysql.DOUBLE(12, 3, unsigned=True)),
+        )
+        engine = create_engine("sqlite://", future=True)
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "CREATE TABLE lanes (id_run INTEGER PRIMARY KEY, "
+                "raw_cluster_density DOUBLE)"
+            )
+            conn.exec_driver_sql("INSERT INTO lanes VALUES (1, 2.5), (2, NULL)")
+
+        with Session(engine) as sess:
+            (batch,) = iter_record_batches(sess, select(lanes))
+
+        assert batch.schema.field("raw_cluster_density").type == pa.float64()
+        assert batch.column("raw_cluster_density").to_pylist() == [2.5, None]
+        assert batch.column("id_run").to_pylist() == [1, 2]
+
+    @m.it("Streams a mapped class as record batches")
+    def test_iter_record_batches(self, mlwh_session: Session):
+        expected = mlwh_session.query(IseqRunLaneMetrics).count()
+
+        batches = list(iter_record_batches(mlwh_session, IseqRunLaneMetrics, 2))
+
+        assert all(batch.num_rows <= 2 for batch in batches)
+        assert sum(batch.num_rows for batch in batches) == expected
+        assert batches[0].schema == arrow_schema(IseqRunLaneMetrics)
+
+    @m.it("Writes compressed Parquet row groups")
+    def test_write_parquet(self, mlwh_session: Session, tmp_path: Path):
+        stmt = select(IseqRunLaneMetrics.id_run, IseqRunLaneMetrics.position).order_by(
+            IseqRunLaneMetrics.id_run, IseqRunLaneMetrics.position
+        )
+        path = tmp_path / "lanes.parquet"
+
+        rows = write_parquet(mlwh_session, stmt, path, batch_size=2)
+
+        parquet = pq.ParquetFile(path)
+        assert parquet.metadata.num_rows == rows
+        assert parquet.metadata.num_row_groups == -(-rows // 2)
+        assert parquet.metadata.row_group(0).column(0).compression == "ZSTD"
+        assert [tuple(r.values()) for r in parquet.read().to_pylist()] == [
+            tuple(r) for r in mlwh_session.execute(stmt)
+        ]
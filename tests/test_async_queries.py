@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import configparser
+from datetime import datetime
+
+import pytest
+from pytest import mark as m
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Select
+
+from examples.genotyping import select_flgen_plate
+from examples.long_illumina import select_long_illumina
+from examples.npg_irods import (
+    select_bmap_flowcell_records,
+    select_pacbio_runs,
+    select_stock_records,
+)
+from examples.npg_qc import (
+    select_iseq_product_metrics_by_decode_percent,
+    select_iseq_product_metrics_by_study,
+    select_iseq_product_metrics_run,
+)
+from examples.recently_updated import (
+    select_recent_fluidigm,
+    select_recent_ont,
+    select_recent_pacbio_runs,
+)
+from ml_warehouse.engine import make_async_engine
+from ml_warehouse.schema import PacBioRun
+
+pytest.importorskip("aiomysql")
+
+
+def run_async(config: configparser.ConfigParser, *stmts: Select) -> list:
+    """Executes statements concurrently, each on its own AsyncSession, and
+    returns their rows."""
+
+    async def execute(engine, stmt):
+        async with AsyncSession(engine) as sess:
+            return (await sess.execute(stmt)).all()
+
+    async def execute_all():
+        engine = make_async_engine(config=config)
+        try:
+            return await asyncio.gather(*[execute(engine, s) for s in stmts])
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(execute_all())
+
+
+@m.describe("Running example queries with asyncio")
+@m.mlwh_clone
+class TestMLWarehouseAsyncQueries(object):
+    @m.it("Retrieves recently updated runs concurrently")
+    def test_recent_queries(self, config, mlwh_session_flgen):
+        pacbio, ont, fluidigm = run_async(
+            config,
+            select_recent_pacbio_runs(datetime(year=2021, month=1, day=31)),
+            select_recent_ont(datetime(year=2018, month=1, day=1)),
+            select_recent_fluidigm(datetime(year=2021, month=8, day=19)),
+        )
+
+        assert {row.id_pac_bio_run_lims for row in pacbio} == {
+            "81230",
+            "81876",
+            "83472",
+        }
+        assert len(ont) == 9
+        assert len(fluidigm) == 3
+
+    @m.it("Retrieves genotyping and npg_irods records concurrently")
+    def test_lookup_queries(self, config, mlwh_session_flgen):
+        flgen, stock, bmap, pacbio = run_async(
+            config,
+            select_flgen_plate(1382108143, "S70"),
+            select_stock_records("stock_barcode_01234"),
+            select_bmap_flowcell_records("KHPZDTGLPQJGPNWU", 2),
+            select_pacbio_runs(32669, "B1"),
+        )
+
+        assert flgen[0].FlgenPlate.id_flgen_plate_tmp == 23194
+        assert stock[0].StockResource.id_stock_resource_tmp == 2345678
+        assert bmap[0].BmapFlowcell.id_sample_tmp == 3135749
+        assert len(pacbio) == 11
+
+    @m.it("Retrieves IseqProductMetrics and long Illumina runs concurrently")
+    def test_npg_qc_queries(self, config, mlwh_session_ipm):
+        by_run, by_study, by_decode, long_runs = run_async(
+            config,
+            select_iseq_product_metrics_run(
+                [7915, 15440, 18980, 17550], "library_indexed_spike", 5
+            ),
+            select_iseq_product_metrics_by_study(
+                "Illumina Controls", (7915, 17550, 18980, 7915, 18448, 1337)
+            ),
+            select_iseq_product_metrics_by_decode_percent(
+                95, [7915, 15440, 18448, 18980, 26291]
+            ),
+            select_long_illumina(
+                "%tyler%",
+                datetime(year=2015, month=1, day=14),
+                datetime(year=2021, month=8, day=31),
+                3,
+                [3434, 1239, 1453],
+            ),
+        )
+
+        assert [tuple(row) for row in by_run] == [(17550, 5)]
+        assert {row.id_run for row in by_study} == {7915, 17550, 18980}
+        assert {row.id_run for row in by_decode} == {18448, 26291}
+        assert [row.id_run for row in long_runs] == [15440]
+
+    @m.it("Loads relationships eagerly, as lazy loading is not available")
+    def test_eager_relationships(self, config, mlwh_session):
+        (rows,) = run_async(
+            config,
+            select_pacbio_runs(32669, "B1").options(
+                selectinload(PacBioRun.sample), selectinload(PacBioRun.study)
+            ),
+        )
+
+        assert all(row.PacBioRun.sample is not None for row in rows)
+        assert all(row.PacBioRun.study is not None for row in rows)
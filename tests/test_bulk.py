@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from pathlib import Path
+
+import pytest
+from pytest import mark as m
+import yaml
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from ml_warehouse._introspect import column_keys
+from ml_warehouse.bulk import (
+    INFILE,
+    INSERT,
+    load_csv,
+    load_rows,
+    load_yaml,
+    local_infile_enabled,
+    upsert_rows,
+)
+from ml_warehouse.engine import dispose_engines, get_engine
+from ml_warehouse.export import Partition, export_partition
+from ml_warehouse.schema import (
+    IseqExternalProductMetrics,
+    IseqRunStatusDict,
+    PacBioRun,
+    StockResource,
+    Study,
+)
+
+
+def pac_bio_runs(sess: Session) -> list:
+    return sess.execute(
+        select(
+            PacBioRun.id_pac_bio_tmp,
+            PacBioRun.well_label,
+            PacBioRun.last_updated,
+            PacBioRun.tag_sequence,
+        ).order_by(PacBioRun.id_pac_bio_tmp)
+    ).all()
+
+
+@m.describe("Bulk loading rows")
+class TestMLWarehouseBulk(object):
+    @m.it("Loads YAML fixtures in batches")
+    def test_load_yaml(self, mlwh_session: Session):
+        mlwh_session.execute(delete(StockResource))
+        mlwh_session.commit()
+
+        result = load_yaml(
+            mlwh_session,
+            StockResource,
+            "tests/fixtures/400-StockResource.yml",
+            batch_size=2,
+            commit_size=3,
+            method=INSERT,
+        )
+
+        assert result.method == INSERT
+        assert result.rows == mlwh_session.query(StockResource).count()
+        assert result.rows_per_second > 0
+
+    @m.it("Loads the files written by an export")
+    def test_load_csv(self, config, mlwh_session: Session, tmp_path: Path):
+        expected = pac_bio_runs(mlwh_session)
+        try:
+            exported = export_partition(
+                get_engine(config=config).url,
+                PacBioRun,
+                Partition(0, 0, 100_000),
+                tmp_path,
+            )
+        finally:
+            dispose_engines()
+
+        mlwh_session.execute(delete(PacBioRun))
+        mlwh_session.commit()
+
+        result = load_csv(mlwh_session, PacBioRun, exported.path, batch_size=10)
+
+        assert result.rows == len(expected) == 56
+        assert pac_bio_runs(mlwh_session) == expected
+
+    @m.it("Loads with LOAD DATA LOCAL INFILE")
+    @m.mlwh_clone
+    def test_load_infile(self, config, mlwh_session: Session):
+        engine = get_engine(config=config, connect_args={"local_infile": True})
+        try:
+            with Session(engine) as sess:
+                if not local_infile_enabled(sess):
+                    pytest.skip("local_infile is disabled on the server")
+
+                sess.execute(delete(StockResource))
+                result = load_yaml(
+                    sess,
+                    StockResource,
+                    "tests/fixtures/400-StockResource.yml",
+                    method=INFILE,
+                )
+
+                assert result.method == INFILE
+                assert result.rows == sess.query(StockResource).count()
+        finally:
+            dispose_engines()
+
+    @m.it("Inserts rows with bytes values rather than writing them to the file")
+    @m.mlwh_clone
+    def test_load_infile_bytes(self, config, mlwh_session: Session):
+        engine = get_engine(config=config, connect_args={"local_infile": True})
+        try:
+            with Session(engine) as sess:
+                if not local_infile_enabled(sess):
+                    pytest.skip("local_infile is disabled on the server")
+
+                with open("tests/fixtures/400-StockResource.yml") as f:
+                    row = yaml.safe_load(f)[0]
+                sess.execute(delete(StockResource))
+                load_rows(
+                    sess,
+                    StockResource,
+                    [dict(row, labware_human_barcode=b"human\tab\tc")],
+                    method=INFILE,
+                )
+
+                barcode = sess.execute(
+                    select(StockResource.labware_human_barcode)
+                ).scalar_one()
+                assert barcode == "human\tab\tc"
+        finally:
+            dispose_engines()
+
+    @m.it("Accepts attribute names and rejects unknown columns")
+    def test_column_names(self, mlwh_session: Session):
+        assert column_keys(IseqExternalProductMetrics)["yield_"] == "yield"
+
+        with pytest.raises(ValueError, match="has no column 'colour'"):
+            load_rows(mlwh_session, IseqRunStatusDict, [{"colour": "red"}])
+
+
+@m.describe("Upserting rows on their unique keys")
+class TestMLWarehouseUpsert(object):
+    @m.it("Inserts new rows and updates present ones")
+    def test_upsert(self, mlwh_session: Session):
+        with open("tests/fixtures/200-Study.yml") as f:
+            present = yaml.safe_load(f)[0]
+        present.pop("id_study_tmp")
+        new = dict(present, id_study_lims="999999", uuid_study_lims=None)
+        present["name"] = "Renamed"
+
+        result = upsert_rows(mlwh_session, Study, [present, new], batch_size=10)
+
+        assert (result.inserted, result.updated) == (1, 1)
+        names = dict(
+            mlwh_session.execute(
+                select(Study.id_study_lims, Study.name).where(
+                    Study.id_study_lims.in_(["3573", "999999"])
+                )
+            ).all()
+        )
+        assert names == {"3573": "Renamed", "999999": "Pf3k"}
+
+    @m.it("Counts single-row upserts")
+    def test_upsert_single_row(self, mlwh_session: Session):
+        with open("tests/fixtures/200-Study.yml") as f:
+            new = yaml.safe_load(f)[0]
+        new.pop("id_study_tmp")
+        new.update(id_study_lims="999999", uuid_study_lims=None)
+
+        inserted = upsert_rows(mlwh_session, Study, [new])
+        unchanged = upsert_rows(mlwh_session, Study, [new])
+        changed = upsert_rows(mlwh_session, Study, [dict(new, name="Renamed")])
+
+        assert (inserted.inserted, inserted.updated) == (1, 0)
+        assert (unchanged.inserted, unchanged.updated) == (0, 1)
+        assert (changed.inserted, changed.updated) == (0, 1)
+
+    @m.it("Only updates the given columns")
+    def test_upsert_columns(self, mlwh_session: Session):
+        row = {"id_lims": "SQSCP", "id_study_lims": "3573", "name": "Renamed"}
+
+        result = upsert_rows(
+            mlwh_session,
+            Study,
+            [dict(row, abbreviation="ABC")],
+            key=["id_study_lims", "id_lims"],
+            update=["abbreviation"],
+        )
+
+        assert (result.inserted, result.updated) == (0, 1)
+        study = mlwh_session.execute(
+            select(Study).where(Study.id_study_lims == "3573")
+        ).scalar_one()
+        assert (study.name, study.abbreviation) == ("Pf3k", "ABC")
+
+    @m.it("Rejects keys which are not unique")
+    def test_upsert_key(self, mlwh_session: Session):
+        with pytest.raises(ValueError, match="is not a unique key of Study"):
+            upsert_rows(mlwh_session, Study, [], key=["name"])
+        with pytest.raises(ValueError, match="lack the key"):
+            upsert_rows(
+                mlwh_session, Study, [{"name": "x"}], key=["id_lims", "id_study_lims"]
+            )
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from pytest import mark as m
+from sqlalchemy import create_engine, select, text, update
+from sqlalchemy.orm import Session
+
+from examples.recently_updated import get_recent_pacbio_runs
+from ml_warehouse.bulk import load_yaml
+from ml_warehouse.cache import DiskBackend, LRUBackend, QueryCache, cache_key
+from ml_warehouse.schema import IseqRunStatusDict, Sample
+
+# SQLite cannot render the MySQL integer types of the mapped table.
+CREATE_TABLE = """
+CREATE TABLE iseq_run_status_dict (
+    id_run_status_dict INTEGER PRIMARY KEY,
+    description VARCHAR(64) NOT NULL,
+    iscurrent INTEGER NOT NULL,
+    temporal_index INTEGER
+)
+"""
+
+CURRENT = select(IseqRunStatusDict.description).where(IseqRunStatusDict.iscurrent == 1)
+
+
+@pytest.fixture(scope="function")
+def dict_session() -> Session:
+    engine = create_engine("sqlite://", future=True)
+    with engine.begin() as conn:
+        conn.execute(text(CREATE_TABLE))
+
+    with Session(engine) as sess:
+        load_yaml(sess, IseqRunStatusDict, "tests/fixtures/00-IseqRunStatusDict.yml")
+        yield sess
+
+
+@m.describe("Caching query results")
+class TestMLWarehouseQueryCache(object):
+    @m.it("Serves repeated queries from the cache")
+    def test_hits(self, dict_session: Session):
+        cache = QueryCache()
+
+        first = cache.execute(dict_session, CURRENT)
+        second = cache.execute(dict_session, CURRENT)
+        other = cache.execute(
+            dict_session,
+            select(IseqRunStatusDict.description).where(
+                IseqRunStatusDict.iscurrent == 0
+            ),
+        )
+
+        assert second is first
+        assert other != first
+        assert (cache.hits, cache.misses, cache.stale) == (1, 2, 0)
+
+    @m.it("Expires results after their time to live")
+    def test_ttl(self, dict_session: Session):
+        cache = QueryCache(ttl=60)
+
+        cache.execute(dict_session, CURRENT, ttl=0)
+        cache.execute(dict_session, CURRENT)
+        cache.execute(dict_session, CURRENT)
+
+        assert (cache.hits, cache.misses, cache.stale) == (1, 1, 1)
+
+    @m.it("Invalidates results when rows are added")
+    def test_validation(self, dict_session: Session):
+        cache = QueryCache()
+        rows = cache.execute(dict_session, CURRENT)
+
+        dict_session.add(
+            IseqRunStatusDict(id_run_status_dict=100, description="new", iscurrent=1)
+        )
+        dict_session.commit()
+
+        assert cache.execute(dict_session, CURRENT, validate=False) is rows
+        assert len(cache.execute(dict_session, CURRENT)) == len(rows) + 1
+        assert cache.stale == 1
+
+    @m.it("Refuses statements selecting mapped classes")
+    def test_entities(self, dict_session: Session):
+        with pytest.raises(ValueError, match="Only statements selecting columns"):
+            QueryCache().execute(dict_session, select(IseqRunStatusDict))
+
+    @m.it("Invalidates the results of Queries on last_updated")
+    def test_last_updated(self, mlwh_session: Session):
+        cache = QueryCache()
+        since = datetime(year=2021, month=1, day=31)
+
+        rows = cache.execute(mlwh_session, get_recent_pacbio_runs(mlwh_session, since))
+        assert (
+            cache.execute(mlwh_session, get_recent_pacbio_runs(mlwh_session, since))
+            is rows
+        )
+
+        mlwh_session.execute(
+            update(Sample).values(last_updated=datetime(year=2022, month=1, day=1))
+        )
+        mlwh_session.commit()
+
+        refreshed = cache.execute(
+            mlwh_session, get_recent_pacbio_runs(mlwh_session, since)
+        )
+        assert len(refreshed) > len(rows)
+        assert (cache.hits, cache.misses, cache.stale) == (1, 1, 1)
+
+
+@m.describe("Storing cached results")
+class TestMLWarehouseCacheBackends(object):
+    @m.it("Evicts the least recently used results")
+    def test_lru(self, dict_session: Session):
+        cache = QueryCache(LRUBackend(maxsize=2))
+        statements = [
+            CURRENT,
+            select(IseqRunStatusDict.id_run_status_dict),
+            select(IseqRunStatusDict.temporal_index),
+        ]
+
+        # The first statement is evicted by the third, then the second by the
+        # first, as the third was used more recently.
+        for i in [0, 1, 2, 2, 0, 2]:
+            cache.execute(dict_session, statements[i])
+
+        assert len(cache.backend) == 2
+        assert (cache.hits, cache.misses) == (2, 4)
+
+    @m.it("Shares results through files")
+    def test_disk(self, dict_session: Session, tmp_path: Path):
+        writer = QueryCache(DiskBackend(tmp_path))
+        reader = QueryCache(DiskBackend(tmp_path))
+
+        rows = writer.execute(dict_session, CURRENT)
+
+        assert reader.execute(dict_session, CURRENT) == rows
+        assert reader.execute(dict_session, CURRENT)[0].description == "run pending"
+        assert reader.hits == 2
+
+        reader.clear()
+        assert len(writer.backend) == 0
+
+    @m.it("Keeps the results of different databases apart")
+    def test_databases(self, tmp_path: Path):
+        backend = DiskBackend(tmp_path / "cache")
+        rows = []
+        for name in ("prod", "test"):
+            engine = create_engine(f"sqlite:///{tmp_path / name}.db", future=True)
+            with engine.begin() as conn:
+                conn.execute(text(CREATE_TABLE))
+            with Session(engine) as sess:
+                load_yaml(
+                    sess, IseqRunStatusDict, "tests/fixtures/00-IseqRunStatusDict.yml"
+                )
+                if name == "test":
+                    sess.execute(update(IseqRunStatusDict).values(iscurrent=0))
+                    sess.commit()
+                rows.append(QueryCache(backend).execute(sess, CURRENT))
+            engine.dispose()
+
+        assert rows[0] != [] and rows[1] == []
+
+        def key(url):
+            return cache_key(Session(create_engine(url, future=True)), CURRENT)
+
+        assert key("mysql+pymysql://u:a@host/mlwh") == key(
+            "mysql+pymysql://u:b@host/mlwh"
+        )
+        assert key("mysql+pymysql://u:a@host/mlwh") != key(
+            "mysql+pymysql://u:a@host/test"
+        )
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import datetime
+
+import pytest
+from pytest import mark as m
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from ml_warehouse.changes import (
+    ChangeFeed,
+    FileWatermarkStore,
+    MemoryWatermarkStore,
+    Watermark,
+)
+from ml_warehouse.schema import (
+    IseqRunLaneMetrics,
+    PacBioRunWellMetrics,
+    Sample,
+)
+
+
+def touch_sample(sess: Session, id_sample_tmp: int):
+    sess.execute(
+        update(Sample)
+        .where(Sample.id_sample_tmp == id_sample_tmp)
+        .values(last_updated=datetime(year=2030, month=1, day=1))
+    )
+    sess.commit()
+
+
+@m.describe("Storing watermarks")
+class TestMLWarehouseWatermarkStore(object):
+    @m.it("Keeps the watermark of each consumer and table in a file")
+    def test_file_store(self, tmp_path):
+        store = FileWatermarkStore(tmp_path)
+        watermark = Watermark(datetime(year=2021, month=1, day=31, hour=12), (7915, 2))
+
+        assert store.get("consumer", "sample") is None
+
+        store.set("consumer", "sample", watermark)
+        store.set(
+            "consumer", "study", Watermark(datetime(year=2020, month=1, day=1), (1,))
+        )
+        store.set(
+            "other", "sample", Watermark(datetime(year=2020, month=1, day=1), (2,))
+        )
+
+        assert FileWatermarkStore(tmp_path).get("consumer", "sample") == watermark
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "consumer.json",
+            "other.json",
+        ]
+
+        store.delete("consumer", "sample")
+        assert store.get("consumer", "sample") is None
+        assert store.get("consumer", "study") is not None
+
+    @m.it("Keeps watermarks in memory")
+    def test_memory_store(self):
+        store = MemoryWatermarkStore()
+        watermark = Watermark(datetime(year=2021, month=1, day=31), (1,))
+
+        store.set("consumer", "sample", watermark)
+        assert store.get("consumer", "sample") == watermark
+        assert store.get("other", "sample") is None
+
+        store.delete("consumer", "sample")
+        assert store.get("consumer", "sample") is None
+
+    @m.it("Refuses tables without a timestamp column")
+    def test_no_timestamp(self):
+        with pytest.raises(ValueError, match="PacBioRunWellMetrics"):
+            ChangeFeed(PacBioRunWellMetrics, "consumer")
+
+
+@m.describe("Reading changed rows after a watermark")
+class TestMLWarehouseChangeFeed(object):
+    @m.it("Reads every row once, in batches ordered by change")
+    def test_batches(self, mlwh_session: Session):
+        feed = ChangeFeed(Sample, "consumer", batch_size=50)
+
+        batches = list(feed.poll(mlwh_session))
+        samples = [s for batch in batches for s in batch]
+        expected = mlwh_session.execute(
+            select(func.count()).where(Sample.last_updated.is_not(None))
+        ).scalar()
+
+        assert all(len(batch) <= 50 for batch in batches)
+        assert len(samples) == expected
+        assert len({s.id_sample_tmp for s in samples}) == expected
+        assert samples == sorted(
+            samples, key=lambda s: (s.last_updated, s.id_sample_tmp)
+        )
+        assert feed.watermark == (
+            samples[-1].last_updated,
+            (samples[-1].id_sample_tmp,),
+        )
+        assert list(feed.poll(mlwh_session)) == []
+
+    @m.it("Reads only the rows changed since the previous poll")
+    def test_changes(self, mlwh_session: Session):
+        feed = ChangeFeed(Sample, "consumer")
+        list(feed.poll(mlwh_session))
+
+        touch_sample(mlwh_session, 2354052)
+        touch_sample(mlwh_session, 2354050)
+
+        (batch,) = feed.poll(mlwh_session)
+        assert [s.id_sample_tmp for s in batch] == [2354050, 2354052]
+
+    @m.it("Starts a new consumer from since")
+    def test_since(self, mlwh_session: Session):
+        since = datetime(year=2017, month=1, day=1)
+        feed = ChangeFeed(Sample, "consumer", since=since)
+
+        samples = [s for batch in feed.poll(mlwh_session) for s in batch]
+
+        assert samples
+        assert all(s.last_updated >= since for s in samples)
+
+    @m.it("Resumes from a stored watermark, reading uncommitted batches again")
+    def test_resume(self, mlwh_session: Session, tmp_path):
+        store = FileWatermarkStore(tmp_path)
+        feed = ChangeFeed(Sample, "consumer", store, batch_size=10)
+
+        first = feed.fetch(mlwh_session)
+        feed.commit(first)
+        second = feed.fetch(mlwh_session)
+
+        resumed = ChangeFeed(
+            Sample, "consumer", FileWatermarkStore(tmp_path), batch_size=10
+        )
+        assert resumed.watermark == first.watermark
+        assert resumed.fetch(mlwh_session).rows == second.rows
+
+        resumed.reset()
+        assert resumed.fetch(mlwh_session).rows == first.rows
+
+    @m.it("Reads a batch again if the consumer stops before asking for more")
+    def test_break(self, mlwh_session: Session):
+        feed = ChangeFeed(Sample, "consumer", batch_size=10)
+
+        for first in feed.poll(mlwh_session):
+            break
+
+        assert feed.watermark is None
+        assert next(feed.poll(mlwh_session)) == first
+
+    @m.it("Breaks ties on composite primary keys")
+    def test_composite_key(self, mlwh_session: Session):
+        feed = ChangeFeed(IseqRunLaneMetrics, "consumer", batch_size=1)
+
+        lanes = [lane for batch in feed.poll(mlwh_session) for lane in batch]
+        keys = [(lane.id_run, lane.position) for lane in lanes]
+
+        assert len(keys) == len(set(keys))
+        assert (
+            len(keys)
+            == mlwh_session.execute(
+                select(func.count()).select_from(IseqRunLaneMetrics)
+            ).scalar()
+        )
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+from pytest import mark as m
+from sqlalchemy.orm import Session
+
+from ml_warehouse.schema import IseqRunLaneMetrics, PacBioRunWellMetrics
+
+np = pytest.importorskip("numpy")
+
+from ml_warehouse.columns import load_columns, numpy_dtype  # noqa: E402
+
+
+@m.describe("Mapping SQL types to NumPy dtypes")
+class TestMLWarehouseNumpyTypes(object):
+    @m.it("Maps numeric and date types")
+    def test_numpy_dtype(self):
+        lanes = IseqRunLaneMetrics
+        wells = PacBioRunWellMetrics
+
+        assert numpy_dtype(lanes.interop_cluster_count_pf_total.type) == np.uint64
+        assert numpy_dtype(lanes.position.type) == np.uint16
+        assert numpy_dtype(lanes.tags_decode_percent.type) == np.float32
+        assert numpy_dtype(lanes.raw_cluster_density.type) == np.float64
+        assert numpy_dtype(wells.run_start.type) == np.dtype("datetime64[us]")
+        assert numpy_dtype(wells.pac_bio_run_name.type) == object
+
+
+@m.describe("Loading columns into NumPy arrays")
+class TestMLWarehouseLoadColumns(object):
+    @m.it("Builds typed arrays in chunks")
+    def test_load_columns(self, mlwh_session: Session):
+        lanes = mlwh_session.query(IseqRunLaneMetrics).all()
+
+        arrays = load_columns(
+            mlwh_session,
+            IseqRunLaneMetrics.id_run,
+            IseqRunLaneMetrics.tags_decode_percent,
+            filters=[IseqRunLaneMetrics.position > 0],
+            chunk_size=3,
+        )
+
+        assert list(arrays) == ["id_run", "tags_decode_percent"]
+        assert arrays["id_run"].dtype == np.uint32
+        assert sorted(arrays["id_run"]) == sorted(lane.id_run for lane in lanes)
+        assert arrays["tags_decode_percent"].dtype == np.float32
+
+    @m.it("Masks NULL values")
+    def test_masked(self, mlwh_session: Session):
+        lanes = mlwh_session.query(IseqRunLaneMetrics).all()
+        nulls = sum(lane.interop_cluster_count_pf_total is None for lane in lanes)
+
+        arrays = load_columns(
+            mlwh_session, IseqRunLaneMetrics.interop_cluster_count_pf_total
+        )
+        values = arrays["interop_cluster_count_pf_total"]
+
+        assert isinstance(values, np.ma.MaskedArray)
+        assert values.dtype == np.uint64
+        assert values.mask.sum() == nulls > 0
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import datetime
+
+import pytest
+from pytest import mark as m
+from sqlalchemy import create_engine, delete, text, update
+from sqlalchemy.orm import Session
+
+from examples.long_illumina import summarize_long_illumina
+from examples.stats import get_sequenced_sum, select_sequenced_sum
+from ml_warehouse.bulk import load_yaml
+from ml_warehouse.dictionaries import (
+    DictionaryCache,
+    dictionary_ids,
+    disable_dictionary_cache,
+    enable_dictionary_cache,
+)
+from ml_warehouse.schema import IseqRunStatusDict
+
+# SQLite cannot render the MySQL integer types of the mapped table.
+CREATE_TABLE = """
+CREATE TABLE iseq_run_status_dict (
+    id_run_status_dict INTEGER PRIMARY KEY,
+    description VARCHAR(64) NOT NULL,
+    iscurrent INTEGER NOT NULL,
+    temporal_index INTEGER
+)
+"""
+
+
+@pytest.fixture(scope="function")
+def dict_session() -> Session:
+    engine = create_engine("sqlite://", future=True)
+    with engine.begin() as conn:
+        conn.execute(text(CREATE_TABLE))
+
+    with Session(engine) as sess:
+        load_yaml(sess, IseqRunStatusDict, "tests/fixtures/00-IseqRunStatusDict.yml")
+        yield sess
+
+
+@pytest.fixture(scope="function")
+def dictionary_cache():
+    yield enable_dictionary_cache()
+    disable_dictionary_cache()
+
+
+def rename_qc_complete(sess: Session):
+    sess.execute(
+        update(IseqRunStatusDict)
+        .where(IseqRunStatusDict.description == "qc complete")
+        .values(description="qc completed")
+    )
+    sess.commit()
+
+
+@m.describe("Caching dictionary tables")
+class TestMLWarehouseDictionaryCache(object):
+    @m.it("Translates descriptions into ids")
+    def test_ids(self, dict_session: Session):
+        cache = DictionaryCache()
+
+        ids = cache.ids(IseqRunStatusDict, ["run pending", "qc complete"], dict_session)
+
+        assert ids == [1, 20]
+        assert cache.ids(IseqRunStatusDict, ["unknown"]) == []
+        assert cache.descriptions(IseqRunStatusDict)[20] == "qc complete"
+
+    @m.it("Reads tables again after the refresh interval")
+    def test_refresh(self, dict_session: Session):
+        kept = DictionaryCache(refresh_interval=None)
+        refreshed = DictionaryCache(refresh_interval=0)
+        for cache in (kept, refreshed):
+            cache.load(dict_session, IseqRunStatusDict)
+
+        rename_qc_complete(dict_session)
+
+        assert kept.ids(IseqRunStatusDict, ["qc complete"], dict_session) == [20]
+        assert refreshed.ids(IseqRunStatusDict, ["qc complete"], dict_session) == []
+
+    @m.it("Matches descriptions ignoring case and trailing spaces")
+    def test_case(self, dict_session: Session):
+        cache = DictionaryCache()
+
+        ids = cache.ids(
+            IseqRunStatusDict, ["Run Pending", "qc complete  "], dict_session
+        )
+
+        assert ids == [1, 20]
+
+    @m.it("Rejects descriptions which differ only by case")
+    def test_case_collision(self, dict_session: Session):
+        dict_session.add(
+            IseqRunStatusDict(
+                id_run_status_dict=99, description="QC Complete", iscurrent=1
+            )
+        )
+        dict_session.commit()
+
+        with pytest.raises(ValueError, match="'qc complete' and 'QC Complete'"):
+            DictionaryCache().load(dict_session, IseqRunStatusDict)
+
+        try:
+            enable_dictionary_cache()
+            assert (
+                dictionary_ids(IseqRunStatusDict, ["qc complete"], dict_session) is None
+            )
+        finally:
+            disable_dictionary_cache()
+
+    @m.it("Remembers a rejected table until it is due a refresh")
+    def test_rejected(self, dict_session: Session):
+        dict_session.add(
+            IseqRunStatusDict(
+                id_run_status_dict=99, description="qc complete ", iscurrent=1
+            )
+        )
+        dict_session.commit()
+
+        kept = DictionaryCache(refresh_interval=None)
+        refreshed = DictionaryCache(refresh_interval=0)
+        for cache in (kept, refreshed):
+            with pytest.raises(ValueError):
+                cache.ids(IseqRunStatusDict, ["qc complete"], dict_session)
+
+        dict_session.execute(
+            delete(IseqRunStatusDict).where(IseqRunStatusDict.id_run_status_dict == 99)
+        )
+        dict_session.commit()
+
+        with pytest.raises(ValueError):
+            kept.ids(IseqRunStatusDict, ["qc complete"], dict_session)
+        assert refreshed.ids(IseqRunStatusDict, ["qc complete"], dict_session) == [20]
+
+    @m.it("Requires a Session to read a table")
+    def test_unread(self):
+        with pytest.raises(LookupError, match="iseq_run_status_dict"):
+            DictionaryCache().ids(IseqRunStatusDict, ["qc complete"])
+
+    @m.it("Is only used by the helpers when enabled")
+    def test_enabled(self, dict_session: Session):
+        assert dictionary_ids(IseqRunStatusDict, ["qc complete"], dict_session) is None
+
+        try:
+            enable_dictionary_cache()
+            assert dictionary_ids(IseqRunStatusDict, ["qc complete"]) is None
+            assert dictionary_ids(IseqRunStatusDict, ["qc complete"], dict_session) == [
+                20
+            ]
+        finally:
+            disable_dictionary_cache()
+
+
+@m.describe("Running the status helpers without joins")
+class TestMLWarehouseDictionaryHelpers(object):
+    @m.it("Sums sequenced bases by month")
+    def test_sequenced_sum(self, mlwh_session: Session, dictionary_cache):
+        since = datetime(year=2010, month=1, day=1)
+
+        disable_dictionary_cache()
+        expected = get_sequenced_sum(mlwh_session, since).all()
+        enable_dictionary_cache()
+
+        stmt = select_sequenced_sum(since)
+        assert "iseq_run_status_dict" in str(stmt)
+
+        observed = get_sequenced_sum(mlwh_session, since)
+        assert "iseq_run_status_dict" not in str(observed.statement)
+        assert observed.all() == expected
+        assert mlwh_session.execute(select_sequenced_sum(since)).all() == expected
+
+    @m.mlwh_clone
+    @m.it("Matches descriptions as the join does")
+    def test_mixed_case(self, mlwh_session: Session, dictionary_cache):
+        since = datetime(year=2010, month=1, day=1)
+        mlwh_session.execute(
+            update(IseqRunStatusDict)
+            .where(IseqRunStatusDict.description == "qc complete")
+            .values(description="QC Complete")
+        )
+        mlwh_session.commit()
+
+        disable_dictionary_cache()
+        expected = get_sequenced_sum(mlwh_session, since).all()
+        enable_dictionary_cache()
+
+        observed = get_sequenced_sum(mlwh_session, since)
+        assert "iseq_run_status_dict" not in str(observed.statement)
+        assert expected
+        assert observed.all() == expected
+
+    @m.it("Summarizes long Illumina runs")
+    def test_long_illumina(self, mlwh_session_ipm: Session, dictionary_cache):
+        records = summarize_long_illumina(
+            mlwh_session_ipm,
+            "%tyler%",
+            datetime(year=2015, month=1, day=14),
+            datetime(year=2021, month=8, day=31),
+            3,
+            [3434, 1239, 1453],
+        )
+
+        assert "iseq_run_status_dict" not in str(records.statement)
+        assert records.all() == [
+            (
+                15440,
+                "qc complete",
+                datetime(2015, 2, 8, 21, 9, 14),
+                4,
+                "SEQCAP_Lebanon_LowCov-seq",
+            )
+        ]
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import configparser
+import multiprocessing
+import os
+
+from pytest import mark as m
+from sqlalchemy import text
+
+from ml_warehouse.engine import (
+    dispose_engines,
+    get_engine,
+    url_from_config,
+    url_from_env,
+)
+
+
+def connection_id(config: configparser.ConfigParser):
+    with get_engine(config=config).connect() as conn:
+        return conn.execute(text("SELECT CONNECTION_ID()")).scalar()
+
+
+@m.describe("Building warehouse URLs")
+class TestMLWarehouseEngineURL(object):
+    @m.it("Reads the URL from an ini file")
+    def test_url_from_config(self, config):
+        url = url_from_config(config)
+
+        assert url.drivername == "mysql+pymysql"
+        assert url.username == "test"
+        assert url.port == 3306
+        assert url.database == config["MySQL"]["schema"]
+        assert url.query["charset"] == "utf8mb4"
+
+    @m.it("Gives each pytest-xdist worker a schema of its own")
+    def test_worker_schema(self, config):
+        worker = os.environ.get("PYTEST_XDIST_WORKER")
+        expected = "mlwarehouse" if worker is None else f"mlwarehouse_{worker}"
+
+        assert url_from_config(config).database == expected
+
+    @m.it("Reads the URL from the environment")
+    def test_url_from_env(self, monkeypatch):
+        monkeypatch.setenv("MYSQL_USER", "user")
+        monkeypatch.setenv("MYSQL_PW", "p@ss/word")
+        monkeypatch.setenv("MYSQL_HOST", "db.example.com")
+        monkeypatch.setenv("MYSQL_PORT", "3307")
+        monkeypatch.setenv("MYSQL_DBNAME", "mlwarehouse")
+
+        url = url_from_env(charset="utf8")
+
+        assert url.password == "p@ss/word"
+        assert url.host == "db.example.com"
+        assert url.port == 3307
+        assert url.query["charset"] == "utf8"
+
+
+@m.describe("Creating pooled engines")
+class TestMLWarehouseEngine(object):
+    @m.it("Reuses one engine per URL and options")
+    def test_engine_reuse(self, config):
+        try:
+            engine = get_engine(config=config)
+
+            assert get_engine(config=config) is engine
+            assert get_engine(config=config, pool_size=2) is not engine
+
+            dispose_engines()
+            assert get_engine(config=config) is not engine
+        finally:
+            dispose_engines()
+
+    @m.it("Reads pool options from the ini file")
+    def test_pool_options(self, config):
+        conf = configparser.ConfigParser()
+        conf.read_dict(config)
+        conf["MySQL"]["pool_size"] = "3"
+        conf["MySQL"]["pool_pre_ping"] = "no"
+
+        try:
+            engine = get_engine(config=conf, pool_recycle=60)
+
+            assert engine.pool.size() == 3
+            assert engine.pool._pre_ping is False
+            assert engine.pool._recycle == 60
+        finally:
+            dispose_engines()
+
+    @m.it("Gives forked processes their own connections")
+    def test_fork_reset(self, config, mlwh_session):
+        try:
+            parent_id = connection_id(config)
+
+            with multiprocessing.get_context("fork").Pool(1) as pool:
+                child_id = pool.apply(connection_id, (config,))
+
+            assert child_id != parent_id
+            assert connection_id(config) == parent_id
+        finally:
+            dispose_engines()
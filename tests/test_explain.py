@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+from datetime import datetime
+
+from pytest import mark as m
+from sqlalchemy.orm import Session
+
+from examples.npg_irods import find_pacbio_runs
+from examples.recently_updated import get_recent_ont
+from examples.registry import HELPERS
+from ml_warehouse.explain import (
+    FILESORT,
+    FULL_INDEX_SCAN,
+    FULL_SCAN,
+    ROWS_EXAMINED,
+    TEMPORARY_TABLE,
+    UNDECLARED_INDEX,
+    Finding,
+    audit,
+    audit_report,
+    compared_columns,
+    explain,
+    plan_tables,
+    suggest_indexes,
+    write_report,
+)
+
+# A plan of get_recent_ont(), as given by MySQL 8.0, trimmed.
+RECENT_ONT_PLAN = {
+    "query_block": {
+        "select_id": 1,
+        "duplicates_removal": {
+            "using_temporary_table": True,
+            "using_filesort": False,
+            "nested_loop": [
+                {
+                    "table": {
+                        "table_name": "oseq_flowcell",
+                        "access_type": "ALL",
+                        "possible_keys": ["fk_oseq_flowcell_to_sample"],
+                        "rows_examined_per_scan": 20,
+                        "rows_produced_per_join": 20,
+                        "filtered": "100.00",
+                    }
+                },
+                {
+                    "table": {
+                        "table_name": "sample",
+                        "access_type": "eq_ref",
+                        "possible_keys": ["PRIMARY"],
+                        "key": "PRIMARY",
+                        "used_key_parts": ["id_sample_tmp"],
+                        "rows_examined_per_scan": 1,
+                        "filtered": "100.00",
+                    }
+                },
+                {
+                    "table": {
+                        "table_name": "study",
+                        "access_type": "index",
+                        "key": "study_id_lims_id_study_lims_index",
+                        "rows_examined_per_scan": 25000,
+                        "filtered": "100.00",
+                        "attached_subqueries": [
+                            {
+                                "query_block": {
+                                    "ordering_operation": {
+                                        "using_filesort": True,
+                                        "table": {
+                                            "table_name": "iseq_run_status",
+                                            "access_type": "ref",
+                                            "key": "iseq_run_status_id_run",
+                                            "rows_examined_per_scan": 3,
+                                        },
+                                    }
+                                }
+                            }
+                        ],
+                    }
+                },
+            ],
+        },
+    }
+}
+
+
+@m.describe("Auditing query plans")
+class TestMLWarehousePlanAudit(object):
+    @m.it("Lists the table accesses of a plan and of its subqueries")
+    def test_plan_tables(self):
+        assert [t["table_name"] for t in plan_tables(RECENT_ONT_PLAN)] == [
+            "oseq_flowcell",
+            "sample",
+            "study",
+            "iseq_run_status",
+        ]
+
+    @m.it("Flags scans, filesorts, temporary tables and large row estimates")
+    def test_audit(self):
+        findings = audit(RECENT_ONT_PLAN, max_rows=1000)
+
+        assert {(f.kind, f.table) for f in findings} == {
+            (TEMPORARY_TABLE, "oseq_flowcell"),
+            (FILESORT, "iseq_run_status"),
+            (FULL_SCAN, "oseq_flowcell"),
+            (FULL_INDEX_SCAN, "study"),
+            (ROWS_EXAMINED, "study"),
+            (UNDECLARED_INDEX, "iseq_run_status"),
+        }
+
+    @m.it("Finds the columns compared by a statement")
+    def test_compared_columns(self):
+        stmt = get_recent_ont(Session(), datetime(year=2018, month=1, day=1))
+
+        assert compared_columns(stmt)["sample"] == {
+            "equality": [],
+            "range": ["last_updated"],
+            "join": ["id_sample_tmp"],
+        }
+        assert compared_columns(find_pacbio_runs(Session(), 32669, "B1")) == {
+            "pac_bio_run": {
+                "equality": ["pac_bio_run_name", "well_label"],
+                "range": [],
+                "join": [],
+            }
+        }
+
+    @m.it("Suggests indexes for the tables with findings")
+    def test_suggest_indexes(self):
+        stmt = get_recent_ont(Session(), datetime(year=2018, month=1, day=1))
+        findings = [
+            Finding(FULL_SCAN, "oseq_flowcell", ""),
+            Finding(FULL_SCAN, "sample", ""),
+        ]
+
+        assert suggest_indexes(stmt, findings) == {
+            "oseq_flowcell": ["last_updated"],
+            "sample": ["last_updated"],
+        }
+
+        stmt = find_pacbio_runs(Session(), 32669, "B1")
+        assert suggest_indexes(stmt, [Finding(FULL_SCAN, "pac_bio_run", "")]) == {
+            "pac_bio_run": ["pac_bio_run_name", "well_label"]
+        }
+
+    @m.it("Writes reports with sorted keys")
+    def test_write_report(self, tmp_path):
+        path = tmp_path / "plans.json"
+        write_report({"helpers": {"b": {}, "a": {}}, "version": 1}, path)
+
+        assert json.loads(path.read_text()) == {
+            "helpers": {"a": {}, "b": {}},
+            "version": 1,
+        }
+        assert path.read_text().index('"a"') < path.read_text().index('"b"')
+
+    @m.it("Explains the statements of the example helpers")
+    def test_explain(self, mlwh_session: Session):
+        plan = explain(mlwh_session, find_pacbio_runs(mlwh_session, 32669, "B1"))
+
+        assert [t["table_name"] for t in plan_tables(plan)] == ["pac_bio_run"]
+
+    @m.it("Audits every registered helper")
+    def test_audit_report(self, mlwh_session: Session):
+        report = audit_report(mlwh_session, HELPERS)
+
+        assert sorted(report["helpers"]) == sorted(HELPERS)
+        for entry in report["helpers"].values():
+            assert entry["tables"]
+        json.dumps(report)
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import csv
+from pathlib import Path
+
+import pytest
+from pytest import mark as m
+from sqlalchemy.orm import Session
+
+from ml_warehouse.engine import dispose_engines
+from ml_warehouse.export import (
+    MINMAX,
+    QUANTILES,
+    Partition,
+    export_table,
+    partition_filename,
+    partition_ranges,
+    read_manifest,
+    retry_partition,
+)
+from ml_warehouse.schema import ArInternalMetadata, PacBioRun
+
+
+def read_keys(path: str) -> list:
+    with open(path, newline="") as f:
+        return [
+            int(row["id_pac_bio_tmp"]) for row in csv.DictReader(f, dialect="excel-tab")
+        ]
+
+
+@m.describe("Partitioning tables by primary key")
+class TestMLWarehousePartitions(object):
+    @m.it("Splits the key interval evenly")
+    def test_minmax(self, mlwh_session: Session):
+        partitions = partition_ranges(mlwh_session, PacBioRun, 5000, MINMAX)
+
+        assert partitions == [
+            Partition(0, 1714, 6713),
+            Partition(1, 6714, 11713),
+            Partition(2, 11714, 16713),
+            Partition(3, 16714, 20992),
+        ]
+
+    @m.it("Splits at quantiles of the keys")
+    def test_quantiles(self, mlwh_session: Session):
+        partitions = partition_ranges(mlwh_session, PacBioRun, 20, QUANTILES)
+
+        assert len(partitions) == 3
+        assert partitions[0].lower == 1714
+        assert partitions[-1].upper == 20992
+        for p in partitions:
+            count = (
+                mlwh_session.query(PacBioRun)
+                .filter(PacBioRun.id_pac_bio_tmp.between(p.lower, p.upper))
+                .count()
+            )
+            assert 18 <= count <= 20
+
+    @m.it("Rejects tables without an integer primary key")
+    def test_key_type(self, mlwh_session: Session):
+        with pytest.raises(ValueError, match="integer primary key"):
+            partition_ranges(mlwh_session, ArInternalMetadata)
+
+
+@m.describe("Exporting tables in parallel")
+class TestMLWarehouseExport(object):
+    @m.it("Exports each partition to its own file")
+    def test_export_table(self, config, mlwh_session: Session, tmp_path: Path):
+        done = []
+        try:
+            results = export_table(
+                PacBioRun,
+                tmp_path,
+                config=config,
+                workers=2,
+                range_size=5000,
+                progress=lambda result, n, total: done.append((n, total)),
+            )
+        finally:
+            dispose_engines()
+
+        assert [r.partition.index for r in results] == [0, 1, 2, 3]
+        assert sum(r.rows for r in results) == 56
+        assert done[-1] == (4, 4)
+
+        keys = [key for r in results for key in read_keys(r.path)]
+        assert keys == sorted(keys)
+        assert len(keys) == 56
+
+        manifest = read_manifest(PacBioRun, tmp_path)
+        assert [p["rows"] for p in manifest["partitions"]] == [r.rows for r in results]
+
+    @m.it("Retries a single partition")
+    def test_retry_partition(self, config, mlwh_session: Session, tmp_path: Path):
+        try:
+            results = export_table(PacBioRun, tmp_path, config=config, range_size=5000)
+            Path(results[2].path).unlink()
+
+            retried = retry_partition(PacBioRun, tmp_path, 2, config=config)
+        finally:
+            dispose_engines()
+
+        assert retried.partition == results[2].partition
+        assert retried.rows == results[2].rows
+        assert read_keys(retried.path) == [
+            12460,
+            12476,
+            12477,
+            12478,
+            12479,
+            12480,
+            16207,
+        ]
+
+    @m.it("Records the other partitions when one fails")
+    def test_failed_partition(self, config, mlwh_session: Session, tmp_path: Path):
+        # A directory in the way of its temporary file makes partition 2 fail.
+        failing = Partition(2, 11714, 16713)
+        blocker = tmp_path / (partition_filename(PacBioRun, failing) + ".tmp")
+        blocker.mkdir()
+
+        try:
+            with pytest.raises(RuntimeError, match=r"1 of 4 partitions") as e:
+                export_table(
+                    PacBioRun, tmp_path, config=config, workers=2, range_size=5000
+                )
+            assert isinstance(e.value.__cause__, IsADirectoryError)
+
+            manifest = read_manifest(PacBioRun, tmp_path)
+            failed = [p for p in manifest["partitions"] if "error" in p]
+            assert [p["index"] for p in failed] == [2]
+            assert "rows" not in failed[0]
+            assert sum(p.get("rows", 0) for p in manifest["partitions"]) == 56 - 7
+
+            blocker.rmdir()
+            retried = retry_partition(PacBioRun, tmp_path, 2, config=config)
+        finally:
+            dispose_engines()
+
+        assert retried.rows == 7
+        assert "error" not in read_manifest(PacBioRun, tmp_path)["partitions"][2]
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+import time
+from datetime import datetime
+
+from pytest import mark as m
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from ml_warehouse.identity import IdentityCache
+from ml_warehouse.schema import Sample, Study
+
+
+def touch_sample(sess: Session, id_sample_tmp: int, name: str):
+    sess.execute(
+        update(Sample)
+        .where(Sample.id_sample_tmp == id_sample_tmp)
+        .values(name=name, last_updated=datetime(year=2030, month=1, day=1))
+    )
+    sess.commit()
+
+
+@m.describe("Caching Sample and Study snapshots")
+class TestMLWarehouseIdentityCache(object):
+    @m.it("Finds snapshots by natural key and by primary key")
+    def test_get(self, mlwh_session: Session):
+        cache = IdentityCache(Sample)
+
+        sample = cache.get(mlwh_session, ("2377277", "SQSCP"))
+
+        assert sample.id_sample_tmp == 2354052
+        assert cache.get_by_id(mlwh_session, 2354052) is sample
+        assert cache.get(mlwh_session, ("2377277", "SQSCP")) is sample
+        assert (cache.hits, cache.misses) == (2, 1)
+        assert len(cache) == 1
+
+    @m.it("Uses the natural key of each table")
+    def test_keys(self):
+        assert [c.key for c in IdentityCache(Sample).key] == [
+            "id_sample_lims",
+            "id_lims",
+        ]
+        assert [c.key for c in IdentityCache(Study).key] == [
+            "id_lims",
+            "id_study_lims",
+        ]
+
+    @m.it("Returns None for missing rows without caching them")
+    def test_missing(self, mlwh_session: Session):
+        cache = IdentityCache(Sample)
+
+        assert cache.get(mlwh_session, ("no such sample", "SQSCP")) is None
+        assert cache.get_by_id(mlwh_session, -1) is None
+        assert len(cache) == 0
+
+    @m.it("Returns snapshots detached from any Session")
+    def test_detached(self, mlwh_session: Session):
+        cache = IdentityCache(Sample)
+        sample = cache.get_by_id(mlwh_session, 2354052)
+
+        assert sample not in mlwh_session
+
+        merged = mlwh_session.merge(sample, load=False)
+        assert merged in mlwh_session
+        assert merged.id_sample_lims == "2377277"
+
+    @m.it("Evicts the least recently used snapshots beyond maxsize")
+    def test_maxsize(self, mlwh_session: Session):
+        cache = IdentityCache(Sample, maxsize=1)
+
+        cache.get_by_id(mlwh_session, 2354052)
+        cache.get_by_id(mlwh_session, 3368614)
+
+        assert len(cache) == 1
+        assert cache.evictions == 1
+
+        cache.get(mlwh_session, ("2377277", "SQSCP"))
+        assert cache.misses == 3
+
+    @m.it("Reads snapshots again after max_age")
+    def test_max_age(self, mlwh_session: Session):
+        cache = IdentityCache(Sample, max_age=0.1)
+
+        sample = cache.get_by_id(mlwh_session, 2354052)
+        time.sleep(0.2)
+
+        assert cache.get_by_id(mlwh_session, 2354052) is not sample
+        assert cache.misses == 2
+
+    @m.it("Evicts snapshots of rows changed since the last check")
+    def test_invalidate_changed(self, mlwh_session: Session):
+        cache = IdentityCache(Sample, check_interval=None)
+        assert cache.invalidate_changed(mlwh_session) == 0
+
+        sample = cache.get_by_id(mlwh_session, 2354052)
+        cache.get_by_id(mlwh_session, 3368614)
+        touch_sample(mlwh_session, 2354052, "renamed")
+
+        assert cache.invalidate_changed(mlwh_session) == 1
+        assert len(cache) == 1
+
+        refreshed = cache.get(mlwh_session, ("2377277", "SQSCP"))
+        assert refreshed is not sample
+        assert refreshed.name == "renamed"
+
+    @m.it("Evicts snapshots of rows changed before the first check")
+    def test_first_check(self, mlwh_session: Session):
+        cache = IdentityCache(Sample, check_interval=None)
+
+        sample = cache.get_by_id(mlwh_session, 2354052)
+        touch_sample(mlwh_session, 2354052, "renamed")
+
+        assert cache.invalidate_changed(mlwh_session) == 1
+        assert cache.get_by_id(mlwh_session, 2354052) is not sample
+        assert cache.get_by_id(mlwh_session, 2354052).name == "renamed"
+
+    @m.it("Checks last_updated at most once per check interval")
+    def test_check_interval(self, mlwh_session: Session):
+        cache = IdentityCache(Sample, check_interval=0)
+        cache.invalidate_changed(mlwh_session)
+
+        sample = cache.get_by_id(mlwh_session, 2354052)
+        touch_sample(mlwh_session, 2354052, "renamed")
+
+        assert cache.get_by_id(mlwh_session, 2354052) is not sample
+
+    @m.it("Is shared between threads")
+    @m.mlwh_clone
+    def test_threads(self, mlwh_session: Session):
+        cache = IdentityCache(Sample)
+        bind = mlwh_session.get_bind()
+        found = []
+
+        def lookup():
+            with Session(bind) as sess:
+                found.append(cache.get_by_id(sess, 2354052))
+
+        threads = [threading.Thread(target=lookup) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(found) == 4
+        assert len(cache) == 1
+        assert cache.hits + cache.misses == 4
+
+    @m.it("Reports its memory use")
+    def test_memory_usage(self, mlwh_session: Session):
+        cache = IdentityCache(Sample)
+        empty = cache.memory_usage()
+
+        cache.get_by_id(mlwh_session, 2354052)
+
+        assert cache.memory_usage() > empty
+        cache.clear()
+        assert len(cache) == 0
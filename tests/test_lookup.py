@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+from pytest import mark as m
+from sqlalchemy.orm import Session, selectinload
+
+from ml_warehouse.lookup import lookup_many
+from ml_warehouse.schema import FlgenPlate, IseqFlowcell, Sample, StockResource
+
+
+@m.describe("Looking up rows by key in batches")
+class TestMLWarehouseLookup(object):
+    @m.it("Uses the natural key of the table by default")
+    def test_natural_key(self, mlwh_session: Session):
+        keys = [("16855", 5, 168, "SQSCP"), ("16855", 5, 1, "SQSCP")]
+
+        found = lookup_many(mlwh_session, IseqFlowcell, keys)
+
+        assert list(found) == keys
+        assert found.one(keys[0]).id_iseq_flowcell_tmp == 2654878
+        assert found.one(keys[1]).id_iseq_flowcell_tmp == 2654879
+        assert found.missing == []
+
+    @m.it("Marks the keys without rows as missing")
+    def test_missing(self, mlwh_session: Session):
+        keys = [("2377277", "SQSCP"), ("no such sample", "SQSCP")]
+
+        found = lookup_many(mlwh_session, Sample, keys)
+
+        assert found.found == [("2377277", "SQSCP")]
+        assert found.missing == [("no such sample", "SQSCP")]
+        assert found[("no such sample", "SQSCP")] == []
+        assert found.one(("no such sample", "SQSCP")) is None
+
+    @m.it("Groups the rows of non-unique keys")
+    def test_non_unique(self, mlwh_session_flgen: Session):
+        keys = [("SQSCP", "17129650"), ("SQSCP", "12127335")]
+
+        found = lookup_many(
+            mlwh_session_flgen,
+            FlgenPlate,
+            keys,
+            key="flgen_plate_id_lims_id_flgen_plate_lims_index",
+        )
+
+        assert [len(found[k]) for k in keys] == [3, 2]
+        with pytest.raises(ValueError):
+            found.one(keys[0])
+
+    @m.it("Looks up single columns by plain values, in chunks")
+    def test_chunks(self, mlwh_session: Session):
+        keys = [f"stock_barcode_0123{i}" for i in range(4, 7)] + ["no such stock"]
+
+        found = lookup_many(
+            mlwh_session,
+            StockResource,
+            keys,
+            key=["id_stock_resource_lims"],
+            chunk_size=2,
+            options=[selectinload(StockResource.sample)],
+        )
+
+        assert found.found == keys[:3]
+        assert found.missing == ["no such stock"]
+        assert found.one("stock_barcode_01234").id_stock_resource_tmp == 2345678
+        assert found.one("stock_barcode_01234").sample is not None
+
+    @m.it("Looks up repeated keys once")
+    def test_repeated(self, mlwh_session: Session):
+        found = lookup_many(mlwh_session, Sample, [2354052, 2354052], key="PRIMARY")
+
+        assert list(found) == [2354052]
+        assert len(found[2354052]) == 1
+
+    @m.it("Rejects keys that do not match the key columns")
+    def test_bad_keys(self, mlwh_session: Session):
+        with pytest.raises(ValueError):
+            lookup_many(mlwh_session, Sample, ["2377277"])
+        with pytest.raises(ValueError):
+            lookup_many(mlwh_session, Sample, ["2377277"], key="no_such_index")
+        with pytest.raises(ValueError):
+            lookup_many(mlwh_session, Sample, ["2377277"], key=["no_such_column"])
+
+    @m.it("Matches keys as MySQL compares them")
+    def test_collation(self, mlwh_session: Session):
+        keys = ["STOCK_BARCODE_01234 ", "stock_barcode_01234"]
+
+        found = lookup_many(
+            mlwh_session, StockResource, keys, key=["id_stock_resource_lims"]
+        )
+
+        assert found.missing == []
+        assert found.one(keys[0]) is found.one(keys[1])
+        assert found.one(keys[0]).id_stock_resource_tmp == 2345678
+
+        found = lookup_many(mlwh_session, Sample, ["2354052"], key="PRIMARY")
+
+        assert found.one("2354052").id_sample_tmp == 2354052
@@ -42,6 +42,7 @@ class TestMLWarehouseQueries(object):
 
 
 @m.describe("Resilience to modifying the database schema")
+@m.mlwh_clone
 class TestMLWarehouseResilience(object):
     @m.it("Retrieves a record of study after a column is added")
     def test_added_column_resilience(self, mlwh_session: Session):
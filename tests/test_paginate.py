@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+from pytest import mark as m
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ml_warehouse.paginate import (
+    decode_cursor,
+    encode_cursor,
+    fetch_page,
+    iter_pages,
+)
+from ml_warehouse.schema import IseqRunLaneMetrics, PacBioRun, Sample
+
+
+@m.describe("Paginating over primary keys")
+class TestMLWarehousePaginate(object):
+    @m.it("Yields every row once, in primary key order")
+    def test_iter_pages(self, mlwh_session: Session):
+        expected = mlwh_session.execute(
+            select(PacBioRun.id_pac_bio_tmp).order_by(PacBioRun.id_pac_bio_tmp)
+        ).scalars()
+
+        pages = list(iter_pages(mlwh_session, PacBioRun, page_size=10))
+
+        assert all(len(page.rows) <= 10 for page in pages)
+        assert [r.id_pac_bio_tmp for p in pages for r in p.rows] == list(expected)
+
+    @m.it("Resumes from a cursor token")
+    def test_resume(self, mlwh_session: Session):
+        first = fetch_page(mlwh_session, PacBioRun, page_size=5)
+        rest = list(iter_pages(mlwh_session, PacBioRun, cursor=first.cursor))
+
+        assert first.cursor is not None
+        assert rest[0].rows[0].id_pac_bio_tmp > first.rows[-1].id_pac_bio_tmp
+        assert len(first.rows) + sum(len(p.rows) for p in rest) == 56
+
+    @m.it("Applies further filters")
+    def test_filters(self, mlwh_session: Session):
+        filters = [PacBioRun.id_pac_bio_run_lims == "39859"]
+
+        pages = list(iter_pages(mlwh_session, PacBioRun, 4, filters))
+
+        assert [len(page.rows) for page in pages] == [4, 4, 4, 3]
+        assert pages[-1].cursor is None
+
+    @m.it("Rejects tables without a single-column primary key")
+    def test_composite_key(self, mlwh_session: Session):
+        with pytest.raises(ValueError, match="single-column primary key"):
+            fetch_page(mlwh_session, IseqRunLaneMetrics)
+
+    @m.it("Rejects cursors of other tables")
+    def test_cursor_table(self):
+        cursor = encode_cursor(PacBioRun, 4062)
+
+        assert decode_cursor(PacBioRun, cursor) == 4062
+        with pytest.raises(ValueError, match="is for table 'pac_bio_run'"):
+            decode_cursor(Sample, cursor)
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(Sample, "not a cursor")
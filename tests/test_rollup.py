@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import datetime
+
+import pytest
+from pytest import mark as m
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from examples.stats import get_sequenced_sum
+from ml_warehouse.rollup import YieldRollup
+from ml_warehouse.schema import IseqRunLaneMetrics, IseqRunStatus
+
+
+def add_qc_complete(sess: Session, id_run: int, date: datetime):
+    sess.add(
+        IseqRunStatus(
+            id_run_status=300000 + id_run,
+            id_run=id_run,
+            date=date,
+            id_run_status_dict=20,
+            iscurrent=1,
+        )
+    )
+    sess.commit()
+
+
+@m.describe("Rolling up the bases sequenced each month")
+class TestMLWarehouseYieldRollup(object):
+    @m.it("Sums every month on the first refresh")
+    def test_refresh(self, mlwh_session: Session):
+        rollup = YieldRollup()
+
+        assert rollup.refresh(mlwh_session) == ["2015-02"]
+        # The only lane of run 15440 has no interop_cluster_count_pf_total.
+        assert rollup.yields() == [("2015-02", "HiSeq", None, 1)]
+
+        since = datetime(year=2010, month=1, day=1)
+        assert rollup.sequenced_sum(mlwh_session, since) == list(
+            get_sequenced_sum(mlwh_session, since)
+        )
+        assert rollup.refresh(mlwh_session) == []
+
+    @m.it("Recomputes only the months of new qc complete statuses")
+    def test_new_status(self, mlwh_session: Session):
+        rollup = YieldRollup()
+        rollup.refresh(mlwh_session)
+
+        add_qc_complete(mlwh_session, 18448, datetime(year=2021, month=3, day=4))
+
+        assert rollup.refresh(mlwh_session) == ["2021-03"]
+        assert [y[:2] for y in rollup.yields()] == [
+            ("2015-02", "HiSeq"),
+            ("2021-03", "HiSeqX"),
+        ]
+        assert rollup.yields("2021-03")[0][3] == 8
+
+        for since in (
+            datetime(year=2010, month=1, day=1),
+            datetime(year=2015, month=2, day=10),
+            datetime(year=2021, month=3, day=1),
+        ):
+            assert rollup.sequenced_sum(mlwh_session, since) == list(
+                get_sequenced_sum(mlwh_session, since)
+            )
+
+    @m.it("Excludes statuses dated exactly at since, like get_sequenced_sum()")
+    def test_since_excluded(self, mlwh_session: Session):
+        since = datetime(year=2021, month=3, day=1)
+        add_qc_complete(mlwh_session, 18448, since)
+
+        rollup = YieldRollup()
+        assert rollup.refresh(mlwh_session) == ["2015-02", "2021-03"]
+
+        assert rollup.sequenced_sum(mlwh_session, since) == list(
+            get_sequenced_sum(mlwh_session, since)
+        )
+        assert rollup.sequenced_sum(mlwh_session, since) == []
+
+    @m.it("Recomputes the months of runs whose lane metrics changed")
+    def test_changed_lanes(self, mlwh_session: Session):
+        rollup = YieldRollup()
+        rollup.refresh(mlwh_session)
+
+        mlwh_session.execute(
+            update(IseqRunLaneMetrics)
+            .where(IseqRunLaneMetrics.id_run == 15440)
+            .values(cycles=1, last_changed=datetime(year=2030, month=1, day=1))
+        )
+        mlwh_session.commit()
+
+        assert rollup.refresh(mlwh_session) == ["2015-02"]
+
+        since = datetime(year=2010, month=1, day=1)
+        assert rollup.sequenced_sum(mlwh_session, since) == list(
+            get_sequenced_sum(mlwh_session, since)
+        )
+
+    @m.it("Keeps lanes with a NULL group apart from those with an empty one")
+    def test_null_group(self, mlwh_session: Session, tmp_path):
+        add_qc_complete(mlwh_session, 18448, datetime(year=2021, month=3, day=4))
+        for positions, model in (([1, 2, 3, 4], None), ([5, 6, 7, 8], "")):
+            mlwh_session.execute(
+                update(IseqRunLaneMetrics)
+                .where(
+                    IseqRunLaneMetrics.id_run == 18448,
+                    IseqRunLaneMetrics.position.in_(positions),
+                )
+                .values(instrument_model=model)
+            )
+        mlwh_session.commit()
+
+        path = tmp_path / "yield.json"
+        rollup = YieldRollup(path)
+        rollup.refresh(mlwh_session)
+
+        yields = rollup.yields("2021-03")
+        assert [(y[1], y[3]) for y in yields] == [(None, 4), ("", 4)]
+        assert YieldRollup(path).yields() == rollup.yields()
+
+        since = datetime(year=2010, month=1, day=1)
+        assert rollup.sequenced_sum(mlwh_session, since) == list(
+            get_sequenced_sum(mlwh_session, since)
+        )
+
+    @m.it("Stores the sums in a file")
+    def test_file(self, mlwh_session: Session, tmp_path):
+        path = tmp_path / "yield.json"
+        rollup = YieldRollup(path, group_by="workflow_type")
+        rollup.refresh(mlwh_session)
+
+        stored = YieldRollup(path, group_by="workflow_type")
+        assert stored.yields() == rollup.yields()
+        assert stored.refresh(mlwh_session) == []
+
+        with pytest.raises(ValueError, match="instrument_model"):
+            YieldRollup(path)
+
+    @m.it("Refuses unknown columns to group by")
+    def test_group_by(self):
+        with pytest.raises(ValueError, match="no_such_column"):
+            YieldRollup(group_by="no_such_column")
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+from pytest import mark as m
+from sqlalchemy import create_engine, select, text, update
+from sqlalchemy.pool import QueuePool
+
+from ml_warehouse.routing import LEAST_CONNECTIONS, ReplicaSet, RoutingSession
+from ml_warehouse.schema import IseqRunStatusDict
+
+# SQLite files stand in for the primary and replica databases. Each holds a
+# status with the same id and the name of the database as its description.
+DATABASES = ["primary", "replica1", "replica2"]
+
+# SQLite cannot render the MySQL integer types of the mapped table.
+CREATE_TABLE = """
+CREATE TABLE iseq_run_status_dict (
+    id_run_status_dict INTEGER PRIMARY KEY,
+    description VARCHAR(64) NOT NULL,
+    iscurrent INTEGER NOT NULL,
+    temporal_index INTEGER
+)
+"""
+
+
+@pytest.fixture(scope="function")
+def engines(tmp_path) -> dict:
+    engines = {}
+    for name in DATABASES:
+        engine = create_engine(
+            f"sqlite:///{tmp_path / name}.db", poolclass=QueuePool, future=True
+        )
+        with engine.begin() as conn:
+            conn.execute(text(CREATE_TABLE))
+            conn.execute(
+                IseqRunStatusDict.__table__.insert().values(
+                    id_run_status_dict=1, description=name, iscurrent=1
+                )
+            )
+        engines[name] = engine
+
+    yield engines
+
+    for engine in engines.values():
+        engine.dispose()
+
+
+def routing_session(engines, **kwargs) -> RoutingSession:
+    replicas = ReplicaSet([engines["replica1"], engines["replica2"]], **kwargs)
+
+    return RoutingSession(primary=engines["primary"], replicas=replicas)
+
+
+def read_description(sess: RoutingSession) -> str:
+    return sess.execute(
+        select(IseqRunStatusDict.description).where(
+            IseqRunStatusDict.id_run_status_dict == 1
+        )
+    ).scalar_one()
+
+
+@m.describe("Routing statements between a primary and replicas")
+class TestMLWarehouseRouting(object):
+    @m.it("Sends the reads of each transaction to each replica in turn")
+    def test_round_robin(self, engines):
+        observed = []
+        with routing_session(engines) as sess:
+            for _ in range(3):
+                observed.append([read_description(sess) for _ in range(2)])
+                sess.commit()
+
+        assert observed == [
+            ["replica1", "replica1"],
+            ["replica2", "replica2"],
+            ["replica1", "replica1"],
+        ]
+
+    @m.it("Sends reads to the replica with fewest checked out connections")
+    def test_least_connections(self, engines):
+        with engines["replica1"].connect():
+            with routing_session(engines, strategy=LEAST_CONNECTIONS) as sess:
+                assert read_description(sess) == "replica2"
+
+    @m.it("Sends flushes and DML to the primary")
+    def test_writes(self, engines):
+        with routing_session(engines) as sess:
+            sess.add(
+                IseqRunStatusDict(id_run_status_dict=2, description="new", iscurrent=1)
+            )
+            sess.execute(
+                update(IseqRunStatusDict)
+                .where(IseqRunStatusDict.id_run_status_dict == 1)
+                .values(iscurrent=0)
+            )
+            sess.commit()
+
+        with engines["primary"].connect() as conn:
+            rows = conn.execute(select(IseqRunStatusDict.iscurrent)).all()
+            assert sorted(rows) == [(0,), (1,)]
+        with engines["replica1"].connect() as conn:
+            rows = conn.execute(select(IseqRunStatusDict.iscurrent)).all()
+            assert rows == [(1,)]
+
+    @m.it("Reads from the primary after writing, until the transaction ends")
+    def test_read_your_writes(self, engines):
+        with routing_session(engines) as sess:
+            sess.add(
+                IseqRunStatusDict(id_run_status_dict=2, description="new", iscurrent=1)
+            )
+            sess.flush()
+            assert read_description(sess) == "primary"
+
+            sess.commit()
+            assert read_description(sess) == "replica1"
+
+    @m.it("Reads from the primary within using_primary")
+    def test_using_primary(self, engines):
+        with routing_session(engines) as sess:
+            with sess.using_primary():
+                assert read_description(sess) == "primary"
+            assert read_description(sess) == "replica1"
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import datetime
+
+import pytest
+from pytest import mark as m
+from sqlalchemy import create_engine, lambda_stmt, select, text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session
+
+from examples.long_illumina import select_long_illumina, summarize_long_illumina
+from examples.npg_qc import select_iseq_product_metrics_run
+from examples.recently_updated import get_recent_ont, select_recent_ont
+from ml_warehouse.bulk import load_yaml
+from ml_warehouse.statements import StatementStats
+from ml_warehouse.schema import IseqRunStatusDict
+
+# SQLite cannot render the MySQL integer types of the mapped table.
+CREATE_TABLE = """
+CREATE TABLE iseq_run_status_dict (
+    id_run_status_dict INTEGER PRIMARY KEY,
+    description VARCHAR(64) NOT NULL,
+    iscurrent INTEGER NOT NULL,
+    temporal_index INTEGER
+)
+"""
+
+
+@pytest.fixture(scope="function")
+def dict_session() -> Session:
+    engine = create_engine("sqlite://", future=True)
+    with engine.begin() as conn:
+        conn.execute(text(CREATE_TABLE))
+
+    with Session(engine) as sess:
+        load_yaml(sess, IseqRunStatusDict, "tests/fixtures/00-IseqRunStatusDict.yml")
+        yield sess
+
+
+def description(sess: Session, id_run_status_dict: int) -> str:
+    return sess.execute(
+        lambda_stmt(
+            lambda: select(IseqRunStatusDict.description).where(
+                IseqRunStatusDict.id_run_status_dict == id_run_status_dict
+            )
+        )
+    ).scalar()
+
+
+def params(stmt) -> dict:
+    compiled = stmt.compile(
+        dialect=mysql.dialect(), compile_kwargs={"render_postcompile": True}
+    )
+
+    return compiled.construct_params()
+
+
+@m.describe("Counting compiled statement cache hits")
+class TestMLWarehouseStatementStats(object):
+    @m.it("Counts hits and misses")
+    def test_hits(self, dict_session: Session):
+        stats = StatementStats(dict_session.get_bind())
+
+        assert description(dict_session, 1) == "run pending"
+        assert description(dict_session, 20) == "qc complete"
+        assert description(dict_session, 2) == "run in progress"
+
+        assert (stats.hits, stats.misses) == (2, 1)
+        assert stats.hit_ratio == pytest.approx(2 / 3)
+        assert stats.compile_seconds > 0
+        assert stats.uncached_seconds == 0.0
+        assert stats.cache_size > 0
+
+    @m.it("Counts statements executed without caching apart from compilation")
+    def test_uncached(self, dict_session: Session):
+        stats = StatementStats(dict_session.get_bind())
+
+        conn = dict_session.connection().execution_options(compiled_cache=None)
+        conn.execute(select(IseqRunStatusDict.description))
+
+        assert (stats.misses, stats.uncached) == (0, 1)
+        assert stats.compile_seconds == 0.0
+        assert stats.uncached_seconds > 0
+
+    @m.it("Ignores statements executed as strings")
+    def test_driver_sql(self, dict_session: Session):
+        stats = StatementStats(dict_session.get_bind())
+
+        dict_session.connection().exec_driver_sql("SELECT 1")
+
+        assert stats.executions == 0
+
+    @m.it("Stops counting when detached")
+    def test_detach(self, dict_session: Session):
+        stats = StatementStats(dict_session.get_bind())
+        description(dict_session, 1)
+
+        stats.detach()
+        description(dict_session, 1)
+        assert stats.executions == 1
+
+        stats.reset()
+        assert (stats.executions, stats.compile_seconds) == (0, 0.0)
+
+
+@m.describe("Caching the statements of the query helpers")
+class TestMLWarehouseHelperStatements(object):
+    @m.it("Binds the arguments of each call to the cached statements")
+    def test_lambda_params(self):
+        first = params(select_iseq_product_metrics_run([1, 2], "a", 3))
+        second = params(select_iseq_product_metrics_run((7, 8, 9), "b", 4))
+
+        assert sorted(first.values(), key=str) == [1, 2, 3, "a"]
+        assert sorted(second.values(), key=str) == [4, 7, 8, 9, "b"]
+
+        args = ("%x%", datetime(2020, 1, 1), datetime(2021, 1, 1), 3, [5])
+        select_long_illumina(*args)
+        observed = params(select_long_illumina("%y%", *args[1:4], [6, 7]))
+
+        assert observed["faculty_sponsor_pattern_1"] == "%y%"
+        assert observed["id_run_status_dict_1"] == 1
+        assert [v for k, v in observed.items() if k.startswith("ids_also")] == [6, 7]
+
+    @m.it("Compiles each helper once")
+    def test_compile_once(self, mlwh_session: Session):
+        stats = StatementStats(mlwh_session.get_bind())
+        try:
+            for year in (2017, 2018, 2019):
+                since = datetime(year=year, month=1, day=1)
+                mlwh_session.execute(select_recent_ont(since)).all()
+                get_recent_ont(mlwh_session, since).all()
+
+            assert (stats.hits, stats.misses) == (4, 2)
+        finally:
+            stats.detach()
+
+    @m.it("Returns the same rows from cached statements")
+    def test_rows(self, mlwh_session_ipm: Session):
+        args = (
+            "%tyler%",
+            datetime(year=2015, month=1, day=14),
+            datetime(year=2021, month=8, day=31),
+            3,
+            [3434, 1239, 1453],
+        )
+
+        expected = summarize_long_illumina(mlwh_session_ipm, *args).all()
+        assert [row.id_run for row in expected] == [15440]
+
+        for _ in range(2):
+            observed = mlwh_session_ipm.execute(select_long_illumina(*args)).all()
+            assert observed == expected
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from pytest import mark as m
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ml_warehouse.schema import (
+    IseqProductMetrics,
+    IseqRunStatus,
+    PacBioRunWellMetrics,
+    Sample,
+)
+from ml_warehouse.stream import MAX_BATCH_SIZE, default_batch_size, iter_rows
+
+
+@m.describe("Streaming rows through a server-side cursor")
+class TestMLWarehouseStream(object):
+    @m.it("Yields every row of a mapped class, expunging each batch")
+    def test_iter_rows_class(self, mlwh_session_ipm: Session):
+        expected = mlwh_session_ipm.query(IseqProductMetrics).count()
+        mlwh_session_ipm.expunge_all()
+
+        observed = 0
+        for row in iter_rows(mlwh_session_ipm, IseqProductMetrics, batch_size=2):
+            observed += 1
+            assert len(mlwh_session_ipm.identity_map) <= 2
+
+        assert observed == expected
+        assert len(mlwh_session_ipm.identity_map) == 0
+
+    @m.it("Yields the rows of a column statement")
+    def test_iter_rows_columns(self, mlwh_session: Session):
+        stmt = select(Sample.id_sample_tmp, Sample.name).order_by(Sample.id_sample_tmp)
+
+        observed = list(iter_rows(mlwh_session, stmt, batch_size=3))
+
+        assert observed == mlwh_session.execute(stmt).all()
+
+    @m.it("Uses larger batches for narrower tables")
+    def test_default_batch_size(self):
+        wide = default_batch_size(select(PacBioRunWellMetrics))
+        narrow = default_batch_size(select(IseqRunStatus))
+
+        assert wide < narrow <= MAX_BATCH_SIZE
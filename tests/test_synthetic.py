@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import Counter
+
+import pytest
+from pytest import mark as m
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from ml_warehouse.bulk import INSERT
+from ml_warehouse.schema import IseqFlowcell, IseqRunStatus
+
+np = pytest.importorskip("numpy")
+
+from ml_warehouse.synthetic import RUN_WORKFLOW, SyntheticWarehouse  # noqa: E402
+
+SCALE = 0.01
+
+
+@pytest.fixture(scope="module")
+def warehouse() -> dict:
+    synthetic = SyntheticWarehouse(seed=7, scale=SCALE)
+
+    return {
+        table.name: list(synthetic.iter_rows(table.name)) for table in synthetic.tables
+    }
+
+
+@pytest.fixture(scope="function")
+def empty_session(mlwh_template) -> Session:
+    mlwh_template.clone(empty=True)
+
+    engine = create_engine(mlwh_template.url, future=True)
+    with Session(engine) as sess:
+        yield sess
+
+    engine.dispose()
+
+
+@m.describe("Generating synthetic warehouses")
+class TestMLWarehouseSynthetic(object):
+    @m.it("Generates the same rows for the same seed and scale")
+    def test_deterministic(self, warehouse):
+        again = SyntheticWarehouse(seed=7, scale=SCALE)
+        other = SyntheticWarehouse(seed=8, scale=SCALE)
+
+        for name in ("sample", "iseq_flowcell", "iseq_run_status"):
+            assert list(again.iter_rows(name)) == warehouse[name]
+            assert list(other.iter_rows(name)) != warehouse[name]
+
+    @m.it("Scales the number of rows")
+    def test_scale(self, warehouse):
+        larger = SyntheticWarehouse(seed=7, scale=SCALE * 2)
+
+        assert len(warehouse["sample"]) == 2000
+        assert larger.count("sample") == 4000
+        assert larger.count("iseq_run_status_dict") == len(
+            warehouse["iseq_run_status_dict"]
+        )
+
+    @m.it("Respects foreign keys, unique keys and NOT NULL")
+    def test_constraints(self, warehouse):
+        synthetic = SyntheticWarehouse(seed=7, scale=SCALE)
+
+        for table in synthetic.tables:
+            rows = warehouse[table.name]
+
+            for constraint in table.foreign_key_constraints:
+                local = [col.key for col in constraint.columns]
+                remote = [element.column.key for element in constraint.elements]
+                parents = {
+                    tuple(row[key] for key in remote)
+                    for row in warehouse[constraint.referred_table.name]
+                }
+                assert all(
+                    tuple(row[key] for key in local) in parents for row in rows
+                ), (table.name, local)
+
+            for index in table.indexes:
+                if index.unique:
+                    keys = [
+                        tuple(row[col.key] for col in index.columns) for row in rows
+                    ]
+                    keys = [key for key in keys if None not in key]
+                    assert len(keys) == len(set(keys)), (table.name, index.name)
+
+            for col in table.columns:
+                if not col.nullable:
+                    assert all(row[col.key] is not None for row in rows), (
+                        table.name,
+                        col.key,
+                    )
+
+    @m.it("Pools libraries in lanes and products on the lanes of runs")
+    def test_pools(self, warehouse):
+        pools = Counter(
+            (row["id_flowcell_lims"], row["position"])
+            for row in warehouse["iseq_flowcell"]
+        )
+        assert max(pools.values()) == 384
+        assert min(pools.values()) == 1
+
+        lanes = {
+            (row["id_run"], row["position"])
+            for row in warehouse["iseq_run_lane_metrics"]
+        }
+        products = warehouse["iseq_product_metrics"]
+        assert len(products) == len(warehouse["iseq_flowcell"])
+        assert all((row["id_run"], row["position"]) in lanes for row in products)
+
+    @m.it("Gives runs statuses in workflow order, some many times over")
+    def test_run_statuses(self, warehouse):
+        statuses = warehouse["iseq_run_status"]
+        by_run = {}
+        for row in statuses:
+            by_run.setdefault(row["id_run"], []).append(row)
+
+        assert max(len(rows) for rows in by_run.values()) > 2 * len(RUN_WORKFLOW)
+        for rows in by_run.values():
+            dates = [row["date"] for row in rows]
+            order = [RUN_WORKFLOW.index(row["id_run_status_dict"]) for row in rows]
+
+            assert dates == sorted(dates)
+            assert order == sorted(order)
+            assert [row["iscurrent"] for row in rows][-1] == 1
+
+    @m.it("Spreads rows unevenly over their parents")
+    def test_skew(self, warehouse):
+        samples = Counter(row["id_sample_tmp"] for row in warehouse["iseq_flowcell"])
+        top = sorted(samples.values(), reverse=True)[: len(warehouse["sample"]) // 10]
+
+        assert sum(top) > 0.3 * len(warehouse["iseq_flowcell"])
+
+    @m.it("Loads a warehouse through the bulk loaders")
+    def test_load(self, empty_session: Session):
+        synthetic = SyntheticWarehouse(seed=7, scale=0.001)
+
+        results = synthetic.load(empty_session, method=INSERT)
+
+        assert results["iseq_flowcell"].rows == synthetic.count("iseq_flowcell")
+        assert empty_session.execute(
+            select(func.count()).select_from(IseqFlowcell)
+        ).scalar() == synthetic.count("iseq_flowcell")
+        assert empty_session.execute(
+            select(func.count()).select_from(IseqRunStatus)
+        ).scalar() == synthetic.count("iseq_run_status")
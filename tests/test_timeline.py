@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2023 Genome Research Ltd. All rights reserved.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import datetime
+
+import pytest
+from pytest import mark as m
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import Session
+
+from ml_warehouse.bulk import load_yaml
+from ml_warehouse.schema import IseqRunStatus, IseqRunStatusDict
+
+np = pytest.importorskip("numpy")
+
+from ml_warehouse.timeline import NO_STATE, RunTimeline  # noqa: E402
+
+CREATE_TABLES = [
+    """
+CREATE TABLE iseq_run_status_dict (
+    id_run_status_dict INTEGER PRIMARY KEY,
+    description VARCHAR(64) NOT NULL,
+    iscurrent INTEGER NOT NULL,
+    temporal_index INTEGER
+)
+""",
+    """
+CREATE TABLE iseq_run_status (
+    id_run_status INTEGER PRIMARY KEY,
+    id_run INTEGER NOT NULL,
+    date DATETIME NOT NULL,
+    id_run_status_dict INTEGER NOT NULL,
+    iscurrent INTEGER NOT NULL
+)
+""",
+]
+
+
+@pytest.fixture(scope="function")
+def status_session() -> Session:
+    engine = create_engine("sqlite://", future=True)
+    with engine.begin() as conn:
+        for create_table in CREATE_TABLES:
+            conn.execute(text(create_table))
+
+    with Session(engine) as sess:
+        load_yaml(sess, IseqRunStatusDict, "tests/fixtures/00-IseqRunStatusDict.yml")
+        load_yaml(sess, IseqRunStatus, "tests/fixtures/100-IseqRunStatus.yml")
+        yield sess
+
+
+@m.describe("Querying run status timelines")
+class TestMLWarehouseRunTimeline(object):
+    @m.it("Finds the current state of runs")
+    def test_current_state(self, status_session: Session):
+        timeline = RunTimeline()
+
+        assert timeline.refresh(status_session) == 28
+        assert list(timeline.runs) == [15440, 15454]
+
+        states, dates = timeline.current_state([15454, 15440, 1])
+
+        assert list(timeline.describe(states)) == ["qc complete", "qc complete", None]
+        assert dates[0] == np.datetime64("2015-02-06T09:10:15")
+        assert np.isnat(dates[2])
+
+    @m.it("Finds the state of runs at a time")
+    def test_state_at(self, status_session: Session):
+        timeline = RunTimeline()
+        timeline.refresh(status_session)
+
+        # Two statuses of run 15440 share this date; the later id wins.
+        states, dates = timeline.state_at(
+            datetime(year=2015, month=2, day=5, hour=17, minute=56, second=44),
+            [15440, 15454],
+        )
+        assert list(timeline.describe(states)) == ["analysis pending", "run pending"]
+        assert dates[1] == np.datetime64("2015-02-05T14:08:06")
+
+        states, _ = timeline.state_at(
+            [datetime(year=2015, month=2, day=1), datetime(year=2015, month=3, day=1)],
+            [15440, 15454],
+        )
+        assert states[0] == NO_STATE
+        assert timeline.describe(states)[1] == "qc complete"
+
+        # Times before 1970, NaT and times far ahead stay within their run.
+        states, _ = timeline.state_at(
+            np.array(["1960-01-01", "NaT", "2600-01-01"], dtype="datetime64[s]"),
+            [15454, 15454, 15440],
+        )
+        assert list(timeline.describe(states)) == [None, None, "qc complete"]
+
+    @m.it("Measures the time between states and the time spent in a state")
+    def test_durations(self, status_session: Session):
+        timeline = RunTimeline()
+        timeline.refresh(status_session)
+
+        pending = timeline.first_dates("run pending", [15440])
+        assert pending[0] == np.datetime64("2015-02-04T11:39:20")
+
+        durations = timeline.durations("run pending", "qc complete", [15440, 15454])
+        assert durations[0] == np.timedelta64(379794, "s")
+        assert durations[1] == np.timedelta64(68529, "s")
+
+        in_pending = timeline.time_in_state("run pending")
+        assert in_pending[0] == np.timedelta64(16051, "s")
+        assert np.isnat(timeline.durations(1, 999, [15440])[0])
+
+    @m.it("Merges the statuses added since the previous refresh")
+    def test_refresh(self, status_session: Session):
+        timeline = RunTimeline()
+        timeline.refresh(status_session)
+
+        status_session.add_all(
+            [
+                IseqRunStatus(
+                    id_run_status=300000,
+                    id_run=15454,
+                    date=datetime(year=2015, month=3, day=1),
+                    id_run_status_dict=21,
+                    iscurrent=1,
+                ),
+                IseqRunStatus(
+                    id_run_status=300001,
+                    id_run=20000,
+                    date=datetime(year=2015, month=3, day=2),
+                    id_run_status_dict=1,
+                    iscurrent=1,
+                ),
+            ]
+        )
+        status_session.commit()
+
+        assert timeline.refresh(status_session) == 2
+        assert timeline.refresh(status_session) == 0
+        assert len(timeline) == 30
+
+        states, _ = timeline.current_state([15440, 15454, 20000])
+        assert list(states) == [20, 21, 1]
+
+    @m.it("Refuses unknown states")
+    def test_unknown_state(self, status_session: Session):
+        timeline = RunTimeline()
+        timeline.refresh(status_session)
+
+        with pytest.raises(ValueError, match="no such state"):
+            timeline.first_dates("no such state")
+
+    @m.it("Agrees with the pending dates read from the warehouse")
+    def test_pending_dates(self, mlwh_session: Session):
+        timeline = RunTimeline()
+        timeline.refresh(mlwh_session)
+
+        expected = mlwh_session.execute(
+            select(IseqRunStatus.id_run, func.min(IseqRunStatus.date))
+            .where(IseqRunStatus.id_run_status_dict == 1)
+            .group_by(IseqRunStatus.id_run)
+            .order_by(IseqRunStatus.id_run)
+        ).all()
+        id_runs = [id_run for id_run, _ in expected]
+
+        assert list(timeline.first_dates("run pending", id_runs)) == [
+            np.datetime64(date, "s") for _, date in expected
+        ]